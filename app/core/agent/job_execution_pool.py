@@ -0,0 +1,175 @@
+import atexit
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import threading
+from typing import Any, Callable, Deque, Dict, Optional
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+from app.core.dal.database import remove_thread_session
+
+
+@dataclass
+class _PendingTask:
+    """A task waiting for a free slot in the job execution pool."""
+
+    expert_name: str
+    fn: Callable[..., Any]
+    args: tuple
+    kwargs: Dict[str, Any]
+    future: Future = field(default_factory=Future)
+
+
+class JobExecutionPool(metaclass=Singleton):
+    """Process-wide pool executing the subjobs of all the job graphs.
+
+    The pool bounds the number of concurrently executing subjobs globally
+    (`JOB_EXECUTION_POOL_SIZE`) and per expert (`JOB_EXPERT_MAX_CONCURRENCY`, overridden per expert
+    by `JOB_EXPERT_CONCURRENCY_LIMITS`, e.g. "Graph Modeling Expert:2,Graph Query Expert:4").
+    Queued subjobs are dispatched round-robin across sessions, so that a session submitting a
+    large job graph does not starve the other sessions. The pool is shut down at exit, cancelling
+    the queued subjobs.
+    """
+
+    def __init__(self):
+        self._max_workers: int = max(SystemEnv.JOB_EXECUTION_POOL_SIZE or 1, 1)
+        self._default_expert_limit: int = SystemEnv.JOB_EXPERT_MAX_CONCURRENCY or 0
+        self._expert_limits: Dict[str, int] = self._parse_expert_limits(
+            SystemEnv.JOB_EXPERT_CONCURRENCY_LIMITS or ""
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="job_execution"
+        )
+
+        self._lock = threading.Lock()
+        # session id -> queued tasks, the order of the sessions is the round-robin order
+        self._queues: "OrderedDict[str, Deque[_PendingTask]]" = OrderedDict()
+        self._running_count: int = 0
+        self._running_by_expert: Dict[str, int] = {}
+        self._is_shutdown: bool = False
+        atexit.register(self.shutdown, wait=False)
+
+    def submit(
+        self, session_id: str, expert_name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Future:
+        """Submit a subjob related task to the pool.
+
+        Args:
+            session_id (str): The session the task belongs to, used for fairness.
+            expert_name (str): The expert executing the task, used for the concurrency limits.
+            fn (Callable[..., Any]): The task.
+            *args (Any): The positional arguments of the task.
+            **kwargs (Any): The keyword arguments of the task.
+
+        Returns:
+            Future: The future of the task result.
+
+        Raises:
+            RuntimeError: If the pool is shut down.
+        """
+        task = _PendingTask(expert_name=expert_name, fn=fn, args=args, kwargs=kwargs)
+        with self._lock:
+            if self._is_shutdown:
+                raise RuntimeError("Cannot submit a task to the shut down job execution pool")
+            self._queues.setdefault(session_id, deque()).append(task)
+        self._dispatch()
+        return task.future
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the numbers of the running and the queued tasks."""
+        with self._lock:
+            return {
+                "max_workers": self._max_workers,
+                "running": self._running_count,
+                "running_by_expert": dict(self._running_by_expert),
+                "queued_by_session": {
+                    session_id: len(queue) for session_id, queue in self._queues.items()
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shutdown the pool, the queued tasks which are not started yet are cancelled."""
+        with self._lock:
+            self._is_shutdown = True
+            queues = list(self._queues.values())
+            self._queues.clear()
+        for queue in queues:
+            for task in queue:
+                task.future.cancel()
+        self._executor.shutdown(wait=wait)
+
+    def _expert_limit(self, expert_name: str) -> int:
+        return self._expert_limits.get(expert_name, self._default_expert_limit)
+
+    def _has_capacity(self, expert_name: str) -> bool:
+        limit = self._expert_limit(expert_name)
+        return limit <= 0 or self._running_by_expert.get(expert_name, 0) < limit
+
+    def _next_task(self) -> Optional[_PendingTask]:
+        """Pop the next runnable task, visiting the sessions in round-robin order."""
+        for session_id in list(self._queues.keys()):
+            queue = self._queues[session_id]
+            task = next((t for t in queue if self._has_capacity(t.expert_name)), None)
+            if not task:
+                continue
+            queue.remove(task)
+            # move the served session to the end of the round
+            if queue:
+                self._queues.move_to_end(session_id)
+            else:
+                del self._queues[session_id]
+            return task
+        return None
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._lock:
+                if self._is_shutdown or self._running_count >= self._max_workers:
+                    return
+                task = self._next_task()
+                if not task:
+                    return
+                if not task.future.set_running_or_notify_cancel():
+                    continue
+                self._running_count += 1
+                self._running_by_expert[task.expert_name] = (
+                    self._running_by_expert.get(task.expert_name, 0) + 1
+                )
+            try:
+                self._executor.submit(self._run, task)
+            except RuntimeError as e:
+                # the executor refuses new tasks once the interpreter is shutting down
+                self._finish(task)
+                task.future.set_exception(e)
+                return
+
+    def _run(self, task: _PendingTask) -> None:
+        try:
+            result = task.fn(*task.args, **task.kwargs)
+        except BaseException as e:
+            task.future.set_exception(e)
+        else:
+            task.future.set_result(result)
+        finally:
+            # the worker thread is reused, do not leak the db session to the next task
+            remove_thread_session()
+            self._finish(task)
+            self._dispatch()
+
+    def _finish(self, task: _PendingTask) -> None:
+        with self._lock:
+            self._running_count -= 1
+            self._running_by_expert[task.expert_name] -= 1
+
+    @staticmethod
+    def _parse_expert_limits(raw: str) -> Dict[str, int]:
+        limits: Dict[str, int] = {}
+        for item in raw.split(","):
+            if not item.strip():
+                continue
+            expert_name, _, limit = item.rpartition(":")
+            if not expert_name.strip():
+                raise ValueError(f"Invalid expert concurrency limit: {item}")
+            limits[expert_name.strip()] = int(limit)
+        return limits
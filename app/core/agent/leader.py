@@ -1,14 +1,14 @@
-from concurrent.futures import Future, ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 import json
-import time
-from time import sleep
-from typing import Dict, List, Optional, Set, Union
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Union
 
 import networkx as nx  # type: ignore
 
 from app.core.agent.agent import Agent, AgentConfig
 from app.core.agent.builtin_leader_state import BuiltinLeaderState
 from app.core.agent.expert import Expert
+from app.core.agent.job_execution_pool import JobExecutionPool
 from app.core.agent.leader_state import LeaderState
 from app.core.central_orchestrator.central_orchestrator import CentralOrchestrator
 from app.core.common.async_func import run_in_thread
@@ -252,238 +252,188 @@ class Leader(Agent):
         )
 
         self.execute_job_graph(original_job_id=original_job.id)
+
     def execute_job_graph_new_version(self, original_job_id: str) -> None:
+        """Execute the job graph, letting each expert build its dynamic workflow before the
+        subjob is executed."""
+        self._schedule_job_graph(original_job_id=original_job_id, build_workflow=True)
+
+    def execute_job_graph(self, original_job_id: str) -> None:
+        """Execute the job graph."""
+        self._schedule_job_graph(original_job_id=original_job_id)
+
+    def _schedule_job_graph(self, original_job_id: str, build_workflow: bool = False) -> None:
+        """Execute the subjobs of the job graph as soon as their dependencies are resolved.
+
+        Each pending subjob keeps a counter of its unfinished predecessors, and the counters of
+        the successors are decreased when a subjob completes, so a subjob is dispatched as soon
+        as its last predecessor finishes. The scheduler blocks on the completion of the running
+        futures instead of polling. If the schedule fails, the queued subjobs are cancelled and
+        the running ones are waited for before the error is raised.
+
+        Args:
+            original_job_id (str): The id of the original job.
+            build_workflow (bool): Whether the expert should build its dynamic workflow for the
+                subjob (in parallel, ahead of the dependencies) before executing it.
+        """
         job_graph: JobGraph = self._job_service.get_job_graph(original_job_id)
         pending_job_ids: Set[str] = set(job_graph.vertices())
-        preparing_jobs:Dict[str, Future] = {}
-        waiting_job_ids: Set[str] = set()
-        running_jobs: Dict[str, Future] = {}
+        running_jobs: Dict[Future, str] = {}
+        preparing_jobs: Dict[Future, str] = {}
+        prepared_job_ids: Set[str] = set()
         expert_results: Dict[str, WorkflowMessage] = {}
         job_inputs: Dict[str, AgentMessage] = {}
-        with ThreadPoolExecutor() as executor:
-            while pending_job_ids or preparing_jobs or waiting_job_ids or running_jobs:
-                ready_job_ids: Set[str] = set()
-                # step1: 并行执行构建后续任务子图
-                for job_id in list(pending_job_ids):
-                    expert_id = self._job_service.get_subjob(job_id).expert_id
-                    assert expert_id is not None, "该任务没有分配Expert"
-                    expert = self.state.get_expert_by_id(expert_id)
-                    preparing_jobs[job_id] = executor.submit(
-                        self._expert_build_workflow, expert, AgentMessage(job_id=job_id)
-                    )
-                    pending_job_ids.remove(job_id)
-                # step2：将构建好子图的Expert任务放入preparing_jobs中
-                finished_preparing = []
-                for job_id, future in preparing_jobs.items():
-                    if future.done():
-                        waiting_job_ids.add(job_id)
-                        finished_preparing.append(job_id)
-
-                for job_id in finished_preparing:
-                    preparing_jobs.pop(job_id, None)
-                # step3：遍历waiting_job_ids，将其按依赖顺序执行（前置节点全部结束即可开始），放入ready_job_ids
-                for job_id in waiting_job_ids:
-                    expert_id = self._job_service.get_subjob(job_id).expert_id
-                    all_predecessors_complete = all(
-                        pred not in waiting_job_ids and pred not in running_jobs
-                        for pred in job_graph.predecessors(job_id)
-                    )
-                    if all_predecessors_complete:
-                        job: SubJob = self._job_service.get_subjob(job_id)
-                        pred_messages: List[WorkflowMessage] = [
-                            expert_results[pred_id] for pred_id in job_graph.predecessors(job_id)
-                        ]
-                        job_inputs[job_id] = AgentMessage(
-                            job_id=job_id, workflow_messages=pred_messages
-                        )
-                        ready_job_ids.add(job_id)
-
-                # step4：执行ready_job_ids中的任务
-                for job_id in ready_job_ids:
-                    expert_id = self._job_service.get_subjob(job_id).expert_id
-                    assert expert_id, "The subjob is not assigned to an expert."
-                    expert = self.state.get_expert_by_id(expert_id=expert_id)
-
-                    running_jobs[job_id] = executor.submit(
-                        self._execute_job, expert, job_inputs[job_id]
-                    )
-                    waiting_job_ids.remove(job_id)
-                if not running_jobs and pending_job_ids:
-                    raise ValueError(
-                        "由于job_graph产出的依赖问题，导致有些任务没有办法被执行"
-                    )
+        subjobs: Dict[str, SubJob] = {}
+        unfinished_predecessors: Dict[str, int] = {}
+        ready_job_ids: Deque[str] = deque()
+        # the subjobs of all the job graphs share one bounded pool
+        executor: JobExecutionPool = JobExecutionPool()
+
+        def get_subjob(job_id: str) -> SubJob:
+            # the subjob is read from the database only once per schedule
+            if job_id not in subjobs:
+                subjobs[job_id] = self._job_service.get_subjob(job_id)
+            return subjobs[job_id]
+
+        def submit(
+            job_id: str, fn: Callable[[Expert, AgentMessage], Any], message: AgentMessage
+        ) -> Future:
+            subjob = get_subjob(job_id)
+            assert subjob.expert_id, "The subjob is not assigned to an expert."
+            expert = self.state.get_expert_by_id(expert_id=subjob.expert_id)
+            return executor.submit(
+                subjob.session_id, expert.get_profile().name, fn, expert, message
+            )
 
-                completed_job_ids = []
-                for job_id, future in running_jobs.items():
-                    if future.done():
-                        completed_job_ids.append(job_id)
-                for completed_job_id in completed_job_ids:
-                    future = running_jobs[completed_job_id]
-                    agent_result: AgentMessage = future.result()
-                    if (
-                            agent_result.get_workflow_result_message().status
-                            == WorkflowStatus.INPUT_DATA_ERROR
-                    ):
-                        waiting_job_ids.add(completed_job_id)
-                        predecessors = list(job_graph.predecessors(completed_job_id))
-                        waiting_job_ids.update(predecessors)
-                        if predecessors:
-                            for pred_id in predecessors:
-                                if pred_id in expert_results:
-                                    del expert_results[pred_id]
-                                    self._job_service.remove_subjob(
-                                        original_job_id=completed_job_id, job_id=pred_id
-                                    )
-                                input_agent_message = job_inputs[pred_id]
-                                lesson = agent_result.get_lesson()
-                                assert lesson is not None
-                                input_agent_message.lesson = lesson
-                                job_inputs[pred_id] = input_agent_message
-                    elif (
-                            agent_result.get_workflow_result_message().status
-                            == WorkflowStatus.JOB_TOO_COMPLICATED_ERROR
-                    ):
-                        old_job_graph: JobGraph = JobGraph()
-                        old_job_graph.add_vertex(completed_job_id)
-                        new_job_graqph: JobGraph = self.execute(agent_message=agent_result)
-                        self._job_service.replace_subgraph(
-                            original_job_id=original_job_id,
-                            new_subgraph=new_job_graqph,
-                            old_subgraph=old_job_graph,
-                        )
-                        job_graph = self._job_service.get_job_graph(original_job_id)
-                        del running_jobs[completed_job_id]
-                        expert_results[completed_job_id] = (
-                            agent_result.get_workflow_result_message()
-                        )
-                        for new_subjob_id in new_job_graqph.vertices():
-                            pending_job_ids.add(new_subjob_id)
-                            if job_graph.predecessors(new_subjob_id):
-                                pred_messages = [
-                                    expert_results[pred_id]
-                                    for pred_id in job_graph.predecessors(new_subjob_id)
-                                ]
-                                job_inputs[new_subjob_id] = AgentMessage(
-                                    job_id=new_subjob_id,
-                                    workflow_messages=pred_messages,
-                                )
-                    else:
-                        expert_results[completed_job_id] = (
-                            agent_result.get_workflow_result_message()
-                        )
+        def is_ready(job_id: str) -> bool:
+            return (
+                job_id in pending_job_ids
+                and job_id not in ready_job_ids
+                and unfinished_predecessors[job_id] == 0
+                and (not build_workflow or job_id in prepared_job_ids)
+            )
 
-                    del running_jobs[completed_job_id]
-                if not completed_job_ids and running_jobs:
-                    time.sleep(0.5)
+        def recount(job_ids: Set[str]) -> None:
+            # recount the unfinished predecessors, after the pending jobs or the graph changed
+            for job_id in job_ids:
+                if not job_graph.has_vertex(job_id):
+                    continue
+                unfinished_predecessors[job_id] = sum(
+                    1
+                    for pred_id in job_graph.predecessors(job_id)
+                    if pred_id in pending_job_ids or pred_id in running_jobs.values()
+                )
+                if is_ready(job_id):
+                    ready_job_ids.append(job_id)
 
+        def prepare(job_ids: List[str]) -> None:
+            for job_id in job_ids:
+                future = submit(job_id, self._expert_build_workflow, AgentMessage(job_id=job_id))
+                preparing_jobs[future] = job_id
 
-    def execute_job_graph(self, original_job_id: str) -> None:
-        job_graph: JobGraph = self._job_service.get_job_graph(original_job_id)
-        pending_job_ids: Set[str] = set(job_graph.vertices())
-        running_jobs: Dict[str, Future] = {}
-        expert_results: Dict[str, WorkflowMessage] = {}
-        job_inputs: Dict[str, AgentMessage] = {}
+        recount(pending_job_ids)
+        if build_workflow:
+            prepare(list(pending_job_ids))
 
-        #使用线程池执行当前的初始化子图
-        with ThreadPoolExecutor() as executor:
-            while pending_job_ids or running_jobs:
-                #准备好了的job
-                ready_job_ids: Set[str] = set()
-                #遍历pending_job_ids，找到前置节点已经全部完成的job_id加入到ready_job_ids中
-                for job_id in pending_job_ids:
-                    all_predecessors_completed = all(
-                        pred not in pending_job_ids and pred not in running_jobs
-                        for pred in job_graph.predecessors(job_id)
-                    )
-                    if all_predecessors_completed:
-                        job: SubJob = self._job_service.get_subjob(job_id)
-                        pred_messages: List[WorkflowMessage] = [
-                            expert_results[pred_id] for pred_id in job_graph.predecessors(job_id)
-                        ]
-                        job_inputs[job.id] = AgentMessage(
-                            job_id=job.id, workflow_messages=pred_messages
-                        )
-                        ready_job_ids.add(job_id)
-
-                # 执行ready jobs，并且加入running_jobs
-                for job_id in ready_job_ids:
-                    expert_id = self._job_service.get_subjob(job_id).expert_id
-                    assert expert_id, "The subjob is not assigned to an expert."
-                    expert = self.state.get_expert_by_id(expert_id=expert_id)
-                    running_jobs[job_id] = executor.submit(
-                        self._execute_job, expert, job_inputs[job_id]
+        try:
+            while True:
+                # dispatch the ready jobs with the results of their predecessors
+                while ready_job_ids:
+                    job_id = ready_job_ids.popleft()
+                    pred_messages: List[WorkflowMessage] = [
+                        expert_results[pred_id] for pred_id in job_graph.predecessors(job_id)
+                    ]
+                    lesson = job_inputs[job_id].get_lesson() if job_id in job_inputs else None
+                    job_inputs[job_id] = AgentMessage(
+                        job_id=job_id, workflow_messages=pred_messages, lesson=lesson
                     )
+                    future = submit(job_id, self._execute_job, job_inputs[job_id])
+                    running_jobs[future] = job_id
                     pending_job_ids.remove(job_id)
-                if not running_jobs and pending_job_ids:
-                    raise ValueError(
-                        "Deadlock detected or invalid job graph: some jobs cannot be executed due "
-                        "to dependencies."
-                    )
-                completed_job_ids = []
-                for job_id, future in running_jobs.items():
-                    if future.done():
-                        completed_job_ids.append(job_id)
-                for completed_job_id in completed_job_ids:
-                    future = running_jobs[completed_job_id]
+
+                if not running_jobs and not preparing_jobs:
+                    if pending_job_ids:
+                        raise ValueError(
+                            "Deadlock detected or invalid job graph: some jobs cannot be executed "
+                            "due to dependencies."
+                        )
+                    return
+
+                done_futures, _ = wait(
+                    list(running_jobs) + list(preparing_jobs), return_when=FIRST_COMPLETED
+                )
+                for future in done_futures:
+                    if future in preparing_jobs:
+                        job_id = preparing_jobs.pop(future)
+                        future.result()
+                        prepared_job_ids.add(job_id)
+                        if is_ready(job_id):
+                            ready_job_ids.append(job_id)
+                        continue
+
+                    completed_job_id = running_jobs.pop(future)
                     agent_result: AgentMessage = future.result()
-                    if (
-                        agent_result.get_workflow_result_message().status
-                        == WorkflowStatus.INPUT_DATA_ERROR
-                    ):
+                    status = agent_result.get_workflow_result_message().status
+
+                    if status == WorkflowStatus.INPUT_DATA_ERROR:
+                        # re-execute the predecessors with the lesson, and then the job itself
+                        predecessors = job_graph.predecessors(completed_job_id)
                         pending_job_ids.add(completed_job_id)
-                        predecessors = list(job_graph.predecessors(completed_job_id))
                         pending_job_ids.update(predecessors)
-                        if predecessors:
-                            for pred_id in predecessors:
-                                if pred_id in expert_results:
-                                    del expert_results[pred_id]
-                                    self._job_service.remove_subjob(
-                                        original_job_id=original_job_id, job_id=pred_id
-                                    )
-                                input_agent_message = job_inputs[pred_id]
-                                lesson = agent_result.get_lesson()
-                                assert lesson is not None
-                                input_agent_message.add_lesson(lesson)
-                                job_inputs[pred_id] = input_agent_message
-
-                    elif (
-                        agent_result.get_workflow_result_message().status
-                        == WorkflowStatus.JOB_TOO_COMPLICATED_ERROR
-                    ):
+                        for pred_id in predecessors:
+                            if pred_id in expert_results:
+                                del expert_results[pred_id]
+                                self._job_service.remove_subjob(
+                                    original_job_id=original_job_id, job_id=pred_id
+                                )
+                            lesson = agent_result.get_lesson()
+                            assert lesson is not None
+                            job_inputs[pred_id].add_lesson(lesson)
+                        affected_job_ids = {completed_job_id, *predecessors}
+                        for job_id in list(affected_job_ids):
+                            affected_job_ids.update(job_graph.successors(job_id))
+                        recount(affected_job_ids)
+
+                    elif status == WorkflowStatus.JOB_TOO_COMPLICATED_ERROR:
                         old_job_graph: JobGraph = JobGraph()
                         old_job_graph.add_vertex(completed_job_id)
-                        new_job_graqph: JobGraph = self.execute(agent_message=agent_result)
+                        new_job_graph: JobGraph = self.execute(agent_message=agent_result)
                         self._job_service.replace_subgraph(
                             original_job_id=original_job_id,
-                            new_subgraph=new_job_graqph,
+                            new_subgraph=new_job_graph,
                             old_subgraph=old_job_graph,
                         )
                         job_graph = self._job_service.get_job_graph(original_job_id)
-                        del running_jobs[completed_job_id]
                         expert_results[completed_job_id] = (
                             agent_result.get_workflow_result_message()
                         )
 
-                        for new_subjob_id in new_job_graqph.vertices():
-                            pending_job_ids.add(new_subjob_id)
-                            if job_graph.predecessors(new_subjob_id):
-                                pred_messages = [
-                                    expert_results[pred_id]
-                                    for pred_id in job_graph.predecessors(new_subjob_id)
-                                ]
-                                job_inputs[new_subjob_id] = AgentMessage(
-                                    job_id=new_subjob_id,
-                                    workflow_messages=pred_messages,
-                                )
+                        new_job_ids = new_job_graph.vertices()
+                        pending_job_ids.update(new_job_ids)
+                        if build_workflow:
+                            prepare(new_job_ids)
+                        affected_job_ids = set(new_job_ids)
+                        for job_id in new_job_ids:
+                            affected_job_ids.update(job_graph.successors(job_id))
+                        recount(affected_job_ids)
 
                     else:
                         expert_results[completed_job_id] = (
                             agent_result.get_workflow_result_message()
                         )
-
-                    del running_jobs[completed_job_id]
-                if not completed_job_ids and running_jobs:
-                    time.sleep(0.5)
+                        for succ_id in job_graph.successors(completed_job_id):
+                            if succ_id in unfinished_predecessors:
+                                unfinished_predecessors[succ_id] -= 1
+                                if is_ready(succ_id):
+                                    ready_job_ids.append(succ_id)
+        except BaseException:
+            # do not leave the subjobs of the failed job graph running: cancel the queued ones,
+            # and wait for the running ones, which cannot be interrupted
+            in_flight = list(running_jobs) + list(preparing_jobs)
+            for future in in_flight:
+                future.cancel()
+            wait(in_flight)
+            raise
 
     def stop_job_graph(self, job_id: str, stop_info: str) -> None:
         try:
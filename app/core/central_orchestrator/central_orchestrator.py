@@ -1,17 +1,20 @@
 
+from typing import TYPE_CHECKING
+
 from app.core.central_orchestrator.command_bus.command_handler import command_handler
 from app.core.central_orchestrator.supervisor.supervisor_manager import SupervisorManager
 from app.core.common.singleton import Singleton
 from app.core.model.execution_context import ExecutionContext
 from app.core.service.operator_service import OperatorService
 
-from app.core.workflow.workflow import Workflow
+if TYPE_CHECKING:
+    from app.core.workflow.workflow import Workflow
 
 
 class CentralOrchestrator(metaclass=Singleton):
     def __init__(self):
         # 存储所有 workflow：expert → workflow
-        self._workflows: dict[str, Workflow] = {}
+        self._workflows: dict[str, "Workflow"] = {}
         self.supervisor_manager = SupervisorManager() # 外部注入 SupervisorManager
         self._operator_service:OperatorService = OperatorService.instance
         import threading
@@ -20,7 +23,7 @@ class CentralOrchestrator(metaclass=Singleton):
 
 
     #注册workflow
-    def register_workflow(self, workflow: Workflow, expert_name: str) -> None:
+    def register_workflow(self, workflow: "Workflow", expert_name: str) -> None:
         self._workflows[expert_name] = workflow
 
 
@@ -1,10 +1,10 @@
-import inspect
 import asyncio
 import uuid
 from queue import PriorityQueue
 from typing import Callable, List, Any, Tuple
 
 from app.core.model.command import Command
+from app.core.toolkit.call_plan import CallPlan
 
 
 #管理Command，并且可以去执行
@@ -15,6 +15,8 @@ class CommandManager:
         self.dead_letter_queue: List[Command] = []
         self.command_validators: List[Callable] = []
         self._handlers: dict[str, Callable] = {}
+        # action → 注册时预编译的调用计划，dispatch 时不再反射 handler 签名
+        self._call_plans: dict[str, CallPlan] = {}
         self.handler_failure_hooks: List[Callable] = []
 
     def register_handlers_from(self, obj):
@@ -23,8 +25,13 @@ class CommandManager:
             if callable(attr) and getattr(attr, "_is_command_handler", False):
                 action = getattr(attr, "_command_action")
                 self._handlers[action] = attr
+                self._call_plans[action] = CallPlan.compile(attr)
                 print(f"[CommandManager] 自动注册指令处理器: action='{action}' → {obj.__class__.__name__}.{attr_name}")
 
+    def get_call_plan(self, action: str) -> CallPlan | None:
+        """获取 action 对应 handler 的预编译调用计划"""
+        return self._call_plans.get(action)
+
     def _prepare_trace_info(self, command: Command, parent_command: Command | None = None):
         """
         对 command 自动填充 trace_id / parent_id / span_id
@@ -75,18 +82,8 @@ class CommandManager:
             handler = self._handlers.get(action)
             if handler is None:
                 raise ValueError(f"未知的 command.action='{action}'，未找到对应处理器")
-            sig = inspect.signature(handler)
-            bound_args = {}
-
-            for name, param in sig.parameters.items():
-                if name in command.params:
-                    bound_args[name] = command.params[name]
-                elif param.default is not inspect._empty:
-                    bound_args[name] = param.default
-                else:
-                    raise ValueError(
-                        f"调用 subscriber 失败：缺少必需参数 '{name}'"
-                    )
+            call_plan = self._call_plans[action]
+            bound_args = call_plan.bind_command_params(command.params)
 
             try:
                 handler(**bound_args)
@@ -119,21 +116,11 @@ class CommandManager:
             handler = self._handlers.get(action)
             if handler is None:
                 raise ValueError(f"未知的 command.action='{action}'，未找到对应处理器")
-            sig = inspect.signature(handler)
-            bound_args = {}
-
-            for name, param in sig.parameters.items():
-                if name in command.params:
-                    bound_args[name] = command.params[name]
-                elif param.default is not inspect._empty:
-                    bound_args[name] = param.default
-                else:
-                    raise ValueError(
-                        f"调用 subscriber 失败：缺少必需参数 '{name}'"
-                    )
+            call_plan = self._call_plans[action]
+            bound_args = call_plan.bind_command_params(command.params)
 
             try:
-                if inspect.iscoroutinefunction(handler):
+                if call_plan.is_coroutine:
                     await handler(**bound_args)
                 else:
                     handler(**bound_args)
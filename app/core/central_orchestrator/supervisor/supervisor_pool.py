@@ -2,13 +2,13 @@
 
 import threading
 from queue import Queue, Empty
-from typing import Callable, Optional, Dict, Any
-from app.core.agent.agent import AgentConfig, Profile
+from typing import TYPE_CHECKING, Callable, Optional, Dict, Any
 
-from app.core.central_orchestrator.supervisor.supervisor import Supervisor
+from app.core.dal.database import remove_thread_session
 from app.core.model.message import AgentMessage
-from app.core.reasoner.simple_reasoner import SimpleReasoner
-from app.plugin.dbgpt.dbgpt_workflow import DbgptWorkflow
+
+if TYPE_CHECKING:
+    from app.core.central_orchestrator.supervisor.supervisor import Supervisor
 
 
 class SupervisorPool:
@@ -25,6 +25,12 @@ class SupervisorPool:
         :param num_workers: worker 数量
         :param callback: 回调函数，由 SupervisorManager 提供
         """
+        # 延迟导入：agent 模块间接依赖本模块，模块级导入会形成循环导入
+        from app.core.agent.agent import AgentConfig, Profile
+        from app.core.central_orchestrator.supervisor.supervisor import Supervisor
+        from app.core.reasoner.simple_reasoner import SimpleReasoner
+        from app.plugin.dbgpt.dbgpt_workflow import DbgptWorkflow
+
         self.num_workers = num_workers
         self.callback = callback
         self.running = True
@@ -51,7 +57,7 @@ class SupervisorPool:
         """将任务提交到队列"""
         self.task_queue.put(msg)
 
-    def _worker_loop(self, supervisor: Supervisor):
+    def _worker_loop(self, supervisor: "Supervisor"):
         """Worker 主循环"""
         while self.running:
             try:
@@ -71,6 +77,9 @@ class SupervisorPool:
                     "error": str(e),
                     "action": "failed"
                 })
+            finally:
+                # worker 线程常驻，每个任务结束后关闭本线程的 db session
+                remove_thread_session()
 
     def stop(self):
         """关闭线程池"""
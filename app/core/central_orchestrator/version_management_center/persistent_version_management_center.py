@@ -1,17 +1,20 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List
+from copy import deepcopy
+from typing import Any, List, Tuple
 
 from app.core.central_orchestrator.version_management_center.record import OperatorExecutionRecord, \
     ActionExecutionRecord, WorkflowExecutionRecord
 from app.core.central_orchestrator.version_management_center.version_management_center import VersionManagementCenter
+from app.core.common.system_env import SystemEnv
+from app.core.common.write_behind_queue import WriteBehindQueue
 # DAO
 from app.core.dal.dao.vmc.action_execution_dao import ActionExecutionDao
 from app.core.dal.dao.vmc.operator_execution_dao import OperatorExecutionDao
 from app.core.dal.dao.vmc.workflow_execution_dao import WorkflowExecutionDao
 
 # DB session (你项目里已经封装好了)
-from app.core.dal.database import DbSession
+from app.core.dal.database import ScopedDbSession
 
 
 class PersistentVersionManagementCenter(VersionManagementCenter):
@@ -19,31 +22,40 @@ class PersistentVersionManagementCenter(VersionManagementCenter):
     持久化版本管理中心
     写入策略：
         1. 先写入内存缓存（父类 VersionManagementCenter）
-        2. 再写入数据库（Action/Operator/Workflow 三张表）
+        2. 再放入 write-behind 队列，由后台线程按批次（数量/时间阈值）写入数据库
+           （Action/Operator/Workflow 三张表），请求线程不再等待数据库提交
     """
 
     def __init__(self):
         super().__init__()
 
         # DAO 初始化
-        session = DbSession()
-
-        self.action_dao = ActionExecutionDao(session)
-        self.operator_dao = OperatorExecutionDao(session)
-        self.workflow_dao = WorkflowExecutionDao(session)
+        self.action_dao = ActionExecutionDao(ScopedDbSession)
+        self.operator_dao = OperatorExecutionDao(ScopedDbSession)
+        self.workflow_dao = WorkflowExecutionDao(ScopedDbSession)
+
+        # write-behind 队列：元素为 record 本身，转换为 Do（含可变字段的拷贝）在后台线程中进行，
+        # 请求线程只负责入队；写入的是 record 在落库时的状态
+        self._write_queue = WriteBehindQueue(
+            name="vmc",
+            sink=self._write_batch,
+            batch_size=SystemEnv.VMC_WRITE_BATCH_SIZE,
+            flush_interval=SystemEnv.VMC_WRITE_FLUSH_INTERVAL,
+            max_size=SystemEnv.VMC_WRITE_QUEUE_SIZE,
+            overflow_policy=SystemEnv.VMC_WRITE_OVERFLOW_POLICY,
+        )
 
     # ---------------------------------------------
     # Action 级别持久化
     # ---------------------------------------------
     def log_action(self, record: ActionExecutionRecord) -> None:
-        """双写：内存 + DB"""
+        """双写：内存 + DB（异步批量）"""
 
         # 写入内存
         super().log_action(record)
 
         # 写入数据库
-        with self.action_dao.new_session() as s:
-            s.add(self._record_to_action_do(record))
+        self._write_queue.put(record)
 
     # ---------------------------------------------
     # Operator 级别持久化
@@ -51,8 +63,7 @@ class PersistentVersionManagementCenter(VersionManagementCenter):
     def log_operator(self, record: OperatorExecutionRecord) -> None:
         super().log_operator(record)
 
-        with self.operator_dao.new_session() as s:
-            s.add(self._record_to_operator_do(record))
+        self._write_queue.put(record)
 
     # ---------------------------------------------
     # Workflow 级别持久化
@@ -60,13 +71,59 @@ class PersistentVersionManagementCenter(VersionManagementCenter):
     def log_workflow(self, record: WorkflowExecutionRecord) -> None:
         super().log_workflow(record)
 
-        with self.workflow_dao.new_session() as s:
-            s.add(self._record_to_workflow_do(record))
+        self._write_queue.put(record)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """等待队列中的记录全部写入数据库，返回是否在超时前完成。"""
+        return self._write_queue.flush(timeout=timeout)
+
+    def close(self) -> None:
+        """写入剩余记录并停止后台线程（进程退出时也会自动调用）。"""
+        self._write_queue.close()
+
+    # ---------------------------------------------
+    # 批量写入（后台线程）
+    # ---------------------------------------------
+    def _write_batch(self, records: List[Any]) -> List[bool]:
+        """将 record 转换为 Do 后批量写入，返回每条记录是否写入成功。"""
+        outcomes: List[bool] = [False] * len(records)
+        converted: List[Tuple[int, Any]] = []
+        for i, record in enumerate(records):
+            try:
+                converted.append((i, self._record_to_do(record)))
+            except Exception as e:
+                print(f"[VMC] failed to convert {type(record).__name__}: {e}")
+
+        try:
+            with self.action_dao.new_session() as s:
+                s.bulk_save_objects([do for _, do in converted])
+            for i, _ in converted:
+                outcomes[i] = True
+        except Exception as e:
+            # 批量失败时逐条重试，避免一条坏记录拖垮整批
+            print(f"[VMC] batch write of {len(converted)} records failed, retrying one by one: {e}")
+            for i, do in converted:
+                try:
+                    with self.action_dao.new_session() as s:
+                        s.add(do)
+                    outcomes[i] = True
+                except Exception as record_e:
+                    print(f"[VMC] failed to write {type(do).__name__}: {record_e}")
+        return outcomes
 
     # ========================================================
-    # Record → Do 转换器
+    # Record → Do 转换器（在后台线程执行）
     # ========================================================
 
+    def _record_to_do(self, record: Any) -> Any:
+        if isinstance(record, ActionExecutionRecord):
+            return self._record_to_action_do(record)
+        if isinstance(record, OperatorExecutionRecord):
+            return self._record_to_operator_do(record)
+        if isinstance(record, WorkflowExecutionRecord):
+            return self._record_to_workflow_do(record)
+        raise TypeError(f"Unsupported record type: {type(record).__name__}")
+
     def _record_to_action_do(self, record: ActionExecutionRecord):
         from app.core.dal.do.vmc.action_execution_do import ActionExecutionDo
 
@@ -80,7 +137,7 @@ class PersistentVersionManagementCenter(VersionManagementCenter):
 
             action_type=record.action_type,
             instruction=record.instruction,
-            structured_input=record.structured_input,
+            structured_input=_snapshot(record.structured_input),
 
             model_name=record.model_name,
             temperature=record.temperature,
@@ -88,7 +145,7 @@ class PersistentVersionManagementCenter(VersionManagementCenter):
             max_tokens=record.max_tokens,
 
             raw_output_text=record.raw_output_text,
-            structured_output=record.structured_output,
+            structured_output=_snapshot(record.structured_output),
             error=record.error,
 
             input_tokens=record.input_tokens,
@@ -105,7 +162,7 @@ class PersistentVersionManagementCenter(VersionManagementCenter):
             span_id=record.span_id,
             parent_span_id=record.parent_span_id,
 
-            metadata=record.metadata,
+            metadata=_snapshot(record.metadata),
         )
 
     def _record_to_operator_do(self, record: OperatorExecutionRecord):
@@ -118,12 +175,12 @@ class PersistentVersionManagementCenter(VersionManagementCenter):
             expert_name=record.expert_name,
             timestamp=record.timestamp,
 
-            job_input=record.job_input,
-            previous_operator_outputs=record.previous_operator_outputs,
-            previous_expert_outputs=record.previous_expert_outputs,
+            job_input=_snapshot(record.job_input),
+            previous_operator_outputs=_snapshot(record.previous_operator_outputs),
+            previous_expert_outputs=_snapshot(record.previous_expert_outputs),
             lesson=record.lesson,
 
-            operator_config=record.operator_config,
+            operator_config=_snapshot(record.operator_config),
 
             output_message=record.output_message,
             evaluation=record.evaluation,
@@ -136,7 +193,7 @@ class PersistentVersionManagementCenter(VersionManagementCenter):
             operator_name=record.operator_name,
             latency_ms=record.latency_ms,
 
-            metadata=record.metadata,
+            metadata=_snapshot(record.metadata),
         )
 
     def _record_to_workflow_do(self, record: WorkflowExecutionRecord):
@@ -153,5 +210,10 @@ class PersistentVersionManagementCenter(VersionManagementCenter):
 
             operator_record_ids=[op.record_id for op in record.operator_records],
 
-            metadata=record.metadata,
-        )
\ No newline at end of file
+            metadata=_snapshot(record.metadata),
+        )
+
+
+def _snapshot(value: Any) -> Any:
+    """拷贝 record 中可变的 JSON 字段，使写入过程中对 record 的修改不影响 Do。"""
+    return deepcopy(value) if isinstance(value, (dict, list)) else value
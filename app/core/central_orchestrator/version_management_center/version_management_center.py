@@ -1,30 +1,68 @@
-from typing import List, Optional, Any, Dict
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import List, Optional, Any, Dict, Iterable, Set
 
 from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
 
 from app.core.central_orchestrator.version_management_center.record import OperatorExecutionRecord, \
     ActionExecutionRecord, WorkflowExecutionRecord
 
 
+@dataclass
+class _TraceBucket:
+    """一个 trace 下的全部记录，淘汰以 trace 为单位进行。"""
+
+    action_ids: Set[str] = field(default_factory=set)
+    operator_ids: Set[str] = field(default_factory=set)
+    workflow_version_ids: Set[str] = field(default_factory=set)
+    size_bytes: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+
+
+def _estimate_size(values: Iterable[Any]) -> int:
+    """粗略估算记录占用的字节数（按字段的文本长度计算），仅用于容量控制。"""
+    size = 0
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, str):
+            size += len(value)
+        elif isinstance(value, (dict, list, tuple)):
+            if value:
+                size += len(repr(value))
+        else:
+            size += len(str(value))
+    return size
+
+
 class VersionManagementCenter(metaclass=Singleton):
     """
     Version Management Center (VMC).
 
     负责记录 Action / Operator / Workflow 三层执行版本。
     当前实现为内存数据库，将来可接 PostgreSQL / Milvus / Qdrant / S3 / MinIO。
+
+    内存中的记录按 trace 分组保留：超过 VMC_MAX_RECORDS 条或 VMC_MAX_BYTES 字节时，
+    按 LRU 顺序整体淘汰最久未访问的 trace；VMC_TRACE_TTL 秒之前创建的 trace 也会被淘汰。
+    淘汰时同步清理所有二级索引。
     """
 
     def __init__(self) -> None:
+        self._lock = threading.RLock()
+
         # Action 记录
         self._action_by_id: Dict[str, ActionExecutionRecord] = {}
-        self._actions_by_action_id: Dict[str, List[ActionExecutionRecord]] = {}
-        self._actions_by_operator_id: Dict[str, List[ActionExecutionRecord]] = {}
-        self._actions_by_trace_id: Dict[str, List[ActionExecutionRecord]] = {}
+        self._actions_by_action_id: Dict[str, Dict[str, ActionExecutionRecord]] = {}
+        self._actions_by_operator_id: Dict[str, Dict[str, ActionExecutionRecord]] = {}
+        self._actions_by_trace_id: Dict[str, Dict[str, ActionExecutionRecord]] = {}
 
         # Operator 记录
         self._operator_by_id: Dict[str, OperatorExecutionRecord] = {}
-        self._operator_by_operator_id: Dict[str, List[OperatorExecutionRecord]] = {}
-        self._operator_by_workflow_version: Dict[str, List[OperatorExecutionRecord]] = {}
+        self._operator_by_operator_id: Dict[str, Dict[str, OperatorExecutionRecord]] = {}
+        self._operator_by_workflow_version: Dict[str, Dict[str, OperatorExecutionRecord]] = {}
 
         # Workflow 记录
         self._workflow_by_version: Dict[str, WorkflowExecutionRecord] = {}
@@ -32,52 +70,133 @@ class VersionManagementCenter(metaclass=Singleton):
         self._workflow_by_trace_id: Dict[str, WorkflowExecutionRecord] = {}
         self._workflow_by_span_id: Dict[str, WorkflowExecutionRecord] = {}
 
+        # trace 保留信息（顺序即 LRU 顺序，最近访问的在末尾）
+        self._traces: "OrderedDict[str, _TraceBucket]" = OrderedDict()
+        # trace 的创建顺序（即过期顺序），TTL 淘汰只需检查队首
+        self._traces_by_creation: "OrderedDict[str, float]" = OrderedDict()
+        self._record_size: Dict[str, int] = {}
+        self._record_count: int = 0
+        self._total_bytes: int = 0
+        self._evicted_traces: int = 0
+        self._evicted_records: int = 0
+
+        self._max_records: int = SystemEnv.VMC_MAX_RECORDS or 0
+        self._max_bytes: int = SystemEnv.VMC_MAX_BYTES or 0
+        self._trace_ttl: float = SystemEnv.VMC_TRACE_TTL or 0
+
     # ---------------------------------------------------------
     # Action 级别
     # ---------------------------------------------------------
 
     def log_action(self, record: ActionExecutionRecord) -> None:
-        self._action_by_id[record.record_id] = record
+        with self._lock:
+            if record.record_id in self._action_by_id:
+                self._remove_action(record.record_id)
+            self._action_by_id[record.record_id] = record
+
+            self._actions_by_action_id.setdefault(record.action_id, {})[record.record_id] = record
+            self._actions_by_operator_id.setdefault(record.operator_id, {})[
+                record.record_id
+            ] = record
+            self._actions_by_trace_id.setdefault(record.trace_id, {})[record.record_id] = record
 
-        self._actions_by_action_id.setdefault(record.action_id, []).append(record)
-        self._actions_by_operator_id.setdefault(record.operator_id, []).append(record)
-        self._actions_by_trace_id.setdefault(record.trace_id, []).append(record)
+            bucket = self._touch_trace(record.trace_id)
+            bucket.action_ids.add(record.record_id)
+            self._account(
+                record.record_id,
+                bucket,
+                _estimate_size((
+                    record.instruction,
+                    record.structured_input,
+                    record.raw_output_text,
+                    record.structured_output,
+                    record.error,
+                    record.feedback,
+                    record.reasoning_content,
+                    record.metadata,
+                )),
+            )
+            self._evict()
 
     def get_action_record(self, record_id: str) -> Optional[ActionExecutionRecord]:
-        return self._action_by_id.get(record_id)
+        with self._lock:
+            return self._action_by_id.get(record_id)
 
     def get_actions_by_action_id(self, action_id: str) -> List[ActionExecutionRecord]:
-        return list(self._actions_by_action_id.get(action_id, []))
+        with self._lock:
+            return list(self._actions_by_action_id.get(action_id, {}).values())
 
     def get_actions_by_operator_id(self, operator_id: str) -> List[ActionExecutionRecord]:
-        return list(self._actions_by_operator_id.get(operator_id, []))
+        with self._lock:
+            return list(self._actions_by_operator_id.get(operator_id, {}).values())
 
     def get_actions_by_trace_id(self, trace_id: str) -> List[ActionExecutionRecord]:
-        return list(self._actions_by_trace_id.get(trace_id, []))
+        with self._lock:
+            records = self._actions_by_trace_id.get(trace_id)
+            if not records:
+                return []
+            self._traces.move_to_end(trace_id)
+            return list(records.values())
 
     # ---------------------------------------------------------
     # Operator 级别
     # ---------------------------------------------------------
 
     def log_operator(self, record: OperatorExecutionRecord) -> None:
-        self._operator_by_id[record.record_id] = record
+        with self._lock:
+            if record.record_id in self._operator_by_id:
+                # 重复记录在 workflow 中原位替换，不从中移除
+                self._remove_operator(record.record_id, detach=False)
+            self._operator_by_id[record.record_id] = record
 
-        self._operator_by_operator_id.setdefault(record.operator_id, []).append(record)
-        self._operator_by_workflow_version.setdefault(record.workflow_version_id, []).append(record)
+            self._operator_by_operator_id.setdefault(record.operator_id, {})[
+                record.record_id
+            ] = record
+            self._operator_by_workflow_version.setdefault(record.workflow_version_id, {})[
+                record.record_id
+            ] = record
 
-        workflow = self._workflow_by_version.get(record.workflow_version_id)
-        if workflow:
-            workflow.operator_records.append(record)
+            workflow = self._workflow_by_version.get(record.workflow_version_id)
+            if workflow:
+                records = workflow.operator_records
+                index = next(
+                    (i for i, r in enumerate(records) if r.record_id == record.record_id), None
+                )
+                if index is None:
+                    records.append(record)
+                else:
+                    records[index] = record
+
+            bucket = self._touch_trace(record.trace_id)
+            bucket.operator_ids.add(record.record_id)
+            self._account(
+                record.record_id,
+                bucket,
+                _estimate_size((
+                    record.job_input,
+                    record.previous_operator_outputs,
+                    record.previous_expert_outputs,
+                    record.lesson,
+                    record.operator_config,
+                    record.output_message,
+                    record.evaluation,
+                    record.metadata,
+                )),
+            )
+            self._evict()
 
     def get_operator_record(self, record_id: str) -> Optional[OperatorExecutionRecord]:
-        return self._operator_by_id.get(record_id)
+        with self._lock:
+            return self._operator_by_id.get(record_id)
 
     def get_operator_history(self, operator_id: str) -> List[OperatorExecutionRecord]:
-        records = list(self._operator_by_operator_id.get(operator_id, []))
+        with self._lock:
+            records = list(self._operator_by_operator_id.get(operator_id, {}).values())
         return sorted(records, key=lambda r: r.timestamp)
 
     def get_operators_by_workflow(self, workflow_version_id: str) -> List[OperatorExecutionRecord]:
-        records = list(self._operator_by_workflow_version.get(workflow_version_id, []))
+        with self._lock:
+            records = list(self._operator_by_workflow_version.get(workflow_version_id, {}).values())
         return sorted(records, key=lambda r: r.timestamp)
 
     # ---------------------------------------------------------
@@ -85,16 +204,171 @@ class VersionManagementCenter(metaclass=Singleton):
     # ---------------------------------------------------------
 
     def log_workflow(self, record: WorkflowExecutionRecord) -> None:
-        self._workflow_by_version[record.workflow_version_id] = record
-        self._workflow_by_trace_id[record.trace_id] = record
-        self._workflow_by_span_id[record.span_id] = record
+        with self._lock:
+            if record.workflow_version_id in self._workflow_by_version:
+                self._remove_workflow(record.workflow_version_id)
+            self._workflow_by_version[record.workflow_version_id] = record
+            self._workflow_by_trace_id[record.trace_id] = record
+            self._workflow_by_span_id[record.span_id] = record
+
+            bucket = self._touch_trace(record.trace_id)
+            bucket.workflow_version_ids.add(record.workflow_version_id)
+            self._account(
+                record.workflow_version_id, bucket, _estimate_size((record.metadata,))
+            )
+            self._evict()
 
     def get_workflow_record(self, workflow_version_id: str) -> Optional[
         WorkflowExecutionRecord]:
-        return self._workflow_by_version.get(workflow_version_id)
+        with self._lock:
+            return self._workflow_by_version.get(workflow_version_id)
 
     def get_workflow_by_trace_id(self, trace_id: str) -> Optional[WorkflowExecutionRecord]:
-        return self._workflow_by_trace_id.get(trace_id)
+        with self._lock:
+            workflow = self._workflow_by_trace_id.get(trace_id)
+            if workflow and trace_id in self._traces:
+                self._traces.move_to_end(trace_id)
+            return workflow
+
+    # ---------------------------------------------------------
+    # 保留策略 / 监控
+    # ---------------------------------------------------------
+
+    def evict_trace(self, trace_id: str) -> int:
+        """淘汰一个 trace 下的全部记录，返回淘汰的记录数。"""
+        with self._lock:
+            bucket = self._traces.pop(trace_id, None)
+            if not bucket:
+                return 0
+            self._traces_by_creation.pop(trace_id, None)
+            count = 0
+            for record_id in bucket.action_ids:
+                count += self._remove_action(record_id, trace_id)
+            for record_id in bucket.operator_ids:
+                count += self._remove_operator(record_id, trace_id)
+            for workflow_version_id in bucket.workflow_version_ids:
+                count += self._remove_workflow(workflow_version_id, trace_id)
+            self._evicted_traces += 1
+            self._evicted_records += count
+            return count
+
+    def stats(self) -> Dict[str, int]:
+        """获取内存占用统计，用于监控。"""
+        with self._lock:
+            return {
+                "traces": len(self._traces),
+                "actions": len(self._action_by_id),
+                "operators": len(self._operator_by_id),
+                "workflows": len(self._workflow_by_version),
+                "records": self._record_count,
+                "estimated_bytes": self._total_bytes,
+                "max_records": self._max_records,
+                "max_bytes": self._max_bytes,
+                "evicted_traces": self._evicted_traces,
+                "evicted_records": self._evicted_records,
+            }
+
+    def _touch_trace(self, trace_id: str) -> _TraceBucket:
+        bucket = self._traces.get(trace_id)
+        if bucket is None:
+            bucket = _TraceBucket()
+            self._traces[trace_id] = bucket
+            self._traces_by_creation[trace_id] = bucket.created_at
+        else:
+            self._traces.move_to_end(trace_id)
+        return bucket
+
+    def _account(self, record_key: str, bucket: _TraceBucket, size: int) -> None:
+        self._record_size[record_key] = size
+        bucket.size_bytes += size
+        self._record_count += 1
+        self._total_bytes += size
+
+    def _release(self, record_key: str, trace_id: str) -> None:
+        size = self._record_size.pop(record_key, 0)
+        self._record_count -= 1
+        self._total_bytes -= size
+        bucket = self._traces.get(trace_id)
+        if bucket:
+            bucket.size_bytes -= size
+
+    def _evict(self) -> None:
+        """淘汰过期的 trace，再按 LRU 淘汰直到满足容量限制（当前 trace 不会被淘汰）。
+
+        trace 按创建顺序过期，只检查创建最早的 trace，每次写入的开销与过期的 trace 数成正比。
+        """
+        if self._trace_ttl > 0:
+            deadline = time.monotonic() - self._trace_ttl
+            while self._traces_by_creation:
+                trace_id, created_at = next(iter(self._traces_by_creation.items()))
+                if created_at >= deadline:
+                    break
+                self.evict_trace(trace_id)
+
+        while len(self._traces) > 1 and (
+            (self._max_records > 0 and self._record_count > self._max_records)
+            or (self._max_bytes > 0 and self._total_bytes > self._max_bytes)
+        ):
+            self.evict_trace(next(iter(self._traces)))
+
+    def _remove_action(self, record_id: str, trace_id: Optional[str] = None) -> int:
+        record = self._action_by_id.get(record_id)
+        if not record or (trace_id is not None and record.trace_id != trace_id):
+            return 0
+        del self._action_by_id[record_id]
+        self._discard_from_bucket(record.trace_id, "action_ids", record_id)
+        self._discard(self._actions_by_action_id, record.action_id, record_id)
+        self._discard(self._actions_by_operator_id, record.operator_id, record_id)
+        self._discard(self._actions_by_trace_id, record.trace_id, record_id)
+        self._release(record_id, record.trace_id)
+        return 1
+
+    def _remove_operator(
+        self, record_id: str, trace_id: Optional[str] = None, detach: bool = True
+    ) -> int:
+        record = self._operator_by_id.get(record_id)
+        if not record or (trace_id is not None and record.trace_id != trace_id):
+            return 0
+        del self._operator_by_id[record_id]
+        workflow = self._workflow_by_version.get(record.workflow_version_id)
+        if detach and workflow:
+            # 被淘汰的记录不再经由 workflow 可达
+            workflow.operator_records[:] = [
+                r for r in workflow.operator_records if r.record_id != record_id
+            ]
+        self._discard_from_bucket(record.trace_id, "operator_ids", record_id)
+        self._discard(self._operator_by_operator_id, record.operator_id, record_id)
+        self._discard(self._operator_by_workflow_version, record.workflow_version_id, record_id)
+        self._release(record_id, record.trace_id)
+        return 1
+
+    def _remove_workflow(self, workflow_version_id: str, trace_id: Optional[str] = None) -> int:
+        record = self._workflow_by_version.get(workflow_version_id)
+        if not record or (trace_id is not None and record.trace_id != trace_id):
+            return 0
+        del self._workflow_by_version[workflow_version_id]
+        self._discard_from_bucket(record.trace_id, "workflow_version_ids", workflow_version_id)
+        if self._workflow_by_trace_id.get(record.trace_id) is record:
+            del self._workflow_by_trace_id[record.trace_id]
+        if self._workflow_by_span_id.get(record.span_id) is record:
+            del self._workflow_by_span_id[record.span_id]
+        self._release(workflow_version_id, record.trace_id)
+        return 1
+
+    def _discard_from_bucket(self, trace_id: str, ids_field: str, record_key: str) -> None:
+        """重复记录或被覆盖的记录从所属 trace 的 bucket 中移除（被淘汰的 trace 已不在其中）。"""
+        bucket = self._traces.get(trace_id)
+        if bucket is not None:
+            getattr(bucket, ids_field).discard(record_key)
+
+    @staticmethod
+    def _discard(index: Dict[str, Dict[str, Any]], key: str, record_id: str) -> None:
+        records = index.get(key)
+        if records is None:
+            return
+        records.pop(record_id, None)
+        if not records:
+            del index[key]
 
     # ---------------------------------------------------------
     # RLHF / 训练数据集导出
@@ -108,8 +382,11 @@ class VersionManagementCenter(metaclass=Singleton):
     ) -> List[Dict[str, Any]]:
         """导出 Action 粒度的 RLHF 样本。"""
 
+        with self._lock:
+            records = list(self._action_by_id.values())
+
         samples: List[Dict[str, Any]] = []
-        for rec in self._action_by_id.values():
+        for rec in records:
             if model_name and rec.model_name != model_name:
                 continue
             if min_score is not None and (rec.score is None or rec.score < min_score):
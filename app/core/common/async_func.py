@@ -23,7 +23,8 @@ def run_async_function(
                     try:
                         return new_loop.run_until_complete(async_func(*args, **kwargs))
                     finally:
-                        new_loop.close()
+                        _close_loop(new_loop)
+                        _remove_thread_session()
 
                 # submit the task to the thread pool and wait for the result
                 future = executor.submit(run_in_new_loop)
@@ -42,14 +43,18 @@ def run_async_function(
             # but hide the traceback from this helper function.
             raise e
         finally:
-            loop.close()
+            _close_loop(loop)
 
 
 def run_in_thread(func, *args, **kwargs):
     """Run a function in a new thread without blocking the current thread."""
 
     def thread_target():
-        return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # close the db session of the thread, if it has used one
+            _remove_thread_session()
 
     thread = threading.Thread(target=thread_target)
     thread.daemon = True
@@ -57,3 +62,39 @@ def run_in_thread(func, *args, **kwargs):
 
     # return thread object to allow caller to choose to thread.join and wait
     return thread
+
+
+async def run_in_worker_thread(func, *args, **kwargs):
+    """Run a function in a worker thread of the event loop, like `asyncio.to_thread`, and close
+    the db session the function has used in the (reused) worker thread."""
+
+    def call():
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _remove_thread_session()
+
+    return await asyncio.to_thread(call)
+
+
+def _remove_thread_session() -> None:
+    # imported lazily, the database module connects to the database when imported
+    from app.core.dal.database import remove_thread_session
+
+    remove_thread_session()
+
+
+def _close_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Close the event loop created by `run_async_function`, closing the pooled http clients
+    bound to it first, so that their connections are released."""
+    # imported lazily, to keep this module free of the dependencies of the pool
+    from app.core.common.http_client_pool import HttpClientPool
+
+    pool = HttpClientPool.instance
+    try:
+        if pool is not None:
+            loop.run_until_complete(pool.aclose())
+    except Exception as e:
+        print(f"[run_async_function] failed to close the http clients of the loop: {e}")
+    finally:
+        loop.close()
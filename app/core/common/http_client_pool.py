@@ -0,0 +1,103 @@
+import asyncio
+import atexit
+import threading
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+
+# (origin, id of the event loop) -> (event loop, client)
+_ClientKey = Tuple[str, int]
+_ClientEntry = Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]
+
+
+class HttpClientPool(metaclass=Singleton):
+    """Process-wide pool of keep-alive async HTTP clients, one per endpoint origin.
+
+    An `httpx.AsyncClient` owns a connection pool, so sharing it across the model calls to the
+    same origin (scheme + host + port) saves a TCP/TLS handshake on every request. The clients
+    are bound to the event loop they were created in, and the jobs run in different threads with
+    their own loops, so the pool is keyed by (origin, loop). The clients of a loop are closed by
+    `aclose` before the loop is closed (see `run_async_function`), the clients of the loops closed
+    without it are dropped on the next lookup, and all the clients are closed at exit.
+
+    The limits and timeouts are configured by the `MODEL_HTTP_*` settings. HTTP/2 is enabled by
+    `MODEL_HTTP2_ENABLED` if the optional `h2` package is installed.
+    """
+
+    def __init__(self):
+        self._clients: Dict[_ClientKey, _ClientEntry] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close_all)
+
+    def get_client(self, endpoint: str) -> httpx.AsyncClient:
+        """Get the pooled client of the endpoint for the running event loop."""
+        loop = asyncio.get_running_loop()
+        parts = urlsplit(endpoint)
+        key = (f"{parts.scheme}://{parts.netloc}", id(loop))
+
+        with self._lock:
+            closed_loop_keys = [k for k, (lp, _) in self._clients.items() if lp.is_closed()]
+            for closed_loop_key in closed_loop_keys:
+                # the connections of a closed loop cannot be closed gracefully anymore
+                self._clients.pop(closed_loop_key)
+
+            entry = self._clients.get(key)
+            if entry and not entry[1].is_closed:
+                return entry[1]
+
+            client = self._create_client()
+            self._clients[key] = (loop, client)
+            return client
+
+    async def aclose(self) -> None:
+        """Close the pooled clients of the running event loop, e.g. at server shutdown."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            keys = [k for k, (lp, _) in self._clients.items() if lp is loop]
+            clients = [self._clients.pop(k)[1] for k in keys]
+        for client in clients:
+            await client.aclose()
+
+    def close_all(self) -> None:
+        """Close all the pooled clients."""
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+        for loop, client in entries:
+            try:
+                if loop.is_closed() or loop.is_running():
+                    continue
+                loop.run_until_complete(client.aclose())
+            except Exception as e:
+                print(f"[HttpClientPool] failed to close the http client: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of the pooled clients by origin."""
+        with self._lock:
+            origins: List[str] = [origin for origin, _ in self._clients]
+        return {origin: origins.count(origin) for origin in set(origins)}
+
+    def _create_client(self) -> httpx.AsyncClient:
+        http2: bool = bool(SystemEnv.MODEL_HTTP2_ENABLED)
+        if http2:
+            try:
+                import h2  # type: ignore # noqa: F401
+            except ImportError:
+                print("[HttpClientPool] h2 is not installed, fall back to HTTP/1.1")
+                http2 = False
+
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=SystemEnv.MODEL_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=SystemEnv.MODEL_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=SystemEnv.MODEL_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                SystemEnv.LLM_REQUEST_TIMEOUT, connect=SystemEnv.MODEL_HTTP_CONNECT_TIMEOUT
+            ),
+        )
@@ -10,6 +10,7 @@ from app.core.common.type import (
     KnowledgeStoreType,
     ModelPlatformType,
     WorkflowPlatformType,
+    WriteBehindOverflowPolicy,
 )
 
 # system environment variable keys
@@ -22,12 +23,42 @@ _env_vars: Dict[str, Tuple[Type, Any]] = {
     "TEMPERATURE": (float, 0.7),
     "MAX_TOKENS": (int, 1048576),
     "MAX_COMPLETION_TOKENS": (int, 65535),
+    "LLM_REQUEST_TIMEOUT": (float, 600.0),
+    "MODEL_HTTP_MAX_CONNECTIONS": (int, 100),
+    "MODEL_HTTP_MAX_KEEPALIVE_CONNECTIONS": (int, 20),
+    "MODEL_HTTP_KEEPALIVE_EXPIRY": (float, 30.0),
+    "MODEL_HTTP_CONNECT_TIMEOUT": (float, 10.0),
+    "MODEL_HTTP2_ENABLED": (bool, False),
+    "MODEL_REQUEST_LOG_LEVEL": (str, "INFO"),
+    "MODEL_RATE_LIMIT_RPS": (float, 0.0),
+    "MODEL_RATE_LIMIT_BURST": (int, 10),
+    "MODEL_CONCURRENCY_INITIAL": (int, 8),
+    "MODEL_CONCURRENCY_MAX": (int, 64),
+    "MODEL_LATENCY_TARGET": (float, 0.0),
+    "MODEL_RATE_LIMIT_MAX_RETRIES": (int, 3),
+    "MODEL_RATE_LIMIT_BACKOFF": (float, 1.0),
+    "MODEL_RESPONSE_CACHE_ENABLED": (bool, False),
+    "MODEL_RESPONSE_CACHE_SIZE": (int, 1024),
+    "MODEL_RESPONSE_CACHE_TTL": (int, 3600),
+    "MODEL_RESPONSE_CACHE_PERSIST": (bool, False),
+    "MODEL_REQUEST_COALESCING_ENABLED": (bool, False),
     "MAX_REASONING_ROUNDS": (int, 20),
+    "FUNCTION_CALL_CONCURRENCY_ENABLED": (bool, True),
+    "FUNCTION_CALL_TIMEOUT": (float, 0.0),
+    "REASONER_MEMORY_TOKEN_BUDGET": (int, 0),
+    "REASONER_MEMORY_KEEP_MESSAGES": (int, 6),
+    "REASONER_MEMORY_STORE_SIZE": (int, 256),
+    "REASONER_MEMORY_STORE_MAX_MESSAGES": (int, 20000),
     "PRINT_REASONER_MESSAGES": (bool, True),
     "PRINT_SYSTEM_PROMPT": (bool, True),
     "PRINT_REASONER_OUTPUT": (bool, True),
     "LIFE_CYCLE": (int, 3),
     "MAX_RETRY_COUNT": (int, 3),
+    "WORKFLOW_MAX_PARALLEL_OPERATORS": (int, 4),
+    "JOB_EXECUTION_POOL_SIZE": (int, 16),
+    "JOB_EXPERT_MAX_CONCURRENCY": (int, 0),
+    "JOB_EXPERT_CONCURRENCY_LIMITS": (str, ""),
+    "JOB_GRAPH_CACHE_SIZE": (int, 256),
     "DEFAULT_TOP_K": (int, 5),
     "DATABASE_URL": (str, f"sqlite:///{os.path.expanduser('~')}/.chat2graph/system/chat2graph.db"),
     "DATABASE_POOL_SIZE": (int, 50),
@@ -35,6 +66,13 @@ _env_vars: Dict[str, Tuple[Type, Any]] = {
     "DATABASE_POOL_TIMEOUT": (int, 60),
     "DATABASE_POOL_RECYCLE": (int, 3600),
     "DATABASE_POOL_PRE_PING": (bool, True),
+    "VMC_MAX_RECORDS": (int, 100000),
+    "VMC_MAX_BYTES": (int, 512 * 1024 * 1024),
+    "VMC_TRACE_TTL": (int, 24 * 3600),
+    "VMC_WRITE_BATCH_SIZE": (int, 100),
+    "VMC_WRITE_FLUSH_INTERVAL": (float, 1.0),
+    "VMC_WRITE_QUEUE_SIZE": (int, 10000),
+    "VMC_WRITE_OVERFLOW_POLICY": (WriteBehindOverflowPolicy, WriteBehindOverflowPolicy.BLOCK),
     "APP_ROOT": (str, f"{os.path.expanduser('~')}/.chat2graph"),
     "SYSTEM_PATH": (str, "/system"),
     "FILE_PATH": (str, "/files"),
@@ -44,6 +82,7 @@ _env_vars: Dict[str, Tuple[Type, Any]] = {
     "EMBEDDING_MODEL_APIKEY": (str, None),
     "GLOBAL_KNOWLEDGE_BASE_NAME": (str, "Global Knowledge Base"),
     "KNOWLEDGE_STORE_TYPE": (KnowledgeStoreType, KnowledgeStoreType.VECTOR),
+    "KNOWLEDGE_STORE_CACHE_SIZE": (int, 32),
     "TUGRAPH_NAME_PREFIX": (str, "Tu_"),
     "GRAPH_KNOWLEDGE_STORE_USERNAME": (str, "admin"),
     "GRAPH_KNOWLEDGE_STORE_PASSWORD": (str, "73@TuGraph"),
@@ -55,6 +94,18 @@ _env_vars: Dict[str, Tuple[Type, Any]] = {
     "GRAPH_DB_USERNAME": (str, None),
     "GRAPH_DB_PASSWORD": (str, None),
     "GRAPH_DB_NAME": (str, "Default Graph DB"),
+    "GRAPH_DB_POOL_SIZE": (int, 50),
+    "GRAPH_DB_POOL_ACQUISITION_TIMEOUT": (float, 60.0),
+    "GRAPH_DB_POOL_MAX_CONNECTION_LIFETIME": (int, 3600),
+    "GRAPH_DB_DRIVER_IDLE_TIMEOUT": (int, 1800),
+    "GRAPH_DB_HEALTH_CHECK_INTERVAL": (int, 60),
+    "GRAPH_DB_IMPORT_BATCH_SIZE": (int, 1000),
+    "GRAPH_ARTIFACT_MAX_VERTICES": (int, 2000),
+    "GRAPH_ARTIFACT_MAX_EDGES": (int, 5000),
+    "CYPHER_RESULT_MAX_ROWS": (int, 1000),
+    "CYPHER_RESULT_MAX_BYTES": (int, 64 * 1024),
+    "GDS_PROJECTION_CACHE_SIZE": (int, 8),
+    "GDS_PROJECTION_IDLE_TTL": (int, 600),
     "SCHEMA_FILE_NAME": (str, "graph.db.schema.json"),
     "SCHEMA_FILE_ID": (str, "schema_file_id"),
     "LANGUAGE": (str, "en-US"),
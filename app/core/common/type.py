@@ -124,6 +124,47 @@ class ToolType(Enum):
     MCP_TOOL = "MCP_TOOL"
 
 
+class ToolConcurrency(Enum):
+    """Whether the calls of a tool can run concurrently with other calls in the same round.
+
+    Attributes:
+        SERIAL: the tool may have side effects, its calls run alone and in order.
+        PARALLEL: the tool is read-only (parallel-safe), its calls run concurrently with the
+            adjacent parallel calls.
+    """
+
+    SERIAL = "SERIAL"
+    PARALLEL = "PARALLEL"
+
+
+class CallParamSource(Enum):
+    """Where the argument of a precompiled call plan parameter comes from.
+
+    Attributes:
+        ARGUMENT: the argument generated by the model (or the command params).
+        CONTEXT: the tool call context, injected.
+        SERVICE: the service of the annotated type, injected if it is registered.
+    """
+
+    ARGUMENT = "ARGUMENT"
+    CONTEXT = "CONTEXT"
+    SERVICE = "SERVICE"
+
+
+class ModelRequestLogLevel(Enum):
+    """Logging level of the model http requests.
+
+    Attributes:
+        NONE: no logging.
+        INFO: the endpoint, the latency and the head of the output.
+        DEBUG: also the full request body.
+    """
+
+    NONE = "NONE"
+    INFO = "INFO"
+    DEBUG = "DEBUG"
+
+
 class ToolGroupType(Enum):
     """Tool set type enumeration"""
 
@@ -138,3 +179,11 @@ class McpTransportType(Enum):
     SSE = "SSE"
     WEBSOCKET = "WEBSOCKET"
     STREAMABLE_HTTP = "STREAMABLE_HTTP"
+
+
+class WriteBehindOverflowPolicy(Enum):
+    """What a write-behind queue does when it is full."""
+
+    BLOCK = "BLOCK"
+    DROP_NEWEST = "DROP_NEWEST"
+    DROP_OLDEST = "DROP_OLDEST"
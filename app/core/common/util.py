@@ -143,3 +143,21 @@ def parse_jsons(
             results.append(e)
 
     return results
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens of the text without a tokenizer.
+
+    ASCII text is counted as about 4 characters per token, and every other character (e.g. CJK)
+    as one token, which slightly overestimates most tokenizers.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    if not text:
+        return 0
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_count + 3) // 4 + (len(text) - ascii_count)
@@ -0,0 +1,165 @@
+import atexit
+from collections import deque
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from app.core.common.type import WriteBehindOverflowPolicy
+
+
+class WriteBehindQueue:
+    """Bounded queue whose items are written in batches by a background flusher thread.
+
+    A batch is handed to the sink when `batch_size` items are queued, or when the oldest queued
+    item has waited `flush_interval` seconds. When the queue is full, the overflow policy decides
+    whether the producer blocks, or whether the newest or the oldest item is dropped.
+
+    Attributes:
+        _sink (Callable[[List[Any]], Optional[List[bool]]]): Writes a batch of items, and returns
+            whether each item was written (None if all of them were). A raised exception counts
+            the whole batch as failed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sink: Callable[[List[Any]], Optional[List[bool]]],
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_size: int = 10000,
+        overflow_policy: WriteBehindOverflowPolicy = WriteBehindOverflowPolicy.BLOCK,
+    ):
+        self._name = name
+        self._sink = sink
+        self._batch_size: int = max(batch_size, 1)
+        self._flush_interval: float = flush_interval
+        self._max_size: int = max(max_size, self._batch_size)
+        self._overflow_policy: WriteBehindOverflowPolicy = overflow_policy
+
+        self._items: Deque[Any] = deque()
+        self._condition = threading.Condition()
+        # number of items taken from the queue, but not written by the sink yet
+        self._in_flight: int = 0
+        self._closed: bool = False
+        self._flush_requested: bool = False
+        self._dropped_count: int = 0
+        self._written_count: int = 0
+        self._failed_count: int = 0
+
+        self._flusher = threading.Thread(target=self._run, name=f"{name}_write_behind", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def put(self, item: Any) -> bool:
+        """Queue an item to be written.
+
+        Returns:
+            bool: False if the item was dropped because the queue is full.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"Write-behind queue {self._name} is closed.")
+            if len(self._items) >= self._max_size:
+                if self._overflow_policy == WriteBehindOverflowPolicy.DROP_NEWEST:
+                    self._dropped_count += 1
+                    return False
+                if self._overflow_policy == WriteBehindOverflowPolicy.DROP_OLDEST:
+                    self._items.popleft()
+                    self._dropped_count += 1
+                else:
+                    while len(self._items) >= self._max_size and not self._closed:
+                        self._condition.wait()
+            self._items.append(item)
+            if len(self._items) == 1 or len(self._items) >= self._batch_size:
+                self._condition.notify_all()
+            return True
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until all the queued items are written.
+
+        Returns:
+            bool: False if the items were not written before the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            if not self._items:
+                # nothing to flush, do not make the next single item skip the flush interval
+                self._flush_requested = False
+            else:
+                self._flush_requested = True
+                self._condition.notify_all()
+            while self._items or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(timeout=remaining)
+        return True
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Write the queued items and stop the flusher."""
+        with self._condition:
+            if self._closed:
+                return
+        self.flush(timeout=timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._flusher.join(timeout=timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the counters of the queue."""
+        with self._condition:
+            return {
+                "queued": len(self._items),
+                "in_flight": self._in_flight,
+                "written": self._written_count,
+                "failed": self._failed_count,
+                "dropped": self._dropped_count,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                deadline = None
+                while True:
+                    if self._items and (
+                        len(self._items) >= self._batch_size
+                        or self._flush_requested
+                        or self._closed
+                    ):
+                        break
+                    if self._items:
+                        # the deadline starts when the flusher sees the first queued item
+                        if deadline is None:
+                            deadline = time.monotonic() + self._flush_interval
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(timeout=remaining)
+                    else:
+                        if self._closed:
+                            return
+                        deadline = None
+                        self._condition.wait()
+
+                batch = [
+                    self._items.popleft() for _ in range(min(self._batch_size, len(self._items)))
+                ]
+                if not self._items:
+                    self._flush_requested = False
+                self._in_flight = len(batch)
+                # wake up the producers blocked by a full queue
+                self._condition.notify_all()
+
+            written = 0
+            try:
+                outcomes = self._sink(batch)
+                written = len(batch) if outcomes is None else sum(1 for ok in outcomes if ok)
+            except Exception as e:
+                print(f"[WriteBehindQueue] {self._name} failed to write a batch: {e}")
+
+            with self._condition:
+                self._written_count += written
+                self._failed_count += len(batch) - written
+                self._in_flight = 0
+                self._condition.notify_all()
@@ -1,7 +1,7 @@
 from contextlib import contextmanager
-from typing import Any, Generator, Generic, List, Optional, Type, TypeVar
+from typing import Any, Generator, Generic, List, Optional, Type, TypeVar, Union
 
-from sqlalchemy.orm import DeclarativeBase, Session as SqlAlchemySession
+from sqlalchemy.orm import DeclarativeBase, Session as SqlAlchemySession, scoped_session
 
 from app.core.common.singleton import Singleton
 from app.core.dal.database import DbSession
@@ -12,13 +12,15 @@ T = TypeVar("T", bound=DeclarativeBase)
 class Dao(Generic[T], metaclass=Singleton):
     """Data Access Object"""
 
-    def __init__(self, model: Type[T], session: SqlAlchemySession):
+    def __init__(self, model: Type[T], session: Union[SqlAlchemySession, scoped_session]):
         self._model: Type[T] = model
-        self._session: SqlAlchemySession = session
+        self._session: Union[SqlAlchemySession, scoped_session] = session
 
     @property
     def session(self) -> SqlAlchemySession:
-        """Get the session."""
+        """Get the session (of the current thread, if the dao uses a scoped session)."""
+        if isinstance(self._session, scoped_session):
+            return self._session()
         return self._session
 
     @contextmanager
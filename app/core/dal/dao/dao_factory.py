@@ -3,7 +3,9 @@ import inspect
 from pathlib import Path
 import pkgutil
 
-from sqlalchemy.orm import Session as SqlAlchemySession
+from typing import Union
+
+from sqlalchemy.orm import Session as SqlAlchemySession, scoped_session
 
 from app.core.dal.dao.dao import Dao
 
@@ -12,11 +14,12 @@ class DaoFactory:
     """Automatically discover and initialize all DAO classes"""
 
     @classmethod
-    def initialize(cls, session: SqlAlchemySession) -> None:
+    def initialize(cls, session: Union[SqlAlchemySession, scoped_session]) -> None:
         """Discover and initialize all DAO classes using dynamic import
 
         Args:
-            session: SQLAlchemy session to be used for all DAOs
+            session: SQLAlchemy session to be used for all DAOs, or a scoped session to give
+                every thread its own session
         """
         # get package name without the module
         current_dir = Path(__file__).parent
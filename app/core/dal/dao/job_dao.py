@@ -1,4 +1,4 @@
-from typing import Optional, cast
+from typing import List, Optional, cast
 
 from sqlalchemy.orm import Session as SqlAlchemySession
 
@@ -66,7 +66,6 @@ class JobDao(Dao[JobDo]):
             context=job.context,
             session_id=job.session_id,
             assigned_expert_name=job.assigned_expert_name,
-            dag=job.dag,
         )
 
     def save_job_result(self, job_result: JobResult) -> JobDo:
@@ -78,11 +77,27 @@ class JobDao(Dao[JobDo]):
             tokens=job_result.tokens,
         )
 
+    def get_job_graph_jobs(self, original_job_id: str) -> List[JobDo]:
+        """Get the original job and all its subjobs (including the legacy ones) in one query."""
+        return (
+            self.session.query(self._model)
+            .filter(
+                (self._model.id == original_job_id)
+                | (self._model.original_job_id == original_job_id)
+            )
+            .all()
+        )
+
     def get_job_by_id(self, id: str) -> Job:
         """Get a job by ID."""
         result = self.get_by_id(id=id)
         if not result:
             raise ValueError(f"Job with ID {id} not found")
+        return self.parse_into_job(job_do=result)
+
+    def parse_into_job(self, job_do: JobDo) -> Job:
+        """Create a job (original job / subjob) model instance."""
+        result = job_do
         if result.category == JobType.JOB.value:
             return Job(
                 id=cast(str, result.id),
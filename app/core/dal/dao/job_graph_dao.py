@@ -0,0 +1,104 @@
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import null, tuple_
+from sqlalchemy.orm import Session as SqlAlchemySession
+
+from app.core.dal.dao.dao import Dao
+from app.core.dal.do.job_do import JobDo
+from app.core.dal.do.job_graph_do import JobEdgeDo, JobVertexDo
+
+# the number of the vertices/edges deleted by one statement, which keeps the bound parameters
+# below the SQLite limit (999 in older versions)
+_DELETE_CHUNK_SIZE = 400
+
+
+class JobVertexDao(Dao[JobVertexDo]):
+    """Job graph vertex Data Access Object"""
+
+    def __init__(self, session: SqlAlchemySession):
+        super().__init__(JobVertexDo, session)
+
+    def get_vertices(self, original_job_id: str) -> List[str]:
+        """Get the subjob ids of the job graph."""
+        return [
+            str(vertex_do.job_id)
+            for vertex_do in self.session.query(self._model)
+            .filter(self._model.original_job_id == original_job_id)
+            .all()
+        ]
+
+    def apply_job_graph_delta(
+        self,
+        original_job_id: str,
+        added_vertices: Iterable[str],
+        removed_vertices: Iterable[str],
+        added_edges: Iterable[Tuple[str, str]],
+        removed_edges: Iterable[Tuple[str, str]],
+    ) -> None:
+        """Save the changes of the job graph in one transaction, so that a failed write leaves
+        the saved job graph unchanged. The edges and the vertices are removed before the
+        vertices and the edges are added."""
+        removed_edges = list(removed_edges)
+        removed_vertices = list(removed_vertices)
+        with self.new_session() as s:
+            for start in range(0, len(removed_edges), _DELETE_CHUNK_SIZE):
+                s.query(JobEdgeDo).filter(
+                    JobEdgeDo.original_job_id == original_job_id,
+                    tuple_(JobEdgeDo.source_id, JobEdgeDo.target_id).in_(
+                        removed_edges[start : start + _DELETE_CHUNK_SIZE]
+                    ),
+                ).delete(synchronize_session=False)
+            for start in range(0, len(removed_vertices), _DELETE_CHUNK_SIZE):
+                s.query(self._model).filter(
+                    self._model.original_job_id == original_job_id,
+                    self._model.job_id.in_(removed_vertices[start : start + _DELETE_CHUNK_SIZE]),
+                ).delete(synchronize_session=False)
+            # flush the deletes first, since the re-added vertices/edges have the same keys
+            s.flush()
+            s.add_all(
+                [
+                    self._model(original_job_id=original_job_id, job_id=job_id)
+                    for job_id in added_vertices
+                ]
+            )
+            s.add_all(
+                [
+                    JobEdgeDo(original_job_id=original_job_id, source_id=source, target_id=target)
+                    for source, target in added_edges
+                ]
+            )
+
+    def migrate_job_graph(
+        self, original_job_id: str, job_ids: Iterable[str], edges: Iterable[Tuple[str, str]]
+    ) -> None:
+        """Save the job graph migrated from the legacy DAG JSON of the original job, and clear
+        the DAG JSON, in one transaction, so that the job graph is migrated only once."""
+        with self.new_session() as s:
+            s.add_all(
+                [self._model(original_job_id=original_job_id, job_id=job_id) for job_id in job_ids]
+            )
+            s.add_all(
+                [
+                    JobEdgeDo(original_job_id=original_job_id, source_id=source, target_id=target)
+                    for source, target in edges
+                ]
+            )
+            s.query(JobDo).filter(JobDo.id == original_job_id).update(
+                {JobDo.dag: null()}, synchronize_session=False
+            )
+
+
+class JobEdgeDao(Dao[JobEdgeDo]):
+    """Job graph edge Data Access Object"""
+
+    def __init__(self, session: SqlAlchemySession):
+        super().__init__(JobEdgeDo, session)
+
+    def get_edges(self, original_job_id: str) -> List[Tuple[str, str]]:
+        """Get the (source, target) subjob ids of the edges of the job graph."""
+        return [
+            (str(edge_do.source_id), str(edge_do.target_id))
+            for edge_do in self.session.query(self._model)
+            .filter(self._model.original_job_id == original_job_id)
+            .all()
+        ]
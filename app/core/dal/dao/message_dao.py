@@ -1,8 +1,8 @@
-from typing import List, cast
+from typing import Dict, List, Optional, cast
 
 from sqlalchemy.orm import Session as SqlAlchemySession
 
-from app.core.common.type import ChatMessageRole
+from app.core.common.type import ChatMessageRole, FunctionCallStatus, MessageSourceType
 from app.core.dal.dao.dao import Dao
 from app.core.dal.dao.file_descriptor_dao import FileDescriptorDao
 from app.core.dal.do.message_do import (
@@ -26,6 +26,7 @@ from app.core.model.message import (
     TextMessage,
     WorkflowMessage,
 )
+from app.core.toolkit.tool import FunctionCallResult
 
 
 class MessageDao(Dao[MessageDo]):
@@ -53,6 +54,58 @@ class MessageDao(Dao[MessageDo]):
             raise ValueError(f"Message with ID {id} not found")
         return self.parse_into_message(message_do=result)
 
+    def get_by_ids(self, ids: List[str]) -> List[MessageDo]:
+        """Get the messages by IDs in one query."""
+        if not ids:
+            return []
+        return self.session.query(self._model).filter(self._model.id.in_(ids)).all()
+
+    def filter_by_job_ids(self, job_ids: List[str], message_type: MessageType) -> List[MessageDo]:
+        """Get the messages of the type by job IDs in one query."""
+        if not job_ids:
+            return []
+        return (
+            self.session.query(self._model)
+            .filter(
+                self._model.type == message_type.value,
+                self._model.job_id.in_(job_ids),
+            )
+            .all()
+        )
+
+    def replace_model_messages(
+        self,
+        session_id: str,
+        job_id: str,
+        operator_id: str,
+        messages: List[ModelMessage],
+    ) -> None:
+        """Replace the model messages of the operator in the job, in one transaction."""
+        with self.new_session() as s:
+            s.query(self._model).filter(
+                self._model.type == MessageType.MODEL_MESSAGE.value,
+                self._model.job_id == job_id,
+                self._model.operator_id == operator_id,
+            ).delete(synchronize_session=False)
+            for message in messages:
+                message_do = self.parse_into_message_do(message)
+                message_do.session_id = session_id
+                message_do.operator_id = operator_id
+                s.merge(message_do)
+
+    def filter_model_messages(self, job_id: str, operator_id: str) -> List[MessageDo]:
+        """Get the model messages of the operator in the job, in the order of the steps."""
+        return (
+            self.session.query(self._model)
+            .filter(
+                self._model.type == MessageType.MODEL_MESSAGE.value,
+                self._model.job_id == job_id,
+                self._model.operator_id == operator_id,
+            )
+            .order_by(self._model.step, self._model.timestamp)
+            .all()
+        )
+
     def get_text_message_by_job_id_and_role(
         self, job_id: str, role: ChatMessageRole
     ) -> List[TextMessageDo]:
@@ -105,6 +158,17 @@ class MessageDao(Dao[MessageDo]):
                 job_id=message.get_job_id(),
                 timestamp=message.get_timestamp(),
                 step=message.get_step(),
+                source_type=message.get_source_type().value,
+                function_calls_json=[
+                    {
+                        "func_name": result.func_name,
+                        "func_args": result.func_args,
+                        "call_objective": result.call_objective,
+                        "output": result.output,
+                        "status": result.status.value,
+                    }
+                    for result in message.get_function_calls() or []
+                ],
             )
 
         if isinstance(message, TextMessage):
@@ -152,10 +216,42 @@ class MessageDao(Dao[MessageDo]):
             )
         raise ValueError(f"Unsupported message type: {type(message)}")
 
-    def parse_into_message(self, message_do: MessageDo) -> Message:
-        """Create a message model instance."""
+    def parse_into_message(
+        self, message_do: MessageDo, related_messages: Optional[Dict[str, Message]] = None
+    ) -> Message:
+        """Create a message model instance.
+
+        Args:
+            message_do (MessageDo): The message data object.
+            related_messages (Optional[Dict[str, Message]]): The prefetched related messages by
+                ID, the missing ones are loaded from the database one by one.
+        """
+        related_messages = related_messages or {}
         message_type = MessageType(str(message_do.type))
 
+        if message_type == MessageType.MODEL_MESSAGE:
+            return ModelMessage(
+                id=str(message_do.id),
+                payload=str(message_do.payload),
+                job_id=str(message_do.job_id),
+                step=int(message_do.step or 0),
+                timestamp=int(message_do.timestamp),
+                source_type=MessageSourceType(
+                    str(message_do.source_type or MessageSourceType.MODEL.value)
+                ),
+                function_calls=[
+                    FunctionCallResult(
+                        func_name=result["func_name"],
+                        func_args=result["func_args"],
+                        call_objective=result["call_objective"],
+                        output=result["output"],
+                        status=FunctionCallStatus(result["status"]),
+                    )
+                    for result in list(message_do.function_calls_json or [])
+                ]
+                or None,
+            )
+
         if message_type == MessageType.WORKFLOW_MESSAGE:
             return WorkflowMessage(
                 id=str(message_do.id),
@@ -172,7 +268,10 @@ class MessageDao(Dao[MessageDo]):
                 payload=str(message_do.payload),
                 workflow_messages=cast(
                     List[WorkflowMessage],
-                    [self.get_message(wf_id) for wf_id in list(message_do.related_message_ids)]
+                    [
+                        related_messages.get(wf_id) or self.get_message(wf_id)
+                        for wf_id in list(message_do.related_message_ids)
+                    ]
                     or [],
                 ),
                 artifact_ids=list(message_do.artifact_ids),
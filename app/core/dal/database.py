@@ -1,8 +1,8 @@
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import DeclarativeMeta
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import ORMExecuteState, declarative_base, scoped_session, sessionmaker
 
 from app.core.common.system_env import SystemEnv
 
@@ -20,4 +20,24 @@ engine = create_engine(
     pool_pre_ping=SystemEnv.DATABASE_POOL_PRE_PING,
 )
 DbSession = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+
+# the session of the current thread, used by the DAO reads, so that the concurrent request
+# threads and job workers do not share one session (and its identity map)
+ThreadDbSession = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+ScopedDbSession = scoped_session(ThreadDbSession)
+
+
+@event.listens_for(ThreadDbSession, "do_orm_execute")
+def _refresh_loaded_objects(orm_execute_state: ORMExecuteState) -> None:
+    """Overwrite the objects already in the identity map of a thread session with the selected
+    rows, so that a job task reading for a long time sees the writes committed by the other
+    sessions. The short-lived sessions of `DbSession` start with an empty identity map, so they
+    are not affected."""
+    if orm_execute_state.is_select:
+        orm_execute_state.update_execution_options(populate_existing=True)
+
+
+def remove_thread_session() -> None:
+    """Close the session of the current thread, at the end of a request or a job task."""
+    ScopedDbSession.remove()
 Do: DeclarativeMeta = declarative_base()
@@ -0,0 +1,28 @@
+from uuid import uuid4
+
+from sqlalchemy import Column, String, UniqueConstraint
+
+from app.core.dal.database import Do
+
+
+class JobVertexDo(Do):  # type: ignore
+    """Job graph vertex table, one row per subjob in the job graph of an original job"""
+
+    __tablename__ = "job_vertex"
+    __table_args__ = (UniqueConstraint("original_job_id", "job_id"),)
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    original_job_id = Column(String(36), nullable=False, index=True)  # FK constraint
+    job_id = Column(String(36), nullable=False)  # FK constraint
+
+
+class JobEdgeDo(Do):  # type: ignore
+    """Job graph edge table, one row per dependency between two subjobs"""
+
+    __tablename__ = "job_edge"
+    __table_args__ = (UniqueConstraint("original_job_id", "source_id", "target_id"),)
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    original_job_id = Column(String(36), nullable=False, index=True)  # FK constraint
+    source_id = Column(String(36), nullable=False)  # FK constraint
+    target_id = Column(String(36), nullable=False)  # FK constraint
@@ -1,14 +1,54 @@
+from collections import OrderedDict
+import threading
+from typing import Tuple
+
 from app.core.common.system_env import SystemEnv
 from app.core.common.type import KnowledgeStoreType
 from app.core.knowledge.knowledge_store import KnowledgeStore
 
 
 class KnowledgeStoreFactory:
-    """Knowledge store factory."""
+    """Knowledge store factory.
+
+    Knowledge stores are cached by (store type, name) in a bounded LRU cache, so that the
+    persistence directories and embedding clients are not reopened on every retrieval.
+    """
+
+    _stores: "OrderedDict[Tuple[KnowledgeStoreType, str], KnowledgeStore]" = OrderedDict()
+    _lock = threading.Lock()
 
     @classmethod
     def get_or_create(cls, name: str) -> KnowledgeStore:
         """Get ore create a knowledge store."""
+        key = (SystemEnv.KNOWLEDGE_STORE_TYPE, name)
+        with cls._lock:
+            store = cls._stores.get(key)
+            if store:
+                cls._stores.move_to_end(key)
+                return store
+
+        # create the store outside the lock, because opening a store can be slow
+        store = cls._create(name)
+
+        with cls._lock:
+            cached_store = cls._stores.get(key)
+            if cached_store:
+                cls._stores.move_to_end(key)
+                return cached_store
+            cls._stores[key] = store
+            while len(cls._stores) > max(SystemEnv.KNOWLEDGE_STORE_CACHE_SIZE or 0, 1):
+                cls._stores.popitem(last=False)
+        return store
+
+    @classmethod
+    def invalidate(cls, name: str) -> None:
+        """Remove the cached knowledge stores of the name."""
+        with cls._lock:
+            for key in [key for key in cls._stores if key[1] == name]:
+                del cls._stores[key]
+
+    @classmethod
+    def _create(cls, name: str) -> KnowledgeStore:
         from app.plugin.dbgpt.dbgpt_knowledge_store import GraphKnowledgeStore, VectorKnowledgeStore
 
         if SystemEnv.KNOWLEDGE_STORE_TYPE == KnowledgeStoreType.VECTOR:
@@ -16,4 +56,4 @@ class KnowledgeStoreFactory:
         elif SystemEnv.KNOWLEDGE_STORE_TYPE == KnowledgeStoreType.GRAPH:
             return GraphKnowledgeStore(name)
 
-        raise ValueError(f"Cannot create knowledge store of type {SystemEnv.NOWLEDGE_STORE_TYPE}")
+        raise ValueError(f"Cannot create knowledge store of type {SystemEnv.KNOWLEDGE_STORE_TYPE}")
@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 
+from app.core.common.type import MessageSourceType
+from app.core.common.util import estimate_tokens
 from app.core.model.message import ModelMessage
 
+# (the current summary, the messages to fold) -> the updated summary
+MemorySummarizer = Callable[[str, List[ModelMessage]], Awaitable[str]]
+
 
 class ReasonerMemory(ABC):
     """Agent message memory."""
@@ -26,6 +31,14 @@ class ReasonerMemory(ABC):
     def get_messages(self) -> List[ModelMessage]:
         """Get a message from the memory."""
 
+    async def get_prompt_messages(self, reserved_tokens: int = 0) -> List[ModelMessage]:
+        """Get the messages to send to the model in the next reasoning round.
+
+        Args:
+            reserved_tokens (int): The tokens already taken by the system prompt.
+        """
+        return self.get_messages()
+
     @abstractmethod
     def clear_messages(self) -> None:
         """Clear all the messages in the memory."""
@@ -46,6 +59,14 @@ class ReasonerMemory(ABC):
     def get_messages_metadata(self) -> List[dict]:
         """Get all the messages in the memory in json format."""
 
+    def get_state(self) -> Dict[str, Any]:
+        """Get the state of the memory besides its messages, e.g. to restore it after the
+        messages are reloaded."""
+        return {}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Restore the state returned by `get_state`."""
+
 
 class BuiltinReasonerMemory(ReasonerMemory):
     """Agent message memory."""
@@ -89,3 +110,144 @@ class BuiltinReasonerMemory(ReasonerMemory):
     def get_messages_metadata(self) -> List[dict]:
         """Get all the messages in the memory in json format."""
         return [message.__dict__ for message in self._history_messages]
+
+
+class SlidingWindowReasonerMemory(BuiltinReasonerMemory):
+    """Reasoner memory which keeps the prompt within a token budget.
+
+    The complete history is still kept (and returned by `get_messages`), but the messages sent
+    to the model are the last `keep_messages` messages verbatim plus a summary of the older ones.
+    The summary is updated incrementally: whenever the prompt exceeds the token budget, the
+    messages that fell out of the window are folded into the existing summary.
+
+    Attributes:
+        _token_budget (int): The max tokens of the prompt (system prompt + messages).
+        _keep_messages (int): The number of the latest messages which are always kept verbatim.
+        _summarizer (Optional[MemorySummarizer]): Folds messages into the summary, usually by an
+            LLM. If not set, the folded messages are truncated and concatenated.
+        _summary (str): The summary of the folded messages.
+        _summarized_count (int): The number of the leading messages covered by the summary.
+        _round_token_stats (List[Dict[str, int]]): The token counts of every prompt.
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        keep_messages: int,
+        summarizer: Optional[MemorySummarizer] = None,
+    ) -> None:
+        super().__init__()
+        self._token_budget: int = token_budget
+        self._keep_messages: int = max(keep_messages, 1)
+        self._summarizer: Optional[MemorySummarizer] = summarizer
+        self._summary: str = ""
+        self._summarized_count: int = 0
+        self._round_token_stats: List[Dict[str, int]] = []
+
+    def remove_message(self):
+        """Remove a message from the memory."""
+        super().remove_message()
+        if self._summarized_count > len(self._history_messages):
+            self._summarized_count = len(self._history_messages)
+
+    def clear_messages(self):
+        """Clear all the messages in the memory."""
+        super().clear_messages()
+        self._summary = ""
+        self._summarized_count = 0
+        self._round_token_stats.clear()
+
+    async def get_prompt_messages(self, reserved_tokens: int = 0) -> List[ModelMessage]:
+        """Get the summary and the latest messages, folding the messages out of the window into
+        the summary if the prompt exceeds the token budget."""
+        window = self._window()
+        prompt_tokens = reserved_tokens + self._count_tokens(window)
+        fold_end = len(self._history_messages) - self._keep_messages
+        if prompt_tokens > self._token_budget and fold_end > self._summarized_count:
+            folded = self._history_messages[self._summarized_count : fold_end]
+            self._summary = await self._summarize(self._summary, folded)
+            self._summarized_count = fold_end
+            window = self._window()
+            prompt_tokens = reserved_tokens + self._count_tokens(window)
+
+        self._round_token_stats.append(
+            {
+                "round": len(self._round_token_stats) + 1,
+                "prompt_tokens": prompt_tokens,
+                "history_tokens": reserved_tokens + self._count_tokens(self._history_messages),
+                "summarized_messages": self._summarized_count,
+            }
+        )
+        return window
+
+    def get_state(self) -> Dict[str, Any]:
+        """Get the summary of the folded messages."""
+        return {
+            "summary": self._summary,
+            "summarized_count": self._summarized_count,
+            "round_token_stats": list(self._round_token_stats),
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Restore the summary of the folded messages."""
+        self._summary = state.get("summary", "")
+        self._summarized_count = min(
+            state.get("summarized_count", 0), len(self._history_messages)
+        )
+        self._round_token_stats = list(state.get("round_token_stats", []))
+
+    def get_token_stats(self) -> List[Dict[str, int]]:
+        """Get the token counts of the prompts of every reasoning round."""
+        return list(self._round_token_stats)
+
+    def _window(self) -> List[ModelMessage]:
+        window = self._history_messages[self._summarized_count :]
+        if not self._summary:
+            return window
+        first = window[0] if window else self._history_messages[-1]
+        summary_message = ModelMessage(
+            payload=(
+                "<history_summary>\n"
+                f"{self._summary}\n"
+                "</history_summary>"
+            ),
+            job_id=first.get_job_id(),
+            step=max(first.get_step() - 1, 0),
+            source_type=MessageSourceType.MODEL,
+        )
+        return [summary_message, *window]
+
+    async def _summarize(self, summary: str, messages: List[ModelMessage]) -> str:
+        if self._summarizer:
+            return await self._summarizer(summary, messages)
+
+        # fallback: keep the head of each folded message
+        lines = [summary] if summary else []
+        lines.extend(
+            f"[step {message.get_step()}] {message.get_payload()[:200].strip()}"
+            for message in messages
+        )
+        return "\n".join(lines)
+
+    def _count_tokens(self, messages: List[ModelMessage]) -> int:
+        tokens = 0
+        for message in messages:
+            tokens += estimate_tokens(message.get_payload())
+            for result in message.get_function_calls() or []:
+                tokens += estimate_tokens(str(result.output))
+        return tokens
+
+
+def render_messages_for_summary(messages: List[ModelMessage]) -> str:
+    """Render the messages (with their function call results) as plain text to be summarized."""
+    rendered: List[Any] = []
+    for message in messages:
+        text = f"[step {message.get_step()}, {message.get_source_type().value}]\n"
+        text += message.get_payload()
+        for result in message.get_function_calls() or []:
+            text += (
+                f"\n<function_call_result> {result.status.value} {result.func_name}: "
+                f"{result.output}</function_call_result>"
+            )
+        rendered.append(text)
+    return "\n\n".join(rendered)
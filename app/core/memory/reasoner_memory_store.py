@@ -0,0 +1,253 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+from app.core.dal.database import remove_thread_session
+from app.core.memory.reasoner_memory import ReasonerMemory
+from app.core.service.message_service import MessageService
+
+# (session_id, job_id, operator_id)
+MemoryKey = Tuple[str, str, str]
+
+
+class ReasonerMemoryStore(metaclass=Singleton):
+    """Store of the reasoner memories, whose footprint is bounded by the active jobs.
+
+    The memories are kept in an LRU of at most `REASONER_MEMORY_STORE_SIZE` memories and
+    `REASONER_MEMORY_STORE_MAX_MESSAGES` messages in total (0 means unlimited). When a memory is
+    evicted, its messages are spilled to the database as model messages and the memory is
+    dropped. When its job reaches a terminal status, the memory is released and spilled in the
+    background instead, so that the caller does not wait for the database. A spilled memory is
+    reloaded lazily by `get`, e.g. when a stopped job is recovered.
+
+    A memory pinned by a running reasoning (ref counted) is never evicted, since the reasoner
+    keeps adding messages to it. The state of an evicted memory besides its messages (e.g. the
+    summary of a sliding window memory) is kept in the store and restored on reload. The
+    database is accessed outside of the store lock.
+    """
+
+    def __init__(self):
+        self._max_size: int = max(SystemEnv.REASONER_MEMORY_STORE_SIZE or 0, 0)
+        self._max_messages: int = max(SystemEnv.REASONER_MEMORY_STORE_MAX_MESSAGES or 0, 0)
+        self._lock = threading.RLock()
+        self._memories: "OrderedDict[MemoryKey, ReasonerMemory]" = OrderedDict()
+        self._job_keys: Dict[str, List[MemoryKey]] = {}  # job_id -> keys of its memories
+        self._pins: Dict[MemoryKey, int] = {}  # key -> number of the running reasonings
+        # the message count of every memory when it was last touched, and their running total
+        self._message_counts: Dict[MemoryKey, int] = {}
+        self._message_count: int = 0
+        # the evicted memories being spilled, which are still served by `get`
+        self._spilling: Dict[MemoryKey, ReasonerMemory] = {}
+        self._states: Dict[MemoryKey, Dict[str, Any]] = {}  # key -> state of the evicted memory
+        self._metrics: Dict[str, int] = {"spills": 0, "reloads": 0, "releases": 0}
+        # spills the released memories, off the thread finishing the job
+        self._release_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="reasoner_memory_release"
+        )
+
+    def put(self, session_id: str, job_id: str, operator_id: str, memory: ReasonerMemory) -> None:
+        """Put the memory of the operator in the job, replacing the existing one."""
+        key: MemoryKey = (session_id, job_id, operator_id)
+        with self._lock:
+            self._add(key, memory)
+            evicted = self._evict(keep=key)
+        self._spill_all(evicted)
+
+    def get(
+        self,
+        session_id: str,
+        job_id: str,
+        operator_id: str,
+        memory_factory: Callable[[], ReasonerMemory],
+    ) -> Optional[ReasonerMemory]:
+        """Get the memory of the operator in the job, reloading it from the database if it was
+        spilled.
+
+        Args:
+            session_id (str): The session id.
+            job_id (str): The job id.
+            operator_id (str): The operator id.
+            memory_factory (Callable[[], ReasonerMemory]): Creates the empty memory to reload the
+                spilled messages into.
+
+        Returns:
+            Optional[ReasonerMemory]: The memory, or None if it is neither in the store nor in
+                the database.
+        """
+        key: MemoryKey = (session_id, job_id, operator_id)
+        with self._lock:
+            memory = self._lookup(key)
+            if memory is not None:
+                return memory
+
+        message_service: Optional[MessageService] = MessageService.instance
+        if not message_service:
+            return None
+        messages = message_service.get_model_messages(job_id=job_id, operator_id=operator_id)
+        if not messages:
+            return None
+
+        reloaded = memory_factory()
+        for message in messages:
+            reloaded.add_message(message)
+
+        with self._lock:
+            # the memory may have been put or reloaded by another thread meanwhile
+            memory = self._lookup(key)
+            if memory is not None:
+                return memory
+            state = self._states.pop(key, None)
+            if state:
+                reloaded.load_state(state)
+            self._metrics["reloads"] += 1
+            self._add(key, reloaded)
+            evicted = self._evict(keep=key)
+        self._spill_all(evicted)
+        return reloaded
+
+    @contextmanager
+    def pin(self, session_id: str, job_id: str, operator_id: str) -> Iterator[None]:
+        """Keep the memory of the operator in the job in the store while the reasoning runs."""
+        key: MemoryKey = (session_id, job_id, operator_id)
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pins[key] -= 1
+                if self._pins[key] == 0:
+                    del self._pins[key]
+                if key in self._memories:
+                    # count the messages added by the reasoning
+                    self._recount(key)
+                evicted = self._evict(keep=None)
+            self._spill_all(evicted)
+
+    def release_job(self, job_id: str) -> None:
+        """Release the memories of the job, called when the job reaches a terminal status. The
+        memories are dropped from the store, and spilled in the background; `get` still serves
+        them until they are spilled."""
+        released: List[Tuple[MemoryKey, ReasonerMemory]] = []
+        with self._lock:
+            keys = self._job_keys.pop(job_id, [])
+            for key in keys:
+                memory = self._memories.pop(key, None)
+                self._message_count -= self._message_counts.pop(key, 0)
+                self._states.pop(key, None)
+                if memory is not None:
+                    released.append((key, memory))
+                    self._spilling[key] = memory
+            if keys:
+                self._metrics["releases"] += 1
+        if released:
+            self._release_executor.submit(self._spill_released, released)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the released memories are spilled, and return whether it was in time."""
+        # the releases are spilled in order by one thread, so a no-op marks the end of the queue
+        done, _ = wait([self._release_executor.submit(lambda: None)], timeout=timeout)
+        return bool(done)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the size and the spill/reload metrics of the store."""
+        with self._lock:
+            return {
+                **self._metrics,
+                "memories": len(self._memories),
+                "messages": self._message_count,
+                "pinned": len(self._pins),
+            }
+
+    def _lookup(self, key: MemoryKey) -> Optional[ReasonerMemory]:
+        """Get the memory in the store, or take it back if it is being spilled. Must be called
+        with the lock held."""
+        memory = self._memories.get(key)
+        if memory is not None:
+            self._memories.move_to_end(key)
+            self._recount(key)
+            return memory
+
+        memory = self._spilling.get(key)
+        if memory is not None:
+            self._states.pop(key, None)
+            self._add(key, memory)
+        return memory
+
+    def _add(self, key: MemoryKey, memory: ReasonerMemory) -> None:
+        """Add the memory as the most recently used one. Must be called with the lock held."""
+        job_keys = self._job_keys.setdefault(key[1], [])
+        if key not in job_keys:
+            job_keys.append(key)
+        self._memories[key] = memory
+        self._memories.move_to_end(key)
+        self._recount(key)
+
+    def _recount(self, key: MemoryKey) -> None:
+        """Update the running message total with the current size of the memory. Must be called
+        with the lock held."""
+        count = len(self._memories[key].get_messages())
+        self._message_count += count - self._message_counts.get(key, 0)
+        self._message_counts[key] = count
+
+    def _evict(self, keep: Optional[MemoryKey]) -> List[Tuple[MemoryKey, ReasonerMemory]]:
+        """Remove the least recently used memories which are not pinned until the store is within
+        its limits, and return them to be spilled. Must be called with the lock held."""
+        evicted: List[Tuple[MemoryKey, ReasonerMemory]] = []
+        candidates = [key for key in self._memories if key != keep and key not in self._pins]
+        for key in candidates:
+            over_size = self._max_size and len(self._memories) > self._max_size
+            over_messages = self._max_messages and self._message_count > self._max_messages
+            if not over_size and not over_messages:
+                break
+
+            memory = self._memories.pop(key)
+            self._message_count -= self._message_counts.pop(key, 0)
+            job_keys = self._job_keys.get(key[1], [])
+            if key in job_keys:
+                job_keys.remove(key)
+                if not job_keys:
+                    self._job_keys.pop(key[1], None)
+            state = memory.get_state()
+            if state:
+                self._states[key] = state
+            self._spilling[key] = memory
+            evicted.append((key, memory))
+        return evicted
+
+    def _spill_all(self, memories: List[Tuple[MemoryKey, ReasonerMemory]]) -> None:
+        """Spill the memories to the database, outside of the lock."""
+        for key, memory in memories:
+            try:
+                self._spill(key, memory)
+            finally:
+                with self._lock:
+                    if self._spilling.get(key) is memory:
+                        del self._spilling[key]
+
+    def _spill_released(self, memories: List[Tuple[MemoryKey, ReasonerMemory]]) -> None:
+        try:
+            self._spill_all(memories)
+        finally:
+            # the release thread is reused, do not leak the db session to the next release
+            remove_thread_session()
+
+    def _spill(self, key: MemoryKey, memory: ReasonerMemory) -> None:
+        messages = list(memory.get_messages())
+        message_service: Optional[MessageService] = MessageService.instance
+        if not messages or not message_service:
+            return
+
+        session_id, job_id, operator_id = key
+        try:
+            message_service.save_model_messages(
+                session_id=session_id, job_id=job_id, operator_id=operator_id, messages=messages
+            )
+            with self._lock:
+                self._metrics["spills"] += 1
+        except Exception as e:
+            print(f"[ReasonerMemoryStore] failed to spill the memory of job {job_id}: {e}")
@@ -1,7 +1,28 @@
+from contextvars import ContextVar
+from types import MappingProxyType
 from uuid import uuid4
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional
 import time
 
+# 当前 operator / action（trace_id → id），保存在模块级 ContextVar 中，并发执行的 operator
+# （asyncio task）各自拥有一份；映射只读，修改时复制后重新 set，不影响其他 task 的上下文
+_CURRENT_OPERATOR_IDS: ContextVar[Mapping[str, Optional[str]]] = ContextVar(
+    "current_operator_ids", default=MappingProxyType({})
+)
+_CURRENT_ACTION_IDS: ContextVar[Mapping[str, Optional[str]]] = ContextVar(
+    "current_action_ids", default=MappingProxyType({})
+)
+
+
+def _set_current(var: ContextVar[Mapping[str, Optional[str]]], trace_id: str,
+                 value: Optional[str]) -> None:
+    current = dict(var.get())
+    if value is None:
+        current.pop(trace_id, None)
+    else:
+        current[trace_id] = value
+    var.set(MappingProxyType(current))
+
 
 class ExecutionContext:
     """保存整个 Workflow → Operator → Action 执行链路的上下文"""
@@ -24,16 +45,12 @@ class ExecutionContext:
         self.operator_spans: Dict[str, str] = {}         # op_id → span_id
         self.operator_exec_count: Dict[str, int] = {}    # op_id → 执行次数
 
-        self.current_operator_id: Optional[str] = None
-
         # ───────────────────────────────
         # Action级别
         # ───────────────────────────────
         self.action_spans: Dict[str, str] = {}           # action_id → span_id
         self.action_exec_count: Dict[str, int] = {}      # action_id → 执行次数
 
-        self.current_action_id: Optional[str] = None
-
         # ───────────────────────────────
         # Token / Latency 聚合（Supervisor & 评估需要）
         # ───────────────────────────────
@@ -44,6 +61,24 @@ class ExecutionContext:
         # 额外元数据（其他模块可以塞东西）
         self.metadata: Dict[str, Any] = {}
 
+    @property
+    def current_operator_id(self) -> Optional[str]:
+        """当前上下文（asyncio task）中正在执行的 operator"""
+        return _CURRENT_OPERATOR_IDS.get().get(self.trace_id)
+
+    @current_operator_id.setter
+    def current_operator_id(self, op_id: Optional[str]) -> None:
+        _set_current(_CURRENT_OPERATOR_IDS, self.trace_id, op_id)
+
+    @property
+    def current_action_id(self) -> Optional[str]:
+        """当前上下文（asyncio task）中正在执行的 action"""
+        return _CURRENT_ACTION_IDS.get().get(self.trace_id)
+
+    @current_action_id.setter
+    def current_action_id(self, action_id: Optional[str]) -> None:
+        _set_current(_CURRENT_ACTION_IDS, self.trace_id, action_id)
+
     # ─────────────────────────────────────────────────
     # Helper：生成 OperatorSpan
     # ─────────────────────────────────────────────────
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Mapping, Tuple
+
+from app.core.model.job import Job, SubJob
+from app.core.model.job_graph import JobGraph
+from app.core.model.job_result import JobResult
+from app.core.model.message import AgentMessage, GraphMessage
+
+
+@dataclass(frozen=True)
+class JobGraphSnapshot:
+    """Point-in-time view of a job graph, loaded from the database in a constant number of queries.
+
+    Attributes:
+        original_job (Job): The original job.
+        original_job_result (JobResult): The result of the original job.
+        job_graph (JobGraph): The job graph, a private copy owned by the snapshot.
+        subjobs (Mapping[str, SubJob]): All the subjobs by id, including the legacy ones.
+        subjob_results (Mapping[str, JobResult]): The subjob results by subjob id.
+        agent_messages (Mapping[str, Tuple[AgentMessage, ...]]): The agent messages by subjob id.
+        graph_messages (Mapping[str, GraphMessage]): The graph messages (artifacts of the agent
+            messages) by message id.
+    """
+
+    original_job: Job
+    original_job_result: JobResult
+    job_graph: JobGraph
+    subjobs: Mapping[str, SubJob]
+    subjob_results: Mapping[str, JobResult]
+    agent_messages: Mapping[str, Tuple[AgentMessage, ...]]
+    graph_messages: Mapping[str, GraphMessage]
+
+    def __post_init__(self):
+        # freeze the mappings, so that the snapshot can be shared safely
+        for name in ("subjobs", "subjob_results", "agent_messages", "graph_messages"):
+            object.__setattr__(self, name, MappingProxyType(dict(getattr(self, name))))
+
+    def get_agent_messages(self, subjob_id: str) -> List[AgentMessage]:
+        """Get the agent messages of the subjob."""
+        return list(self.agent_messages.get(subjob_id, ()))
+
+    def get_active_subjobs(self) -> List[SubJob]:
+        """Get the subjobs which are not legacy."""
+        return [subjob for subjob in self.subjobs.values() if not subjob.is_legacy]
@@ -251,4 +251,15 @@ OPERATOR_ACTION_INPUT_PROMPT_TEMPLATE = """
 
 OPERATOR_CONCLUDE_PROMPT_TEMPLATE = """
 
-"""
\ No newline at end of file
+"""
+REASONER_MEMORY_SUMMARY_PROMPT_TEMPLATE = """
+You are compressing the earlier part of a reasoning conversation so that it can be continued within a limited context window.
+
+Summary of the even earlier part (may be empty):
+{summary}
+
+Messages to fold into the summary:
+{messages}
+
+Write an updated summary that merges both. Keep the facts, decisions, function calls and their key results, errors and open questions that later steps may rely on. Omit greetings and repeated reasoning. Answer with the summary only, in at most {max_words} words.
+"""
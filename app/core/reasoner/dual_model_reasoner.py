@@ -3,7 +3,8 @@ from typing import Any
 
 from app.core.common.system_env import SystemEnv
 from app.core.common.type import MessageSourceType
-from app.core.memory.reasoner_memory import BuiltinReasonerMemory, ReasonerMemory
+from app.core.common.util import estimate_tokens
+from app.core.memory.reasoner_memory import ReasonerMemory
 from app.core.model.message import ModelMessage
 from app.core.model.task import Task
 from app.core.prompt.reasoner import ACTOR_PROMPT_TEMPLATE, THINKER_PROMPT_TEMPLATE
@@ -20,7 +21,7 @@ class DualModelReasoner(Reasoner):
         _thinker_name (str): The name of the thinker.
         _actor_model (ModelService): The actor model service.
         _thinker_model (ModelService): The thinker model service.
-        _memories (Dict[str, ReasonerMemory]): The memories of the reasonings.
+        _memory_store (ReasonerMemoryStore): The memories of the reasonings.
     """
 
     def __init__(
@@ -70,57 +71,62 @@ class DualModelReasoner(Reasoner):
             step=1,
         )
 
-        # init the memory
-        reasoner_memory = self.init_memory(task=task)
-        reasoner_memory.add_message(init_message)
-
-        for _ in range(max_reasoning_rounds):
-            # thinker
-            response = await self._thinker_model.generate(
-                sys_prompt=thinker_sys_prompt,
-                messages=reasoner_memory.get_messages(),
-                tool_call_ctx=task.get_tool_call_ctx(),
-            )
-            response.set_source_type(MessageSourceType.THINKER)
-            reasoner_memory.add_message(response)
-
-            # TODO: use standard logging instead of print
-            if print_messages:
-                print(f"\033[94mThinker:\n{response.get_payload()}\033[0m\n")
-
-            # actor
-            response = await self._actor_model.generate(
-                sys_prompt=actor_sys_prompt,
-                messages=reasoner_memory.get_messages(),
-                tools=task.tools,
-                tool_call_ctx=task.get_tool_call_ctx(),
-            )
-            response.set_source_type(MessageSourceType.ACTOR)
-            reasoner_memory.add_message(response)
-
-            # TODO: use standard logging instead of print
-            if print_messages:
-                print(f"\033[92mActor:\n{response.get_payload()}\033[0m\n")
-                func_call_results = response.get_function_calls()
-                if func_call_results:
-                    print(
-                        "\033[92m<function_call_result>\n"
-                        + "\n".join(
-                            [
-                                f"{i + 1}. {result.status.value} called function "
-                                f"{result.func_name}:\n"
-                                f"Call objective: {result.call_objective}\n"
-                                f"Function Output: {result.output}"
-                                for i, result in enumerate(func_call_results)
-                            ]
+        with self._pin_memory(task=task):
+            # init the memory
+            reasoner_memory = self.init_memory(task=task)
+            reasoner_memory.add_message(init_message)
+
+            for _ in range(max_reasoning_rounds):
+                # thinker
+                response = await self._thinker_model.generate(
+                    sys_prompt=thinker_sys_prompt,
+                    messages=await reasoner_memory.get_prompt_messages(
+                        reserved_tokens=estimate_tokens(thinker_sys_prompt)
+                    ),
+                    tool_call_ctx=task.get_tool_call_ctx(),
+                )
+                response.set_source_type(MessageSourceType.THINKER)
+                reasoner_memory.add_message(response)
+
+                # TODO: use standard logging instead of print
+                if print_messages:
+                    print(f"\033[94mThinker:\n{response.get_payload()}\033[0m\n")
+
+                # actor
+                response = await self._actor_model.generate(
+                    sys_prompt=actor_sys_prompt,
+                    messages=await reasoner_memory.get_prompt_messages(
+                        reserved_tokens=estimate_tokens(actor_sys_prompt)
+                    ),
+                    tools=task.tools,
+                    tool_call_ctx=task.get_tool_call_ctx(),
+                )
+                response.set_source_type(MessageSourceType.ACTOR)
+                reasoner_memory.add_message(response)
+
+                # TODO: use standard logging instead of print
+                if print_messages:
+                    print(f"\033[92mActor:\n{response.get_payload()}\033[0m\n")
+                    func_call_results = response.get_function_calls()
+                    if func_call_results:
+                        print(
+                            "\033[92m<function_call_result>\n"
+                            + "\n".join(
+                                [
+                                    f"{i + 1}. {result.status.value} called function "
+                                    f"{result.func_name}:\n"
+                                    f"Call objective: {result.call_objective}\n"
+                                    f"Function Output: {result.output}"
+                                    for i, result in enumerate(func_call_results)
+                                ]
+                            )
+                            + "\n</function_call_result>\033[0m\n"
                         )
-                        + "\n</function_call_result>\033[0m\n"
-                    )
 
-            if self.stopped(response):
-                break
+                if self.stopped(response):
+                    break
 
-        return await self.conclude(reasoner_memory=reasoner_memory)
+            return await self.conclude(reasoner_memory=reasoner_memory)
 
     async def update_knowledge(self, data: Any) -> None:
         """Update the knowledge."""
@@ -217,33 +223,31 @@ class DualModelReasoner(Reasoner):
     def init_memory(self, task: Task) -> ReasonerMemory:
         """Initialize the memory."""
         if not task.operator_config:
-            return BuiltinReasonerMemory()
-
-        session_id = task.job.session_id
-        job_id = task.job.id
-        operator_id = task.operator_config.id
+            return self._new_memory(summary_model=self._thinker_model)
 
-        if session_id not in self._memories:
-            self._memories[session_id] = {}
-        if job_id not in self._memories[session_id]:
-            self._memories[session_id][job_id] = {}
-        reasoner_memory = BuiltinReasonerMemory()
-        self._memories[session_id][job_id][operator_id] = reasoner_memory
+        reasoner_memory = self._new_memory(summary_model=self._thinker_model)
+        self._memory_store.put(
+            session_id=task.job.session_id,
+            job_id=task.job.id,
+            operator_id=task.operator_config.id,
+            memory=reasoner_memory,
+        )
 
         return reasoner_memory
 
     def get_memory(self, task: Task) -> ReasonerMemory:
         """Get the memory."""
-        session_id = task.job.session_id
-        job_id = task.job.id
-
-        try:
-            assert task.operator_config
-            operator_id = task.operator_config.id
-            return self._memories[session_id][job_id][operator_id]
-        except (KeyError, AssertionError, AttributeError):
+        if not task.operator_config:
             return self.init_memory(task=task)
 
+        reasoner_memory = self._memory_store.get(
+            session_id=task.job.session_id,
+            job_id=task.job.id,
+            operator_id=task.operator_config.id,
+            memory_factory=lambda: self._new_memory(summary_model=self._thinker_model),
+        )
+        return reasoner_memory or self.init_memory(task=task)
+
     @staticmethod
     def stopped(message: ModelMessage) -> bool:
         """Stop the reasoner."""
@@ -0,0 +1,226 @@
+import asyncio
+from dataclasses import dataclass, field
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+
+T = TypeVar("T")
+
+
+@dataclass
+class _ModelLimit:
+    """The token bucket and the adaptive concurrency limit of a model."""
+
+    tokens: float
+    concurrency_limit: float
+    in_flight: int = 0
+    updated_at: float = field(default_factory=time.monotonic)
+    blocked_until: float = 0.0  # set by the retry-after of a rate limited response
+    # (event loop, future) of the requests waiting for a concurrency slot
+    waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = field(
+        default_factory=list
+    )
+    metrics: Dict[str, float] = field(
+        default_factory=lambda: {
+            "requests": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "queue_wait_total": 0.0,
+            "queue_wait_max": 0.0,
+        }
+    )
+
+
+class ModelRateLimiter(metaclass=Singleton):
+    """Per-model rate limiter shared by all the model services.
+
+    Every model (keyed by the model name) has:
+        - a token bucket of `MODEL_RATE_LIMIT_RPS` requests per second with a burst of
+            `MODEL_RATE_LIMIT_BURST` (disabled if the rate is 0);
+        - an adaptive concurrency limit (AIMD), starting at `MODEL_CONCURRENCY_INITIAL`: it grows
+            by one per limit-many successful requests up to `MODEL_CONCURRENCY_MAX`, and is halved
+            when the provider answers 429 or the latency exceeds `MODEL_LATENCY_TARGET`.
+
+    A rate limited request is retried up to `MODEL_RATE_LIMIT_MAX_RETRIES` times, after the
+    retry-after of the response if given, otherwise after an exponential backoff with jitter.
+    While a retry-after is pending, no request of the model is sent.
+
+    The models are called from the event loops of different threads, so the state is guarded by
+    a thread lock, and a request waiting for a concurrency slot awaits a future of its own event
+    loop, which is resolved thread-safely when a slot of the model is released.
+    """
+
+    def __init__(self):
+        self._limits: Dict[str, _ModelLimit] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether the rate limiter is enabled."""
+        return (SystemEnv.MODEL_CONCURRENCY_MAX or 0) > 0
+
+    async def run(self, key: str, request: Callable[[], Awaitable[T]]) -> T:
+        """Send the request of the model under its rate and concurrency limits.
+
+        Args:
+            key (str): The model name.
+            request (Callable[[], Awaitable[T]]): Sends the request, may be called again to retry.
+
+        Returns:
+            T: The result of the request.
+        """
+        max_retries: int = SystemEnv.MODEL_RATE_LIMIT_MAX_RETRIES or 0
+        attempt = 0
+        while True:
+            await self._acquire(key)
+            start = time.monotonic()
+            rate_limited, retry_after = False, None
+            try:
+                return await request()
+            except Exception as e:
+                rate_limited, retry_after = self._rate_limit_info(e)
+                if not rate_limited or attempt >= max_retries:
+                    raise
+            finally:
+                # also released when the request is cancelled
+                self._release(key, latency=time.monotonic() - start, rate_limited=rate_limited)
+
+            backoff = retry_after or self._backoff(attempt)
+            with self._lock:
+                limit = self._limits[key]
+                limit.blocked_until = max(limit.blocked_until, time.monotonic() + backoff)
+                limit.metrics["retries"] += 1
+            attempt += 1
+            print(
+                f"[ModelRateLimiter] {key} is rate limited, retry {attempt}/{max_retries} "
+                f"in {backoff:.1f}s"
+            )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the limits and the queue-wait metrics of the models."""
+        with self._lock:
+            return {
+                key: {
+                    **limit.metrics,
+                    "concurrency_limit": int(limit.concurrency_limit),
+                    "in_flight": limit.in_flight,
+                    "queue_wait_avg": (
+                        limit.metrics["queue_wait_total"] / limit.metrics["requests"]
+                        if limit.metrics["requests"]
+                        else 0.0
+                    ),
+                }
+                for key, limit in self._limits.items()
+            }
+
+    async def _acquire(self, key: str) -> None:
+        """Wait for a token and a concurrency slot of the model."""
+        rate: float = SystemEnv.MODEL_RATE_LIMIT_RPS or 0.0
+        burst: float = max(SystemEnv.MODEL_RATE_LIMIT_BURST or 1, 1)
+        enqueued_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+        while True:
+            waiter: Optional["asyncio.Future[None]"] = None
+            with self._lock:
+                limit = self._get_limit(key, burst)
+                now = time.monotonic()
+                if rate > 0:
+                    limit.tokens = min(burst, limit.tokens + (now - limit.updated_at) * rate)
+                limit.updated_at = now
+
+                wait = max(limit.blocked_until - now, 0.0)
+                if not wait and rate > 0 and limit.tokens < 1:
+                    wait = (1 - limit.tokens) / rate
+                if not wait and limit.in_flight >= int(limit.concurrency_limit):
+                    # woken up by the release of a slot
+                    waiter = loop.create_future()
+                    limit.waiters.append((loop, waiter))
+
+                if not wait and waiter is None:
+                    if rate > 0:
+                        limit.tokens -= 1
+                    limit.in_flight += 1
+                    queue_wait = now - enqueued_at
+                    limit.metrics["requests"] += 1
+                    limit.metrics["queue_wait_total"] += queue_wait
+                    limit.metrics["queue_wait_max"] = max(
+                        limit.metrics["queue_wait_max"], queue_wait
+                    )
+                    return
+
+            if waiter is None:
+                await asyncio.sleep(min(wait, 1.0))
+                continue
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if (loop, waiter) in limit.waiters:
+                        limit.waiters.remove((loop, waiter))
+
+    def _release(self, key: str, latency: float, rate_limited: bool) -> None:
+        """Release the concurrency slot, adapt the concurrency limit (AIMD) and wake up the
+        waiters of the model."""
+        latency_target: float = SystemEnv.MODEL_LATENCY_TARGET or 0.0
+        max_limit: float = max(SystemEnv.MODEL_CONCURRENCY_MAX or 1, 1)
+        with self._lock:
+            limit = self._limits[key]
+            limit.in_flight -= 1
+            if rate_limited or (latency_target > 0 and latency > latency_target):
+                if rate_limited:
+                    limit.metrics["rate_limited"] += 1
+                limit.concurrency_limit = max(limit.concurrency_limit / 2, 1.0)
+            else:
+                limit.concurrency_limit = min(
+                    limit.concurrency_limit + 1 / limit.concurrency_limit, max_limit
+                )
+            # the waiters compete for the free slots again
+            waiters, limit.waiters = limit.waiters, []
+
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake_up, waiter)
+            except RuntimeError:
+                # the event loop of the waiter is closed
+                pass
+
+    def _get_limit(self, key: str, burst: float) -> _ModelLimit:
+        limit = self._limits.get(key)
+        if not limit:
+            initial: int = SystemEnv.MODEL_CONCURRENCY_INITIAL or 1
+            limit = _ModelLimit(
+                tokens=burst,
+                concurrency_limit=float(min(initial, SystemEnv.MODEL_CONCURRENCY_MAX)),
+            )
+            self._limits[key] = limit
+        return limit
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        base: float = SystemEnv.MODEL_RATE_LIMIT_BACKOFF or 1.0
+        return base * (2**attempt) * (1 + random.random() * 0.5)
+
+    @staticmethod
+    def _rate_limit_info(e: Exception) -> Tuple[bool, Optional[float]]:
+        """Get whether the error is a rate limited (429) response, and its retry-after in
+        seconds if given."""
+        response = getattr(e, "response", None)
+        status_code = getattr(e, "status_code", None) or getattr(response, "status_code", None)
+        if status_code != 429:
+            return False, None
+
+        headers = getattr(response, "headers", None) or {}
+        try:
+            retry_after: Optional[float] = float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            retry_after = None
+        return True, retry_after
+
+
+def _wake_up(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
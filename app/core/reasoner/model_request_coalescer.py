@@ -0,0 +1,98 @@
+import asyncio
+from concurrent.futures import Future
+import threading
+from typing import Awaitable, Callable, Dict
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+
+
+class ModelRequestCoalescer(metaclass=Singleton):
+    """Singleflight of the identical model requests in flight.
+
+    The first request of a key is sent, and the identical requests issued while it is in flight
+    await its result (or its error) instead of being sent again. The key is the content hash of
+    the request (see `ModelResponseCache.make_key`), so it complements the response cache for
+    the concurrent bursts which the cache cannot catch yet.
+
+    If the sending request is cancelled, the waiters are not failed: one of them sends the
+    request again, and the others await it. Coalescing is disabled by default, since the
+    identical requests sampled at a positive temperature would get the same answer instead of
+    independent samples.
+
+    The requests come from the event loops of different threads, so the in-flight requests are
+    tracked by thread-safe `concurrent.futures.Future`s, which the waiters wrap in their own loop.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, int] = {"requests": 0, "coalesced": 0}
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether the request coalescing is enabled."""
+        return bool(SystemEnv.MODEL_REQUEST_COALESCING_ENABLED)
+
+    async def run(self, key: str, request: Callable[[], Awaitable[str]]) -> str:
+        """Send the request, or await the identical request in flight.
+
+        Args:
+            key (str): The content hash of the request.
+            request (Callable[[], Awaitable[str]]): Sends the request.
+
+        Returns:
+            str: The response text.
+        """
+        with self._lock:
+            self._metrics["requests"] += 1
+        while True:
+            with self._lock:
+                future = self._in_flight.get(key)
+                leader = future is None
+                if future is None:
+                    future = Future()
+                    self._in_flight[key] = future
+                else:
+                    self._metrics["coalesced"] += 1
+
+            if leader:
+                return await self._lead(key, future, request)
+
+            try:
+                # shielded, so that a cancelled waiter does not cancel the shared request
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderCancelled:
+                # the request was not answered, so one of the waiters sends it again
+                continue
+
+    async def _lead(self, key: str, future: Future, request: Callable[[], Awaitable[str]]) -> str:
+        """Send the request, and share its result with the waiters."""
+        try:
+            text = await request()
+        except asyncio.CancelledError:
+            # only the leader is cancelled, the waiters retry the request
+            self._forget(key, future)
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            self._forget(key, future)
+            future.set_exception(e)
+            raise
+        self._forget(key, future)
+        future.set_result(text)
+        return text
+
+    def _forget(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of the requests, the coalesced ones and the ones in flight."""
+        with self._lock:
+            return {**self._metrics, "in_flight": len(self._in_flight)}
+
+
+class _LeaderCancelled(Exception):
+    """The request awaited by the waiters was cancelled before it was answered."""
@@ -0,0 +1,156 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+from app.core.toolkit.tool import Tool
+
+
+class ModelResponseCache(metaclass=Singleton):
+    """Opt-in cache of the raw model response texts, keyed by a content hash of the request.
+
+    The key covers everything that determines the model output: the model name, the rendered
+    request messages (including the system prompt), the tools and the temperature. Only the raw
+    text is cached, the function calls in it are still executed on every (cached) generation.
+
+    Entries are kept in an in-memory LRU (`MODEL_RESPONSE_CACHE_SIZE` entries) and, if
+    `MODEL_RESPONSE_CACHE_PERSIST` is enabled, in a SQLite file under the system path, so that
+    they survive restarts. Both tiers expire entries after `MODEL_RESPONSE_CACHE_TTL` seconds
+    (0 means never).
+    """
+
+    def __init__(self):
+        self._max_size: int = max(SystemEnv.MODEL_RESPONSE_CACHE_SIZE or 0, 0)
+        self._ttl: float = SystemEnv.MODEL_RESPONSE_CACHE_TTL or 0
+        self._lock = threading.Lock()
+        # key -> (response text, expires at in unix time, or None)
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._metrics: Dict[str, int] = {"hits": 0, "disk_hits": 0, "misses": 0, "puts": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if SystemEnv.MODEL_RESPONSE_CACHE_PERSIST:
+            db_dir = SystemEnv.APP_ROOT + SystemEnv.SYSTEM_PATH
+            os.makedirs(db_dir, exist_ok=True)
+            self._db = sqlite3.connect(
+                f"{db_dir}/model_response_cache.db", check_same_thread=False
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS model_response_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether the model response cache is enabled."""
+        return bool(SystemEnv.MODEL_RESPONSE_CACHE_ENABLED)
+
+    @staticmethod
+    def make_key(
+        model: str,
+        request_messages: List[Dict[str, Any]],
+        tools: Optional[List[Tool]],
+        temperature: Optional[float],
+    ) -> str:
+        """Make the cache key of a model request.
+
+        Args:
+            model (str): The model name.
+            request_messages (List[Dict[str, Any]]): The rendered request messages, including the
+                system prompt.
+            tools (Optional[List[Tool]]): The tools available to the model.
+            temperature (Optional[float]): The sampling temperature.
+
+        Returns:
+            str: The hex digest of the request.
+        """
+        content = json.dumps(
+            {
+                "model": model,
+                "messages": request_messages,
+                "tools": sorted((tool.name, tool.description) for tool in tools or []),
+                "temperature": temperature,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the cached response text of the key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                response, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._metrics["hits"] += 1
+                    return response
+                del self._entries[key]
+
+            if self._db:
+                row = self._db.execute(
+                    "SELECT response, expires_at FROM model_response_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and (row[1] is None or row[1] > now):
+                    self._remember(key, row[0], row[1])
+                    self._metrics["disk_hits"] += 1
+                    return row[0]
+                if row:
+                    self._db.execute("DELETE FROM model_response_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._metrics["misses"] += 1
+            return None
+
+    def put(self, key: str, response: str) -> None:
+        """Cache the response text of the key."""
+        expires_at = time.time() + self._ttl if self._ttl > 0 else None
+        with self._lock:
+            self._remember(key, response, expires_at)
+            self._metrics["puts"] += 1
+            if self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO model_response_cache (key, response, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, response, expires_at),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        """Remove all the cached responses, in both tiers."""
+        with self._lock:
+            self._entries.clear()
+            if self._db:
+                self._db.execute("DELETE FROM model_response_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the hit/miss metrics of the cache."""
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["disk_hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "size": len(self._entries),
+                "hit_rate": (
+                    (self._metrics["hits"] + self._metrics["disk_hits"]) / lookups
+                    if lookups
+                    else 0.0
+                ),
+            }
+
+    def _remember(self, key: str, response: str, expires_at: Optional[float]) -> None:
+        if self._max_size <= 0:
+            return
+        self._entries[key] = (response, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
@@ -1,19 +1,24 @@
 from abc import ABC, abstractmethod
-import inspect
+import asyncio
 import json
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
-from app.core.common.type import FunctionCallStatus
+from app.core.common.async_func import run_in_worker_thread
+from app.core.common.system_env import SystemEnv
+from app.core.common.type import FunctionCallStatus, ToolConcurrency
 from app.core.common.util import parse_jsons
 from app.core.model.llm_model import LLMModel
 from app.core.model.message import ModelMessage
-from app.core.model.task import Task, ToolCallContext
+from app.core.model.task import ToolCallContext
 from app.core.prompt.model_service import FUNC_CALLING_JSON_GUIDE
 from app.core.reasoner.injection_mapping import (
     injection_services_mapping,
     setup_injection_services_mapping,
 )
+from app.core.reasoner.model_rate_limiter import ModelRateLimiter
+from app.core.reasoner.model_request_coalescer import ModelRequestCoalescer
+from app.core.reasoner.model_response_cache import ModelResponseCache
 from app.core.service.model_registry_service import ModelRegistryService
 from app.core.toolkit.tool import FunctionCallResult, Tool
 
@@ -39,6 +44,56 @@ class ModelService(ABC):
     ) -> ModelMessage:
         """Generate a text given a prompt non-streaming"""
 
+    async def _generate_text_with_cache(
+        self,
+        model: str,
+        request_messages: List[Dict[str, Any]],
+        tools: Optional[List[Tool]],
+        temperature: Optional[float],
+        generate_text: Callable[[], Awaitable[str]],
+    ) -> Tuple[str, bool]:
+        """Get the raw model response text from the response cache if it is enabled, otherwise
+        (or on a cache miss) generate it under the per-model rate limits and cache it. Identical
+        requests in flight at the same time are coalesced into one.
+
+        Args:
+            model (str): The model name.
+            request_messages (List[Dict[str, Any]]): The rendered request messages.
+            tools (Optional[List[Tool]]): The tools available to the model.
+            temperature (Optional[float]): The sampling temperature.
+            generate_text (Callable[[], Awaitable[str]]): Sends the request to the model.
+
+        Returns:
+            Tuple[str, bool]: The response text, and whether it came from the cache.
+        """
+        key = ModelResponseCache.make_key(
+            model=model, request_messages=request_messages, tools=tools, temperature=temperature
+        )
+
+        async def send_request() -> str:
+            # every model service sends its requests under the per-model rate limits
+            if ModelRateLimiter.enabled():
+                return await ModelRateLimiter().run(key=model, request=generate_text)
+            return await generate_text()
+
+        async def send_or_join_request() -> str:
+            # identical requests in flight are sent once
+            if ModelRequestCoalescer.enabled():
+                return await ModelRequestCoalescer().run(key=key, request=send_request)
+            return await send_request()
+
+        if not ModelResponseCache.enabled():
+            return await send_or_join_request(), False
+
+        cache = ModelResponseCache()
+        cached_text = cache.get(key)
+        if cached_text is not None:
+            return cached_text, True
+
+        text = await send_or_join_request()
+        cache.put(key, text)
+        return text, False
+
     async def call_function(
         self,
         tools: List[Tool],
@@ -60,115 +115,159 @@ class ModelService(ABC):
             # do not call any functions
             return None
 
-        func_call_results: List[FunctionCallResult] = []
-        for func_tuple, err in func_calls:
-            if err:
-                # handle parsing error
-                func_call_results.append(FunctionCallResult.error(err))
-                continue
-
-            assert isinstance(func_tuple, tuple)
-            func_name, call_objective, func_args = func_tuple
-            func = self._find_function(func_name, tools)
-            if not func:
-                if len(tools) == 0:
-                    available_funcs_desc = "No function calling available now."
-                else:
-                    available_funcs_desc = (
-                        "The available functions/tools that can be called by <function_call>: ["
-                        f"{', '.join([tool.function.__name__ for tool in tools])}]"
-                    )
+        if not SystemEnv.FUNCTION_CALL_CONCURRENCY_ENABLED:
+            func_call_results: List[FunctionCallResult] = []
+            for func_call in func_calls:
                 func_call_results.append(
-                    FunctionCallResult(
-                        func_name=func_name,
-                        call_objective=call_objective,
-                        func_args=func_args,
-                        status=FunctionCallStatus.FAILED,
-                        output=f"Error: Function {func_name} does not exist in the current scope. "
-                        "You have called a function that does not exist in the system, "
-                        f"and have made a mistake of function calling. {available_funcs_desc}",
-                    )
+                    await self._call_single_function(tools, func_call, tool_call_ctx)
                 )
+            return func_call_results
+
+        # split the calls into stages: consecutive parallel-safe calls run concurrently in one
+        # stage, while a serial call (or an unknown/malformed one) runs alone in its own stage,
+        # so that the side effects still happen in the order the model emitted them
+        stages: List[List[int]] = []
+        parallel_stage: List[int] = []
+        for index, (func_tuple, _) in enumerate(func_calls):
+            tool = self._find_tool(func_tuple[0], tools) if func_tuple else None
+            if tool and tool.concurrency == ToolConcurrency.PARALLEL:
+                parallel_stage.append(index)
                 continue
+            if parallel_stage:
+                stages.append(parallel_stage)
+                parallel_stage = []
+            stages.append([index])
+        if parallel_stage:
+            stages.append(parallel_stage)
+
+        # per-tool semaphores, limiting the concurrent calls of a tool in this round
+        semaphores: Dict[str, asyncio.Semaphore] = {
+            tool.name: asyncio.Semaphore(tool.max_concurrency)
+            for tool in tools
+            if tool.max_concurrency > 0
+        }
+
+        async def call(index: int, in_thread: bool) -> FunctionCallResult:
+            func_tuple = func_calls[index][0]
+            semaphore = semaphores.get(func_tuple[0]) if func_tuple else None
+            if not semaphore:
+                return await self._call_single_function(
+                    tools, func_calls[index], tool_call_ctx, in_thread
+                )
+            async with semaphore:
+                return await self._call_single_function(
+                    tools, func_calls[index], tool_call_ctx, in_thread
+                )
 
-            try:
-                # prepare function arguments:
-                # handle the service injection based on sig parameter types.
-                # this will auto-inject services from the mapping when a function requires them
-                # TODO: handle the case when the function has no type hints
-                # TODO: handle the case when the function has default value
-                sig = inspect.signature(func)
-                for param_name, param in sig.parameters.items():
-                    injection_type_found: bool = False
-                    param_type: Any = param.annotation
-
-                    # inject task parameter if parameter type is Task
-                    if param_type is ToolCallContext:
-                        if tool_call_ctx is None:
-                            raise ValueError(
-                                f"Function {func_name} requires FunctionCallContext, "
-                                "but no FunctionCallContext is provided."
-                            )
-                        func_args[param_name] = tool_call_ctx
-                        injection_type_found = True
-                        continue
-
-                    # handle the union types
-                    if param_type is Union:
-                        available_types = getattr(param_type, "__args__", [])
-                        for available_type in available_types:
-                            # skip None type
-                            if available_type is type(None):
-                                continue
-
-                            # inject task if Task type is found in union
-                            if available_type is Task:
-                                if tool_call_ctx is None:
-                                    raise ValueError(
-                                        f"Function {func_name} requires FunctionCallContext, "
-                                        "but no FunctionCallContext is provided."
-                                    )
-                                func_args[param_name] = tool_call_ctx
-                                injection_type_found = True
-                                break
-
-                            if available_type in injection_services_mapping:
-                                func_args[param_name] = injection_services_mapping[available_type]
-                                injection_type_found = True
-                                break
-
-                    # try to inject service based on parameter type
-                    if not injection_type_found:
-                        if param_type in injection_services_mapping:
-                            func_args[param_name] = injection_services_mapping[param_type]
-
-                # execute function call
-                if inspect.iscoroutinefunction(func):
-                    result = await func(**func_args)
-                else:
-                    result = func(**func_args)
+        results: Dict[int, FunctionCallResult] = {}
+        for stage in stages:
+            stage_results = await asyncio.gather(
+                *[call(index, in_thread=len(stage) > 1) for index in stage]
+            )
+            results.update(zip(stage, stage_results))
 
-                func_call_results.append(
-                    FunctionCallResult(
-                        func_name=func_name,
-                        call_objective=call_objective,
-                        func_args=func_args,
-                        status=FunctionCallStatus.SUCCEEDED,
-                        output=str(result),
-                    )
-                )
-            except Exception as e:
-                func_call_results.append(
-                    FunctionCallResult(
-                        func_name=func_name,
-                        call_objective=call_objective,
-                        func_args=func_args,
-                        status=FunctionCallStatus.FAILED,
-                        output=f"Function {func_name} execution failed: {str(e)}",
-                    )
+        # keep the results in the order of the function calls
+        return [results[index] for index in range(len(func_calls))]
+
+    async def _call_single_function(
+        self,
+        tools: List[Tool],
+        func_call: Tuple[Optional[Tuple[str, str, Dict[str, Any]]], Optional[str]],
+        tool_call_ctx: Optional[ToolCallContext] = None,
+        in_thread: bool = False,
+    ) -> FunctionCallResult:
+        """Call a parsed function call.
+
+        Args:
+            tools (List[Tool]): The tools to call.
+            func_call: The parsed function call, or the parsing error.
+            tool_call_ctx (Optional[ToolCallContext]): The context to inject into the function.
+            in_thread (bool): Whether to run a sync function in a worker thread, so that it does
+                not block the other concurrent calls. A parallel sync function with a timeout
+                always runs in a worker thread.
+
+        The timeout of a sync function is soft: a worker thread can not be interrupted, so the
+        timed out call keeps running in the background. Thus the timeout only applies to the
+        coroutine functions and the parallel (read-only) sync functions, while a serial sync
+        function, which may have side effects, always runs to completion, so that it does not
+        overlap with the next calls.
+
+        Returns:
+            FunctionCallResult: The result of the function call.
+        """
+        func_tuple, err = func_call
+        if err:
+            # handle parsing error
+            return FunctionCallResult.error(err)
+
+        assert isinstance(func_tuple, tuple)
+        func_name, call_objective, func_args = func_tuple
+        tool = self._find_tool(func_name, tools)
+        if not tool:
+            if len(tools) == 0:
+                available_funcs_desc = "No function calling available now."
+            else:
+                available_funcs_desc = (
+                    "The available functions/tools that can be called by <function_call>: ["
+                    f"{', '.join([t.function.__name__ for t in tools])}]"
                 )
+            return FunctionCallResult(
+                func_name=func_name,
+                call_objective=call_objective,
+                func_args=func_args,
+                status=FunctionCallStatus.FAILED,
+                output=f"Error: Function {func_name} does not exist in the current scope. "
+                "You have called a function that does not exist in the system, "
+                f"and have made a mistake of function calling. {available_funcs_desc}",
+            )
 
-        return func_call_results
+        try:
+            # bind the function arguments by the call plan precompiled with the tool,
+            # which injects the tool call context and the services based on the param types
+            func = tool.function
+            call_plan = tool.call_plan
+            kwargs = call_plan.bind_tool_args(
+                func_args=func_args,
+                tool_call_ctx=tool_call_ctx,
+                services=injection_services_mapping,
+            )
+
+            # execute function call
+            timeout = tool.timeout or SystemEnv.FUNCTION_CALL_TIMEOUT
+            if not call_plan.is_coroutine and tool.concurrency != ToolConcurrency.PARALLEL:
+                timeout = None
+            if call_plan.is_coroutine:
+                result = await asyncio.wait_for(func(**kwargs), timeout=timeout or None)
+            elif in_thread or timeout:
+                result = await asyncio.wait_for(
+                    run_in_worker_thread(func, **kwargs), timeout=timeout or None
+                )
+            else:
+                result = func(**kwargs)
+
+            return FunctionCallResult(
+                func_name=func_name,
+                call_objective=call_objective,
+                func_args=func_args,
+                status=FunctionCallStatus.SUCCEEDED,
+                output=str(result),
+            )
+        except asyncio.TimeoutError:
+            return FunctionCallResult(
+                func_name=func_name,
+                call_objective=call_objective,
+                func_args=func_args,
+                status=FunctionCallStatus.FAILED,
+                output=f"Function {func_name} execution failed: timed out after {timeout}s",
+            )
+        except Exception as e:
+            return FunctionCallResult(
+                func_name=func_name,
+                call_objective=call_objective,
+                func_args=func_args,
+                status=FunctionCallStatus.FAILED,
+                output=f"Function {func_name} execution failed: {str(e)}",
+            )
 
     def _parse_function_calls(
         self, text: str
@@ -252,11 +351,11 @@ class ModelService(ABC):
 
         return func_calls
 
-    def _find_function(self, func_name: str, tools: List[Tool]) -> Optional[Callable[..., Any]]:
-        """Find matching function from the provided list."""
+    def _find_tool(self, func_name: str, tools: List[Tool]) -> Optional[Tool]:
+        """Find matching tool from the provided list."""
         for tool in tools:
             if tool.name == func_name:
-                return tool.function
+                return tool
         return None
 
     def get_model(self, model_name: str) -> LLMModel :
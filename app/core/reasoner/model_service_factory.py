@@ -12,7 +12,7 @@ class ModelServiceFactory:
     def create(cls, model_platform_type: ModelPlatformType, **kwargs) -> ModelService:
         """Create a model service."""
         if model_platform_type == ModelPlatformType.LITELLM:
-            return LiteLlmClient()
+            return LiteLlmClient(stream_callback=kwargs.get("stream_callback"))
         if model_platform_type == ModelPlatformType.AISUITE:
             return AiSuiteLlmClient()
         # TODO: add more platforms, so the **kwargs can be used to pass the necessary parameters
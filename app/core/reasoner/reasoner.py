@@ -1,18 +1,29 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from contextlib import contextmanager
+from typing import Any, Iterator, List
 
-from app.core.memory.reasoner_memory import ReasonerMemory
+from app.core.common.system_env import SystemEnv
+from app.core.common.type import MessageSourceType
+from app.core.memory.reasoner_memory import (
+    BuiltinReasonerMemory,
+    ReasonerMemory,
+    SlidingWindowReasonerMemory,
+    render_messages_for_summary,
+)
+from app.core.memory.reasoner_memory_store import ReasonerMemoryStore
+from app.core.model.message import ModelMessage
 from app.core.model.task import Task
 from app.core.prompt.model_service import TASK_DESCRIPTOR_PROMPT_TEMPLATE
+from app.core.prompt.reasoner import REASONER_MEMORY_SUMMARY_PROMPT_TEMPLATE
+from app.core.reasoner.model_service import ModelService
 
 
 class Reasoner(ABC):
     """Base Reasoner, an env element of the multi-agent system."""
 
     def __init__(self):
-        self._memories: Dict[
-            str, Dict[str, Dict[str, ReasonerMemory]]
-        ] = {}  # session_id -> job_id -> operator_id -> memory
+        # (session_id, job_id, operator_id) -> memory, released when the job is terminated
+        self._memory_store: ReasonerMemoryStore = ReasonerMemoryStore()
 
     @abstractmethod
     async def infer(self, task: Task) -> str:
@@ -38,6 +49,54 @@ class Reasoner(ABC):
     def get_memory(self, task: Task) -> ReasonerMemory:
         """Get the memory."""
 
+    @contextmanager
+    def _pin_memory(self, task: Task) -> Iterator[None]:
+        """Keep the memory of the task in the memory store while the reasoning runs."""
+        if not task.operator_config:
+            yield
+            return
+        with self._memory_store.pin(
+            session_id=task.job.session_id,
+            job_id=task.job.id,
+            operator_id=task.operator_config.id,
+        ):
+            yield
+
+    def _new_memory(self, summary_model: ModelService) -> ReasonerMemory:
+        """Create the memory of a reasoning.
+
+        If `REASONER_MEMORY_TOKEN_BUDGET` is set, the memory keeps the prompt within the budget
+        by folding the older messages into a rolling summary generated by the summary model.
+        """
+        token_budget: int = SystemEnv.REASONER_MEMORY_TOKEN_BUDGET
+        if not token_budget or token_budget <= 0:
+            return BuiltinReasonerMemory()
+
+        async def summarize(summary: str, messages: List[ModelMessage]) -> str:
+            prompt = REASONER_MEMORY_SUMMARY_PROMPT_TEMPLATE.format(
+                summary=summary or "None",
+                messages=render_messages_for_summary(messages),
+                max_words=max(token_budget // 8, 100),
+            )
+            response = await summary_model.generate(
+                sys_prompt=prompt,
+                messages=[
+                    ModelMessage(
+                        payload="Summarize the messages.",
+                        job_id=messages[-1].get_job_id(),
+                        step=messages[-1].get_step(),
+                        source_type=MessageSourceType.MODEL,
+                    )
+                ],
+            )
+            return response.get_payload().strip()
+
+        return SlidingWindowReasonerMemory(
+            token_budget=token_budget,
+            keep_messages=SystemEnv.REASONER_MEMORY_KEEP_MESSAGES,
+            summarizer=summarize,
+        )
+
     def _build_task_context(self, task: Task) -> str:
         """Build the task context string for system prompts."""
         if task.insights:
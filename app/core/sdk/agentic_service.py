@@ -9,7 +9,7 @@ from app.core.agent.leader import Leader
 from app.core.common.singleton import Singleton
 from app.core.common.type import ReasonerType, WorkflowPlatformType
 from app.core.dal.dao.dao_factory import DaoFactory
-from app.core.dal.database import DbSession
+from app.core.dal.database import ScopedDbSession
 from app.core.model.agentic_config import AgenticConfig, ExpertConfig, LocalToolConfig
 from app.core.model.graph_db_config import GraphDbConfig
 from app.core.model.job import Job
@@ -47,8 +47,8 @@ class AgenticService(metaclass=Singleton):
     def __init__(self, service_name: Optional[str] = None):
         self._service_name = service_name or "Chat2Graph"
 
-        # initialize the dao
-        DaoFactory.initialize(DbSession())
+        # initialize the dao, every thread reads by its own session
+        DaoFactory.initialize(ScopedDbSession)
 
         # initialize the services
         ServiceFactory.initialize()
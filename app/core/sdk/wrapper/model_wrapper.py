@@ -1,13 +1,27 @@
 import json
+import time
 import httpx
 from typing import List, Dict
+from app.core.common.http_client_pool import HttpClientPool
 from app.core.common.system_env import SystemEnv
+from app.core.common.type import ModelRequestLogLevel
 from app.core.model.llm_model import LLMModel
 
 
 class ModelWrapper:
     def __init__(self, model: LLMModel):
         self._model = model
+        self._log_level = self._parse_log_level()
+
+    @staticmethod
+    def _parse_log_level() -> ModelRequestLogLevel:
+        """解析 MODEL_REQUEST_LOG_LEVEL，非法值回退为 INFO。"""
+        value = str(SystemEnv.MODEL_REQUEST_LOG_LEVEL).upper()
+        try:
+            return ModelRequestLogLevel(value)
+        except ValueError:
+            print(f"[ModelWrapper] 未知的 MODEL_REQUEST_LOG_LEVEL: {value}，使用 INFO")
+            return ModelRequestLogLevel.INFO
 
     async def generate(self, messages: List[Dict[str, str]]) -> str:
         """
@@ -40,29 +54,36 @@ class ModelWrapper:
             "top_p": top_p,
         }
 
-        print(f"[ModelWrapper] 🚀 调用模型API: {endpoint}")
-        print(f"[ModelWrapper] 请求体: {json.dumps(payload, ensure_ascii=False, indent=2)}")
+        log_level = self._log_level
+        if log_level != ModelRequestLogLevel.NONE:
+            print(f"[ModelWrapper] 🚀 调用模型API: {endpoint}")
+        if log_level == ModelRequestLogLevel.DEBUG:
+            print(f"[ModelWrapper] 请求体: {json.dumps(payload, ensure_ascii=False, indent=2)}")
 
         try:
-            async with httpx.AsyncClient(timeout=SystemEnv.REQUEST_TIMEOUT) as client:
-                response = await client.post(endpoint, headers=headers, json=payload)
-                response.raise_for_status()
-                data = response.json()
+            # 复用按 endpoint 池化的 keep-alive client，避免每次请求重新握手
+            client = HttpClientPool().get_client(endpoint)
+            start = time.perf_counter()
+            response = await client.post(endpoint, headers=headers, json=payload)
+            response.raise_for_status()
+            data = response.json()
 
-                # 不同API返回结构不同，这里取最常见的：
-                # OpenAI格式: {'choices': [{'message': {'content': 'xxx'}}]}
+            # 不同API返回结构不同，这里取最常见的：
+            # OpenAI格式: {'choices': [{'message': {'content': 'xxx'}}]}
 
 
-                # 返回格式需要进行对接更新：
-                if "choices" in data:
-                    result = data["choices"][0]["message"]["content"]
-                elif "output" in data:
-                    result = data["output"]
-                else:
-                    result = json.dumps(data, ensure_ascii=False)
+            # 返回格式需要进行对接更新：
+            if "choices" in data:
+                result = data["choices"][0]["message"]["content"]
+            elif "output" in data:
+                result = data["output"]
+            else:
+                result = json.dumps(data, ensure_ascii=False)
 
-                print(f"[ModelWrapper] ✅ 模型输出: {result[:150]}...")
-                return result
+            if log_level != ModelRequestLogLevel.NONE:
+                latency_ms = (time.perf_counter() - start) * 1000
+                print(f"[ModelWrapper] ✅ 模型输出 ({latency_ms:.0f}ms): {result[:150]}...")
+            return result
 
         except httpx.HTTPStatusError as e:
             print(f"[ModelWrapper] ❌ HTTP错误: {e.response.status_code} - {e.response.text}")
@@ -1,10 +1,13 @@
 import asyncio
+import copy
 import time
 import json
 from functools import lru_cache
 from typing import Any, Dict, List, Callable
 from dataclasses import asdict
 
+import networkx as nx  # type: ignore
+
 from app.core.central_orchestrator.version_management_center.execution_context_provider import execution_context_service
 from app.core.central_orchestrator.version_management_center.record import ActionExecutionRecord
 from app.core.central_orchestrator.version_management_center.vmc_provider import vmc
@@ -182,13 +185,14 @@ class ActionRegistry:
 
 
 class ActionPipeline:
-    """按 order 顺序执行 + 层内并行的 Action 执行引擎（以 name 作为主键）"""
+    """按依赖关系调度的 Action 执行引擎（以 name 作为主键）：
+    每个 Action 在其 prev 依赖全部完成后立即执行，不再按 order 分层等待。"""
 
     def __init__(self, actions_dag: Dict[str, Dict[str, Any]], summarized_input_message: WorkflowMessage,job_id: str,operator_id:str, job: Job):
         """
         Args:
-            actions_dag: build_dag() 的输出，键可为任意（但内部字段使用 name / order / depends_on）
-            action_service: ActionService 实例，用于创建 Action 实例
+            actions_dag: build_dag() 的输出，键为 action id（prev/next 中引用的也是 id）
+            summarized_input_message: 摘要后的输入消息，每个 Action 在其副本上填入前驱的输出
         """
         # 转换成以 name 为主键的结构
         self.job_id = job_id
@@ -198,53 +202,111 @@ class ActionPipeline:
         self.action_service:ActionService = ActionService.instance
         self.results: Dict[str, Any] = {}
         self.tasks: Dict[str, str] = self._get_task()
-        self.ordered_layers = self._group_by_order()
+        self.dependencies: Dict[str, List[str]] = self._resolve_dependencies(actions_dag)
+        self._validate_dag()
         self.input_messages: WorkflowMessage = summarized_input_message
         self.operator_id = operator_id
         self.job:Job = job
-        self.action_service:ActionService = ActionService.instance
 
-    def _group_by_order(self) -> Dict[int, List[str]]:
-        """按 order 分层（返回每层的 Action 名称列表）"""
-        layers: Dict[int, List[str]] = {}
+    def _resolve_dependencies(self, actions_dag: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+        """将 prev 中的 action id（或 name）解析为 action name"""
+        id_to_name: Dict[str, str] = {
+            str(act_id): node["name"] for act_id, node in actions_dag.items()
+        }
+        dependencies: Dict[str, List[str]] = {}
         for name, node in self.actions_dag.items():
-            order = node.get("order", 0)
-            layers.setdefault(order, []).append(name)
-        return dict(sorted(layers.items()))
+            deps: List[str] = []
+            for dep in node.get("prev", []):
+                dep_name = id_to_name.get(str(dep)) or (dep if dep in self.actions_dag else None)
+                if dep_name is None:
+                    print(f"[ActionPipeline] ⚠️ {name} 依赖的 Action {dep} 不存在，已忽略")
+                    continue
+                if dep_name not in deps:
+                    deps.append(dep_name)
+            dependencies[name] = deps
+        return dependencies
+
+    def _validate_dag(self) -> None:
+        """执行前检查 Action 依赖图中是否存在环"""
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.actions_dag.keys())
+        for name, deps in self.dependencies.items():
+            graph.add_edges_from((dep, name) for dep in deps)
+        if not nx.is_directed_acyclic_graph(graph):
+            cycle = " -> ".join(src for src, _ in nx.find_cycle(graph))
+            raise ValueError(f"[ActionPipeline] Action 依赖图中存在环：{cycle}")
 
     def _get_task(self):
         tasks :Dict[str, str] = {}
         for name, node in self.actions_dag.items():
             tasks[name] = node.get("task", name)
         return tasks
+
     async def run(self, inputs: Dict[str, Any] = None) -> str:
-        """顺序执行 DAG，每一层内并行"""
+        """按依赖执行 DAG：前驱全部完成的 Action 立即并行执行"""
         if inputs is None:
             inputs = {"job_id": self.job_id}
 
-        for order, names in self.ordered_layers.items():
-            print(f"\n🧩 执行第 {order} 层 Actions：{names}")
-            tasks = [ self._run_action(name, inputs) for name in names]
-            results:List[ModelMessage] = await asyncio.gather(*tasks)
-            i = 0
-            self.input_messages.get_payload()["action_input"]["input_data"] =  {}
-            for  result in results:
-                self.results[names[i]] = result
-                self.input_messages.get_payload()["action_input"]["input_data"][names[i]] = result.get_payload()
-                i= i+1
+        successors: Dict[str, List[str]] = {name: [] for name in self.actions_dag}
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                successors[dep].append(name)
+        unfinished_deps: Dict[str, int] = {
+            name: len(deps) for name, deps in self.dependencies.items()
+        }
+        ready: List[str] = [name for name, count in unfinished_deps.items() if count == 0]
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while ready or running:
+                # order 仅作为同时就绪时的启动顺序
+                ready.sort(key=lambda n: self.actions_dag[n].get("order", 0))
+                print(f"\n🧩 执行 Actions：{ready}")
+                for name in ready:
+                    task = asyncio.create_task(self._run_action(name, dict(inputs)))
+                    running[task] = name
+                ready = []
+
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    self.results[name] = task.result()
+                    for succ in successors[name]:
+                        unfinished_deps[succ] -= 1
+                        if unfinished_deps[succ] == 0:
+                            ready.append(succ)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+
         print("\n🎉 Pipeline 执行完成！")
-        answer:str = json.dumps(self.results, indent=2, ensure_ascii=False)
+        answer:str = json.dumps(
+            {name: result.get_payload() for name, result in self.results.items()},
+            indent=2,
+            ensure_ascii=False,
+        )
         return answer
 
+    def _build_action_message(self, name: str) -> WorkflowMessage:
+        """基于摘要消息为 Action 构造独立的输入消息，input_data 中只包含其前驱的输出"""
+        payload = self.input_messages.get_payload()
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        payload = copy.deepcopy(payload)
+        payload.setdefault("action_input", {})["input_data"] = {
+            dep: self.results[dep].get_payload() for dep in self.dependencies[name]
+        }
+        return WorkflowMessage(payload=payload, job_id=self.input_messages.get_job_id())
+
     async def _run_action(self, name: str, inputs: Dict[str, Any]) -> ModelMessage:
         print(f"🚀 [ActionPipeline] 执行 {name}")
         action = self.action_service.create(name)
         inputs["task"] = self.tasks[name]
         inputs["job"] = self.job
-        inputs["message"] = self.input_messages
+        inputs["message"] = self._build_action_message(name)
         inputs["operator_id"] = self.operator_id
         result: ModelMessage = await self.action_service.execute_actions_pipeline(name ,inputs)
         print(f"✅ [{name}] 输出: {result}")
         return result
-
-
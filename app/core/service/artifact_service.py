@@ -202,8 +202,10 @@ class ArtifactService(metaclass=Singleton):
                 }
 
             if isinstance(current_content, dict) and isinstance(new_content, dict):
-                # start with a deep copy of the current graph structure
-                result_graph = deepcopy(current_content)
+                # start with a shallow copy of the current graph structure: the vertex/edge
+                # lists are rebuilt below and their items are replaced rather than modified, so
+                # the (possibly large) current graph does not need to be deep copied
+                result_graph = dict(current_content)
 
                 # ensure base structure exists in the result
                 if "vertices" not in result_graph:
@@ -6,6 +6,7 @@ from app.core.common.type import GraphDbType
 from app.core.dal.dao.graph_db_dao import GraphDbDao
 from app.core.model.graph_db_config import GraphDbConfig, Neo4jDbConfig
 from app.core.toolkit.graph_db.graph_db import GraphDb
+from app.core.toolkit.graph_db.graph_db_driver_registry import GraphDbDriverRegistry
 from app.core.toolkit.graph_db.graph_db_factory import GraphDbFactory
 
 
@@ -59,6 +60,7 @@ class GraphDbService(metaclass=Singleton):
         if not graph_db:
             raise ValueError(f"GraphDB with ID {id} not found")
         self._graph_db_dao.delete(id=id)
+        GraphDbDriverRegistry().invalidate(key=id)
 
     def update_graph_db_config(self, graph_db_config: GraphDbConfig) -> GraphDbConfig:
         """Update a GraphDB by ID.
@@ -103,6 +105,8 @@ class GraphDbService(metaclass=Singleton):
         if fields_to_update:
             assert graph_db_config.id is not None, "ID must be provided for update"
             result = self._graph_db_dao.update(id=graph_db_config.id, **fields_to_update)
+            if fields_to_update.keys() & {"type", "host", "port", "user", "pwd"}:
+                GraphDbDriverRegistry().invalidate(key=graph_db_config.id)
             return GraphDbConfig.from_do(result)
 
         return GraphDbConfig.from_do(graph_db_do)
@@ -140,7 +144,7 @@ class GraphDbService(metaclass=Singleton):
             return False
         finally:
             if "graph_db" in locals():
-                graph_db.conn.close()
+                graph_db.close()
 
     def get_schema_metadata(self, graph_db_config: GraphDbConfig) -> Dict[str, Any]:
         """Get schema metadata for a graph database."""
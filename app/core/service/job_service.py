@@ -1,14 +1,20 @@
+from collections import OrderedDict
 import re
-from typing import List, Optional, Set, Tuple, cast
+import threading
+from typing import Dict, List, Optional, Set, Tuple, cast
 
 import networkx as nx  # type: ignore
 
 from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
 from app.core.common.type import ChatMessageRole, JobStatus
 from app.core.dal.dao.job_dao import JobDao
+from app.core.dal.dao.job_graph_dao import JobEdgeDao, JobVertexDao
 from app.core.dal.do.job_do import JobDo
+from app.core.memory.reasoner_memory_store import ReasonerMemoryStore
 from app.core.model.job import Job, JobType, SubJob
 from app.core.model.job_graph import JobGraph
+from app.core.model.job_graph_snapshot import JobGraphSnapshot
 from app.core.model.job_result import JobResult
 from app.core.model.message import (
     AgentMessage,
@@ -26,8 +32,14 @@ class JobService(metaclass=Singleton):
 
     def __init__(self):
         self._job_dao: JobDao = JobDao.instance
+        self._job_vertex_dao: JobVertexDao = JobVertexDao.instance
+        self._job_edge_dao: JobEdgeDao = JobEdgeDao.instance
         self._message_service: MessageService = MessageService.instance
 
+        # original job id -> job graph, the job graphs of the running original jobs
+        self._job_graphs: "OrderedDict[str, JobGraph]" = OrderedDict()
+        self._job_graph_lock = threading.RLock()
+
     def save_job(self, job: Job) -> Job:
         """Save a new job."""
         self._job_dao.save_job(job=job)
@@ -88,8 +100,68 @@ class JobService(metaclass=Singleton):
         job_do: Optional[JobDo] = self._job_dao.get_by_id(id=job_id)
         if not job_do:
             raise ValueError(f"Job with id {job_id} not found in the job registry.")
+        return self._parse_job_result(job_do)
+
+    def get_job_graph_snapshot(self, original_job_id: str) -> JobGraphSnapshot:
+        """Get a read-only snapshot of the job graph, including the subjobs, their results, the
+        agent messages and the graph messages, in a constant number of queries.
+
+        Args:
+            original_job_id (str): The ID of the original job.
+
+        Returns:
+            JobGraphSnapshot: The snapshot of the job graph.
+        """
+        job_dos: List[JobDo] = self._job_dao.get_job_graph_jobs(original_job_id=original_job_id)
+        original_job_do: Optional[JobDo] = next(
+            (job_do for job_do in job_dos if str(job_do.id) == original_job_id), None
+        )
+        if not original_job_do:
+            raise ValueError(f"Job with ID {original_job_id} not found in the job registry")
+        original_job = self._job_dao.parse_into_job(job_do=original_job_do)
+        if isinstance(original_job, SubJob):
+            raise ValueError(f"Job with id {original_job_id} is a subjob, not an original job.")
+
+        subjobs: Dict[str, SubJob] = {}
+        subjob_results: Dict[str, JobResult] = {}
+        for job_do in job_dos:
+            if job_do is original_job_do:
+                continue
+            subjob = cast(SubJob, self._job_dao.parse_into_job(job_do=job_do))
+            subjobs[subjob.id] = subjob
+            subjob_results[subjob.id] = self._parse_job_result(job_do)
+
+        agent_messages: Dict[str, Tuple[AgentMessage, ...]] = {
+            job_id: tuple(cast(List[AgentMessage], messages))
+            for job_id, messages in self._message_service.get_messages_by_job_ids(
+                job_ids=list(subjobs.keys()), message_type=MessageType.AGENT_MESSAGE
+            ).items()
+        }
+        graph_messages = cast(
+            Dict[str, GraphMessage],
+            self._message_service.get_messages(
+                ids=[
+                    artifact_id
+                    for messages in agent_messages.values()
+                    for message in messages
+                    for artifact_id in message.get_artifact_ids()
+                ]
+            ),
+        )
+
+        return JobGraphSnapshot(
+            original_job=original_job,
+            original_job_result=self._parse_job_result(original_job_do),
+            job_graph=self.get_job_graph(original_job_id),
+            subjobs=subjobs,
+            subjob_results=subjob_results,
+            agent_messages=agent_messages,
+            graph_messages=graph_messages,
+        )
+
+    def _parse_job_result(self, job_do: JobDo) -> JobResult:
         return JobResult(
-            job_id=job_id,
+            job_id=str(job_do.id),
             status=JobStatus[str(job_do.status)],
             duration=float(job_do.duration),
             tokens=int(job_do.tokens),
@@ -98,6 +170,13 @@ class JobService(metaclass=Singleton):
     def save_job_result(self, job_result: JobResult) -> None:
         """Update the job (original job / subjob) result."""
         self._job_dao.save_job_result(job_result=job_result)
+        if job_result.has_result():
+            # the job graph of a finished original job is not changed anymore
+            with self._job_graph_lock:
+                self._job_graphs.pop(job_result.job_id, None)
+            # the reasoning of a terminated job is spilled in the background, and reloaded if the
+            # job is recovered
+            ReasonerMemoryStore().release_job(job_id=job_result.job_id)
 
     def query_original_job_result(self, original_job_id: str) -> JobResult:
         """Query and process the original job result of the multi-agent system.
@@ -132,25 +211,29 @@ class JobService(metaclass=Singleton):
             # return the current job result, it will be processed later
             return original_job_result
 
-        # wait for creating the subjob by leader
-        job_graph = self.get_job_graph(original_job_id)
+        return self._assemble_original_job_result(
+            snapshot=self.get_job_graph_snapshot(original_job_id)
+        )
+
+    def _assemble_original_job_result(self, snapshot: JobGraphSnapshot) -> JobResult:
+        """Combine the results of the subjobs into the original job result, see
+        `query_original_job_result`."""
+        original_job: Job = snapshot.original_job
+        original_job_id: str = original_job.id
+        original_job_result: JobResult = snapshot.original_job_result
+        job_graph: JobGraph = snapshot.job_graph
 
         # collect and combine the content of the job results and the artifacts
         # from the job graph vertices
         multi_agent_payload = ""
         graph_messages: List[GraphMessage] = []
         for vertex in job_graph.vertices():
-            subjob_result: JobResult = self.get_job_result(vertex)
-            if not subjob_result.has_result():
+            subjob_result: Optional[JobResult] = snapshot.subjob_results.get(vertex)
+            if not subjob_result or not subjob_result.has_result():
                 # not all the subjobs have been finished, so return the job result itself
                 return original_job_result
 
-            agent_messages: List[AgentMessage] = cast(
-                List[AgentMessage],
-                self._message_service.get_message_by_job_id(
-                    job_id=subjob_result.job_id, message_type=MessageType.AGENT_MESSAGE
-                ),
-            )
+            agent_messages: List[AgentMessage] = snapshot.get_agent_messages(vertex)
             assert len(agent_messages) == 1, (
                 f"One subjob is assigned to one agent, but {len(agent_messages)} messages found."
             )
@@ -174,7 +257,8 @@ class JobService(metaclass=Singleton):
             graph_message_ids = agent_messages[0].get_artifact_ids()
             graph_messages.extend(
                 [
-                    cast(GraphMessage, self._message_service.get_message(id=id))
+                    snapshot.graph_messages.get(id)
+                    or cast(GraphMessage, self._message_service.get_message(id=id))
                     for id in graph_message_ids
                 ]
             )
@@ -187,7 +271,6 @@ class JobService(metaclass=Singleton):
                 self.save_job_result(job_result=original_job_result)
 
         # save/update the multi-agent result to the database
-        original_job: Job = self.get_original_job(original_job_id)
         try:
             multi_agent_answer_message = self._message_service.get_text_message_by_job_id_and_role(
                 original_job_id, ChatMessageRole.SYSTEM
@@ -227,11 +310,13 @@ class JobService(metaclass=Singleton):
 
     def get_conversation_view(self, original_job_id: str) -> MessageView:
         """Get conversation view (including thinking chain) for a specific job."""
-        # get original job
-        original_job = self.get_original_job(original_job_id=original_job_id)
+        # get the snapshot of the original job and its subjobs
+        snapshot = self.get_job_graph_snapshot(original_job_id=original_job_id)
 
         # get original job result
-        original_job_result = self.query_original_job_result(original_job_id=original_job_id)
+        original_job_result = snapshot.original_job_result
+        if not original_job_result.has_result() and original_job_result.status != JobStatus.CREATED:
+            original_job_result = self._assemble_original_job_result(snapshot=snapshot)
 
         # get the user question message
         question_message = self._message_service.get_hybrid_message_by_job_id_and_role(
@@ -250,34 +335,27 @@ class JobService(metaclass=Singleton):
             Tuple[AgentMessage, SubJob, JobResult]
         ] = []  # to sort by timestamp
 
-        subjob_ids = self.get_subjob_ids(original_job_id=original_job.id)
-        for subjob_id in subjob_ids:
-            # get the information, whose job is not legacy
-            subjob = self.get_subjob(subjob_id=subjob_id)
-            if not subjob.is_legacy: #子任务不被遗留使用 -> 该子任务被分解
-                # get the subjob result
-                subjob_result = self.get_job_result(job_id=subjob_id)
-
-                # get the agent message
-                agent_messages = cast(
-                    List[AgentMessage],
-                    self._message_service.get_message_by_job_id(
-                        job_id=subjob_id, message_type=MessageType.AGENT_MESSAGE
-                    ),
+        # get the information, whose job is not legacy
+        for subjob in snapshot.get_active_subjobs(): #子任务不被遗留使用 -> 该子任务被分解
+            subjob_id = subjob.id
+            # get the subjob result
+            subjob_result = snapshot.subjob_results[subjob_id]
+
+            # get the agent message
+            agent_messages = snapshot.get_agent_messages(subjob_id)
+            if len(agent_messages) == 1:
+                thinking_message = agent_messages[0]
+            elif len(agent_messages) == 0:
+                # handle the unexecuted subjob
+                thinking_message = AgentMessage(
+                    job_id=subjob_id, payload=f"The subjob is {subjob_result.status.value}."
                 )
-                if len(agent_messages) == 1:
-                    thinking_message = agent_messages[0]
-                elif len(agent_messages) == 0:
-                    # handle the unexecuted subjob
-                    thinking_message = AgentMessage(
-                        job_id=subjob_id, payload=f"The subjob is {subjob_result.status.value}."
-                    )
-                else:
-                    raise ValueError(
-                        f"Multiple agent messages found for job ID {subjob_id}: {agent_messages}"
-                    )
-                # store the pair of message and result
-                message_result_pairs.append((thinking_message, subjob, subjob_result))
+            else:
+                raise ValueError(
+                    f"Multiple agent messages found for job ID {subjob_id}: {agent_messages}"
+                )
+            # store the pair of message and result
+            message_result_pairs.append((thinking_message, subjob, subjob_result))
 
         # sort pairs by message timestamp
         message_result_pairs.sort(
@@ -301,27 +379,32 @@ class JobService(metaclass=Singleton):
         )
 
     def get_job_graph(self, original_job_id: str) -> JobGraph:
-        """Get the job graph by the original job id. If the job graph does not exist,
-        create a new one and save it to the database."""
-        job_do = self._job_dao.get_by_id(original_job_id)
-        if not job_do:
-            raise ValueError(f"Job with ID {original_job_id} not found in the job registry")
+        """Get (a copy of) the job graph by the original job id.
 
-        if not job_do.dag:
-            job_graph: JobGraph = JobGraph()
-            self._job_dao.update(id=original_job_id, dag=job_graph.to_json_str())
-        else:
-            job_graph = JobGraph.from_json_str(str(job_do.dag))
-        return job_graph
+        The job graph is loaded from the job vertex/edge tables once and then cached in memory,
+        the mutations of the job service update the cached graph and write only the changed
+        vertices and edges to the database. The job graphs stored as the DAG JSON of the original
+        job by the former versions are migrated to the tables on first load.
+        """
+        with self._job_graph_lock:
+            job_graph = self._load_job_graph(original_job_id)
+            return JobGraph(job_graph.get_graph().copy())
 
     def set_job_graph(self, original_job_id: str, job_graph: JobGraph) -> None:
-        """Set the job graph by the original job id."""
-        # save the jobs to the databases
-        original_job: Job = self.get_original_job(original_job_id)
-        original_job.dag = job_graph.to_json_str()
-        self.save_job(original_job)
-        for subjob_id in job_graph.vertices():
-            self.save_job(job=self.get_subjob(subjob_id))
+        """Set the job graph by the original job id, only the differences are saved."""
+        with self._job_graph_lock:
+            current_job_graph = self._load_job_graph(original_job_id)
+            current_vertices = set(current_job_graph.vertices())
+            vertices = set(job_graph.vertices())
+            current_edges = set(current_job_graph.get_graph().edges())
+            edges = set(job_graph.get_graph().edges())
+            self._apply_job_graph_delta(
+                original_job_id=original_job_id,
+                added_vertices=vertices - current_vertices,
+                removed_vertices=current_vertices - vertices,
+                added_edges=edges - current_edges,
+                removed_edges=current_edges - edges,
+            )
 
     def add_subjob(
         self,
@@ -332,28 +415,19 @@ class JobService(metaclass=Singleton):
         successors: Optional[List[SubJob]] = None,
     ) -> None:
         """Assign a subjob to an expert and return the expert instance."""
-        # add job to the jobs graph
-        job_graph = self.get_job_graph(original_job_id)
-        job_graph.add_vertex(job.id)
-
         job.original_job_id = original_job_id
         job.expert_id = expert_id
 
         # save the job to the database
         self.save_job(job=job)
 
-        if not predecessors:
-            predecessors = []
-        if not successors:
-            successors = []
-        for predecessor in predecessors:
-            job_graph.add_edge(predecessor.id, job.id)
-            self.save_job(predecessor)
-        for successor in successors:
-            self.save_job(successor)
-            job_graph.add_edge(job.id, successor.id)
-
-        self.set_job_graph(original_job_id, job_graph)
+        # add job to the jobs graph
+        self._apply_job_graph_delta(
+            original_job_id=original_job_id,
+            added_vertices={job.id},
+            added_edges={(predecessor.id, job.id) for predecessor in predecessors or []}
+            | {(job.id, successor.id) for successor in successors or []},
+        )
 
     def remove_subjob(self, original_job_id: str, job_id: str) -> None:
         """Remove a subjob from the job registry."""
@@ -364,9 +438,7 @@ class JobService(metaclass=Singleton):
         self.save_job(subjob)
 
         # update the state of the job service
-        job_graph = self.get_job_graph(original_job_id)
-        job_graph.remove_vertex(job_id)
-        self.set_job_graph(original_job_id=original_job_id, job_graph=job_graph)
+        self._apply_job_graph_delta(original_job_id=original_job_id, removed_vertices={job_id})
 
     def replace_subgraph(
         self,
@@ -411,23 +483,27 @@ class JobService(metaclass=Singleton):
             old_subgraph (Optional[JobGraph]): The subgraph to be replaced. Must be a connected
                 component of the current jobs DAG with exactly one entry and one exit vertex.
         """
-        job_graph: JobGraph = self.get_job_graph(original_job_id)
+        new_edges: Set[Tuple[str, str]] = set(new_subgraph.get_graph().edges())
 
         if not old_subgraph:
-            job_graph.update(new_subgraph)
-
-            # save the updated jobs to the database
-            self.set_job_graph(original_job_id, job_graph)
+            self._apply_job_graph_delta(
+                original_job_id=original_job_id,
+                added_vertices=set(new_subgraph.vertices()),
+                added_edges=new_edges,
+            )
             return
 
+        old_subgraph_vertices: Set[str] = set(old_subgraph.vertices())
+
         if new_subgraph.vertices_count() == 0:
             # if the new subgraph is empty, we can simply remove the old subgraph and return.
             # this will effectively remove the subgraph from the job graph.
-            job_graph.remove_vertices(set(old_subgraph.vertices()))
-            self.set_job_graph(original_job_id, job_graph)
+            self._apply_job_graph_delta(
+                original_job_id=original_job_id, removed_vertices=old_subgraph_vertices
+            )
             return
 
-        old_subgraph_vertices: Set[str] = set(old_subgraph.vertices())
+        job_graph: JobGraph = self.get_job_graph(original_job_id)
         entry_vertices: List[str] = []
         exit_vertices: List[str] = []
 
@@ -468,24 +544,111 @@ class JobService(metaclass=Singleton):
             else []
         )
 
-        # remove old subgraph
-        job_graph.remove_vertices(old_subgraph_vertices)
+        # mark the old subgraph as legacy
         for vertex in old_subgraph_vertices:
             job = self.get_subjob(vertex)
             job.is_legacy = True
             self._job_dao.save_job(job=job)
 
-        # add the new subgraph without connecting it to the rest of the graph
-        job_graph.update(new_subgraph)
-
         # connect the new subgraph with the rest of the graph
         topological_sorted_vertices = list(nx.topological_sort(new_subgraph.get_graph()))
         head_vertex = topological_sorted_vertices[0]
         tail_vertex = topological_sorted_vertices[-1]
-        for predecessor in predecessors:
-            job_graph.add_edge(predecessor, head_vertex)
-        for successor in successors:
-            job_graph.add_edge(tail_vertex, successor)
+        new_edges.update((predecessor, head_vertex) for predecessor in predecessors)
+        new_edges.update((tail_vertex, successor) for successor in successors)
+
+        # remove the old subgraph and add the new one in one delta
+        self._apply_job_graph_delta(
+            original_job_id=original_job_id,
+            added_vertices=set(new_subgraph.vertices()),
+            removed_vertices=old_subgraph_vertices,
+            added_edges=new_edges,
+        )
+
+    def _load_job_graph(self, original_job_id: str) -> JobGraph:
+        """Get the cached job graph, loading it from the database if necessary. The caller must
+        hold the job graph lock and must not leak the returned graph."""
+        job_graph = self._job_graphs.get(original_job_id)
+        if job_graph is not None:
+            self._job_graphs.move_to_end(original_job_id)
+            return job_graph
+
+        job_graph = JobGraph()
+        vertices = self._job_vertex_dao.get_vertices(original_job_id=original_job_id)
+        edges = self._job_edge_dao.get_edges(original_job_id=original_job_id)
+        if vertices or edges:
+            for vertex in vertices:
+                job_graph.add_vertex(vertex)
+            for source, target in edges:
+                job_graph.add_edge(source, target)
+        else:
+            job_do = self._job_dao.get_by_id(original_job_id)
+            if not job_do:
+                raise ValueError(f"Job with ID {original_job_id} not found in the job registry")
+            if job_do.dag:
+                # migrate the job graph saved as the DAG JSON by the earlier versions, the DAG
+                # JSON is cleared, so that an emptied job graph is not migrated again
+                job_graph = JobGraph.from_json_str(str(job_do.dag))
+                self._job_vertex_dao.migrate_job_graph(
+                    original_job_id=original_job_id,
+                    job_ids=job_graph.vertices(),
+                    edges=job_graph.get_graph().edges(),
+                )
+
+        self._job_graphs[original_job_id] = job_graph
+        while len(self._job_graphs) > max(SystemEnv.JOB_GRAPH_CACHE_SIZE, 1):
+            self._job_graphs.popitem(last=False)
+        return job_graph
 
-        # save the updated jobs to the database
-        self.set_job_graph(original_job_id, job_graph)
+    def _apply_job_graph_delta(
+        self,
+        original_job_id: str,
+        added_vertices: Optional[Set[str]] = None,
+        removed_vertices: Optional[Set[str]] = None,
+        added_edges: Optional[Set[Tuple[str, str]]] = None,
+        removed_edges: Optional[Set[Tuple[str, str]]] = None,
+    ) -> None:
+        """Apply the changes to the cached job graph, and save only the changes to the database.
+
+        The vertices are removed before the vertices and the edges are added, and removing a
+        vertex removes its edges as well.
+        """
+        with self._job_graph_lock:
+            job_graph = self._load_job_graph(original_job_id)
+            graph: nx.DiGraph = job_graph.get_graph()
+
+            removed_vertices = {v for v in removed_vertices or set() if graph.has_node(v)}
+            removed_edges = {e for e in removed_edges or set() if graph.has_edge(*e)}
+            for vertex in removed_vertices:
+                removed_edges.update(graph.in_edges(vertex))
+                removed_edges.update(graph.out_edges(vertex))
+            job_graph.remove_vertices(removed_vertices)
+            for source, target in removed_edges:
+                if graph.has_edge(source, target):
+                    job_graph.remove_edge(source, target)
+
+            added_edges = {e for e in added_edges or set() if not graph.has_edge(*e)}
+            # like networkx, adding an edge adds its missing vertices
+            added_vertices = {
+                v
+                for v in (added_vertices or set()) | {v for edge in added_edges for v in edge}
+                if not graph.has_node(v)
+            }
+            for vertex in added_vertices:
+                job_graph.add_vertex(vertex)
+            for source, target in added_edges:
+                job_graph.add_edge(source, target)
+
+            # the re-added vertices/edges are deleted and inserted again
+            try:
+                self._job_vertex_dao.apply_job_graph_delta(
+                    original_job_id=original_job_id,
+                    added_vertices=added_vertices,
+                    removed_vertices=removed_vertices,
+                    added_edges=added_edges,
+                    removed_edges=removed_edges,
+                )
+            except Exception:
+                # the cached job graph is ahead of the database, reload it next time
+                self._job_graphs.pop(original_job_id, None)
+                raise
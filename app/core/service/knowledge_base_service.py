@@ -166,6 +166,7 @@ class KnowledgeBaseService(metaclass=Singleton):
             self._knowledge_base_dao.delete(id=id)
             # drop knowledge base folder
             KnowledgeStoreFactory.get_or_create(id).drop()
+            KnowledgeStoreFactory.invalidate(id)
 
     def get_all_knowledge_bases(self) -> Tuple[KnowledgeBase, List[KnowledgeBase]]:
         """Get all knowledge bases.
@@ -1,10 +1,16 @@
-from typing import List, cast
+from typing import Dict, List, cast
 
 from app.core.common.singleton import Singleton
 from app.core.common.type import ChatMessageRole
 from app.core.dal.dao.message_dao import MessageDao
 from app.core.dal.do.message_do import TextMessageDo
-from app.core.model.message import HybridMessage, Message, MessageType, TextMessage
+from app.core.model.message import (
+    HybridMessage,
+    Message,
+    MessageType,
+    ModelMessage,
+    TextMessage,
+)
 
 
 class MessageService(metaclass=Singleton):
@@ -30,6 +36,56 @@ class MessageService(metaclass=Singleton):
             return []
         return [self._message_dao.parse_into_message(message_do=result) for result in results]
 
+    def get_messages(self, ids: List[str]) -> Dict[str, Message]:
+        """Get the messages by IDs in one query."""
+        return {
+            str(result.id): self._message_dao.parse_into_message(message_do=result)
+            for result in self._message_dao.get_by_ids(ids=ids)
+        }
+
+    def get_messages_by_job_ids(
+        self, job_ids: List[str], message_type: MessageType
+    ) -> Dict[str, List[Message]]:
+        """Get the messages of the type grouped by job ID, in a constant number of queries."""
+        results = self._message_dao.filter_by_job_ids(job_ids=job_ids, message_type=message_type)
+
+        # prefetch the related workflow messages of the agent messages
+        related_messages: Dict[str, Message] = {}
+        if message_type == MessageType.AGENT_MESSAGE:
+            related_messages = self.get_messages(
+                ids=[
+                    related_id
+                    for result in results
+                    for related_id in list(result.related_message_ids or [])
+                ]
+            )
+
+        messages_by_job_id: Dict[str, List[Message]] = {}
+        for result in results:
+            messages_by_job_id.setdefault(str(result.job_id), []).append(
+                self._message_dao.parse_into_message(
+                    message_do=result, related_messages=related_messages
+                )
+            )
+        return messages_by_job_id
+
+    def save_model_messages(
+        self, session_id: str, job_id: str, operator_id: str, messages: List[ModelMessage]
+    ) -> None:
+        """Save the reasoning messages of the operator in the job, replacing the saved ones."""
+        self._message_dao.replace_model_messages(
+            session_id=session_id, job_id=job_id, operator_id=operator_id, messages=messages
+        )
+
+    def get_model_messages(self, job_id: str, operator_id: str) -> List[ModelMessage]:
+        """Get the saved reasoning messages of the operator in the job."""
+        return [
+            cast(ModelMessage, self._message_dao.parse_into_message(message_do=result))
+            for result in self._message_dao.filter_model_messages(
+                job_id=job_id, operator_id=operator_id
+            )
+        ]
+
     def get_text_message_by_job_id_and_role(
         self, job_id: str, role: ChatMessageRole
     ) -> TextMessage:
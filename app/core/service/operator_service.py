@@ -1,10 +1,12 @@
 import random
-from typing import List, Optional, Dict
+from typing import TYPE_CHECKING, List, Optional, Dict
 
-from app.core.agent.agent import Agent
 from app.core.common.singleton import Singleton
 from app.core.workflow.operator_config import OperatorConfig
 
+if TYPE_CHECKING:
+    from app.core.agent.agent import Agent
+
 
 class OperatorService(metaclass=Singleton):
     def __init__(self):
@@ -81,10 +83,10 @@ class OperatorService(metaclass=Singleton):
         return [[ops[0]]]
 
 
-    def register_operator_for_agent(self, op: OperatorConfig, agent: Agent):
+    def register_operator_for_agent(self, op: OperatorConfig, agent: "Agent"):
         self._registry.register_operator_for_agent(op,agent)
 
-    def get_operator_for_agent(self, agent: Agent) -> Optional[List[OperatorConfig]]:
+    def get_operator_for_agent(self, agent: "Agent") -> Optional[List[OperatorConfig]]:
         return self._registry.get_operators_for_agent(agent)
 
 
@@ -104,13 +106,13 @@ class OperatorRegistry:
     def all(self) -> List[OperatorConfig]:
         return list(self._operators.values())
 
-    def register_operator_for_agent(self, op: OperatorConfig, agent: Agent):
+    def register_operator_for_agent(self, op: OperatorConfig, agent: "Agent"):
         if agent.get_profile().name not in self._operator_map:
             self._operator_map[agent.get_profile().name] = []
         self._operator_map[agent.get_profile().name].append(op)
         self.register(op)
 
-    def get_operators_for_agent(self, agent: Agent) -> Optional[List[OperatorConfig]]:
+    def get_operators_for_agent(self, agent: "Agent") -> Optional[List[OperatorConfig]]:
         if agent.get_profile().name not in self._operator_map:
              return None
         return self._operator_map[agent.get_profile().name]
@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+import inspect
+import types
+from typing import Any, Callable, Dict, Optional, Tuple, Union, get_origin
+
+from app.core.common.type import CallParamSource
+
+
+@dataclass(frozen=True)
+class CallParam:
+    """A parameter of a call plan.
+
+    Attributes:
+        name (str): The parameter name.
+        source (CallParamSource): Where the argument comes from.
+        service_types (Tuple[type, ...]): The annotated classes which may be injected services,
+            looked up in the service mapping on every call.
+        default (Any): The default value, or `inspect.Parameter.empty` if required.
+    """
+
+    name: str
+    source: CallParamSource
+    service_types: Tuple[type, ...] = ()
+    default: Any = inspect.Parameter.empty
+
+    @property
+    def required(self) -> bool:
+        """Whether the parameter has no default value."""
+        return self.default is inspect.Parameter.empty
+
+
+@dataclass(frozen=True)
+class CallPlan:
+    """The precompiled way to call a function, so that the signature of the function is not
+    inspected on every call.
+
+    Attributes:
+        func_name (str): The name of the function.
+        params (Tuple[CallParam, ...]): The parameters of the function.
+        is_coroutine (bool): Whether the function is a coroutine function.
+    """
+
+    func_name: str
+    params: Tuple[CallParam, ...]
+    is_coroutine: bool
+
+    @classmethod
+    def compile(cls, func: Callable) -> "CallPlan":
+        """Compile the call plan of the function, by inspecting its signature once."""
+        # imported here to avoid the circular import (task -> tool -> call plan -> task)
+        from app.core.model.task import Task, ToolCallContext
+
+        params = []
+        for name, param in inspect.signature(func).parameters.items():
+            if param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+                continue
+
+            annotation: Any = param.annotation
+            if get_origin(annotation) in (Union, types.UnionType):
+                candidates = tuple(t for t in annotation.__args__ if t is not type(None))
+            else:
+                candidates = (annotation,)
+
+            if any(t is ToolCallContext or t is Task for t in candidates):
+                source = CallParamSource.CONTEXT
+                service_types: Tuple[type, ...] = ()
+            else:
+                service_types = tuple(
+                    t for t in candidates if isinstance(t, type) and t.__module__ != "builtins"
+                )
+                source = CallParamSource.SERVICE if service_types else CallParamSource.ARGUMENT
+
+            params.append(
+                CallParam(
+                    name=name, source=source, service_types=service_types, default=param.default
+                )
+            )
+
+        return cls(
+            func_name=getattr(func, "__name__", str(func)),
+            params=tuple(params),
+            is_coroutine=inspect.iscoroutinefunction(func),
+        )
+
+    def bind_tool_args(
+        self,
+        func_args: Dict[str, Any],
+        tool_call_ctx: Optional[Any] = None,
+        services: Optional[Dict[type, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Bind the arguments of a tool call, injecting the context and the services.
+
+        Args:
+            func_args (Dict[str, Any]): The arguments generated by the model.
+            tool_call_ctx (Optional[ToolCallContext]): The context of the tool call.
+            services (Optional[Dict[type, Any]]): The injectable services by type.
+
+        Returns:
+            Dict[str, Any]: The keyword arguments to call the function with.
+        """
+        services = services or {}
+        kwargs = dict(func_args)
+        for param in self.params:
+            if param.source == CallParamSource.CONTEXT:
+                if tool_call_ctx is None:
+                    raise ValueError(
+                        f"Function {self.func_name} requires FunctionCallContext, "
+                        "but no FunctionCallContext is provided."
+                    )
+                kwargs[param.name] = tool_call_ctx
+            elif param.source == CallParamSource.SERVICE:
+                for service_type in param.service_types:
+                    if service_type in services:
+                        kwargs[param.name] = services[service_type]
+                        break
+        return kwargs
+
+    def bind_command_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Bind the parameters of a command, filling in the defaults.
+
+        Raises:
+            ValueError: If a required parameter is missing.
+        """
+        kwargs: Dict[str, Any] = {}
+        for param in self.params:
+            if param.name in params:
+                kwargs[param.name] = params[param.name]
+            elif not param.required:
+                kwargs[param.name] = param.default
+            else:
+                raise ValueError(
+                    f"Failed to call the subscriber: missing required parameter '{param.name}'"
+                )
+        return kwargs
@@ -16,3 +16,13 @@ class GraphDb(Generic[T]):
     def conn(self):
         """Get the database connection."""
         raise NotImplementedError("Subclasses should implement this method.")
+
+    def close(self) -> None:
+        """Close the connection owned by this instance.
+
+        Drivers shared through the GraphDbDriverRegistry are not closed here, they are managed
+        by the registry.
+        """
+        if self._driver:
+            self._driver.close()
+            self._driver = None
@@ -0,0 +1,325 @@
+import atexit
+from contextlib import contextmanager
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+
+
+@dataclass
+class _DriverEntry:
+    """A pooled driver and its bookkeeping."""
+
+    driver: Any
+    fingerprint: Hashable
+    created_at: float
+    last_used_at: float
+    last_health_check_at: float
+    ref_count: int = 0
+    retired: bool = False
+
+
+class GraphDbDriverRegistry(metaclass=Singleton):
+    """Process-wide registry of graph database drivers, keyed by graph db config id.
+
+    A driver owns its own connection pool, so sharing one driver per graph db config avoids
+    paying a handshake on every tool call. Drivers are recreated when the connection settings
+    (the fingerprint) change, when a periodic health check fails, or after they were explicitly
+    invalidated. Drivers that are not used for `GRAPH_DB_DRIVER_IDLE_TIMEOUT` seconds are closed.
+
+    The drivers are used through leases (ref counted), so a driver which is replaced, invalidated
+    or closed at exit while another thread still uses it is only retired, and it is closed when
+    its last lease is released. The drivers are created outside of the registry lock, so opening
+    a driver does not block the lookups of the others.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _DriverEntry] = {}
+        self._lock = threading.RLock()
+        atexit.register(self.close_all)
+
+    def get_driver(
+        self,
+        key: str,
+        fingerprint: Hashable,
+        factory: Callable[[], Any],
+        health_check: Optional[Callable[[Any], None]] = None,
+    ) -> "LeasedDriver":
+        """Get a handle of the pooled driver for the key, whose sessions lease the driver.
+
+        Args:
+            key (str): The graph db config id.
+            fingerprint (Hashable): The connection settings the driver was created with.
+            factory (Callable[[], Any]): Creates a new driver.
+            health_check (Optional[Callable[[Any], None]]): Raises if the driver is unhealthy.
+
+        Returns:
+            LeasedDriver: The handle of the pooled driver.
+        """
+        return LeasedDriver(
+            registry=self,
+            key=key,
+            fingerprint=fingerprint,
+            factory=factory,
+            health_check=health_check,
+        )
+
+    @contextmanager
+    def lease(
+        self,
+        key: str,
+        fingerprint: Hashable,
+        factory: Callable[[], Any],
+        health_check: Optional[Callable[[Any], None]] = None,
+    ) -> Iterator[Any]:
+        """Lease the pooled driver for the key, creating it if necessary. The driver is not
+        closed before the lease is released.
+
+        Args:
+            key (str): The graph db config id.
+            fingerprint (Hashable): The connection settings the driver was created with.
+            factory (Callable[[], Any]): Creates a new driver.
+            health_check (Optional[Callable[[Any], None]]): Raises if the driver is unhealthy.
+
+        Yields:
+            Any: The pooled driver.
+        """
+        entry = self._acquire(key, fingerprint, factory, health_check)
+        try:
+            yield entry.driver
+        finally:
+            self._release(entry)
+
+    def invalidate(self, key: str, driver: Optional[Any] = None) -> None:
+        """Remove the pooled driver of the key, closing it once it is not leased anymore.
+
+        Args:
+            key (str): The graph db config id.
+            driver (Optional[Any]): If given, only invalidate when it is still the pooled driver.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry or (driver is not None and entry.driver is not driver):
+                return
+            self._entries.pop(key)
+            to_close = self._retire([entry])
+        self._close_drivers(to_close)
+
+    def evict_idle(self) -> int:
+        """Close the drivers which are not leased and have been idle for too long.
+
+        Returns:
+            int: The number of evicted drivers.
+        """
+        idle_timeout = SystemEnv.GRAPH_DB_DRIVER_IDLE_TIMEOUT
+        if not idle_timeout or idle_timeout <= 0:
+            return 0
+
+        now = time.monotonic()
+        with self._lock:
+            idle_keys = [
+                key
+                for key, entry in self._entries.items()
+                if entry.ref_count == 0 and now - entry.last_used_at >= idle_timeout
+            ]
+            to_close = self._retire([self._entries.pop(key) for key in idle_keys])
+        self._close_drivers(to_close)
+        return len(idle_keys)
+
+    def close_all(self) -> None:
+        """Close all the pooled drivers, the leased ones once they are released."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            to_close = self._retire(entries)
+        self._close_drivers(to_close)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get the age, idle time (in seconds) and leases of the pooled drivers."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: {
+                    "age": now - entry.created_at,
+                    "idle": now - entry.last_used_at,
+                    "leases": entry.ref_count,
+                }
+                for key, entry in self._entries.items()
+            }
+
+    def _acquire(
+        self,
+        key: str,
+        fingerprint: Hashable,
+        factory: Callable[[], Any],
+        health_check: Optional[Callable[[Any], None]],
+    ) -> _DriverEntry:
+        self.evict_idle()
+
+        while True:
+            entry = self._lease_pooled(key, fingerprint)
+            if entry is None:
+                # open the driver outside of the lock, and keep the first one pooled if another
+                # thread created one meanwhile
+                driver = factory()
+                now = time.monotonic()
+                created = _DriverEntry(
+                    driver=driver,
+                    fingerprint=fingerprint,
+                    created_at=now,
+                    last_used_at=now,
+                    last_health_check_at=now,
+                )
+                entry = self._lease_pooled(key, fingerprint, created)
+                if entry is not created:
+                    self._close_drivers([driver])
+                assert entry is not None
+                return entry
+
+            now = time.monotonic()
+            with self._lock:
+                need_check = (
+                    health_check is not None
+                    and now - entry.last_health_check_at
+                    >= SystemEnv.GRAPH_DB_HEALTH_CHECK_INTERVAL
+                )
+                if need_check:
+                    # mark first, so that concurrent callers do not check the same driver again
+                    entry.last_health_check_at = now
+            if not need_check:
+                return entry
+
+            assert health_check is not None
+            try:
+                health_check(entry.driver)
+                return entry
+            except Exception as e:
+                print(f"[GraphDbDriverRegistry] driver of {key} is unhealthy, recreating: {e}")
+                self.invalidate(key, driver=entry.driver)
+                self._release(entry)
+                # the recreated driver was just created, so it is not checked again
+                health_check = None
+
+    def _lease_pooled(
+        self, key: str, fingerprint: Hashable, created: Optional[_DriverEntry] = None
+    ) -> Optional[_DriverEntry]:
+        """Lease the pooled driver of the key, pooling the created one if there is none."""
+        to_close: List[Any] = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.fingerprint != fingerprint:
+                to_close = self._retire([self._entries.pop(key)])
+                entry = None
+            if entry is None and created is not None:
+                entry = created
+                self._entries[key] = entry
+            if entry is not None:
+                entry.ref_count += 1
+                entry.last_used_at = time.monotonic()
+        self._close_drivers(to_close)
+        return entry
+
+    def _release(self, entry: _DriverEntry) -> None:
+        with self._lock:
+            entry.ref_count -= 1
+            entry.last_used_at = time.monotonic()
+            close = entry.retired and entry.ref_count == 0
+        if close:
+            self._close_drivers([entry.driver])
+
+    def _retire(self, entries: List[_DriverEntry]) -> List[Any]:
+        """Mark the removed entries as retired, and return the drivers to close now. Must be
+        called with the lock held."""
+        for entry in entries:
+            entry.retired = True
+        return [entry.driver for entry in entries if entry.ref_count == 0]
+
+    def _close_drivers(self, drivers: List[Any]) -> None:
+        for driver in drivers:
+            try:
+                driver.close()
+            except Exception as e:
+                print(f"[GraphDbDriverRegistry] failed to close driver: {e}")
+
+
+class LeasedDriver:
+    """Handle of a pooled driver of the GraphDbDriverRegistry.
+
+    A session opened by the handle leases the driver until the session is closed, and the
+    other driver methods (e.g. `verify_connectivity`) lease it for the duration of the call.
+    """
+
+    def __init__(
+        self,
+        registry: GraphDbDriverRegistry,
+        key: str,
+        fingerprint: Hashable,
+        factory: Callable[[], Any],
+        health_check: Optional[Callable[[Any], None]] = None,
+    ):
+        self._registry = registry
+        self._key = key
+        self._fingerprint = fingerprint
+        self._factory = factory
+        self._health_check = health_check
+
+    def session(self, **kwargs: Any) -> "_LeasedSession":
+        """Open a session of the pooled driver, which holds the lease until it is closed."""
+        lease = self._lease()
+        driver = lease.__enter__()
+        try:
+            session = driver.session(**kwargs)
+        except BaseException:
+            lease.__exit__(None, None, None)
+            raise
+        return _LeasedSession(session, lease)
+
+    def __getattr__(self, name: str) -> Any:
+        with self._lease() as driver:
+            attr = getattr(driver, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            with self._lease() as driver:
+                return getattr(driver, name)(*args, **kwargs)
+
+        return call
+
+    def _lease(self):
+        return self._registry.lease(
+            key=self._key,
+            fingerprint=self._fingerprint,
+            factory=self._factory,
+            health_check=self._health_check,
+        )
+
+
+class _LeasedSession:
+    """A driver session which releases the driver lease when closed."""
+
+    def __init__(self, session: Any, lease: Any):
+        self._session = session
+        self._lease = lease
+        self._released = False
+
+    def __enter__(self) -> "_LeasedSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the session and release the driver lease."""
+        try:
+            self._session.close()
+        finally:
+            if not self._released:
+                self._released = True
+                self._lease.__exit__(None, None, None)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
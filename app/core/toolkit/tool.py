@@ -1,8 +1,9 @@
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 from uuid import uuid4
 
-from app.core.common.type import FunctionCallStatus, ToolType
+from app.core.common.type import FunctionCallStatus, ToolConcurrency, ToolType
+from app.core.toolkit.call_plan import CallPlan
 
 
 @dataclass
@@ -43,6 +44,12 @@ class Tool:
         _description: Description of the tool, will be shown to the LLM.
         _function: Callable function that can be invoked by the LLM.
         _tool_type: Type of the tool, default is LOCAL_TOOL.
+        _concurrency: Whether the calls of the tool can run concurrently, default is SERIAL.
+        _max_concurrency: Max concurrent calls of the tool in a round, 0 means unlimited.
+        _timeout: Timeout of a call in seconds, None means the FUNCTION_CALL_TIMEOUT setting.
+            It is soft for a sync function (the timed out call keeps running in its thread),
+            and ignored for a SERIAL sync function, which may have side effects.
+        _call_plan: The precompiled plan to bind the arguments and call the function.
     """
 
     def __init__(
@@ -51,6 +58,9 @@ class Tool:
         description: str,
         function: Callable,
         tool_type: ToolType = ToolType.LOCAL_TOOL,
+        concurrency: ToolConcurrency = ToolConcurrency.SERIAL,
+        max_concurrency: int = 0,
+        timeout: Optional[float] = None,
     ):
         """Initialize the Tool with name, description, and optional function."""
         self._id: str = str(uuid4())
@@ -58,6 +68,10 @@ class Tool:
         self._description: str = description
         self._type: ToolType = tool_type
         self._function: Callable = function
+        self._concurrency: ToolConcurrency = concurrency
+        self._max_concurrency: int = max_concurrency
+        self._timeout: Optional[float] = timeout
+        self._call_plan: CallPlan = CallPlan.compile(function)
 
     @property
     def id(self) -> str:
@@ -84,6 +98,26 @@ class Tool:
         """Get the callable function of the tool."""
         return self._function
 
+    @property
+    def concurrency(self) -> ToolConcurrency:
+        """Get whether the calls of the tool can run concurrently."""
+        return self._concurrency
+
+    @property
+    def max_concurrency(self) -> int:
+        """Get the max concurrent calls of the tool in a round."""
+        return self._max_concurrency
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """Get the timeout of a call in seconds."""
+        return self._timeout
+
+    @property
+    def call_plan(self) -> CallPlan:
+        """Get the precompiled call plan of the function."""
+        return self._call_plan
+
     def copy(self) -> "Tool":
         """Create a copy of the tool."""
         return Tool(
@@ -91,6 +125,9 @@ class Tool:
             description=self._description,
             function=self._function,
             tool_type=self._type,
+            concurrency=self._concurrency,
+            max_concurrency=self._max_concurrency,
+            timeout=self._timeout,
         )
 
     def to_dict(self):
@@ -8,10 +8,8 @@ from uuid import uuid4
 from app.core.central_orchestrator.central_orchestrator import CentralOrchestrator
 from app.core.central_orchestrator.version_management_center.record import OperatorExecutionRecord
 from app.core.central_orchestrator.version_management_center.vmc_provider import vmc
-from app.core.service.agent_service import AgentService
-from contourpy.util.data import simple
-from fontTools.ttLib.tables.ttProgram import instructions
 
+from app.core.common.async_func import run_in_worker_thread
 from app.core.common.system_env import SystemEnv
 
 from app.core.reasoner.model_service_factory import ModelServiceFactory
@@ -355,15 +353,14 @@ class Operator:
         action_input_prompt = OPERATOR_ACTION_INPUT_PROMPT_TEMPLATE.format(
             goal=task,
             joined_text=joined_text,
-            instructions=instructions,
         )
 
         # ========== Step 4. 并行调用模型 ==========
         async def summarize_context():
-            return await asyncio.to_thread(self._private_reasoner.generate, summary_prompt)
+            return await run_in_worker_thread(self._private_reasoner.generate, summary_prompt)
 
         async def generate_action_input():
-            return await asyncio.to_thread(self._private_reasoner.generate, action_input_prompt)
+            return await run_in_worker_thread(self._private_reasoner.generate, action_input_prompt)
 
         summary_result, action_result = await asyncio.gather(
             summarize_context(), generate_action_input()
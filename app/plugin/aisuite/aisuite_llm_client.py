@@ -52,12 +52,12 @@ class AiSuiteLlmClient(ModelService):
         )
 
         # generate response using the llm client
-        model_response: Any = self._llm_client.chat.completions.create(
+        model_response_text, _ = await self._generate_text_with_cache(
             model=self._model_alias,
-            messages=aisuite_messages,
+            request_messages=aisuite_messages,
+            tools=tools,
             temperature=SystemEnv.TEMPERATURE,
-            max_tokens=self._max_tokens,
-            max_completion_tokens=self._max_completion_tokens,
+            generate_text=lambda: self._complete(aisuite_messages=aisuite_messages),
         )
 
         # call functions based on the model output
@@ -65,19 +65,30 @@ class AiSuiteLlmClient(ModelService):
         if tools:
             func_call_results = await self.call_function(
                 tools=tools,
-                model_response_text=cast(str, model_response.choices[0].message.content),
+                model_response_text=model_response_text,
                 tool_call_ctx=tool_call_ctx,
             )
 
         # parse model response to agent message
         response: ModelMessage = self._parse_model_response(
-            model_response=model_response,
+            model_response_text=model_response_text,
             messages=messages,
             func_call_results=func_call_results,
         )
 
         return response
 
+    async def _complete(self, aisuite_messages: List[Dict[str, str]]) -> str:
+        """Send the request to the model, and return the text of the model response."""
+        model_response: Any = self._llm_client.chat.completions.create(
+            model=self._model_alias,
+            messages=aisuite_messages,
+            temperature=SystemEnv.TEMPERATURE,
+            max_tokens=self._max_tokens,
+            max_completion_tokens=self._max_completion_tokens,
+        )
+        return cast(str, model_response.choices[0].message.content or "")
+
     def _prepare_model_request(
         self,
         sys_prompt: str,
@@ -125,7 +136,7 @@ class AiSuiteLlmClient(ModelService):
 
     def _parse_model_response(
         self,
-        model_response: Any,
+        model_response_text: str,
         messages: List[ModelMessage],
         func_call_results: Optional[List[FunctionCallResult]] = None,
     ) -> ModelMessage:
@@ -140,12 +151,7 @@ class AiSuiteLlmClient(ModelService):
             source_type = MessageSourceType.ACTOR
 
         response = ModelMessage(
-            payload=cast(
-                str,
-                (
-                    model_response.choices[0].message.content or "The LLM response is missing."
-                ).strip(),
-            ),
+            payload=(model_response_text or "The LLM response is missing.").strip(),
             job_id=messages[-1].get_job_id(),
             step=messages[-1].get_step() + 1,
             source_type=source_type,
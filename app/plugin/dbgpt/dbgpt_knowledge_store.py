@@ -1,5 +1,6 @@
+from functools import lru_cache
 import os
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from dbgpt.rag.embedding import DefaultEmbeddingFactory  # type: ignore
 from dbgpt.rag.retriever import RetrieverStrategy  # type: ignore
@@ -24,6 +25,16 @@ from app.core.model.knowledge import KnowledgeChunk
 from app.plugin.dbgpt.dbgpt_llm_client import DbgptLlmClient
 
 
+@lru_cache(maxsize=8)
+def _get_embedding_fn(api_url: str, api_key: Optional[str], model_name: str) -> Any:
+    """Get the remote embedding client shared by all the knowledge stores."""
+    return DefaultEmbeddingFactory.remote(
+        api_url=api_url,
+        api_key=api_key,
+        model_name=model_name,
+    )
+
+
 class VectorKnowledgeStore(KnowledgeStore):
     """Knowledge base for storing vectors."""
 
@@ -33,7 +44,7 @@ class VectorKnowledgeStore(KnowledgeStore):
         self._vector_store = ChromaStore(
             config,
             name=name,
-            embedding_fn=DefaultEmbeddingFactory.remote(
+            embedding_fn=_get_embedding_fn(
                 api_url=SystemEnv.EMBEDDING_MODEL_ENDPOINT,
                 api_key=SystemEnv.EMBEDDING_MODEL_APIKEY,
                 model_name=SystemEnv.EMBEDDING_MODEL_NAME,
@@ -96,7 +107,7 @@ class GraphKnowledgeStore(KnowledgeStore):
         self._graph_store = CommunitySummaryKnowledgeGraph(
             config=config,
             name=SystemEnv.TUGRAPH_NAME_PREFIX + name.replace("-", ""),
-            embedding_fn=DefaultEmbeddingFactory.remote(
+            embedding_fn=_get_embedding_fn(
                 api_url=SystemEnv.EMBEDDING_MODEL_ENDPOINT,
                 api_key=SystemEnv.EMBEDDING_MODEL_APIKEY,
                 model_name=SystemEnv.EMBEDDING_MODEL_NAME,
@@ -57,25 +57,39 @@ class DbgptLlmClient(ModelService):
             sys_prompt=sys_prompt, messages=messages, tools=tools
         )
 
-        # generate response using the llm client
-        model_response: ModelOutput = await self._llm_client.generate(model_request)
+        # generate response using the llm client, under the rate limits and the response cache
+        model_response_text, _ = await self._generate_text_with_cache(
+            model=SystemEnv.LLM_NAME,
+            request_messages=[
+                {"role": message.role, "content": message.content}
+                for message in model_request.messages
+            ],
+            tools=tools,
+            temperature=SystemEnv.TEMPERATURE,
+            generate_text=lambda: self._complete(model_request=model_request),
+        )
 
         # call functions based on the model output
         func_call_results: Optional[List[FunctionCallResult]] = None
         if tools:
             func_call_results = await self.call_function(
-                tools=tools, model_response_text=model_response.text, tool_call_ctx=tool_call_ctx
+                tools=tools, model_response_text=model_response_text, tool_call_ctx=tool_call_ctx
             )
 
         # parse model response to agent message
         response: ModelMessage = self._parse_model_response(
-            model_response=model_response,
+            model_response_text=model_response_text,
             messages=messages,
             func_call_results=func_call_results,
         )
 
         return response
 
+    async def _complete(self, model_request: ModelRequest) -> str:
+        """Send the request to the model, and return the text of the model response."""
+        model_response: ModelOutput = await self._llm_client.generate(model_request)
+        return model_response.text
+
     def _prepare_model_request(
         self,
         sys_prompt: str,
@@ -129,7 +143,7 @@ class DbgptLlmClient(ModelService):
 
     def _parse_model_response(
         self,
-        model_response: ModelOutput,
+        model_response_text: str,
         messages: List[ModelMessage],
         func_call_results: Optional[List[FunctionCallResult]] = None,
     ) -> ModelMessage:
@@ -144,7 +158,7 @@ class DbgptLlmClient(ModelService):
             source_type = MessageSourceType.ACTOR
 
         response = ModelMessage(
-            payload=model_response.text,
+            payload=model_response_text,
             job_id=messages[-1].get_job_id(),
             step=messages[-1].get_step() + 1,
             source_type=source_type,
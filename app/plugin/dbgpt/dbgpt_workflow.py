@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional, Tuple, Any
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple, Any
 
 from app.core.central_orchestrator.central_orchestrator import CentralOrchestrator
 from app.core.central_orchestrator.version_management_center.record import WorkflowExecutionRecord
@@ -15,6 +16,7 @@ from dbgpt.core.awel import (  # type: ignore
 import networkx as nx  # type: ignore
 
 from app.core.common.async_func import run_async_function
+from app.core.common.system_env import SystemEnv
 from app.core.model.job import Job
 from app.core.model.message import WorkflowMessage
 from app.core.reasoner.reasoner import Reasoner
@@ -203,16 +205,14 @@ class DbgptWorkflow(Workflow):
         self._last_previous_expert_outputs = previous_expert_outputs
         self._last_lesson = lesson
 
-        for op_id in nx.topological_sort(self._operator_graph):
-            if self._stopped:
-                raise RuntimeError("Workflow execution has been stopped.")
-            await self._run_single_operator(
-                op_id=op_id,
-                job=job,
-                operator_outputs=operator_outputs,
-                previous_expert_outputs=previous_expert_outputs,
-                lesson=lesson,
-            )
+        await self._run_operators(
+            op_ids=set(self._operator_graph.nodes()),
+            job=job,
+            operator_outputs=operator_outputs,
+            previous_expert_outputs=previous_expert_outputs,
+            lesson=lesson,
+            stopped_error="Workflow execution has been stopped.",
+        )
 
         # 找到尾结点（下游没有其它 Operator 的结点）
         tail_map_op_ids = [
@@ -236,6 +236,68 @@ class DbgptWorkflow(Workflow):
 
         return tail_output
 
+    async def _run_operators(
+        self,
+        op_ids: Set[str],
+        job: Job,
+        operator_outputs: Dict[str, WorkflowMessage],
+        previous_expert_outputs: List[WorkflowMessage],
+        lesson: Optional[str],
+        stopped_error: str,
+    ) -> None:
+        """Run the operators concurrently, each one as soon as its predecessors are done.
+
+        The predecessors outside `op_ids` must already have their outputs in `operator_outputs`.
+        At most `WORKFLOW_MAX_PARALLEL_OPERATORS` operators run at the same time, and the ready
+        operators are started in topological order. If an operator fails, the running operators
+        are cancelled and the error is raised.
+        """
+        max_parallelism = max(SystemEnv.WORKFLOW_MAX_PARALLEL_OPERATORS or 1, 1)
+        order: Dict[str, int] = {
+            op_id: i for i, op_id in enumerate(nx.topological_sort(self._operator_graph))
+        }
+        unfinished_predecessors: Dict[str, int] = {
+            op_id: sum(1 for pred in self._operator_graph.predecessors(op_id) if pred in op_ids)
+            for op_id in op_ids
+        }
+        ready: List[str] = [op_id for op_id, count in unfinished_predecessors.items() if count == 0]
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while ready or running:
+                ready.sort(key=lambda op_id: order[op_id])
+                while ready and len(running) < max_parallelism:
+                    if self._stopped:
+                        raise RuntimeError(stopped_error)
+                    op_id = ready.pop(0)
+                    task = asyncio.create_task(
+                        self._run_single_operator(
+                            op_id=op_id,
+                            job=job,
+                            operator_outputs=operator_outputs,
+                            previous_expert_outputs=previous_expert_outputs,
+                            lesson=lesson,
+                        )
+                    )
+                    running[task] = op_id
+
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    op_id = running.pop(task)
+                    # re-raise the error of the failed operator
+                    task.result()
+                    for succ in self._operator_graph.successors(op_id):
+                        if succ not in unfinished_predecessors:
+                            continue
+                        unfinished_predecessors[succ] -= 1
+                        if unfinished_predecessors[succ] == 0:
+                            ready.append(succ)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+
     async def _run_single_operator(self, op_id, job, operator_outputs, previous_expert_outputs, lesson=None):
         base_op = self._operator_graph.nodes[op_id]["operator"]
         in_edges = list(self._operator_graph.in_edges(op_id))
@@ -264,18 +326,14 @@ class DbgptWorkflow(Workflow):
         affected_nodes.add(to_op_id)
         operator_outputs = dict(self._last_operator_outputs)
         self._stopped = False
-        for op_id in nx.topological_sort(self._operator_graph):
-            if op_id not in affected_nodes:
-                continue
-            if self._stopped:
-                raise RuntimeError("Workflow execution has been stopped during rollback.")
-            await self._run_single_operator(
-                op_id=op_id,
-                job=self._last_job,
-                operator_outputs=operator_outputs,
-                previous_expert_outputs=self._last_previous_expert_outputs,
-                lesson=self._last_lesson,
-            )
+        await self._run_operators(
+            op_ids=affected_nodes,
+            job=self._last_job,
+            operator_outputs=operator_outputs,
+            previous_expert_outputs=self._last_previous_expert_outputs,
+            lesson=self._last_lesson,
+            stopped_error="Workflow execution has been stopped during rollback.",
+        )
         self._last_operator_outputs = operator_outputs
         tail_ids = [n for n in self._operator_graph.nodes() if self._operator_graph.out_degree(n) == 0]
         tail_id = tail_ids[0]
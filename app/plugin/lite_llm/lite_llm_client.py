@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional, Union, cast
+import inspect
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union, cast
 
 from app.core.common.system_env import SystemEnv
 from app.core.common.type import MessageSourceType
@@ -14,9 +15,19 @@ class LiteLlmClient(ModelService):
     Uses LiteLLM to interact with various LLM providers.
     API keys for providers (OpenAI, Anthropic, etc.) should be set as environment variables
     (e.g., OPENAI_API_KEY, ANTHROPIC_API_KEY). LiteLLM will pick them up.
+
+    The requests are sent by `litellm.acompletion`, so the event loop is not blocked while waiting
+    for the model. LiteLLM caches the underlying async HTTP clients by (api key, api base, timeout),
+    so the connections are kept alive and reused across requests of the same endpoint.
+
+    Attributes:
+        _stream_callback (Optional[Callable[[str], Union[None, Awaitable[None]]]]): If set, the
+            response is streamed and every received text delta is passed to the callback.
     """
 
-    def __init__(self):
+    def __init__(
+        self, stream_callback: Optional[Callable[[str], Union[None, Awaitable[None]]]] = None
+    ):
         super().__init__()
         # e.g., "openai/gpt-4o", "anthropic/claude-3-sonnet-20240229"
         # SystemEnv.LLM_ENDPOINT can be used as api_base for custom OpenAI-compatible endpoints
@@ -27,6 +38,8 @@ class LiteLlmClient(ModelService):
 
         self._max_tokens: int = SystemEnv.MAX_TOKENS
         self._max_completion_tokens: int = SystemEnv.MAX_COMPLETION_TOKENS
+        self._timeout: float = SystemEnv.LLM_REQUEST_TIMEOUT
+        self._stream_callback = stream_callback
 
     async def generate(
         self,
@@ -41,46 +54,82 @@ class LiteLlmClient(ModelService):
             sys_prompt=sys_prompt, messages=messages, tools=tools
         )
 
-        from litellm import completion
-        from litellm.litellm_core_utils.streaming_handler import CustomStreamWrapper
-        from litellm.types.utils import ModelResponse, StreamingChoices
-
-        model_response: Union[ModelResponse, CustomStreamWrapper] = completion(
+        model_response_text, cached = await self._generate_text_with_cache(
             model=self._model_alias,
-            api_base=self._api_base,
-            api_key=self._api_key,
-            messages=litellm_messages,
+            request_messages=litellm_messages,
+            tools=tools,
             temperature=self._temperature,
-            max_tokens=self._max_tokens,
-            max_completion_tokens=self._max_completion_tokens,
-            stream=False,
+            generate_text=lambda: self._complete(litellm_messages=litellm_messages),
         )
-        if isinstance(model_response, CustomStreamWrapper) or isinstance(
-            model_response.choices[0], StreamingChoices
-        ):
-            raise ValueError(
-                "Streaming responses are not supported in LiteLlmClient. "
-                "Please PR to add a streaming feature."
-            )
+        if cached and self._stream_callback:
+            callback_result = self._stream_callback(model_response_text)
+            if inspect.isawaitable(callback_result):
+                await callback_result
 
         # call functions based on the model output
         func_call_results: Optional[List[FunctionCallResult]] = None
         if tools:
             func_call_results = await self.call_function(
                 tools=tools,
-                model_response_text=cast(str, model_response.choices[0].message.content),
+                model_response_text=model_response_text,
                 tool_call_ctx=tool_call_ctx,
             )
 
         # parse model response to agent message
         response: ModelMessage = self._parse_model_response(
-            model_response=model_response,
+            model_response_text=model_response_text,
             messages=messages,
             func_call_results=func_call_results,
         )
 
         return response
 
+    async def _complete(self, litellm_messages: List[Dict[str, str]]) -> str:
+        """Send the request to the model, and return the text of the model response."""
+        from litellm import acompletion
+        from litellm.litellm_core_utils.streaming_handler import CustomStreamWrapper
+        from litellm.types.utils import ModelResponse, StreamingChoices
+
+        model_response: Union[ModelResponse, CustomStreamWrapper] = await acompletion(
+            model=self._model_alias,
+            api_base=self._api_base,
+            api_key=self._api_key,
+            messages=litellm_messages,
+            temperature=self._temperature,
+            max_tokens=self._max_tokens,
+            max_completion_tokens=self._max_completion_tokens,
+            timeout=self._timeout,
+            stream=self._stream_callback is not None,
+        )
+        if isinstance(model_response, CustomStreamWrapper):
+            model_response = await self._consume_stream(
+                stream=model_response, litellm_messages=litellm_messages
+            )
+        if isinstance(model_response.choices[0], StreamingChoices):
+            raise ValueError("Failed to build the model response from the streaming chunks.")
+
+        return cast(str, model_response.choices[0].message.content or "")
+
+    async def _consume_stream(self, stream: Any, litellm_messages: List[Dict[str, str]]) -> Any:
+        """Pass the text deltas of the streaming response to the stream callback, and rebuild the
+        complete model response from the chunks."""
+        from litellm import stream_chunk_builder
+
+        assert self._stream_callback is not None
+        chunks: List[Any] = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                callback_result = self._stream_callback(delta)
+                if inspect.isawaitable(callback_result):
+                    await callback_result
+
+        model_response = stream_chunk_builder(chunks=chunks, messages=litellm_messages)
+        if model_response is None:
+            raise ValueError("The streaming response of LiteLLM is empty.")
+        return model_response
+
     def _prepare_model_request(
         self,
         sys_prompt: str,
@@ -128,7 +177,7 @@ class LiteLlmClient(ModelService):
 
     def _parse_model_response(
         self,
-        model_response: Any,
+        model_response_text: str,
         messages: List[ModelMessage],
         func_call_results: Optional[List[FunctionCallResult]] = None,
     ) -> ModelMessage:
@@ -143,12 +192,7 @@ class LiteLlmClient(ModelService):
             source_type = MessageSourceType.ACTOR
 
         response = ModelMessage(
-            payload=cast(
-                str,
-                (
-                    model_response.choices[0].message.content or "The LLM response was missing."
-                ).strip(),
-            ),
+            payload=(model_response_text or "The LLM response was missing.").strip(),
             job_id=messages[-1].get_job_id(),
             step=messages[-1].get_step() + 1,
             source_type=source_type,
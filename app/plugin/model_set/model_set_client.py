@@ -43,6 +43,9 @@ class ModelSetClient(ModelService):
     def __init__(self, model_name: str):
         super().__init__()
         self._model: LLMModel = self.get_model(model_name)
+        # created on the first request; the pooled http client of the endpoint is the piece
+        # shared across the wrappers, the wrapper itself is cheap
+        self._model_wrapper: Optional[ModelWrapper] = None
 
 
     async def generate(self,
@@ -61,9 +64,17 @@ class ModelSetClient(ModelService):
 
         sys_prompt = self._model.system_prompt.format(toos = tools,task = task,summary = summary,prev_outputs = prev_outputs)
         prompt =  self.parse_model_request(sys_prompt,task).payload
-        model_wrapper: ModelWrapper = ModelWrapper(self._model)
+        if self._model_wrapper is None:
+            self._model_wrapper = ModelWrapper(self._model)
+        model_wrapper: ModelWrapper = self._model_wrapper
         #注意这里的result需不需要换成带有更多字段的格式
-        result = await model_wrapper.generate(prompt)
+        result, _ = await self._generate_text_with_cache(
+            model=self._model.name,
+            request_messages=[{"role": "user", "content": prompt}],
+            tools=tools,
+            temperature=self._model.temperature,
+            generate_text=lambda: model_wrapper.generate(prompt),
+        )
         func_call_results: Optional[List[FunctionCallResult]] = None
         if tools:
             func_call_results = await self.call_function(
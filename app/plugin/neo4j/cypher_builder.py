@@ -0,0 +1,287 @@
+from dataclasses import dataclass, field
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from app.core.service.graph_db_service import GraphDbService
+
+# the wildcard of the labels/types, e.g. in the GDS projections
+ALL = "*"
+
+_IDENTIFIER_PATTERN = re.compile(r"^[^`\x00-\x1f]+$")
+
+# both counts are answered by the count store, without scanning the graph
+TOTAL_NODES_QUERY = "MATCH (n) RETURN count(n) AS total_nodes"
+TOTAL_RELATIONSHIPS_QUERY = "MATCH ()-[r]->() RETURN count(r) AS total_relationships"
+
+
+@dataclass(frozen=True)
+class CypherStatement:
+    """A cypher statement and its parameters.
+
+    Attributes:
+        text (str): The statement text, which contains identifiers but never values.
+        parameters (Dict[str, Any]): The values, referenced as `$name` in the text.
+    """
+
+    text: str
+    parameters: Dict[str, Any] = field(default_factory=dict)
+
+
+class CypherBuilder:
+    """Builder of the parameterized cypher statements of the neo4j tools.
+
+    Neo4j caches the query plans by the statement text, so the values (ids, limits, the
+    algorithm configurations, the graph names, ...) are always passed as `$parameters`, and the
+    text of a statement only varies by its identifiers. The identifiers (labels, relationship
+    types, property keys), which cannot be parameterized, are validated and quoted, and the
+    labels/types are whitelisted against the known ones (e.g. the schema metadata) if given.
+
+    Args:
+        vertex_labels (Optional[Iterable[str]]): The allowed vertex labels, None to allow any.
+        relationship_types (Optional[Iterable[str]]): The allowed relationship types, None to
+            allow any.
+    """
+
+    def __init__(
+        self,
+        vertex_labels: Optional[Iterable[str]] = None,
+        relationship_types: Optional[Iterable[str]] = None,
+    ):
+        self._vertex_labels = set(vertex_labels) if vertex_labels is not None else None
+        self._relationship_types = (
+            set(relationship_types) if relationship_types is not None else None
+        )
+
+    @classmethod
+    def from_schema(cls, schema: Dict[str, Any]) -> "CypherBuilder":
+        """Create the builder allowing the labels/types of the schema metadata. A section which
+        is not defined yet (e.g. a database populated outside of the tools) allows any."""
+        nodes = schema.get("nodes") or {}
+        relationships = schema.get("relationships") or {}
+        return cls(
+            vertex_labels=nodes.keys() if nodes else None,
+            relationship_types=relationships.keys() if relationships else None,
+        )
+
+    @classmethod
+    def from_graph_db_service(cls, graph_db_service: GraphDbService) -> "CypherBuilder":
+        """Create the builder allowing the labels/types of the default graph database schema."""
+        return cls.from_schema(
+            graph_db_service.get_schema_metadata(
+                graph_db_config=graph_db_service.get_default_graph_db_config()
+            )
+        )
+
+    @staticmethod
+    def quote(name: str) -> str:
+        """Validate and quote an identifier (label, relationship type, property key, index name).
+
+        Raises:
+            ValueError: If the identifier is empty or contains backticks or control characters.
+        """
+        if not isinstance(name, str) or not name.strip() or not _IDENTIFIER_PATTERN.match(name):
+            raise ValueError(f"Invalid cypher identifier: {name!r}")
+        return f"`{name}`"
+
+    def vertex_label(self, label: str) -> str:
+        """Get the quoted vertex label, which must be allowed."""
+        self.check_vertex_labels(label)
+        return self.quote(label)
+
+    def relationship_type(self, rel_type: str) -> str:
+        """Get the quoted relationship type, which must be allowed."""
+        self.check_relationship_types(rel_type)
+        return self.quote(rel_type)
+
+    def vertex_label_filter(self, label: Optional[str]) -> str:
+        """Get the label filter of a node pattern, e.g. `:Person`, empty for any label."""
+        return "" if not label or label == ALL else f":{self.vertex_label(label)}"
+
+    def relationship_type_filter(self, rel_type: Optional[str]) -> str:
+        """Get the type filter of a relationship pattern, e.g. `:KNOWS`, empty for any type."""
+        return "" if not rel_type or rel_type == ALL else f":{self.relationship_type(rel_type)}"
+
+    def check_vertex_labels(self, labels: Union[str, List[str]]) -> Union[str, List[str]]:
+        """Check the vertex label(s), e.g. of a GDS node projection, and return them.
+
+        Raises:
+            ValueError: If a label is invalid or not allowed.
+        """
+        return self._check(labels, self._vertex_labels, "vertex label")
+
+    def check_relationship_types(self, types: Union[str, List[str]]) -> Union[str, List[str]]:
+        """Check the relationship type(s), e.g. of a GDS relationship projection, and return them.
+
+        Raises:
+            ValueError: If a type is invalid or not allowed.
+        """
+        return self._check(types, self._relationship_types, "relationship type")
+
+    def create_vertex_unique_constraint(self, label: str, key: str) -> CypherStatement:
+        """Create the uniqueness constraint of the vertex primary key."""
+        name = self.quote(f"{label.lower()}_{key}_unique")
+        return CypherStatement(
+            f"CREATE CONSTRAINT {name} IF NOT EXISTS "
+            f"FOR (n:{self.quote(label)}) REQUIRE n.{self.quote(key)} IS UNIQUE"
+        )
+
+    def create_vertex_index(self, label: str, key: str) -> CypherStatement:
+        """Create the index of a vertex property."""
+        return CypherStatement(
+            f"CREATE INDEX {self.quote(f'{label}_{key}_idx')} IF NOT EXISTS "
+            f"FOR (n:{self.quote(label)}) ON (n.{self.quote(key)})"
+        )
+
+    def create_relationship_unique_constraint(self, rel_type: str, key: str) -> CypherStatement:
+        """Create the uniqueness constraint of the relationship primary key."""
+        name = self.quote(f"{rel_type.lower()}_{key}_unique")
+        return CypherStatement(
+            f"CREATE CONSTRAINT {name} IF NOT EXISTS "
+            f"FOR ()-[r:{self.quote(rel_type)}]-() REQUIRE r.{self.quote(key)} IS UNIQUE"
+        )
+
+    def create_relationship_index(self, rel_type: str, key: str) -> CypherStatement:
+        """Create the index of a relationship property."""
+        return CypherStatement(
+            f"CREATE INDEX {self.quote(f'{rel_type}_{key}_idx')} IF NOT EXISTS "
+            f"FOR ()-[r:{self.quote(rel_type)}]-() ON (r.{self.quote(key)})"
+        )
+
+    def merge_triplets(
+        self,
+        source_label: str,
+        source_primary_key: str,
+        relationship_type: str,
+        target_label: str,
+        target_primary_key: str,
+        rows: List[Dict[str, Any]],
+    ) -> CypherStatement:
+        """Merge a batch of triplets of the same labels, each row of which has the `source_id`,
+        `source_properties`, `target_id`, `target_properties` and `relationship_properties`.
+        The merged `source`, `target` and `r` of every row are returned."""
+        source = f"{self.vertex_label(source_label)} {{{self.quote(source_primary_key)}"
+        target = f"{self.vertex_label(target_label)} {{{self.quote(target_primary_key)}"
+        return CypherStatement(
+            "UNWIND $rows AS row "
+            f"MERGE (source:{source}: row.source_id}}) "
+            "SET source = row.source_properties "
+            f"MERGE (target:{target}: row.target_id}}) "
+            "SET target = row.target_properties "
+            f"MERGE (source)-[r:{self.relationship_type(relationship_type)}]->(target) "
+            "SET r = row.relationship_properties "
+            "RETURN source, target, r",
+            {"rows": rows},
+        )
+
+    def count_vertices_by_labels(self, labels: List[str]) -> CypherStatement:
+        """Count the vertices of the labels, yielding `label` and `count`. Every label is counted
+        by its own `UNION ALL` branch, which is answered by the count store instead of a scan."""
+        return self._count_by_names(
+            labels, lambda label: f"MATCH (n:{self.vertex_label(label)}) WITH count(n) AS count"
+        )
+
+    def count_relationships_by_types(self, types: List[str]) -> CypherStatement:
+        """Count the relationships of the types, yielding `label` and `count`. Every type is
+        counted by its own `UNION ALL` branch, which is answered by the count store instead of
+        a scan."""
+        return self._count_by_names(
+            types,
+            lambda rel_type: (
+                f"MATCH ()-[r:{self.relationship_type(rel_type)}]->() WITH count(r) AS count"
+            ),
+        )
+
+    def count_vertices(self, label: str) -> CypherStatement:
+        """Count the vertices of the label, yielding `count`."""
+        return CypherStatement(f"MATCH (n:{self.vertex_label(label)}) RETURN count(n) as count")
+
+    def sample_vertices(self, label: str, limit: int) -> CypherStatement:
+        """Sample the vertices of the label, yielding `n`."""
+        return CypherStatement(
+            f"MATCH (n:{self.vertex_label(label)}) RETURN n LIMIT $limit", {"limit": int(limit)}
+        )
+
+    def count_relationships(self, rel_type: str) -> CypherStatement:
+        """Count the relationships of the type, yielding `count`."""
+        return CypherStatement(
+            f"MATCH ()-[r:{self.relationship_type(rel_type)}]->() RETURN count(r) as count"
+        )
+
+    def sample_relationships(self, rel_type: str, limit: int) -> CypherStatement:
+        """Sample the relationships of the type with their endpoints."""
+        return CypherStatement(
+            f"""
+                MATCH (a)-[r:{self.relationship_type(rel_type)}]->(b)
+                RETURN
+                    elementId(r) as rel_element_id,
+                    type(r) as type,
+                    properties(r) as props,
+                    coalesce(labels(a)[0], 'Unknown') as source_label,
+                    coalesce(a.id, elementId(a)) as source_id,
+                    coalesce(labels(b)[0], 'Unknown') as target_label,
+                    coalesce(b.id, elementId(b)) as target_id
+                LIMIT $limit
+            """,
+            {"limit": int(limit)},
+        )
+
+    def gds_project(
+        self,
+        graph_name: str,
+        vertex_labels: Union[str, List[str]] = ALL,
+        relationship_types: Union[str, List[str]] = ALL,
+        configuration: Optional[Dict[str, Any]] = None,
+    ) -> CypherStatement:
+        """Project a GDS graph, yielding `graphName`, `nodeCount` and `relationshipCount`."""
+        return CypherStatement(
+            """
+            CALL gds.graph.project(
+                $graph_name, $node_projection, $relationship_projection, $configuration
+            )
+            YIELD graphName, nodeCount, relationshipCount
+            RETURN graphName, nodeCount, relationshipCount
+            """,
+            {
+                "graph_name": graph_name,
+                "node_projection": self.check_vertex_labels(vertex_labels),
+                "relationship_projection": self.check_relationship_types(relationship_types),
+                "configuration": configuration or {},
+            },
+        )
+
+    @staticmethod
+    def gds_drop(graph_name: str, fail_if_missing: bool = True) -> CypherStatement:
+        """Drop a GDS graph, yielding `graphName`."""
+        return CypherStatement(
+            """
+            CALL gds.graph.drop($graph_name, $fail_if_missing)
+            YIELD graphName
+            RETURN graphName
+            """,
+            {"graph_name": graph_name, "fail_if_missing": fail_if_missing},
+        )
+
+    @staticmethod
+    def _count_by_names(names: List[str], count_query: Callable[[str], str]) -> CypherStatement:
+        if not names:
+            return CypherStatement("UNWIND [] AS label RETURN label, 0 AS count")
+        branches = [
+            f"{count_query(name)} RETURN $label_{i} AS label, count"
+            for i, name in enumerate(names)
+        ]
+        return CypherStatement(
+            " UNION ALL ".join(branches), {f"label_{i}": name for i, name in enumerate(names)}
+        )
+
+    def _check(
+        self, names: Union[str, List[str]], allowed: Optional[set], kind: str
+    ) -> Union[str, List[str]]:
+        for name in [names] if isinstance(names, str) else names:
+            if name == ALL:
+                continue
+            self.quote(name)
+            if allowed is not None and name not in allowed:
+                raise ValueError(
+                    f"Unknown {kind} '{name}', the defined ones are: {sorted(allowed)}"
+                )
+        return names if isinstance(names, str) else list(names)
@@ -0,0 +1,234 @@
+import atexit
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import hashlib
+import itertools
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+from app.core.service.graph_db_service import GraphDbService
+from app.core.toolkit.graph_db.graph_db import GraphDb
+from app.plugin.neo4j.cypher_builder import CypherBuilder
+
+# (graph db key, projection spec json)
+_ProjectionKey = Tuple[str, str]
+
+
+@dataclass
+class _Projection:
+    """A GDS graph projection cached by the manager."""
+
+    graph_name: str
+    store: GraphDb
+    write_version: int
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    created: bool = False
+    info: Dict[str, Any] = field(default_factory=dict)
+    ref_count: int = 0
+    last_used_at: float = field(default_factory=time.monotonic)
+
+
+class GdsProjectionManager(metaclass=Singleton):
+    """Cache of the GDS graph projections shared by the graph analysis algorithms.
+
+    Projecting the graph is usually the dominant cost of the algorithms, so the projections are
+    named by their (graph database, vertex labels, relationship types, configuration) and reused
+    across the calls. Every graph database has a write version, bumped after the data is written
+    (e.g. imported), and the projections of an older version are not reused but dropped once
+    released. The projections idle for `GDS_PROJECTION_IDLE_TTL` seconds, or the least recently
+    used ones beyond `GDS_PROJECTION_CACHE_SIZE`, are dropped on the next acquisition, and all
+    the projections are dropped at exit.
+
+    The tools run in different threads, so the state is guarded by a thread lock, and a
+    projection in use (ref counted) is never dropped. The projection names are unique to the
+    process, since the GDS graph catalog is shared by all the processes using the database, and
+    unique to each projection, so that dropping a stale projection never drops its replacement.
+    """
+
+    def __init__(self):
+        self._projections: Dict[_ProjectionKey, _Projection] = {}
+        self._write_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._name_prefix = f"chat2graph_{uuid4().hex[:8]}"
+        # numbers every projection, so that a dropped projection never shares the name of the
+        # one replacing it
+        self._generations = itertools.count()
+        atexit.register(self.drop_all)
+
+    @contextmanager
+    def projection(
+        self,
+        graph_db_service: GraphDbService,
+        builder: CypherBuilder,
+        vertex_labels: Union[str, List[str]] = "*",
+        relationship_types: Union[str, List[str]] = "*",
+        configuration: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Acquire the projection of the default graph database, projecting it if not cached.
+
+        Args:
+            graph_db_service (GraphDbService): The graph database service.
+            builder (CypherBuilder): The builder to check the labels/types with.
+            vertex_labels (Union[str, List[str]]): The node projection, "*" for all nodes.
+            relationship_types (Union[str, List[str]]): The relationship projection, "*" for all
+                relationships.
+            configuration (Optional[Dict[str, Any]]): The projection configuration, e.g. the node
+                or relationship properties.
+
+        Yields:
+            Dict[str, Any]: The `graphName`, `nodeCount` and `relationshipCount` of the
+                projection, and whether it is `reused`.
+        """
+        vertex_labels = builder.check_vertex_labels(vertex_labels)
+        relationship_types = builder.check_relationship_types(relationship_types)
+        configuration = configuration or {}
+
+        config = graph_db_service.get_default_graph_db_config()
+        db_key = str(config.id)
+        spec = json.dumps(
+            [
+                sorted(vertex_labels) if isinstance(vertex_labels, list) else vertex_labels,
+                sorted(relationship_types)
+                if isinstance(relationship_types, list)
+                else relationship_types,
+                configuration,
+            ],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        key = (db_key, spec)
+
+        with self._lock:
+            stale = self._collect_stale(now=time.monotonic(), adding=key not in self._projections)
+            write_version = self._write_versions.get(db_key, 0)
+            projection = self._projections.get(key)
+            if projection is None or projection.write_version != write_version:
+                if projection is not None and projection.ref_count == 0:
+                    stale.append(projection)
+                digest = hashlib.sha1(f"{db_key}:{spec}".encode("utf-8")).hexdigest()[:12]
+                projection = _Projection(
+                    graph_name=(
+                        f"{self._name_prefix}_{digest}_v{write_version}_{next(self._generations)}"
+                    ),
+                    store=graph_db_service.get_default_graph_db(),
+                    write_version=write_version,
+                )
+                self._projections[key] = projection
+            projection.ref_count += 1
+            projection.last_used_at = time.monotonic()
+
+        self._drop(stale)
+
+        try:
+            # the projection is created once, the concurrent users of the same key wait for it
+            with projection.lock:
+                reused = projection.created and self._exists(projection)
+                if not reused:
+                    statement = builder.gds_project(
+                        projection.graph_name, vertex_labels, relationship_types, configuration
+                    )
+                    with projection.store.conn.session() as session:
+                        # a projection lost by the server (e.g. restarted) may still be listed
+                        drop = CypherBuilder.gds_drop(projection.graph_name, fail_if_missing=False)
+                        session.run(drop.text, drop.parameters).consume()
+                        records = session.run(statement.text, statement.parameters).data()
+                    projection.info = records[0] if records else {}
+                    projection.created = True
+            yield {**projection.info, "reused": reused}
+        except BaseException:
+            with self._lock:
+                # forget the failed projection, so that the next call projects it again
+                if self._projections.get(key) is projection and not projection.created:
+                    self._projections.pop(key)
+            raise
+        finally:
+            with self._lock:
+                projection.ref_count -= 1
+                projection.last_used_at = time.monotonic()
+                outdated = (
+                    projection.ref_count == 0
+                    and self._projections.get(key) is not projection
+                    and projection.created
+                )
+            if outdated:
+                self._drop([projection])
+
+    def bump_write_version(self, graph_db_service: GraphDbService) -> None:
+        """Mark the data of the default graph database as written, so that its projections are
+        projected again on the next use."""
+        db_key = str(graph_db_service.get_default_graph_db_config().id)
+        with self._lock:
+            self._write_versions[db_key] = self._write_versions.get(db_key, 0) + 1
+
+    def drop_all(self) -> None:
+        """Drop all the cached projections which are not in use."""
+        with self._lock:
+            keys = [k for k, p in self._projections.items() if p.ref_count == 0]
+            projections = [self._projections.pop(k) for k in keys]
+        self._drop(projections)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the cached projections and their users."""
+        with self._lock:
+            return {
+                p.graph_name: {"ref_count": p.ref_count, "write_version": p.write_version}
+                for p in self._projections.values()
+            }
+
+    def _collect_stale(self, now: float, adding: bool) -> List[_Projection]:
+        """Remove and return the idle or outdated projections, and the least recently used ones
+        beyond the cache size, making room for a new one if adding. Must be called with the lock
+        held."""
+        idle_ttl: int = SystemEnv.GDS_PROJECTION_IDLE_TTL or 0
+        cache_size: int = SystemEnv.GDS_PROJECTION_CACHE_SIZE or 0
+
+        stale_keys = [
+            key
+            for key, p in self._projections.items()
+            if p.ref_count == 0
+            and (
+                (idle_ttl > 0 and now - p.last_used_at > idle_ttl)
+                or p.write_version != self._write_versions.get(key[0], 0)
+            )
+        ]
+        if cache_size > 0:
+            idle = sorted(
+                (
+                    (p.last_used_at, key)
+                    for key, p in self._projections.items()
+                    if p.ref_count == 0 and key not in stale_keys
+                ),
+            )
+            overflow = len(self._projections) - len(stale_keys) - cache_size + int(adding)
+            stale_keys.extend(key for _, key in idle[: max(overflow, 0)])
+        return [self._projections.pop(key) for key in stale_keys]
+
+    @staticmethod
+    def _exists(projection: _Projection) -> bool:
+        """Whether the projection still exists, e.g. it is lost when the server restarts."""
+        with projection.store.conn.session() as session:
+            record = session.run(
+                "CALL gds.graph.exists($graph_name) YIELD exists RETURN exists",
+                graph_name=projection.graph_name,
+            ).single()
+        return bool(record and record["exists"])
+
+    @staticmethod
+    def _drop(projections: List[_Projection]) -> None:
+        for projection in projections:
+            if not projection.created:
+                continue
+            try:
+                with projection.store.conn.session() as session:
+                    drop = CypherBuilder.gds_drop(projection.graph_name, fail_if_missing=False)
+                    session.run(drop.text, drop.parameters).consume()
+            except Exception as e:
+                print(
+                    f"[GdsProjectionManager] failed to drop the projection "
+                    f"{projection.graph_name}: {e}"
+                )
@@ -1,7 +1,9 @@
-from neo4j import GraphDatabase
+from neo4j import Driver, GraphDatabase
 
+from app.core.common.system_env import SystemEnv
 from app.core.model.graph_db_config import Neo4jDbConfig  # type: ignore
 from app.core.toolkit.graph_db.graph_db import GraphDb
+from app.core.toolkit.graph_db.graph_db_driver_registry import GraphDbDriverRegistry
 
 
 class Neo4jDb(GraphDb[Neo4jDbConfig]):
@@ -12,9 +14,29 @@ class Neo4jDb(GraphDb[Neo4jDbConfig]):
 
     @property
     def conn(self):
-        """Get the database connection."""
-        if not self._driver:
-            self._driver = GraphDatabase.driver(
-                self._config.uri, auth=(self._config.user, self._config.pwd)
+        """Get the database connection.
+
+        Persisted graph db configs share a pooled driver through the GraphDbDriverRegistry,
+        whose sessions lease the driver until they are closed, while transient configs (e.g. the
+        ones being validated) own a private driver.
+        """
+        if self._config.id:
+            return GraphDbDriverRegistry().get_driver(
+                key=self._config.id,
+                fingerprint=(self._config.uri, self._config.user, self._config.pwd),
+                factory=self._create_driver,
+                health_check=lambda driver: driver.verify_connectivity(),
             )
+
+        if not self._driver:
+            self._driver = self._create_driver()
         return self._driver
+
+    def _create_driver(self) -> Driver:
+        return GraphDatabase.driver(
+            self._config.uri,
+            auth=(self._config.user, self._config.pwd),
+            max_connection_pool_size=SystemEnv.GRAPH_DB_POOL_SIZE,
+            connection_acquisition_timeout=SystemEnv.GRAPH_DB_POOL_ACQUISITION_TIMEOUT,
+            max_connection_lifetime=SystemEnv.GRAPH_DB_POOL_MAX_CONNECTION_LIFETIME,
+        )
@@ -1,6 +1,8 @@
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from app.core.common.system_env import SystemEnv
+from app.core.common.type import ToolConcurrency
 from app.core.model.artifact import (
     Artifact,
     ArtifactMetadata,
@@ -11,6 +13,13 @@ from app.core.model.artifact import (
 from app.core.service.artifact_service import ArtifactService
 from app.core.service.graph_db_service import GraphDbService
 from app.core.toolkit.tool import Tool
+from app.plugin.neo4j.cypher_builder import (
+    TOTAL_NODES_QUERY,
+    TOTAL_RELATIONSHIPS_QUERY,
+    CypherBuilder,
+    CypherStatement,
+)
+from app.plugin.neo4j.gds_projection_manager import GdsProjectionManager
 
 
 class SchemaGetter(Tool):
@@ -21,6 +30,7 @@ class SchemaGetter(Tool):
             name=self.get_schema.__name__,
             description=self.get_schema.__doc__ or "",
             function=self.get_schema,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def get_schema(self, graph_db_service: GraphDbService) -> str:
@@ -77,6 +87,7 @@ class DataStatusCheck(Tool):
             name=self.check_data_status.__name__,
             description=self.check_data_status.__doc__ or "",
             function=self.check_data_status,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def check_data_status(
@@ -115,32 +126,34 @@ class DataStatusCheck(Tool):
 
             with store.conn.session() as session:
                 # 1. 获取总体统计信息
-                total_stats = session.run("""
-                    MATCH (n)
-                    OPTIONAL MATCH (n)-[r]->()
-                    RETURN
-                        count(DISTINCT n) as total_nodes,
-                        count(DISTINCT r) as total_relationships
-                """).single()
+                total_nodes, total_relationships = _count_totals(session)
 
                 results["总体统计"] = {
-                    "总节点数": total_stats["total_nodes"] if total_stats else 0,
-                    "总关系数": total_stats["total_relationships"] if total_stats else 0,
+                    "总节点数": total_nodes,
+                    "总关系数": total_relationships,
                 }
 
-                # 2. 获取所有节点标签列表（如果未指定）
+                # 2. 获取所有节点标签列表，未指定时检查全部标签
+                labels_result = session.run(
+                    "CALL db.labels() YIELD label RETURN collect(label) as labels"
+                ).single()
+                db_node_labels = labels_result["labels"] if labels_result else []
                 if node_labels is None:
-                    labels_result = session.run(
-                        "CALL db.labels() YIELD label RETURN collect(label) as labels"
-                    ).single()
-                    node_labels = labels_result["labels"] if labels_result else []
+                    node_labels = db_node_labels
 
-                # 3. 获取所有关系类型列表（如果未指定）
+                # 3. 获取所有关系类型列表，未指定时检查全部类型
+                rel_types_result = session.run(
+                    "CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) as types"  # noqa: E501
+                ).single()
+                db_relationship_labels = rel_types_result["types"] if rel_types_result else []
                 if relationship_labels is None:
-                    rel_types_result = session.run(
-                        "CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) as types"  # noqa: E501
-                    ).single()
-                    relationship_labels = rel_types_result["types"] if rel_types_result else []
+                    relationship_labels = db_relationship_labels
+
+                # only the labels/types existing in the database are queried, the others have
+                # no data
+                builder = CypherBuilder(
+                    vertex_labels=db_node_labels, relationship_types=db_relationship_labels
+                )
 
                 # 4. 获取节点标签统计和样例
                 results["节点统计"] = {}
@@ -150,18 +163,24 @@ class DataStatusCheck(Tool):
                 current_node_labels = node_labels if node_labels is not None else []
                 for label in current_node_labels:
                     try:
-                        # Escape label if it contains special characters (basic escaping)
-                        safe_label = f"`{label.replace('`', '``')}`"
+                        if label not in db_node_labels:
+                            results["节点统计"][label] = 0
+                            continue
+
                         # 统计每个标签的节点数量
-                        count_query = f"MATCH (n:{safe_label}) RETURN count(n) as count"
-                        count_result = session.run(count_query).single()
+                        count_query = builder.count_vertices(label)
+                        count_result = session.run(
+                            count_query.text, count_query.parameters
+                        ).single()
                         node_count = count_result["count"] if count_result else 0
                         results["节点统计"][label] = node_count
 
                         # 获取每个标签的样例数据
                         if node_count > 0:
-                            sample_query = f"MATCH (n:{safe_label}) RETURN n LIMIT {sample_limit}"
-                            sample_results = list(session.run(sample_query))
+                            sample_query = builder.sample_vertices(label, sample_limit)
+                            sample_results = list(
+                                session.run(sample_query.text, sample_query.parameters)
+                            )
                             samples = []
 
                             for record in sample_results:
@@ -190,30 +209,25 @@ class DataStatusCheck(Tool):
                 )
                 for rel_type in current_relationship_labels:
                     try:
-                        # Escape relationship type if it contains special characters (basic escaping)  # noqa: E501
-                        safe_rel_type = f"`{rel_type.replace('`', '``')}`"
+                        if rel_type not in db_relationship_labels:
+                            results["关系统计"][rel_type] = 0
+                            continue
+
                         # 统计每个类型的关系数量
-                        count_query = f"MATCH ()-[r:{safe_rel_type}]->() RETURN count(r) as count"
-                        count_result = session.run(count_query).single()
+                        count_query = builder.count_relationships(rel_type)
+                        count_result = session.run(
+                            count_query.text, count_query.parameters
+                        ).single()
                         rel_count = count_result["count"] if count_result else 0
                         results["关系统计"][rel_type] = rel_count
 
                         # 获取每个类型的样例数据
                         if rel_count > 0:
                             # Enhanced sample query to handle missing labels/ids gracefully
-                            sample_query = f"""
-                                MATCH (a)-[r:{safe_rel_type}]->(b)
-                                RETURN
-                                    elementId(r) as rel_element_id,
-                                    type(r) as type,
-                                    properties(r) as props,
-                                    coalesce(labels(a)[0], 'Unknown') as source_label,
-                                    coalesce(a.id, elementId(a)) as source_id,
-                                    coalesce(labels(b)[0], 'Unknown') as target_label,
-                                    coalesce(b.id, elementId(b)) as target_id
-                                LIMIT {sample_limit}
-                            """
-                            sample_results = list(session.run(sample_query))
+                            sample_query = builder.sample_relationships(rel_type, sample_limit)
+                            sample_results = list(
+                                session.run(sample_query.text, sample_query.parameters)
+                            )
                             samples = []
 
                             for record in sample_results:
@@ -408,248 +422,398 @@ class DataImport(Tool):
         """  # noqa: E501
 
         # arguments validation
-        if not all(
-            [
-                graph_db_service,
-                artifact_service,
-                session_id,
-                job_id,
-                source_label,
-                source_primary_key,
-                target_label,
-                target_primary_key,
-                relationship_label,
-            ]
-        ):
+        if not all([graph_db_service, artifact_service, session_id, job_id]):
             raise ValueError("Missing required arguments for data import.")
-
-        if not isinstance(source_label, str) or not source_label.strip():
-            raise ValueError("source_label must be a non-empty string.")
-        if not isinstance(target_label, str) or not target_label.strip():
-            raise ValueError("target_label must be a non-empty string.")
-        if not isinstance(relationship_label, str) or not relationship_label.strip():
-            raise ValueError("relationship_label must be a non-empty string.")
-
-        if not isinstance(source_primary_key, str) or not source_primary_key.strip():
-            raise ValueError("source_primary_key must be a non-empty string.")
-        if not isinstance(target_primary_key, str) or not target_primary_key.strip():
-            raise ValueError("target_primary_key must be a non-empty string.")
-
-        if not isinstance(source_properties, dict):
-            raise ValueError("source_properties must be a dictionary.")
-        if not isinstance(target_properties, dict):
-            raise ValueError("target_properties must be a dictionary.")
-        if not isinstance(relationship_properties, dict):
-            # allow None or empty dict for it, but enforce dict type if provided
-            raise ValueError("relationship_properties must be a dictionary.")
-
-        if source_primary_key not in source_properties:
-            raise ValueError(
-                f"Source primary key '{source_primary_key}' "
-                f"not found in source_properties: {source_properties}"
-            )
-        if target_primary_key not in target_properties:
-            raise ValueError(
-                f"Target primary key '{target_primary_key}' "
-                f"not found in target_properties: {target_properties}"
-            )
-
-        def format_date(value: str) -> str:
-            """Format date value to ensure it has a leading zero in the year."""
-            date_pattern = r"^(\d{3})-(\d{2})-(\d{2})(T[\d:]+Z)?$"
-            match = re.match(date_pattern, value)
-            if match:
-                year = match.group(1)
-                if len(year) == 3:
-                    time_part = match.group(4) or ""
-                    return f"0{year}-{match.group(2)}-{match.group(3)}{time_part}"
-            return value
-
-        def format_property_value(value: Any) -> str:
-            """Format property value for Cypher query."""
-            if value is None:
-                return "null"
-            elif isinstance(value, int | float):
-                return str(value)
-            else:
-                str_value = str(value)
-                str_value = str_value.replace("'", "\\'")
-                return f"'{str_value}'"
-
-        def format_properties(properties: Dict[str, Any]) -> str:
-            """Format properties dictionary to Cypher property string."""
-            props = []
-            for key, value in properties.items():
-                if key in ["date", "start_date", "end_date", "start_time"] and isinstance(
-                    value, str
-                ):
-                    value = format_date(value)
-                props.append(f"{key}: {format_property_value(value)}")
-            return "{" + ", ".join(props) + "}"
+        triplet = {
+            "source_label": source_label,
+            "source_primary_key": source_primary_key,
+            "source_properties": source_properties,
+            "target_label": target_label,
+            "target_primary_key": target_primary_key,
+            "target_properties": target_properties,
+            "relationship_label": relationship_label,
+            "relationship_properties": relationship_properties,
+        }
+        builder = CypherBuilder.from_graph_db_service(graph_db_service)
+        validate_triplet(triplet, builder)
 
         try:
-            # format properties to Cypher property string
-            source_props = format_properties(source_properties)
-            target_props = format_properties(target_properties)
-            rel_props = format_properties(relationship_properties)
-
-            # cypher statement
-            cypher = f"""
-            MERGE (source:{source_label} {{{source_primary_key}: {format_property_value(source_properties[source_primary_key])}}})
-            ON CREATE SET source = {source_props}
-            ON MATCH SET source = {source_props}
-            WITH source
-            MERGE (target:{target_label} {{{target_primary_key}: {format_property_value(target_properties[target_primary_key])}}})
-            ON CREATE SET target = {target_props}
-            ON MATCH SET target = {target_props}
-            WITH source, target
-            MERGE (source)-[r:{relationship_label}]->(target)
-            ON CREATE SET r = {rel_props}
-            ON MATCH SET r = {rel_props}
-            RETURN source, target, r
-            """  # noqa: E501
-
-            store = graph_db_service.get_default_graph_db()
-            with store.conn.session() as session:
-                # execute the import operation
-                print(f"Executing statement: {cypher}")
-                result = session.run(cypher)
-                summary = result.consume()
-                nodes_created = summary.counters.nodes_created
-                nodes_updated = summary.counters.properties_set
-                rels_created = summary.counters.relationships_created
-
-                # get details of this operation
-                details = {
-                    "source": f"{source_label}(id: {source_properties[source_primary_key]})",
-                    "target": f"{target_label}(id: {target_properties[target_primary_key]})",
-                    "relationship": f"{relationship_label}",
-                }
+            stats = import_triplets(
+                graph_db_service=graph_db_service, triplets=[triplet], builder=builder
+            )
 
-                # get current status of the database
-                # 1. node statistics
-                node_counts = {}
-                for label in [source_label, target_label]:
-                    result = session.run(f"MATCH (n:{label}) RETURN count(n) as count")
-                    node_counts[label] = result.single()["count"]
-
-                # 2. relationship statistics
-                rel_count = session.run(
-                    f"MATCH ()-[r:{relationship_label}]->() RETURN count(r) as count"
-                ).single()["count"]
-
-                # 3. overall statistics
-                total_stats = session.run("""
-                    MATCH (n) 
-                    OPTIONAL MATCH (n)-[r]->() 
-                    RETURN 
-                        count(DISTINCT n) as total_nodes,
-                        count(DISTINCT r) as total_relationships
-                """).single()
-
-            # fetch the current graph state
-            data_graph_dict = fetch_and_construct_data_graph(graph_db_service)
-
-            # save the graph state as an artifact
+            # merge the touched vertices and edges into the graph artifact
             update_graph_artifact(
                 artifact_service=artifact_service,
                 session_id=session_id,
                 job_id=job_id,
-                data_graph_dict=data_graph_dict,
+                data_graph_dict=stats["graph_delta"],
                 description="It is the data graph.",
+                total_vertices=stats["total_nodes"],
+                total_edges=stats["total_relationships"],
             )
 
             return f"""数据导入成功！
 本次操作详情：
 - 创建/更新的节点：
-- 源节点: {details["source"]}
-- 目标节点: {details["target"]}
-- 创建的关系: {details["relationship"]}
+- 源节点: {source_label}(id: {source_properties[source_primary_key]})
+- 目标节点: {target_label}(id: {target_properties[target_primary_key]})
+- 创建的关系: {relationship_label}
 - 操作统计：
-- 新建节点数: {nodes_created}
-- 更新属性数: {nodes_updated}
-- 新建关系数: {rels_created}
+- 新建节点数: {stats["nodes_created"]}
+- 更新属性数: {stats["properties_set"]}
+- 新建关系数: {stats["relationships_created"]}
 
 当前数据库状态：
 - 节点统计：
-- {source_label}: {node_counts[source_label]} 个
-- {target_label}: {node_counts[target_label]} 个
+- {source_label}: {stats["node_counts"].get(source_label, 0)} 个
+- {target_label}: {stats["node_counts"].get(target_label, 0)} 个
 - 关系统计：
-- {relationship_label}: {rel_count} 个
+- {relationship_label}: {stats["relationship_counts"].get(relationship_label, 0)} 个
 - 总体统计：
-- 总节点数: {total_stats["total_nodes"]}
-- 总关系数: {total_stats["total_relationships"]}
+- 总节点数: {stats["total_nodes"]}
+- 总关系数: {stats["total_relationships"]}
 """
 
         except Exception as e:
             raise Exception(f"Failed to import data: {str(e)}") from e
 
 
-def fetch_and_construct_data_graph(
+class DataBatchImport(Tool):
+    """Tool for importing a batch of triplets into a graph database."""
+
+    def __init__(self):
+        super().__init__(
+            name=self.import_triplet_batch.__name__,
+            description=self.import_triplet_batch.__doc__ or "",
+            function=self.import_triplet_batch,
+        )
+
+    async def import_triplet_batch(
+        self,
+        graph_db_service: GraphDbService,
+        artifact_service: ArtifactService,
+        session_id: str,
+        job_id: str,
+        triplets: List[Dict[str, Any]],
+    ) -> str:
+        """Import many triplets into the database at once. Prefer it to import_triplet_data when
+        there are more than a few triplets to import, since all of them are imported in one call.
+
+        Every triplet follows the same data validation rules as import_triplet_data: the labels
+        must exist in the schema, the direction of the relationship must follow the edge
+        constraints, the properties must contain the primary keys, and the dates must be in
+        YYYY-MM-DD format.
+
+        Args:
+            session_id (str): The session ID
+            job_id (str): The job ID
+            triplets (List[Dict[str, Any]]): The triplets, each of them is a dict with the keys:
+                - source_label (str): Label of the source node, defined in the graph schema
+                - source_primary_key (str): Primary key of the source node
+                - source_properties (Dict[str, Any]): Properties of the source node
+                - target_label (str): Label of the target node, defined in the graph schema
+                - target_primary_key (str): Primary key of the target node
+                - target_properties (Dict[str, Any]): Properties of the target node
+                - relationship_label (str): Label of the relationship, defined in the graph schema
+                - relationship_properties (Dict[str, Any]): Properties of the relationship
+
+        Returns:
+            str: Summary of the import operation, including the statistics of every batch and
+                the current counts of the imported labels.
+
+        Examples:
+            >>> triplets = [{"source_label": "Person", "source_primary_key": "id",
+            ...     "source_properties": {"id": "liu_bei", "name": "Liu Bei"},
+            ...     "target_label": "Person", "target_primary_key": "id",
+            ...     "target_properties": {"id": "guan_yu", "name": "Guan Yu"},
+            ...     "relationship_label": "SWORN_BROTHER", "relationship_properties": {}}]
+            >>> result = await import_triplet_batch("session_id_xxx", "job_id_xxx", triplets)
+        """
+        if not all([graph_db_service, artifact_service, session_id, job_id]):
+            raise ValueError("Missing required arguments for data import.")
+        if not isinstance(triplets, list) or not triplets:
+            raise ValueError("triplets must be a non-empty list.")
+
+        # invalid triplets are skipped and reported, instead of failing the whole batch
+        builder = CypherBuilder.from_graph_db_service(graph_db_service)
+        valid_triplets: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        for i, triplet in enumerate(triplets):
+            try:
+                validate_triplet(triplet, builder)
+                valid_triplets.append(triplet)
+            except ValueError as e:
+                errors.append(f"- triplet {i}: {e}")
+        if not valid_triplets:
+            raise ValueError("No valid triplet to import:\n" + "\n".join(errors))
+
+        try:
+            stats = import_triplets(
+                graph_db_service=graph_db_service, triplets=valid_triplets, builder=builder
+            )
+
+            update_graph_artifact(
+                artifact_service=artifact_service,
+                session_id=session_id,
+                job_id=job_id,
+                data_graph_dict=stats["graph_delta"],
+                description="It is the data graph.",
+                total_vertices=stats["total_nodes"],
+                total_edges=stats["total_relationships"],
+            )
+        except Exception as e:
+            raise Exception(f"Failed to import data: {str(e)}") from e
+
+        lines = [
+            "数据批量导入成功！",
+            f"- 导入三元组数: {len(valid_triplets)}，跳过的无效三元组数: {len(errors)}",
+            f"- 新建节点数: {stats['nodes_created']}",
+            f"- 更新属性数: {stats['properties_set']}",
+            f"- 新建关系数: {stats['relationships_created']}",
+            "批次统计：",
+        ]
+        for batch in stats["batches"]:
+            lines.append(
+                f"- ({batch['source_label']})-[{batch['relationship_label']}]->"
+                f"({batch['target_label']}) x {batch['rows']}: "
+                f"新建节点 {batch['nodes_created']}，新建关系 {batch['relationships_created']}"
+            )
+        lines.append("当前数据库状态：")
+        for label, count in stats["node_counts"].items():
+            lines.append(f"- {label}: {count} 个节点")
+        for label, count in stats["relationship_counts"].items():
+            lines.append(f"- {label}: {count} 个关系")
+        lines.append(f"- 总节点数: {stats['total_nodes']}")
+        lines.append(f"- 总关系数: {stats['total_relationships']}")
+        if errors:
+            lines.append("跳过的无效三元组：")
+            lines.extend(errors)
+        return "\n".join(lines)
+
+
+_DATE_PROPERTY_KEYS = ("date", "start_date", "end_date", "start_time")
+
+
+def validate_triplet(triplet: Dict[str, Any], builder: Optional[CypherBuilder] = None) -> None:
+    """Validate the labels, primary keys and properties of a triplet. The labels are also
+    whitelisted by the builder if given.
+
+    Raises:
+        ValueError: If the triplet is invalid.
+    """
+    for key in ["source_label", "target_label", "relationship_label"]:
+        if not isinstance(triplet.get(key), str) or not triplet[key].strip():
+            raise ValueError(f"{key} must be a non-empty string.")
+    for key in ["source_primary_key", "target_primary_key"]:
+        if not isinstance(triplet.get(key), str) or not triplet[key].strip():
+            raise ValueError(f"{key} must be a non-empty string.")
+    for key in ["source_properties", "target_properties", "relationship_properties"]:
+        if not isinstance(triplet.get(key), dict):
+            raise ValueError(f"{key} must be a dictionary.")
+
+    if triplet["source_primary_key"] not in triplet["source_properties"]:
+        raise ValueError(
+            f"Source primary key '{triplet['source_primary_key']}' "
+            f"not found in source_properties: {triplet['source_properties']}"
+        )
+    if triplet["target_primary_key"] not in triplet["target_properties"]:
+        raise ValueError(
+            f"Target primary key '{triplet['target_primary_key']}' "
+            f"not found in target_properties: {triplet['target_properties']}"
+        )
+
+    builder = builder or CypherBuilder()
+    builder.check_vertex_labels([triplet["source_label"], triplet["target_label"]])
+    builder.check_relationship_types(triplet["relationship_label"])
+    builder.quote(triplet["source_primary_key"])
+    builder.quote(triplet["target_primary_key"])
+
+
+def _format_date(value: str) -> str:
+    """Format date value to ensure it has a leading zero in the year."""
+    date_pattern = r"^(\d{3})-(\d{2})-(\d{2})(T[\d:]+Z)?$"
+    match = re.match(date_pattern, value)
+    if match:
+        year = match.group(1)
+        if len(year) == 3:
+            time_part = match.group(4) or ""
+            return f"0{year}-{match.group(2)}-{match.group(3)}{time_part}"
+    return value
+
+
+def _format_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Format the properties into the Cypher parameter values: numbers and booleans are kept,
+    the other values are stored as strings."""
+    formatted: Dict[str, Any] = {}
+    for key, value in properties.items():
+        if key in _DATE_PROPERTY_KEYS and isinstance(value, str):
+            value = _format_date(value)
+        if value is None or isinstance(value, bool | int | float):
+            formatted[key] = value
+        else:
+            formatted[key] = str(value)
+    return formatted
+
+
+def import_triplets(
     graph_db_service: GraphDbService,
-) -> Dict[str, List[Dict[str, Any]]]:
-    """Fetches all nodes and edges from the database and constructs a graph dictionary."""
-    store = graph_db_service.get_default_graph_db()
-    schema = graph_db_service.get_schema_metadata(
-        graph_db_config=graph_db_service.get_default_graph_db_config()
-    )
-    node_schema = schema.get("nodes", {})  # Safely get node schema part
-
-    with store.conn.session() as session:
-        # fetch all nodes
-        all_nodes_result = session.run("MATCH (n) RETURN n")
-        # fetch edges along with their start and end nodes
-        all_edges_result = session.run(
-            "MATCH (a)-[r]->(b) RETURN r, a AS start_node, b AS end_node"
+    triplets: List[Dict[str, Any]],
+    batch_size: Optional[int] = None,
+    builder: Optional[CypherBuilder] = None,
+) -> Dict[str, Any]:
+    """Import the validated triplets by parameterized `UNWIND $rows AS row MERGE ...` batches.
+
+    The triplets are grouped by their (source label, relationship label, target label) and the
+    primary keys, since the labels cannot be parameterized, and every group is imported in
+    batches of `GRAPH_DB_IMPORT_BATCH_SIZE` rows, each in an explicit write transaction. The
+    counts of the imported labels are queried once at the end.
+
+    Returns:
+        Dict[str, Any]: The import statistics, with the total counters, the per-batch counters,
+            the node/relationship counts of the imported labels and the total counts.
+    """
+    batch_size = max(batch_size or SystemEnv.GRAPH_DB_IMPORT_BATCH_SIZE or 1000, 1)
+    builder = builder or CypherBuilder()
+
+    groups: Dict[Tuple[str, str, str, str, str], List[Dict[str, Any]]] = {}
+    for triplet in triplets:
+        group_key = (
+            triplet["source_label"],
+            triplet["source_primary_key"],
+            triplet["relationship_label"],
+            triplet["target_label"],
+            triplet["target_primary_key"],
+        )
+        source_properties = _format_properties(triplet["source_properties"])
+        target_properties = _format_properties(triplet["target_properties"])
+        groups.setdefault(group_key, []).append(
+            {
+                "source_id": source_properties[triplet["source_primary_key"]],
+                "source_properties": source_properties,
+                "target_id": target_properties[triplet["target_primary_key"]],
+                "target_properties": target_properties,
+                "relationship_properties": _format_properties(triplet["relationship_properties"]),
+            }
         )
 
-        # construct the data graph
-        vertices = []
-        for record in all_nodes_result:
-            node = record.get("n")
-            if node:
-                node_labels = list(node.labels)
-                label = node_labels[0] if node_labels else ""
-                properties = dict(node.items())
-
-                # determine alias using schema's primary key
-                primary_key_prop = node_schema.get(label, {}).get("primary_key")
-                alias = node.element_id  # default alias is element_id
-                if primary_key_prop and primary_key_prop in properties:
-                    alias = properties[primary_key_prop]
-
-                vertices.append(
-                    {
-                        "id": node.element_id,  # use element_id for the main ID
-                        "label": label,
-                        "alias": alias,  # set alias based on primary key value
-                        "properties": properties,
-                    }
-                )
+    stats: Dict[str, Any] = {
+        "nodes_created": 0,
+        "properties_set": 0,
+        "relationships_created": 0,
+        "batches": [],
+    }
+    # the vertices and edges touched by the import, by element id
+    delta_vertices: Dict[str, Dict[str, Any]] = {}
+    delta_edges: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    store = graph_db_service.get_default_graph_db()
+    try:
+        with store.conn.session() as session:
+            for group_key, rows in groups.items():
+                source_label, source_pk, rel_label, target_label, target_pk = group_key
+                for start in range(0, len(rows), batch_size):
+                    batch_rows = rows[start : start + batch_size]
+                    statement = builder.merge_triplets(
+                        source_label, source_pk, rel_label, target_label, target_pk, batch_rows
+                    )
+                    records, counters = session.execute_write(_run_merge_batch, statement)
+                    for record in records:
+                        source = _vertex_to_dict(record["source"], source_pk)
+                        target = _vertex_to_dict(record["target"], target_pk)
+                        edge = _edge_to_dict(record["r"], record["source"], record["target"])
+                        delta_vertices[source["id"]] = source
+                        delta_vertices[target["id"]] = target
+                        delta_edges[(edge["source"], edge["target"], edge["label"])] = edge
+                    stats["nodes_created"] += counters.nodes_created
+                    stats["properties_set"] += counters.properties_set
+                    stats["relationships_created"] += counters.relationships_created
+                    stats["batches"].append(
+                        {
+                            "source_label": source_label,
+                            "relationship_label": rel_label,
+                            "target_label": target_label,
+                            "rows": len(batch_rows),
+                            "nodes_created": counters.nodes_created,
+                            "properties_set": counters.properties_set,
+                            "relationships_created": counters.relationships_created,
+                        }
+                    )
+
+            # the current counts of the imported labels, queried once for all the batches
+            node_labels = sorted({key[0] for key in groups} | {key[3] for key in groups})
+            rel_labels = sorted({key[2] for key in groups})
+            node_count_query = builder.count_vertices_by_labels(node_labels)
+            node_counts = {
+                record["label"]: record["count"]
+                for record in session.run(node_count_query.text, node_count_query.parameters)
+            }
+            rel_count_query = builder.count_relationships_by_types(rel_labels)
+            relationship_counts = {
+                record["label"]: record["count"]
+                for record in session.run(rel_count_query.text, rel_count_query.parameters)
+            }
+            total_nodes, total_relationships = _count_totals(session)
+    finally:
+        # even a partial import changes the data, so the cached projections are outdated
+        GdsProjectionManager().bump_write_version(graph_db_service)
+
+    stats["node_counts"] = {label: node_counts.get(label, 0) for label in node_labels}
+    stats["relationship_counts"] = {
+        label: relationship_counts.get(label, 0) for label in rel_labels
+    }
+    stats["total_nodes"] = total_nodes
+    stats["total_relationships"] = total_relationships
+    stats["graph_delta"] = {
+        "vertices": list(delta_vertices.values()),
+        "edges": list(delta_edges.values()),
+    }
+    return stats
+
+
+def _count_totals(session: Any) -> Tuple[int, int]:
+    """Count all the nodes and relationships of the graph from the count store."""
+    node_record = session.run(TOTAL_NODES_QUERY).single()
+    relationship_record = session.run(TOTAL_RELATIONSHIPS_QUERY).single()
+    return (
+        node_record["total_nodes"] if node_record else 0,
+        relationship_record["total_relationships"] if relationship_record else 0,
+    )
 
-        edges = []
-        for record in all_edges_result:
-            relationship = record.get("r")
-            start_node = record.get("start_node")
-            end_node = record.get("end_node")
-
-            if relationship and start_node and end_node:
-                properties = dict(relationship.items())
-                # determine alias: use 'id' property if exists, else use relationship type
-                alias = properties.get("id", relationship.type)
-
-                edges.append(
-                    {
-                        # use element_id of start/end nodes for source/target
-                        "source": start_node.element_id,
-                        "target": end_node.element_id,
-                        "label": relationship.type,
-                        "alias": alias,  # set alias based on 'id' property or type
-                        "properties": properties,
-                    }
-                )
 
-        return {"vertices": vertices, "edges": edges}
+def _run_merge_batch(tx: Any, statement: CypherStatement) -> Tuple[List[Any], Any]:
+    """Run a merge batch in the write transaction, returning its records and counters."""
+    result = tx.run(statement.text, statement.parameters)
+    records = list(result)
+    return records, result.consume().counters
+
+
+def _vertex_to_dict(node: Any, primary_key: Optional[str]) -> Dict[str, Any]:
+    """Convert a neo4j node into a vertex of the graph dict, aliased by its primary key."""
+    node_labels = list(node.labels)
+    properties = dict(node.items())
+    alias = node.element_id  # default alias is element_id
+    if primary_key and primary_key in properties:
+        alias = properties[primary_key]
+    return {
+        "id": node.element_id,  # use element_id for the main ID
+        "label": node_labels[0] if node_labels else "",
+        "alias": alias,  # set alias based on primary key value
+        "properties": properties,
+    }
+
+
+def _edge_to_dict(relationship: Any, start_node: Any, end_node: Any) -> Dict[str, Any]:
+    """Convert a neo4j relationship into an edge of the graph dict."""
+    properties = dict(relationship.items())
+    return {
+        # use element_id of start/end nodes for source/target
+        "source": start_node.element_id,
+        "target": end_node.element_id,
+        "label": relationship.type,
+        # determine alias: use 'id' property if exists, else use relationship type
+        "alias": properties.get("id", relationship.type),
+        "properties": properties,
+    }
 
 
 def update_graph_artifact(
@@ -658,11 +822,46 @@ def update_graph_artifact(
     job_id: str,
     data_graph_dict: Dict[str, List[Dict[str, Any]]],
     description: str = "It is the data graph.",
+    total_vertices: Optional[int] = None,
+    total_edges: Optional[int] = None,
 ) -> None:
-    """Saves the graph data as an artifact."""
+    """Saves the graph data as an artifact, merged into the graph artifact of the job.
+
+    The graph data can be a delta (e.g. the vertices and edges touched by an import), since it is
+    merged by the vertex ids and the edge endpoints. The artifact is a capped preview of at most
+    `GRAPH_ARTIFACT_MAX_VERTICES` vertices and `GRAPH_ARTIFACT_MAX_EDGES` edges: the vertices and
+    edges already shown are still updated, but the new ones beyond the caps are left out, and so
+    are the edges to the vertices left out. The preview counts (and the total counts of the
+    database if given) are recorded in `metadata_dict["preview"]`.
+    """
     artifacts: List[Artifact] = artifact_service.get_artifacts_by_job_id_and_type(
         job_id=job_id, content_type=ContentType.GRAPH
     )
+    current_graph = (artifacts[0].content if artifacts else None) or {"vertices": [], "edges": []}
+    data_graph_dict = cap_graph_delta(
+        current_graph=current_graph,
+        graph_delta=data_graph_dict,
+        max_vertices=SystemEnv.GRAPH_ARTIFACT_MAX_VERTICES or 0,
+        max_edges=SystemEnv.GRAPH_ARTIFACT_MAX_EDGES or 0,
+    )
+
+    # the preview counts of the merged graph
+    preview: Dict[str, Any] = {
+        "shown_vertices": len(
+            {v.get("id") for v in current_graph.get("vertices", [])}
+            | {v.get("id") for v in data_graph_dict.get("vertices", [])}
+        ),
+        "shown_edges": len(
+            {_edge_key(e) for e in current_graph.get("edges", [])}
+            | {_edge_key(e) for e in data_graph_dict.get("edges", [])}
+        ),
+    }
+    if total_vertices is not None and total_edges is not None:
+        preview["total_vertices"] = total_vertices
+        preview["total_edges"] = total_edges
+        preview["truncated"] = (
+            preview["shown_vertices"] < total_vertices or preview["shown_edges"] < total_edges
+        )
 
     if len(artifacts) == 0:
         artifact = Artifact(
@@ -670,11 +869,60 @@ def update_graph_artifact(
             content=data_graph_dict,
             source_reference=SourceReference(job_id=job_id, session_id=session_id),
             status=ArtifactStatus.FINISHED,
-            metadata=ArtifactMetadata(version=1, description=description),
+            metadata=ArtifactMetadata(
+                version=1, description=description, metadata_dict={"preview": preview}
+            ),
         )
         artifact_service.save_artifact(artifact=artifact)
     else:
+        artifacts[0].metadata.metadata_dict["preview"] = preview
         artifact_service.increment_and_save(
             artifact=artifacts[0],
             new_content=data_graph_dict,
         )
+
+
+def cap_graph_delta(
+    current_graph: Dict[str, Any],
+    graph_delta: Dict[str, List[Dict[str, Any]]],
+    max_vertices: int,
+    max_edges: int,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Cap the graph delta to merge into the current graph, so that the merged graph has at most
+    `max_vertices` vertices and `max_edges` edges (0 for no cap). The updates of the vertices and
+    edges in the current graph are always kept."""
+    if max_vertices <= 0 and max_edges <= 0:
+        return graph_delta
+
+    vertex_ids = {v.get("id") for v in current_graph.get("vertices", []) if isinstance(v, dict)}
+    vertex_room = max_vertices - len(vertex_ids) if max_vertices > 0 else None
+    vertices = []
+    for vertex in graph_delta.get("vertices", []):
+        if vertex.get("id") in vertex_ids:
+            vertices.append(vertex)
+        elif vertex_room is None or vertex_room > 0:
+            vertices.append(vertex)
+            vertex_ids.add(vertex.get("id"))
+            if vertex_room is not None:
+                vertex_room -= 1
+
+    edge_keys = {_edge_key(e) for e in current_graph.get("edges", []) if isinstance(e, dict)}
+    edge_room = max_edges - len(edge_keys) if max_edges > 0 else None
+    edges = []
+    for edge in graph_delta.get("edges", []):
+        if edge.get("source") not in vertex_ids or edge.get("target") not in vertex_ids:
+            continue
+        edge_key = _edge_key(edge)
+        if edge_key in edge_keys:
+            edges.append(edge)
+        elif edge_room is None or edge_room > 0:
+            edges.append(edge)
+            edge_keys.add(edge_key)
+            if edge_room is not None:
+                edge_room -= 1
+
+    return {"vertices": vertices, "edges": edges}
+
+
+def _edge_key(edge: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (str(edge.get("source")), str(edge.get("target")), str(edge.get("label")))
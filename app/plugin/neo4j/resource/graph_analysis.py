@@ -1,9 +1,11 @@
 import json
 from typing import Any, Dict, List, Optional, Union
-from uuid import uuid4
 
+from app.core.common.type import ToolConcurrency
 from app.core.service.graph_db_service import GraphDbService
 from app.core.toolkit.tool import Tool
+from app.plugin.neo4j.cypher_builder import CypherBuilder
+from app.plugin.neo4j.gds_projection_manager import GdsProjectionManager
 
 
 class AlgorithmsGetter(Tool):
@@ -14,6 +16,7 @@ class AlgorithmsGetter(Tool):
             name=self.get_algorithms.__name__,
             description=self.get_algorithms.__doc__ or "",
             function=self.get_algorithms,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def get_algorithms(self) -> str:
@@ -110,40 +113,39 @@ class PageRankExecutor(Tool):
             str: The result of the algorithm execution in JSON format.
         """  # noqa: E501
         store = graph_db_service.get_default_graph_db()
-        # generate a unique name for the graph projection
-        graph_name = f"pagerank_graph_{uuid4().hex[:8]}"
+        builder = CypherBuilder.from_graph_db_service(graph_db_service)
 
         result = {}
 
         try:
-            with store.conn.session() as session:
-                # step 1: Create graph projection
-                result["graph_creation"] = session.run(
-                    f"""
-                    CALL gds.graph.project(
-                        '{graph_name}',
-                        '{vertex_label}',
-                        '{relationship_type}'
-                    )
-                    YIELD graphName, nodeCount, relationshipCount
-                    RETURN graphName, nodeCount, relationshipCount
-                    """
-                ).data()
+            with (
+                GdsProjectionManager().projection(
+                    graph_db_service, builder, vertex_label, relationship_type
+                ) as projection,
+                store.conn.session() as session,
+            ):
+                # step 1: create graph projection (or reuse the cached one)
+                graph_name = projection["graphName"]
+                result["graph_creation"] = [projection]
 
                 # step 2: Execute PageRank algorithm
+                config = {
+                    "maxIterations": int(iterations),
+                    "dampingFactor": float(damping_factor),
+                    "tolerance": float(tolerance),
+                }
                 pagerank_result = session.run(
-                    f"""
-                    CALL gds.pageRank.stream('{graph_name}', {{
-                        maxIterations: {iterations},
-                        dampingFactor: {damping_factor},
-                        tolerance: {tolerance}
-                    }})
+                    """
+                    CALL gds.pageRank.stream($graph_name, $config)
                     YIELD nodeId, score
                     WITH gds.util.asNode(nodeId) AS node, score
                     RETURN node.name AS name, node.id AS id, labels(node) AS labels, score
                     ORDER BY score DESC
-                    LIMIT {top_n}
-                    """
+                    LIMIT $top_n
+                    """,
+                    graph_name=graph_name,
+                    config=config,
+                    top_n=int(top_n),
                 ).data()
 
                 # Clean up result for better readability
@@ -161,38 +163,18 @@ class PageRankExecutor(Tool):
 
                 # step 3: Get algorithm statistics
                 stats = session.run(
-                    f"""
-                    CALL gds.pageRank.stats('{graph_name}', {{
-                        maxIterations: {iterations},
-                        dampingFactor: {damping_factor},
-                        tolerance: {tolerance}
-                    }})
+                    """
+                    CALL gds.pageRank.stats($graph_name, $config)
                     YIELD ranIterations, didConverge, preProcessingMillis, computeMillis, postProcessingMillis
                     RETURN ranIterations, didConverge, preProcessingMillis, computeMillis, postProcessingMillis
-                    """  # noqa: E501
+                    """,  # noqa: E501
+                    graph_name=graph_name,
+                    config=config,
                 ).data()
 
                 result["algorithm_stats"] = stats[0] if stats else {}
 
-                # step 4: Remove graph projection
-                drop_result = session.run(
-                    f"""
-                    CALL gds.graph.drop('{graph_name}')
-                    YIELD graphName
-                    RETURN graphName
-                    """
-                ).data()
-
-                result["graph_removal"] = drop_result
-
         except Exception as e:
-            # in case of errors, try to clean up the graph projection
-            try:
-                with store.conn.session() as session:
-                    session.run(f"CALL gds.graph.drop('{graph_name}', false)")
-            except Exception:
-                pass
-
             result["error"] = str(e)
 
         # return results as JSON string
@@ -224,7 +206,7 @@ class BetweennessCentralityExecutor(Tool):
         2. execute the betweenness centrality algorithm on the projected graph
         3. retrieve the top-ranked nodes based on betweenness score
         4. gather statistics about the algorithm execution
-        5. remove the graph projection
+        5. release the graph projection, which is cached for the next calls
 
         example cypher queries executed (for a graph with Person nodes and BELONGS_TO relationships):
         - create projection:
@@ -237,8 +219,6 @@ class BetweennessCentralityExecutor(Tool):
           ORDER BY score DESC LIMIT 10
         - get statistics:
           CALL gds.betweenness.stats('betweenness_graph_12345678', {samplingSize: 100})
-        - remove projection:
-          CALL gds.graph.drop('betweenness_graph_12345678')
 
         Args:
             vertex_label (str): Label of nodes to include in calculation, "*" for all nodes.
@@ -250,37 +230,35 @@ class BetweennessCentralityExecutor(Tool):
             str: The result of the algorithm execution in JSON format.
         """  # noqa: E501
         store = graph_db_service.get_default_graph_db()
-        # generate a unique name for the graph projection
-        graph_name = f"betweenness_graph_{uuid4().hex[:8]}"
+        builder = CypherBuilder.from_graph_db_service(graph_db_service)
 
         result = {}
 
         try:
-            with store.conn.session() as session:
-                # step 1: create graph projection
-                result["graph_creation"] = session.run(
-                    f"""
-                    CALL gds.graph.project(
-                        '{graph_name}',
-                        '{vertex_label}',
-                        '{relationship_type}'
-                    )
-                    YIELD graphName, nodeCount, relationshipCount
-                    RETURN graphName, nodeCount, relationshipCount
-                    """
-                ).data()
+            with (
+                GdsProjectionManager().projection(
+                    graph_db_service, builder, vertex_label, relationship_type
+                ) as projection,
+                store.conn.session() as session,
+            ):
+                # step 1: create graph projection (or reuse the cached one)
+                graph_name = projection["graphName"]
+                result["graph_creation"] = [projection]
 
                 # step 2: execute betweenness centrality algorithm
-                sampling_config = f"{{samplingSize: {sample_size}}}" if sample_size > 0 else "{}"
+                sampling_config = {"samplingSize": int(sample_size)} if sample_size > 0 else {}
                 betweenness_result = session.run(
-                    f"""
-                    CALL gds.betweenness.stream('{graph_name}', {sampling_config})
+                    """
+                    CALL gds.betweenness.stream($graph_name, $config)
                     YIELD nodeId, score
                     WITH gds.util.asNode(nodeId) AS node, score
                     RETURN node.name AS name, node.id AS id, labels(node) AS labels, score
                     ORDER BY score DESC
-                    LIMIT {top_n}
-                    """
+                    LIMIT $top_n
+                    """,
+                    graph_name=graph_name,
+                    config=sampling_config,
+                    top_n=int(top_n),
                 ).data()
 
                 # clean up result for better readability
@@ -298,34 +276,18 @@ class BetweennessCentralityExecutor(Tool):
 
                 # step 3: get algorithm statistics
                 stats = session.run(
-                    f"""
-                    CALL gds.betweenness.stats('{graph_name}', {sampling_config})
+                    """
+                    CALL gds.betweenness.stats($graph_name, $config)
                     YIELD preProcessingMillis, computeMillis, postProcessingMillis
                     RETURN preProcessingMillis, computeMillis, postProcessingMillis
-                    """
+                    """,
+                    graph_name=graph_name,
+                    config=sampling_config,
                 ).data()
 
                 result["algorithm_stats"] = stats[0] if stats else {}
 
-                # step 4: remove graph projection
-                drop_result = session.run(
-                    f"""
-                    CALL gds.graph.drop('{graph_name}')
-                    YIELD graphName
-                    RETURN graphName
-                    """
-                ).data()
-
-                result["graph_removal"] = drop_result
-
         except Exception as e:
-            # in case of errors, try to clean up the graph projection
-            try:
-                with store.conn.session() as session:
-                    session.run(f"CALL gds.graph.drop('{graph_name}', false)")
-            except Exception:
-                pass
-
             result["error"] = str(e)
 
         # return results as json string
@@ -360,7 +322,7 @@ class LouvainExecutor(Tool):
         2. execute the louvain community detection algorithm on the projected graph
         3. retrieve community assignments for nodes
         4. gather statistics about the algorithm execution
-        5. remove the graph projection
+        5. release the graph projection, which is cached for the next calls
 
         example cypher queries executed (for a graph with Person and Location nodes, and BELONGS_TO relationships):
         - create projection:
@@ -378,8 +340,6 @@ class LouvainExecutor(Tool):
           ORDER BY communityId, name LIMIT 10
         - get statistics:
           CALL gds.louvain.stats('louvain_graph_12345678')
-        - remove projection:
-          CALL gds.graph.drop('louvain_graph_12345678')
 
         Args:
             vertex_label (str): Label of nodes to include in calculation, "*" for all nodes.
@@ -394,35 +354,31 @@ class LouvainExecutor(Tool):
             str: The result of the algorithm execution in JSON format.
         """  # noqa: E501
         store = graph_db_service.get_default_graph_db()
-        # generate a unique name for the graph projection
-        graph_name = f"louvain_graph_{uuid4().hex[:8]}"
+        builder = CypherBuilder.from_graph_db_service(graph_db_service)
 
         result = {}
 
         try:
-            with store.conn.session() as session:
-                # step 1: create graph projection
-                result["graph_creation"] = session.run(
-                    f"""
-                    CALL gds.graph.project(
-                        '{graph_name}',
-                        '{vertex_label}',
-                        '{relationship_type}'
-                    )
-                    YIELD graphName, nodeCount, relationshipCount
-                    RETURN graphName, nodeCount, relationshipCount
-                    """
-                ).data()
+            with (
+                GdsProjectionManager().projection(
+                    graph_db_service, builder, vertex_label, relationship_type
+                ) as projection,
+                store.conn.session() as session,
+            ):
+                # step 1: create graph projection (or reuse the cached one)
+                graph_name = projection["graphName"]
+                result["graph_creation"] = [projection]
 
                 # step 2: execute louvain algorithm
+                config = {
+                    "includeIntermediateCommunities": bool(include_intermediate_communities),
+                    "maxLevels": int(max_levels),
+                    "maxIterations": int(max_iterations),
+                    "tolerance": float(tolerance),
+                }
                 louvain_result = session.run(
-                    f"""
-                    CALL gds.louvain.stream('{graph_name}', {{
-                        includeIntermediateCommunities: {str(include_intermediate_communities).lower()},
-                        maxLevels: {max_levels},
-                        maxIterations: {max_iterations},
-                        tolerance: {tolerance}
-                    }})
+                    """
+                    CALL gds.louvain.stream($graph_name, $config)
                     YIELD nodeId, communityId, intermediateCommunityIds
                     WITH gds.util.asNode(nodeId) AS node, communityId, intermediateCommunityIds
                     RETURN 
@@ -432,8 +388,11 @@ class LouvainExecutor(Tool):
                         communityId,
                         intermediateCommunityIds
                     ORDER BY communityId, name
-                    LIMIT {top_n}
-                    """  # noqa: E501
+                    LIMIT $top_n
+                    """,
+                    graph_name=graph_name,
+                    config=config,
+                    top_n=int(top_n),
                 ).data()
 
                 # clean up result for better readability
@@ -452,59 +411,35 @@ class LouvainExecutor(Tool):
 
                 # step 3: get community distribution statistics
                 community_stats = session.run(
-                    f"""
-                    CALL gds.louvain.stream('{graph_name}', {{
-                        includeIntermediateCommunities: false,
-                        maxLevels: {max_levels},
-                        maxIterations: {max_iterations},
-                        tolerance: {tolerance}
-                    }})
+                    """
+                    CALL gds.louvain.stream($graph_name, $config)
                     YIELD nodeId, communityId
                     RETURN 
                         communityId, 
                         count(*) AS communitySize
                     ORDER BY communitySize DESC
                     LIMIT 10
-                    """
+                    """,
+                    graph_name=graph_name,
+                    config={**config, "includeIntermediateCommunities": False},
                 ).data()
 
                 result["community_stats"] = community_stats
 
                 # step 4: get algorithm execution statistics
                 stats = session.run(
-                    f"""
-                    CALL gds.louvain.stats('{graph_name}', {{
-                        includeIntermediateCommunities: {str(include_intermediate_communities).lower()},
-                        maxLevels: {max_levels},
-                        maxIterations: {max_iterations},
-                        tolerance: {tolerance}
-                    }})
+                    """
+                    CALL gds.louvain.stats($graph_name, $config)
                     YIELD preProcessingMillis, computeMillis, postProcessingMillis, communityCount, modularity, modularities
                     RETURN preProcessingMillis, computeMillis, postProcessingMillis, communityCount, modularity, modularities
-                    """  # noqa: E501
+                    """,  # noqa: E501
+                    graph_name=graph_name,
+                    config=config,
                 ).data()
 
                 result["algorithm_stats"] = stats[0] if stats else {}
 
-                # step 5: remove graph projection
-                drop_result = session.run(
-                    f"""
-                    CALL gds.graph.drop('{graph_name}')
-                    YIELD graphName
-                    RETURN graphName
-                    """
-                ).data()
-
-                result["graph_removal"] = drop_result
-
         except Exception as e:
-            # in case of errors, try to clean up the graph projection
-            try:
-                with store.conn.session() as session:
-                    session.run(f"CALL gds.graph.drop('{graph_name}', false)")
-            except Exception:
-                pass
-
             result["error"] = str(e)
 
         # return results as json string
@@ -538,7 +473,7 @@ class LabelPropagationExecutor(Tool):
         2. execute the label propagation algorithm on the projected graph
         3. retrieve community assignments for nodes
         4. gather statistics about the algorithm execution and community distribution
-        5. remove the graph projection
+        5. release the graph projection, which is cached for the next calls
 
         example cypher queries executed (for a graph with Event nodes and AFFECTS relationships):
         - create projection:
@@ -553,8 +488,6 @@ class LabelPropagationExecutor(Tool):
           ORDER BY communityId, name LIMIT 10
         - get statistics:
           CALL gds.labelPropagation.stats('labelprop_graph_12345678', {maxIterations: 10})
-        - remove projection:
-          CALL gds.graph.drop('labelprop_graph_12345678')
 
         Args:
             vertex_label (str): Label of nodes to include in calculation, "*" for all nodes.
@@ -568,56 +501,42 @@ class LabelPropagationExecutor(Tool):
             str: The result of the algorithm execution in JSON format.
         """  # noqa: E501
         store = graph_db_service.get_default_graph_db()
-        # generate a unique name for the graph projection
-        graph_name = f"labelprop_graph_{uuid4().hex[:8]}"
+        builder = CypherBuilder.from_graph_db_service(graph_db_service)
 
         result = {}
 
+        # add relationship properties config if weight property is specified
+        projection_config: Dict[str, Any] = {}
+        if weight_property:
+            projection_config["relationshipProperties"] = {
+                weight_property: {"property": weight_property, "defaultValue": 1.0}
+            }
+
         try:
-            with store.conn.session() as session:
+            with (
+                GdsProjectionManager().projection(
+                    graph_db_service, builder, vertex_label, relationship_type, projection_config
+                ) as projection,
+                store.conn.session() as session,
+            ):
                 # step 1: create graph projection with relationship properties if needed
-                projection_query = f"""
-                CALL gds.graph.project(
-                    '{graph_name}',
-                    '{vertex_label}',
-                    '{relationship_type}'
-                """
-
-                # add relationship properties config if weight property is specified
-                if weight_property:
-                    projection_query += f""",
-                    {{
-                        relationshipProperties: {{
-                            '{weight_property}': {{
-                                property: '{weight_property}',
-                                defaultValue: 1.0
-                            }}
-                        }}
-                    }}
-                """
-
-                projection_query += """)
-                YIELD graphName, nodeCount, relationshipCount
-                RETURN graphName, nodeCount, relationshipCount
-                """
-
-                result["graph_creation"] = session.run(projection_query).data()
+                # (or reuse the cached one)
+                graph_name = projection["graphName"]
+                result["graph_creation"] = [projection]
 
                 # step 2: build configuration for label propagation
-                config_params = [f"maxIterations: {max_iterations}"]
+                config: Dict[str, Any] = {"maxIterations": int(max_iterations)}
 
                 if weight_property:
-                    config_params.append(f"relationshipWeightProperty: '{weight_property}'")
+                    config["relationshipWeightProperty"] = weight_property
 
                 if seed_property:
-                    config_params.append(f"seedProperty: '{seed_property}'")
-
-                config = "{" + ", ".join(config_params) + "}"
+                    config["seedProperty"] = seed_property
 
                 # step 3: execute label propagation algorithm
                 lp_result = session.run(
-                    f"""
-                    CALL gds.labelPropagation.stream('{graph_name}', {config})
+                    """
+                    CALL gds.labelPropagation.stream($graph_name, $config)
                     YIELD nodeId, communityId
                     WITH gds.util.asNode(nodeId) AS node, communityId
                     RETURN 
@@ -626,8 +545,11 @@ class LabelPropagationExecutor(Tool):
                         labels(node) AS labels, 
                         communityId
                     ORDER BY communityId, name
-                    LIMIT {top_n}
-                    """
+                    LIMIT $top_n
+                    """,
+                    graph_name=graph_name,
+                    config=config,
+                    top_n=int(top_n),
                 ).data()
 
                 # clean up result for better readability
@@ -645,49 +567,35 @@ class LabelPropagationExecutor(Tool):
 
                 # step 4: get community distribution statistics
                 community_stats = session.run(
-                    f"""
-                    CALL gds.labelPropagation.stream('{graph_name}', {config})
+                    """
+                    CALL gds.labelPropagation.stream($graph_name, $config)
                     YIELD nodeId, communityId
                     RETURN 
                         communityId, 
                         count(*) AS communitySize
                     ORDER BY communitySize DESC
                     LIMIT 10
-                    """
+                    """,
+                    graph_name=graph_name,
+                    config=config,
                 ).data()
 
                 result["community_stats"] = community_stats
 
                 # step 5: get algorithm execution statistics
                 stats = session.run(
-                    f"""
-                    CALL gds.labelPropagation.stats('{graph_name}', {config})
+                    """
+                    CALL gds.labelPropagation.stats($graph_name, $config)
                     YIELD preProcessingMillis, computeMillis, postProcessingMillis, communityCount, didConverge, ranIterations
                     RETURN preProcessingMillis, computeMillis, postProcessingMillis, communityCount, didConverge, ranIterations
-                    """  # noqa: E501
+                    """,  # noqa: E501
+                    graph_name=graph_name,
+                    config=config,
                 ).data()
 
                 result["algorithm_stats"] = stats[0] if stats else {}
 
-                # step 6: remove graph projection
-                drop_result = session.run(
-                    f"""
-                    CALL gds.graph.drop('{graph_name}')
-                    YIELD graphName
-                    RETURN graphName
-                    """
-                ).data()
-
-                result["graph_removal"] = drop_result
-
         except Exception as e:
-            # in case of errors, try to clean up the graph projection
-            try:
-                with store.conn.session() as session:
-                    session.run(f"CALL gds.graph.drop('{graph_name}', false)")
-            except Exception:
-                pass
-
             result["error"] = str(e)
 
         # return results as json string
@@ -721,7 +629,7 @@ class ShortestPathExecutor(Tool):
         2. execute the dijkstra shortest path algorithm between the specified start and end nodes
         3. retrieve the path details including nodes and relationships in the path
         4. gather statistics about the algorithm execution
-        5. remove the graph projection
+        5. release the graph projection, which is cached for the next calls
 
         example cypher queries executed (for a graph with LOCATION nodes and BELONGS_TO relationships):
         - create projection with relationship property:
@@ -756,8 +664,6 @@ class ShortestPathExecutor(Tool):
             })
             YIELD totalCost
             RETURN min(totalCost) AS minCost, max(totalCost) AS maxCost, count(*) AS pathCount
-        - remove projection:
-          CALL gds.graph.drop('shortestpath_graph_123456')
 
         Args:
             start_node_id (str): ID of the starting point node, not the elementId.
@@ -771,120 +677,65 @@ class ShortestPathExecutor(Tool):
             str: The result of the algorithm execution in JSON format.
         """  # noqa: E501
         store = graph_db_service.get_default_graph_db()
-        # generate a unique name for the graph projection
-        graph_name = f"shortestpath_graph_{uuid4().hex[:8]}"
+        builder = CypherBuilder.from_graph_db_service(graph_db_service)
 
         result = {}
 
+        # determine if we need to add relationship properties
+        projection_config: Dict[str, Any] = {}
+        if weight_property:
+            # use proper format for relationship properties with default value
+            projection_config["relationshipProperties"] = {
+                "weight": {"property": weight_property, "defaultValue": 1.0}
+            }
+
         try:
-            with store.conn.session() as session:
+            with (
+                GdsProjectionManager().projection(
+                    graph_db_service, builder, vertex_label, relationship_type, projection_config
+                ) as projection,
+                store.conn.session() as session,
+            ):
                 # step 1: create graph projection with relationship properties if needed
-                projection_query = ""
+                # (or reuse the cached one)
+                graph_name = projection["graphName"]
+                result["graph_creation"] = [projection]
 
-                # determine if we need to add relationship properties
-                if weight_property:
-                    # use proper format for relationship properties with default value
-                    projection_query = f"""
-                    CALL gds.graph.project(
-                        '{graph_name}',
-                        '{vertex_label}',
-                        '{relationship_type}',
-                        {{
-                            relationshipProperties: {{
-                                weight: {{
-                                    property: '{weight_property}',
-                                    defaultValue: 1.0
-                                }}
-                            }}
-                        }}
-                    )
-                    YIELD graphName, nodeCount, relationshipCount
-                    RETURN graphName, nodeCount, relationshipCount
-                    """
-                else:
-                    # create projection without relationship properties
-                    projection_query = f"""
-                    CALL gds.graph.project(
-                        '{graph_name}',
-                        '{vertex_label}',
-                        '{relationship_type}'
-                    )
-                    YIELD graphName, nodeCount, relationshipCount
-                    RETURN graphName, nodeCount, relationshipCount
-                    """
-
-                result["graph_creation"] = session.run(projection_query).data()
-
-                # step 2: first find the node objects based on their IDs
+                # step 2: find the internal IDs of the nodes based on their IDs, which GDS
+                # requires instead of the elementId strings
                 # convert end_node_id to list if it's a single value
                 target_ids = end_node_id if isinstance(end_node_id, list) else [end_node_id]
-
-                # find source node using elementId()
-                source_node_query = f"""
-                MATCH (source)
-                WHERE source.id = '{start_node_id}'
-                RETURN elementId(source) AS sourceNodeId
-                """
-                source_result = session.run(source_node_query).data()
-                if not source_result:
+                internal_ids: Dict[Any, int] = {}
+                for record in session.run(
+                    "MATCH (n) WHERE n.id IN $ids RETURN n.id AS id, id(n) AS internalId",
+                    ids=[start_node_id, *target_ids],
+                ):
+                    internal_ids.setdefault(record["id"], record["internalId"])
+
+                if start_node_id not in internal_ids:
                     raise ValueError(f"Source node with id '{start_node_id}' not found")
-                source_node_id = source_result[0]["sourceNodeId"]
-
-                # find target nodes using elementId()
-                target_node_ids = []
-                for target_id in target_ids:
-                    target_node_query = f"""
-                    MATCH (target)
-                    WHERE target.id = '{target_id}'
-                    RETURN elementId(target) AS targetNodeId
-                    """
-                    target_result = session.run(target_node_query).data()
-                    if target_result:
-                        target_node_ids.append(target_result[0]["targetNodeId"])
+                source_internal_id = internal_ids[start_node_id]
 
-                if not target_node_ids:
+                target_internal_ids = [
+                    internal_ids[target_id] for target_id in target_ids if target_id in internal_ids
+                ]
+                if not target_internal_ids:
                     raise ValueError("No target nodes found with the provided IDs")
 
                 # step 3: build configuration for shortest path
-                # GDS requires the internal node ID, not the elementId string.
-                # We need to match the nodes again within the CALL block or pass the internal IDs.
-                # Passing internal IDs directly is cleaner if we fetch them first.
-                # However, GDS procedures often accept the node object itself or its elementId.
-                # Let's try passing elementId strings directly first, as it's simpler.
-                # If that fails, we'll need to adjust to pass internal IDs or node objects.
-
-                # re-fetch internal IDs for GDS call
-                source_internal_id_query = (
-                    f"MATCH (n) WHERE elementId(n) = '{source_node_id}' RETURN id(n) AS internalId"
-                )
-                source_internal_id = session.run(source_internal_id_query).single()["internalId"]
-
-                target_internal_ids = []
-                for target_node_id_str in target_node_ids:
-                    target_internal_id_query = (
-                        "MATCH (n) WHERE elementId(n) = "
-                        f"'{target_node_id_str}' RETURN id(n) AS internalId"
-                    )
-                    target_internal_id = session.run(target_internal_id_query).single()[
-                        "internalId"
-                    ]
-                    target_internal_ids.append(target_internal_id)
-
-                config_params = [
-                    f"sourceNode: {source_internal_id}",
-                    f"targetNodes: {target_internal_ids}",
-                ]
+                config: Dict[str, Any] = {
+                    "sourceNode": source_internal_id,
+                    "targetNodes": target_internal_ids,
+                }
 
                 if weight_property:
-                    config_params.append("relationshipWeightProperty: 'weight'")
-
-                config = "{" + ", ".join(config_params) + "}"
+                    config["relationshipWeightProperty"] = "weight"
 
                 # step 4: execute shortest path algorithm using dijkstra
                 if path_details:
                     path_result = session.run(
-                        f"""
-                        CALL gds.shortestPath.dijkstra.stream('{graph_name}', {config})
+                        """
+                        CALL gds.shortestPath.dijkstra.stream($graph_name, $config)
                         YIELD index, sourceNode, targetNode, totalCost, nodeIds, costs, path
                         RETURN 
                             index,
@@ -896,12 +747,14 @@ class ShortestPathExecutor(Tool):
                             [nodeId IN nodeIds | gds.util.asNode(nodeId).name] AS nodeNames,
                             [nodeId IN nodeIds | gds.util.asNode(nodeId).id] AS nodeIds,
                             costs
-                        """
+                        """,
+                        graph_name=graph_name,
+                        config=config,
                     ).data()
                 else:
                     path_result = session.run(
-                        f"""
-                        CALL gds.shortestPath.dijkstra.stream('{graph_name}', {config})
+                        """
+                        CALL gds.shortestPath.dijkstra.stream($graph_name, $config)
                         YIELD sourceNode, targetNode, totalCost
                         RETURN 
                             gds.util.asNode(sourceNode).name AS sourceNodeName,
@@ -909,41 +762,27 @@ class ShortestPathExecutor(Tool):
                             gds.util.asNode(targetNode).name AS targetNodeName,
                             gds.util.asNode(targetNode).id AS targetNodeId,
                             totalCost
-                        """
+                        """,
+                        graph_name=graph_name,
+                        config=config,
                     ).data()
 
                 result["path_results"] = path_result
 
                 # step 5: get algorithm execution statistics
                 stats = session.run(
-                    f"""
-                    CALL gds.shortestPath.dijkstra.stream('{graph_name}', {config})
+                    """
+                    CALL gds.shortestPath.dijkstra.stream($graph_name, $config)
                     YIELD totalCost
                     RETURN min(totalCost) AS minCost, max(totalCost) AS maxCost, count(*) AS pathCount
-                    """  # noqa: E501
+                    """,  # noqa: E501
+                    graph_name=graph_name,
+                    config=config,
                 ).data()
 
                 result["algorithm_stats"] = stats[0] if stats else {}
 
-                # step 6: remove graph projection
-                drop_result = session.run(
-                    f"""
-                    CALL gds.graph.drop('{graph_name}')
-                    YIELD graphName
-                    RETURN graphName
-                    """
-                ).data()
-
-                result["graph_removal"] = drop_result
-
         except Exception as e:
-            # in case of errors, try to clean up the graph projection
-            try:
-                with store.conn.session() as session:
-                    session.run(f"CALL gds.graph.drop('{graph_name}', false)")
-            except Exception:
-                pass
-
             result["error"] = str(e)
 
         # return results as json string
@@ -977,7 +816,7 @@ class NodeSimilarityExecutor(Tool):
         2. execute the node similarity algorithm to find similar nodes based on their relationships
         3. retrieve the top similar node pairs with their similarity scores
         4. gather statistics about the algorithm execution
-        5. remove the graph projection
+        5. release the graph projection, which is cached for the next calls
 
         example cypher queries executed (for a graph with Person nodes and AFFECTS relationships):
         - create projection:
@@ -1003,8 +842,6 @@ class NodeSimilarityExecutor(Tool):
             })
             YIELD preProcessingMillis, computeMillis, postProcessingMillis, similarityPairs, similarityDistribution
             RETURN preProcessingMillis, computeMillis, postProcessingMillis, similarityPairs, similarityDistribution
-        - remove projection:
-            CALL gds.graph.drop('similarity_graph_12345678')
 
         Args:
             vertex_label (str): Label of nodes to include in calculation, "*" for all nodes.
@@ -1018,37 +855,32 @@ class NodeSimilarityExecutor(Tool):
             str: The result of the algorithm execution in JSON format.
         """  # noqa: E501
         store = graph_db_service.get_default_graph_db()
-        # generate a unique name for the graph projection
-        graph_name = f"similarity_graph_{uuid4().hex[:8]}"
+        builder = CypherBuilder.from_graph_db_service(graph_db_service)
 
         result = {}
 
         try:
-            with store.conn.session() as session:
-                # step 1: create graph projection
-                result["graph_creation"] = session.run(
-                    f"""
-                    CALL gds.graph.project(
-                        '{graph_name}',
-                        '{vertex_label}',
-                        '{relationship_type}'
-                    )
-                    YIELD graphName, nodeCount, relationshipCount
-                    RETURN graphName, nodeCount, relationshipCount
-                    """
-                ).data()
+            with (
+                GdsProjectionManager().projection(
+                    graph_db_service, builder, vertex_label, relationship_type
+                ) as projection,
+                store.conn.session() as session,
+            ):
+                # step 1: create graph projection (or reuse the cached one)
+                graph_name = projection["graphName"]
+                result["graph_creation"] = [projection]
 
                 # step 2: build configuration for node similarity
-                config = f"""{{
-                    topK: {top_k},
-                    similarityCutoff: {similarity_cutoff},
-                    degreeCutoff: {degree_cutoff}
-                }}"""
+                config = {
+                    "topK": int(top_k),
+                    "similarityCutoff": float(similarity_cutoff),
+                    "degreeCutoff": int(degree_cutoff),
+                }
 
                 # step 3: execute node similarity algorithm
                 similarity_result = session.run(
-                    f"""
-                    CALL gds.nodeSimilarity.stream('{graph_name}', {config})
+                    """
+                    CALL gds.nodeSimilarity.stream($graph_name, $config)
                     YIELD node1, node2, similarity
                     WITH 
                         gds.util.asNode(node1) AS first_node,
@@ -1063,8 +895,11 @@ class NodeSimilarityExecutor(Tool):
                         labels(second_node) AS second_node_labels,
                         similarity
                     ORDER BY similarity DESC, first_node_name, second_node_name
-                    LIMIT {top_n}
-                    """
+                    LIMIT $top_n
+                    """,
+                    graph_name=graph_name,
+                    config=config,
+                    top_n=int(top_n),
                 ).data()
 
                 # clean up result for better readability
@@ -1089,34 +924,18 @@ class NodeSimilarityExecutor(Tool):
 
                 # step 4: get algorithm execution statistics
                 stats = session.run(
-                    f"""
-                    CALL gds.nodeSimilarity.stats('{graph_name}', {config})
+                    """
+                    CALL gds.nodeSimilarity.stats($graph_name, $config)
                     YIELD preProcessingMillis, computeMillis, postProcessingMillis, similarityPairs, similarityDistribution
                     RETURN preProcessingMillis, computeMillis, postProcessingMillis, similarityPairs, similarityDistribution
-                    """  # noqa: E501
+                    """,  # noqa: E501
+                    graph_name=graph_name,
+                    config=config,
                 ).data()
 
                 result["algorithm_stats"] = stats[0] if stats else {}
 
-                # step 5: remove graph projection
-                drop_result = session.run(
-                    f"""
-                    CALL gds.graph.drop('{graph_name}')
-                    YIELD graphName
-                    RETURN graphName
-                    """
-                ).data()
-
-                result["graph_removal"] = drop_result
-
         except Exception as e:
-            # in case of errors, try to clean up the graph projection
-            try:
-                with store.conn.session() as session:
-                    session.run(f"CALL gds.graph.drop('{graph_name}', false)")
-            except Exception:
-                pass
-
             result["error"] = str(e)
 
         # return results as json string
@@ -1171,16 +990,17 @@ class CommonNeighborsExecutor(Tool):
             str: The result of the algorithm execution in JSON format.
         """  # noqa: E501
         store = graph_db_service.get_default_graph_db()
+        builder = CypherBuilder.from_graph_db_service(graph_db_service)
         result: Dict[str, Any] = {}
 
         try:
             with store.conn.session() as session:
                 # step 1: get node details and common neighbors count
-                node_label_clause = "" if vertex_label == "*" else f":{vertex_label}"
+                node_label_clause = builder.vertex_label_filter(vertex_label)
 
                 common_neighbors_query = f"""
-                MATCH (n1{node_label_clause} {{id: '{node1_id}'}})
-                MATCH (n2{node_label_clause} {{id: '{node2_id}'}})
+                MATCH (n1{node_label_clause} {{id: $node1_id}})
+                MATCH (n2{node_label_clause} {{id: $node2_id}})
                 RETURN 
                     gds.alpha.linkprediction.commonNeighbors(n1, n2) AS commonNeighborsCount,
                     n1.name AS node1_name, 
@@ -1191,7 +1011,9 @@ class CommonNeighborsExecutor(Tool):
                     labels(n2) AS node2_labels
                 """
 
-                common_neighbors_result = session.run(common_neighbors_query).data()
+                common_neighbors_result = session.run(
+                    common_neighbors_query, node1_id=node1_id, node2_id=node2_id
+                ).data()
 
                 if not common_neighbors_result:
                     raise ValueError(
@@ -1217,9 +1039,9 @@ class CommonNeighborsExecutor(Tool):
 
                 # step 2: get common neighbors details if requested and relationship type is specified  # noqa: E501
                 if include_neighbor_details and relationship_type:
-                    rel_type = f":{relationship_type}"
+                    rel_type = builder.relationship_type_filter(relationship_type)
                     neighbors_query = f"""
-                    MATCH (n1 {{id: '{node1_id}'}})-[{rel_type}]-(common)-[{rel_type}]-(n2 {{id: '{node2_id}'}})
+                    MATCH (n1 {{id: $node1_id}})-[{rel_type}]-(common)-[{rel_type}]-(n2 {{id: $node2_id}})
                     RETURN 
                         common.name AS neighbor_name, 
                         common.id AS neighbor_id, 
@@ -1227,7 +1049,9 @@ class CommonNeighborsExecutor(Tool):
                     ORDER BY neighbor_name
                     """  # noqa: E501
 
-                    neighbors_details = session.run(neighbors_query).data()
+                    neighbors_details = session.run(
+                        neighbors_query, node1_id=node1_id, node2_id=node2_id
+                    ).data()
 
                     # clean up result for better readability
                     cleaned_neighbors: List[Dict[str, Any]] = []
@@ -1275,7 +1099,7 @@ class KMeansExecutor(Tool):
         2. execute the k-means algorithm to cluster nodes based on their properties
         3. retrieve node cluster assignments and centroids
         4. gather statistics about the algorithm execution and cluster distribution
-        5. remove the graph projection
+        5. release the graph projection, which is cached for the next calls
 
         example cypher queries executed (for a graph with Location nodes with latitude and longitude properties):
         - create projection:
@@ -1300,8 +1124,6 @@ class KMeansExecutor(Tool):
           LIMIT 10
         - get statistics:
           CALL gds.beta.kmeans.stats('kmeans_graph_12345678', {k: 3, ...})
-        - remove projection:
-          CALL gds.graph.drop('kmeans_graph_12345678')
 
         Args:
             vertex_label (str): Label of nodes to include in clustering, "*" for all nodes.
@@ -1315,46 +1137,41 @@ class KMeansExecutor(Tool):
             str: The result of the algorithm execution in JSON format.
         """  # noqa: E501
         store = graph_db_service.get_default_graph_db()
-        # generate a unique name for the graph projection
-        graph_name = f"kmeans_graph_{uuid4().hex[:8]}"
+        builder = CypherBuilder.from_graph_db_service(graph_db_service)
 
         # default to empty list if node_properties is None
         if node_properties is None:
             node_properties = []
 
-        # convert node properties list to string for cypher query
-        properties_str = str(node_properties).replace("'", '"')
-
         result: Dict[str, Any] = {}
 
         try:
-            with store.conn.session() as session:
-                # step 1: create graph projection with node properties
-                projection_query = f"""
-                CALL gds.graph.project(
-                    '{graph_name}',
-                    '{vertex_label}',
-                    '*',
-                    {{nodeProperties: {properties_str}}}
-                )
-                YIELD graphName, nodeCount, relationshipCount
-                RETURN graphName, nodeCount, relationshipCount
-                """
-
-                result["graph_creation"] = session.run(projection_query).data()
+            with (
+                GdsProjectionManager().projection(
+                    graph_db_service,
+                    builder,
+                    vertex_label,
+                    "*",
+                    {"nodeProperties": node_properties},
+                ) as projection,
+                store.conn.session() as session,
+            ):
+                # step 1: create graph projection with node properties (or reuse the cached one)
+                graph_name = projection["graphName"]
+                result["graph_creation"] = [projection]
 
                 # step 2: build configuration for k-means
-                config = f"""{{
-                    k: {k},
-                    maxIterations: {max_iterations},
-                    randomSeed: {seed},
-                    nodeProperties: {properties_str}
-                }}"""
+                config = {
+                    "k": int(k),
+                    "maxIterations": int(max_iterations),
+                    "randomSeed": int(seed),
+                    "nodeProperties": node_properties,
+                }
 
                 # step 3: execute k-means algorithm
                 kmeans_result = session.run(
-                    f"""
-                    CALL gds.beta.kmeans.stream('{graph_name}', {config})
+                    """
+                    CALL gds.beta.kmeans.stream($graph_name, $config)
                     YIELD nodeId, communityId
                     WITH gds.util.asNode(nodeId) AS node, communityId
                     RETURN 
@@ -1363,12 +1180,25 @@ class KMeansExecutor(Tool):
                         labels(node) AS labels, 
                         communityId
                     ORDER BY communityId, name
-                    LIMIT {top_n}
-                    """
+                    LIMIT $top_n
+                    """,
+                    graph_name=graph_name,
+                    config=config,
+                    top_n=int(top_n),
                 ).data()
 
                 # add node properties to the result if provided
                 if node_properties:
+                    # get the node properties of all the returned nodes at once
+                    node_props: Dict[Any, List[Any]] = {}
+                    for props_record in session.run(
+                        "MATCH (n) WHERE n.id IN $ids "
+                        "RETURN n.id AS id, [key IN $keys | n[key]] AS values",
+                        ids=[record.get("id") for record in kmeans_result],
+                        keys=node_properties,
+                    ):
+                        node_props.setdefault(props_record["id"], props_record["values"])
+
                     # clean up result with properties
                     cleaned_result = []
                     for record in kmeans_result:
@@ -1381,16 +1211,9 @@ class KMeansExecutor(Tool):
                         }
 
                         # get node properties if available
-                        node_props_result = session.run(
-                            f"""
-                            MATCH (n) WHERE n.id = '{cleaned_record["id"]}'
-                            RETURN {", ".join([f"n.{prop} AS {prop}" for prop in node_properties])}
-                            """
-                        ).data()
-
-                        if node_props_result:
-                            for prop in node_properties:
-                                cleaned_record["properties"][prop] = node_props_result[0].get(prop)
+                        values = node_props.get(record.get("id"))
+                        if values is not None:
+                            cleaned_record["properties"] = dict(zip(node_properties, values))
 
                         cleaned_result.append(cleaned_record)
                 else:
@@ -1409,25 +1232,29 @@ class KMeansExecutor(Tool):
 
                 # step 4: get cluster distribution statistics
                 cluster_stats = session.run(
-                    f"""
-                    CALL gds.beta.kmeans.stream('{graph_name}', {config})
+                    """
+                    CALL gds.beta.kmeans.stream($graph_name, $config)
                     YIELD nodeId, communityId
                     RETURN 
                         communityId, 
                         count(*) AS clusterSize
                     ORDER BY clusterSize DESC
-                    """
+                    """,
+                    graph_name=graph_name,
+                    config=config,
                 ).data()
 
                 result["cluster_stats"] = cluster_stats
 
                 # step 5: get algorithm execution statistics
                 stats = session.run(
-                    f"""
-                    CALL gds.beta.kmeans.stats('{graph_name}', {config})
+                    """
+                    CALL gds.beta.kmeans.stats($graph_name, $config)
                     YIELD preProcessingMillis, computeMillis, postProcessingMillis, k, didConverge, ranIterations
                     RETURN preProcessingMillis, computeMillis, postProcessingMillis, k, didConverge, ranIterations
-                    """  # noqa: E501
+                    """,  # noqa: E501
+                    graph_name=graph_name,
+                    config=config,
                 ).data()
 
                 result["algorithm_stats"] = stats[0] if stats else {}
@@ -1435,35 +1262,19 @@ class KMeansExecutor(Tool):
                 # step 6: get centroids if node properties are provided
                 if node_properties:
                     centroids = session.run(
-                        f"""
-                        CALL gds.beta.kmeans.stats('{graph_name}', {config})
+                        """
+                        CALL gds.beta.kmeans.stats($graph_name, $config)
                         YIELD centroids
                         RETURN centroids
-                        """
+                        """,
+                        graph_name=graph_name,
+                        config=config,
                     ).data()
 
                     if centroids and centroids[0].get("centroids"):
                         result["centroids"] = centroids[0]["centroids"]
 
-                # step 7: remove graph projection
-                drop_result = session.run(
-                    f"""
-                    CALL gds.graph.drop('{graph_name}')
-                    YIELD graphName
-                    RETURN graphName
-                    """
-                ).data()
-
-                result["graph_removal"] = drop_result
-
         except Exception as e:
-            # in case of errors, try to clean up the graph projection
-            try:
-                with store.conn.session() as session:
-                    session.run(f"CALL gds.graph.drop('{graph_name}', false)")
-            except Exception:
-                pass
-
             result["error"] = str(e)
 
         # return results as json string
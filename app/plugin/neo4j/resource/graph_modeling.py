@@ -1,5 +1,6 @@
 from typing import Any, Dict, List, Set, Union
 
+from app.core.common.type import ToolConcurrency
 from app.core.model.artifact import (
     Artifact,
     ArtifactMetadata,
@@ -11,6 +12,7 @@ from app.core.service.artifact_service import ArtifactService
 from app.core.service.file_service import FileService
 from app.core.service.graph_db_service import GraphDbService
 from app.core.toolkit.tool import Tool
+from app.plugin.neo4j.cypher_builder import CypherBuilder, CypherStatement
 from app.plugin.neo4j.resource.data_importation import update_graph_artifact
 
 
@@ -22,6 +24,7 @@ class DocumentReader(Tool):
             name=self.read_document.__name__,
             description=self.read_document.__doc__ or "",
             function=self.read_document,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def read_document(self, file_service: FileService, file_id: str) -> str:
@@ -96,20 +99,16 @@ class VertexLabelAdder(Tool):
             ```
         """
 
-        statements = []
+        # the label is new, so it is validated but not whitelisted
+        builder = CypherBuilder()
+        statements: List[CypherStatement] = []
 
-        statements.append(
-            f"CREATE CONSTRAINT {label.lower()}_{primary}_unique IF NOT EXISTS "
-            f"FOR (n:{label}) REQUIRE n.{primary} IS UNIQUE"
-        )
+        statements.append(builder.create_vertex_unique_constraint(label, primary))
 
         # create indexes for other properties
         for prop in properties:
             if prop.get("index", True) and prop["name"] != primary:
-                statements.append(
-                    f"CREATE INDEX {label}_{prop['name']}_idx IF NOT EXISTS "
-                    f"FOR (n:{label}) ON (n.{prop['name']})"
-                )
+                statements.append(builder.create_vertex_index(label, prop["name"]))
 
         # prepare schema information
         property_details = []
@@ -126,8 +125,8 @@ class VertexLabelAdder(Tool):
         store = graph_db_service.get_default_graph_db()
         with store.conn.session() as session:
             for statement in statements:
-                print(f"Executing statement: {statement}")
-                session.run(statement)
+                print(f"Executing statement: {statement.text}")
+                session.run(statement.text, statement.parameters)
 
             # update schema file
             schema = graph_db_service.get_schema_metadata(
@@ -245,22 +244,16 @@ class EdgeLabelAdder(Tool):
         # end of validation
 
         label = label.upper()
-        statements = []
+        builder = CypherBuilder()
+        statements: List[CypherStatement] = []
 
         # create the constraints for the relationship
-        statements.append(
-            f"CREATE CONSTRAINT {label.lower()}_{primary}_unique IF NOT EXISTS "
-            f"FOR ()-[r:{label}]-() "
-            f"REQUIRE r.{primary} IS UNIQUE"
-        )
+        statements.append(builder.create_relationship_unique_constraint(label, primary))
 
         # create indexes for other properties
         for prop in properties:
             if prop.get("index", True) and prop["name"] != primary:
-                statements.append(
-                    f"CREATE INDEX {label}_{prop['name']}_idx IF NOT EXISTS "
-                    f"FOR ()-[r:{label}]-() ON (r.{prop['name']})"
-                )
+                statements.append(builder.create_relationship_index(label, prop["name"]))
 
         # prepare schema information
         property_details = []
@@ -282,8 +275,8 @@ class EdgeLabelAdder(Tool):
         store = graph_db_service.get_default_graph_db()
         with store.conn.session() as session:
             for statement in statements:
-                print(f"Executing statement: {statement}")
-                session.run(statement)
+                print(f"Executing statement: {statement.text}")
+                session.run(statement.text, statement.parameters)
 
         # update schema file
         schema = graph_db_service.get_schema_metadata(
@@ -345,6 +338,7 @@ class GraphReachabilityGetter(Tool):
             name=self.calculate_and_get_graph_reachability.__name__,
             description=self.calculate_and_get_graph_reachability.__doc__ or "",
             function=self.calculate_and_get_graph_reachability,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def calculate_and_get_graph_reachability(self, graph_db_service: GraphDbService) -> str:
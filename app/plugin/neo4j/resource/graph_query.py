@@ -4,9 +4,18 @@ from typing import Any, Dict, List, Set
 
 from neo4j.graph import Node, Path, Relationship
 
+from app.core.common.system_env import SystemEnv
+from app.core.model.artifact import (
+    Artifact,
+    ArtifactMetadata,
+    ArtifactStatus,
+    ContentType,
+    SourceReference,
+)
 from app.core.service.artifact_service import ArtifactService
 from app.core.service.graph_db_service import GraphDbService
 from app.core.toolkit.tool import Tool
+from app.plugin.neo4j.gds_projection_manager import GdsProjectionManager
 from app.plugin.neo4j.resource.data_importation import update_graph_artifact
 
 
@@ -27,13 +36,21 @@ class CypherExecutor(Tool):
         session_id: str,
         job_id: str,
         cypher_query: str,
+        return_artifact_handle: bool = False,
     ) -> str:
         """Execute a Cypher query directly against the Neo4j database.
 
+        At most a limited number of records are read, and the textual results are truncated to a
+        limited size, with the counts of what was omitted. Use LIMIT or aggregations in the query
+        to get the relevant data instead of large results.
+
         Args:
             session_id (str): The session ID
             job_id (str): The job ID
             cypher_query (str): The Cypher query to execute
+            return_artifact_handle (bool): Whether to save the result records as an artifact and
+                return its handle with a summary, instead of the records inline. Use it when the
+                records are not needed in the conversation (default: False).
 
         Returns:
             str: Query execution results
@@ -43,7 +60,14 @@ class CypherExecutor(Tool):
             >>> result = await executor.execute_cypher("session_id_xxx", "job_id_xxx", cypher_query)
         """
         store = graph_db_service.get_default_graph_db()
-        text_results = []  # for the textual representation
+        max_rows: int = SystemEnv.CYPHER_RESULT_MAX_ROWS or 0
+        max_bytes: int = SystemEnv.CYPHER_RESULT_MAX_BYTES or 0
+
+        text_results: List[str] = []  # for the textual representation
+        text_bytes = 0
+        omitted_text_rows = 0
+        row_count = 0
+        has_more_rows = False
         # initialize graph data following the standard structure
         graph_data: Dict[str, List[Dict[str, Any]]] = {
             "vertices": [],
@@ -59,44 +83,43 @@ class CypherExecutor(Tool):
         )
         node_schema = schema.get("nodes", {})
 
-        with store.conn.session() as session:
+        # fetch just one record more than the limit, to know whether the result is truncated
+        fetch_size = min(max_rows + 1, 1000) if max_rows > 0 else 1000
+        with store.conn.session(fetch_size=fetch_size) as session:
             try:
                 result = session.run(cypher_query)
-                records = list(result)  # consume the result iterator
 
-                # process each record to extract nodes and relationships
-                for record in records:
-                    for value in record.values():
+                # stream the records, building the graph data and the text in a single pass
+                for record in result:
+                    if max_rows > 0 and row_count >= max_rows:
+                        has_more_rows = True
+                        break
+                    row_count += 1
+
+                    record_dict = {}
+                    for key, value in record.items():
                         _process_value(
                             value, graph_data, node_schema, processed_nodes, processed_rels
                         )
+                        record_dict[key] = _format_value(value)
 
-                # build a textual representation of the results
-                for record in records:  # iterate again for text formatting
-                    record_dict = {}
-                    for key, value in record.items():
-                        if isinstance(value, Node):
-                            node_id = value.element_id if hasattr(value, "element_id") else value.id
-                            label = list(value.labels)[0] if value.labels else "Unknown"
-                            props = dict(value.items())
-                            record_dict[key] = f"({node_id}:{label} {props})"
-                        elif isinstance(value, Relationship):
-                            rel_id = value.element_id if hasattr(value, "element_id") else value.id
-                            props = dict(value.items())
-                            # simplified text representation
-                            record_dict[key] = f"[:{value.type} {{id: {rel_id}, props: {props}}}]"
-                        elif isinstance(value, Path):
-                            # simple path representation for text
-                            record_dict[key] = " -> ".join(
-                                [f"({n.element_id})" for n in value.nodes]
-                            )
-                        else:
-                            # handle primitive values or other complex types as strings
-                            try:
-                                record_dict[key] = json.dumps(value, ensure_ascii=False)
-                            except TypeError:
-                                record_dict[key] = str(value)
-                    text_results.append(str(record_dict))
+                    record_str = str(record_dict)
+                    record_bytes = len(record_str.encode("utf-8")) + 1
+                    if (
+                        return_artifact_handle
+                        or max_bytes <= 0
+                        or text_bytes + record_bytes <= max_bytes
+                    ):
+                        text_results.append(record_str)
+                        text_bytes += record_bytes
+                    else:
+                        omitted_text_rows += 1
+
+                # discard the records not read, instead of streaming them from the server
+                summary_counters = result.consume().counters
+                if summary_counters.contains_updates:
+                    # the written data outdates the cached graph projections of the analysis
+                    GdsProjectionManager().bump_write_version(graph_db_service)
 
                 if graph_data["vertices"] or graph_data["edges"]:
                     update_graph_artifact(
@@ -107,16 +130,58 @@ class CypherExecutor(Tool):
                         description="Graph generated from Cypher query results.",
                     )
 
+                summary = (
+                    f"共读取 {row_count} 条记录，包含 {len(graph_data['vertices'])} 个节点、"
+                    f"{len(graph_data['edges'])} 条关系。"
+                )
+                if has_more_rows:
+                    summary += f"结果超过 {max_rows} 条记录的上限，其余记录未读取。"
+
+                if return_artifact_handle:
+                    artifact = Artifact(
+                        content_type=ContentType.JSON,
+                        content=text_results,
+                        source_reference=SourceReference(job_id=job_id, session_id=session_id),
+                        status=ArtifactStatus.FINISHED,
+                        metadata=ArtifactMetadata(
+                            version=1,
+                            description=f"Records of the Cypher query: {cypher_query}",
+                            metadata_dict={
+                                "row_count": row_count,
+                                "truncated": has_more_rows,
+                            },
+                        ),
+                    )
+                    artifact_id = artifact_service.save_artifact(artifact=artifact)
+                    return (
+                        f"Cypher查询执行成功。\n查询语句：\n{cypher_query}\n{summary}\n"
+                        f"查询结果已保存为 artifact，handle: artifact:{artifact_id}"
+                    )
+
                 if not text_results:
-                    result_str = "没有查询到数据。"
+                    result_str = "没有查询到数据。" if row_count == 0 else ""
                 else:
                     result_str = "\n".join(text_results)  # use the formatted text results
+                if omitted_text_rows:
+                    result_str += (
+                        f"\n...（结果超过 {max_bytes} 字节的上限，"
+                        f"省略了 {omitted_text_rows} 条记录）"
+                    )
 
-                # include GraphJSON in the final string output
+                # include GraphJSON in the final string output if it fits in the size limit
                 graph_json_str = json.dumps(graph_data, indent=4, ensure_ascii=False)
+                if (
+                    (graph_data["vertices"] or graph_data["edges"])
+                    and max_bytes > 0
+                    and text_bytes + len(graph_json_str.encode("utf-8")) > max_bytes
+                ):
+                    graph_json_str = (
+                        f"（GraphJSON 超过 {max_bytes} 字节的上限，已省略，"
+                        "节点与关系已保存到图 artifact）"
+                    )
                 return (
-                    f"Cypher查询执行成功。\n查询语句：\n{cypher_query}\n查询结果：\n{result_str}\n"
-                    f"GraphJSON：\n{graph_json_str}"
+                    f"Cypher查询执行成功。\n查询语句：\n{cypher_query}\n{summary}\n"
+                    f"查询结果：\n{result_str}\nGraphJSON：\n{graph_json_str}"
                 )
 
             except Exception as e:
@@ -128,6 +193,28 @@ class CypherExecutor(Tool):
                 )
 
 
+def _format_value(value: Any) -> str:
+    """Formats a value of a query record as text."""
+    if isinstance(value, Node):
+        node_id = value.element_id if hasattr(value, "element_id") else value.id
+        label = list(value.labels)[0] if value.labels else "Unknown"
+        props = dict(value.items())
+        return f"({node_id}:{label} {props})"
+    if isinstance(value, Relationship):
+        rel_id = value.element_id if hasattr(value, "element_id") else value.id
+        props = dict(value.items())
+        # simplified text representation
+        return f"[:{value.type} {{id: {rel_id}, props: {props}}}]"
+    if isinstance(value, Path):
+        # simple path representation for text
+        return " -> ".join([f"({n.element_id})" for n in value.nodes])
+    # handle primitive values or other complex types as strings
+    try:
+        return json.dumps(value, ensure_ascii=False)
+    except TypeError:
+        return str(value)
+
+
 def _get_node_alias(node: Node, node_schema: Dict[str, Any]) -> str:
     """Determines the alias for a node based on the schema's primary key."""
     node_id = node.element_id if hasattr(node, "element_id") else str(node.id)
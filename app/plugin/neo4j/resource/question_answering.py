@@ -1,3 +1,4 @@
+from app.core.common.type import ToolConcurrency
 from app.core.service.knowledge_base_service import KnowledgeBaseService
 from app.core.toolkit.tool import Tool
 
@@ -10,6 +11,7 @@ class KnowledgeBaseRetriever(Tool):
             name=self.knowledge_base_search.__name__,
             description=self.knowledge_base_search.__doc__ or "",
             function=self.knowledge_base_search,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def knowledge_base_search(
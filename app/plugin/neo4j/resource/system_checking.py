@@ -1,4 +1,5 @@
 
+from app.core.common.type import ToolConcurrency
 from app.core.model.graph_db_config import GraphDbConfig
 from app.core.service.graph_db_service import GraphDbService
 from app.core.toolkit.tool import Tool
@@ -12,6 +13,7 @@ class SystemStatusChecker(Tool):
             name=self.query_system_status.__name__,
             description=self.query_system_status.__doc__ or "",
             function=self.query_system_status,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def query_system_status(self, graph_db_service: GraphDbService) -> str:
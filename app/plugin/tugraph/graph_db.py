@@ -1,7 +1,9 @@
-from neo4j import GraphDatabase
+from neo4j import Driver, GraphDatabase
 
+from app.core.common.system_env import SystemEnv
 from app.core.model.graph_db_config import TuGraphDbConfig
 from app.core.toolkit.graph_db.graph_db import GraphDb
+from app.core.toolkit.graph_db.graph_db_driver_registry import GraphDbDriverRegistry
 
 
 class TuGraphDb(GraphDb[TuGraphDbConfig]):
@@ -13,8 +15,23 @@ class TuGraphDb(GraphDb[TuGraphDbConfig]):
     @property
     def conn(self):
         """Get the database connection."""
-        if not self._driver:
-            self._driver = GraphDatabase.driver(
-                self._config.uri, auth=(self._config.user, self._config.pwd)
+        if self._config.id:
+            return GraphDbDriverRegistry().get_driver(
+                key=self._config.id,
+                fingerprint=(self._config.uri, self._config.user, self._config.pwd),
+                factory=self._create_driver,
+                health_check=lambda driver: driver.verify_connectivity(),
             )
+
+        if not self._driver:
+            self._driver = self._create_driver()
         return self._driver
+
+    def _create_driver(self) -> Driver:
+        return GraphDatabase.driver(
+            self._config.uri,
+            auth=(self._config.user, self._config.pwd),
+            max_connection_pool_size=SystemEnv.GRAPH_DB_POOL_SIZE,
+            connection_acquisition_timeout=SystemEnv.GRAPH_DB_POOL_ACQUISITION_TIMEOUT,
+            max_connection_lifetime=SystemEnv.GRAPH_DB_POOL_MAX_CONNECTION_LIFETIME,
+        )
@@ -3,6 +3,7 @@ import re
 from typing import Any, Dict, List
 
 from app.core.common.system_env import SystemEnv
+from app.core.common.type import ToolConcurrency
 from app.core.model.message import ModelMessage
 from app.core.model.task import ToolCallContext
 from app.core.reasoner.model_service_factory import ModelServiceFactory
@@ -176,6 +177,7 @@ class DocumentReader(Tool):
             name=self.read_document.__name__,
             description=self.read_document.__doc__ or "",
             function=self.read_document,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def read_document(self, doc_name: str, chapter_name: str) -> str:
@@ -200,6 +202,7 @@ class SchemaGetter(Tool):
             name=self.get_schema.__name__,
             description=self.get_schema.__doc__ or "",
             function=self.get_schema,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def get_schema(self, graph_db_service: GraphDbService) -> str:
@@ -1,6 +1,7 @@
 import json
 from typing import Dict, List
 
+from app.core.common.type import ToolConcurrency
 from app.core.service.graph_db_service import GraphDbService
 from app.core.toolkit.tool import Tool
 
@@ -13,6 +14,7 @@ class AlgorithmsGetter(Tool):
             name=self.get_algorithms.__name__,
             description=self.get_algorithms.__doc__ or "",
             function=self.get_algorithms,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def get_algorithms(self, grapb_db_service: GraphDbService) -> str:
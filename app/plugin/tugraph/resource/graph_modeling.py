@@ -2,6 +2,7 @@ import json
 from typing import Dict, List, Optional, Set, Union
 
 from app.core.common.system_env import SystemEnv
+from app.core.common.type import ToolConcurrency
 from app.core.model.message import ModelMessage
 from app.core.model.task import ToolCallContext
 from app.core.reasoner.model_service_factory import ModelServiceFactory
@@ -353,6 +354,7 @@ class DocumentReader(Tool):
             name=self.read_document.__name__,
             description=self.read_document.__doc__ or "",
             function=self.read_document,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def read_document(self, doc_name: str, chapter_name: str) -> str:
@@ -595,6 +597,7 @@ class GraphReachabilityGetter(Tool):
             name=self.get_graph_reachability.__name__,
             description=self.get_graph_reachability.__doc__ or "",
             function=self.get_graph_reachability,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def get_graph_reachability(self, graph_db_service: GraphDbService) -> str:
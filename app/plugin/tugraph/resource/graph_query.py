@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, List
 
+from app.core.common.type import ToolConcurrency
 from app.core.service.graph_db_service import GraphDbService
 from app.core.toolkit.tool import Tool
 
@@ -21,6 +22,7 @@ class SchemaGetter(Tool):
             name=self.get_schema.__name__,
             description=self.get_schema.__doc__ or "",
             function=self.get_schema,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def get_schema(self, graph_db_service: GraphDbService) -> str:
@@ -50,6 +52,7 @@ class GrammerReader(Tool):
             name=self.read_grammer.__name__,
             description=self.read_grammer.__doc__ or "",
             function=self.read_grammer,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def read_grammer(self) -> str:
@@ -75,6 +78,7 @@ class VertexQuerier(Tool):
             name=self.query_vertex.__name__,
             description=self.query_vertex.__doc__ or "",
             function=self.query_vertex,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     def _format_value(self, value: Any) -> str:
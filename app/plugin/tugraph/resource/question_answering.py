@@ -1,5 +1,6 @@
 from typing import List, Tuple
 
+from app.core.common.type import ToolConcurrency
 from app.core.toolkit.tool import Tool
 
 TUGRAPH_DOC = [
@@ -140,6 +141,7 @@ class KnowledgeBaseRetriever(Tool):
             name=self.knowledge_base_search.__name__,
             description=self.knowledge_base_search.__doc__ or "",
             function=self.knowledge_base_search,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def knowledge_base_search(self, question: str) -> Tuple[List[str], List[str]]:
@@ -164,6 +166,7 @@ class InternetRetriever(Tool):
             name=self.internet_search.__name__,
             description=self.internet_search.__doc__ or "",
             function=self.internet_search,
+            concurrency=ToolConcurrency.PARALLEL,
         )
 
     async def internet_search(self, question: str) -> Tuple[List[str], List[str]]:
@@ -5,6 +5,7 @@ from flask_cors import CORS  # type: ignore
 import pyfiglet  # type: ignore
 
 from app.core.central_orchestrator.central_orchestrator import CentralOrchestrator
+from app.core.dal.database import remove_thread_session
 from app.core.dal.init_db import init_db
 from app.core.sdk.agentic_service import AgenticService
 from app.server.api import register_blueprints
@@ -45,6 +46,11 @@ def create_app():
 
     register_blueprints(app)
 
+    @app.teardown_appcontext
+    def remove_db_session(_exception=None):
+        # every request thread reads by its own db session, close it after the request
+        remove_thread_session()
+
     @app.errorhandler(Exception)
     def handle_base_exception(e: Exception):
         return make_error(e)
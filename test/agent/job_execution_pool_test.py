@@ -0,0 +1,91 @@
+import threading
+from typing import List
+
+import pytest
+
+from app.core.agent.job_execution_pool import JobExecutionPool
+from app.core.common.system_env import SystemEnv
+
+
+def _new_pool(pool_size: int, expert_limits: str = "") -> JobExecutionPool:
+    """Create a pool outside of the singleton, with the given limits."""
+    original = (SystemEnv.JOB_EXECUTION_POOL_SIZE, SystemEnv.JOB_EXPERT_CONCURRENCY_LIMITS)
+    SystemEnv.JOB_EXECUTION_POOL_SIZE = pool_size
+    SystemEnv.JOB_EXPERT_CONCURRENCY_LIMITS = expert_limits
+    try:
+        pool = object.__new__(JobExecutionPool)
+        pool.__init__()
+    finally:
+        SystemEnv.JOB_EXECUTION_POOL_SIZE, SystemEnv.JOB_EXPERT_CONCURRENCY_LIMITS = original
+    return pool
+
+
+def test_queued_tasks_are_dispatched_round_robin_across_sessions():
+    pool = _new_pool(pool_size=1)
+    started = threading.Event()
+    release = threading.Event()
+    order: List[str] = []
+
+    def task(name: str) -> str:
+        order.append(name)
+        if name == "a1":
+            started.set()
+            release.wait(timeout=5)
+        return name
+
+    futures = [pool.submit("s1", "expert", task, "a1")]
+    assert started.wait(timeout=5)
+    futures += [pool.submit("s1", "expert", task, name) for name in ("a2", "a3")]
+    futures += [pool.submit("s2", "expert", task, name) for name in ("b1", "b2")]
+    release.set()
+
+    assert [f.result(timeout=5) for f in futures] == ["a1", "a2", "a3", "b1", "b2"]
+    # the second session is served between the tasks of the first one
+    assert order == ["a1", "a2", "b1", "a3", "b2"]
+    pool.shutdown()
+
+
+def test_expert_concurrency_limit_lets_other_experts_run():
+    pool = _new_pool(pool_size=2, expert_limits="Slow Expert:1")
+    release = threading.Event()
+    running: List[str] = []
+
+    def task(name: str) -> str:
+        running.append(name)
+        if name == "slow1":
+            release.wait(timeout=5)
+        return name
+
+    slow1 = pool.submit("s1", "Slow Expert", task, "slow1")
+    slow2 = pool.submit("s1", "Slow Expert", task, "slow2")
+    fast = pool.submit("s1", "Fast Expert", task, "fast")
+
+    # the second slow task waits for the first one, the other expert does not
+    assert fast.result(timeout=5) == "fast"
+    assert not slow2.done()
+    release.set()
+    assert slow1.result(timeout=5) == "slow1"
+    assert slow2.result(timeout=5) == "slow2"
+    assert running.index("fast") < running.index("slow2")
+    pool.shutdown()
+
+
+def test_shutdown_cancels_queued_tasks_and_rejects_new_ones():
+    pool = _new_pool(pool_size=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking() -> None:
+        started.set()
+        release.wait(timeout=5)
+
+    running = pool.submit("s1", "expert", blocking)
+    assert started.wait(timeout=5)
+    queued = pool.submit("s1", "expert", lambda: None)
+
+    threading.Timer(0.1, release.set).start()
+    pool.shutdown()
+
+    assert running.done() and queued.cancelled()
+    with pytest.raises(RuntimeError):
+        pool.submit("s1", "expert", lambda: None)
@@ -0,0 +1,225 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from app.core.agent.job_execution_pool import JobExecutionPool
+from app.core.agent.leader import Leader
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+from app.core.common.type import WorkflowStatus
+from app.core.model.job_graph import JobGraph
+from app.core.model.message import AgentMessage, WorkflowMessage
+
+
+class _FakeSubJob:
+    def __init__(self, job_id: str, expert_id: str):
+        self.id = job_id
+        self.expert_id = expert_id
+        self.session_id = "session"
+
+
+class _FakeExpert:
+    def __init__(self, name: str):
+        self._name = name
+
+    def get_profile(self) -> "_FakeExpert":
+        return self
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+
+class _FakeLeaderState:
+    def get_expert_by_id(self, expert_id: str) -> _FakeExpert:
+        return _FakeExpert(expert_id)
+
+
+class _FakeJobService:
+    """Keeps the job graph in memory, replacing a single vertex like the job service does."""
+
+    def __init__(self, edges: List[Tuple[str, str]], vertices: Tuple[str, ...] = ()):
+        self.job_graph = JobGraph()
+        for vertex in vertices:
+            self.job_graph.add_vertex(vertex)
+        for u, v in edges:
+            self.job_graph.add_edge(u, v)
+        self.experts: Dict[str, str] = {}
+        self.removed_job_ids: List[str] = []
+
+    def get_job_graph(self, original_job_id: str) -> JobGraph:
+        return self.job_graph
+
+    def get_subjob(self, subjob_id: str) -> _FakeSubJob:
+        return _FakeSubJob(subjob_id, self.experts.get(subjob_id, "Expert"))
+
+    def remove_subjob(self, original_job_id: str, job_id: str) -> None:
+        self.removed_job_ids.append(job_id)
+
+    def replace_subgraph(
+        self, original_job_id: str, new_subgraph: JobGraph, old_subgraph: JobGraph
+    ) -> None:
+        (old_id,) = old_subgraph.vertices()
+        predecessors = self.job_graph.predecessors(old_id)
+        successors = self.job_graph.successors(old_id)
+        self.job_graph.remove_vertex(old_id)
+        self.job_graph.update(new_subgraph)
+        new_ids = new_subgraph.vertices()
+        for pred_id in predecessors:
+            self.job_graph.add_edge(pred_id, new_ids[0])
+        for succ_id in successors:
+            self.job_graph.add_edge(new_ids[-1], succ_id)
+
+
+def _result(job_id: str, status: WorkflowStatus, lesson: Optional[str] = None) -> AgentMessage:
+    return AgentMessage(
+        job_id=job_id,
+        workflow_messages=[
+            WorkflowMessage(payload={"status": status, "job_id": job_id}, job_id=job_id)
+        ],
+        lesson=lesson,
+    )
+
+
+def _new_leader(
+    monkeypatch,
+    job_service: _FakeJobService,
+    execute_job: Callable[[_FakeExpert, AgentMessage], AgentMessage],
+    pool_size: int = 4,
+    expert_limits: str = "",
+) -> Leader:
+    """Create a leader scheduling on a fresh pool, with the subjob execution replaced."""
+    original = (SystemEnv.JOB_EXECUTION_POOL_SIZE, SystemEnv.JOB_EXPERT_CONCURRENCY_LIMITS)
+    SystemEnv.JOB_EXECUTION_POOL_SIZE = pool_size
+    SystemEnv.JOB_EXPERT_CONCURRENCY_LIMITS = expert_limits
+    try:
+        pool = object.__new__(JobExecutionPool)
+        pool.__init__()
+    finally:
+        SystemEnv.JOB_EXECUTION_POOL_SIZE, SystemEnv.JOB_EXPERT_CONCURRENCY_LIMITS = original
+    monkeypatch.setitem(Singleton._instances, JobExecutionPool, pool)
+
+    leader = object.__new__(Leader)
+    leader._job_service = job_service
+    leader._leader_state = _FakeLeaderState()
+    leader._execute_job = execute_job
+    return leader
+
+
+def test_subjob_is_dispatched_after_its_last_predecessor_with_their_results(monkeypatch):
+    job_service = _FakeJobService(edges=[("a", "c"), ("b", "c")])
+    b_started = threading.Event()
+    inputs: Dict[str, List[str]] = {}
+    order: List[str] = []
+
+    def execute_job(expert: _FakeExpert, message: AgentMessage) -> AgentMessage:
+        job_id = message.get_job_id()
+        order.append(job_id)
+        inputs[job_id] = [m.job_id for m in message.get_workflow_messages()]
+        if job_id == "a":
+            # the predecessors run concurrently
+            assert b_started.wait(timeout=5)
+        elif job_id == "b":
+            b_started.set()
+        return _result(job_id, WorkflowStatus.SUCCESS)
+
+    leader = _new_leader(monkeypatch, job_service, execute_job)
+    leader.execute_job_graph(original_job_id="original")
+
+    assert order[-1] == "c"
+    assert sorted(inputs["c"]) == ["a", "b"]
+    assert inputs["a"] == inputs["b"] == []
+
+
+def test_input_data_error_re_executes_the_predecessors_with_the_lesson(monkeypatch):
+    job_service = _FakeJobService(edges=[("a", "b")])
+    calls: List[Tuple[str, Optional[str]]] = []
+
+    def execute_job(expert: _FakeExpert, message: AgentMessage) -> AgentMessage:
+        job_id = message.get_job_id()
+        calls.append((job_id, message.get_lesson()))
+        if job_id == "b" and len(calls) == 2:
+            return _result(job_id, WorkflowStatus.INPUT_DATA_ERROR, lesson="fix the input")
+        return _result(job_id, WorkflowStatus.SUCCESS)
+
+    leader = _new_leader(monkeypatch, job_service, execute_job)
+    leader.execute_job_graph(original_job_id="original")
+
+    assert calls == [("a", None), ("b", None), ("a", "fix the input"), ("b", None)]
+    assert job_service.removed_job_ids == ["a"]
+
+
+def test_too_complicated_subjob_is_expanded_before_its_successors(monkeypatch):
+    job_service = _FakeJobService(edges=[("a", "b"), ("b", "c")])
+    order: List[str] = []
+    inputs: Dict[str, List[str]] = {}
+
+    def execute_job(expert: _FakeExpert, message: AgentMessage) -> AgentMessage:
+        job_id = message.get_job_id()
+        order.append(job_id)
+        inputs[job_id] = [m.job_id for m in message.get_workflow_messages()]
+        if job_id == "b":
+            return _result(job_id, WorkflowStatus.JOB_TOO_COMPLICATED_ERROR)
+        return _result(job_id, WorkflowStatus.SUCCESS)
+
+    def execute(agent_message: AgentMessage) -> JobGraph:
+        assert agent_message.get_job_id() == "b"
+        expanded = JobGraph()
+        expanded.add_edge("b1", "b2")
+        return expanded
+
+    leader = _new_leader(monkeypatch, job_service, execute_job)
+    leader.execute = execute
+    leader.execute_job_graph(original_job_id="original")
+
+    assert order == ["a", "b", "b1", "b2", "c"]
+    assert inputs["b1"] == ["a"]
+    assert inputs["c"] == ["b2"]
+
+
+def test_deadlocked_job_graph_fails(monkeypatch):
+    job_service = _FakeJobService(edges=[("a", "b"), ("b", "a")], vertices=("c",))
+    executed: List[str] = []
+
+    def execute_job(expert: _FakeExpert, message: AgentMessage) -> AgentMessage:
+        executed.append(message.get_job_id())
+        return _result(message.get_job_id(), WorkflowStatus.SUCCESS)
+
+    leader = _new_leader(monkeypatch, job_service, execute_job)
+    with pytest.raises(ValueError, match="Deadlock"):
+        leader.execute_job_graph(original_job_id="original")
+
+    assert executed == ["c"]
+
+
+def test_failed_schedule_cancels_the_queued_subjobs_and_waits_for_the_running_ones(monkeypatch):
+    # "slow" and "queued" share an expert limited to one subjob, so one of them stays queued
+    job_service = _FakeJobService(edges=[], vertices=("failing", "slow", "queued"))
+    job_service.experts = {"failing": "Fast Expert", "slow": "Slow Expert", "queued": "Slow Expert"}
+    slow_started = threading.Event()
+    started: List[str] = []
+    finished: List[str] = []
+
+    def execute_job(expert: _FakeExpert, message: AgentMessage) -> AgentMessage:
+        job_id = message.get_job_id()
+        if job_id == "failing":
+            assert slow_started.wait(timeout=5)
+            raise RuntimeError("subjob failed")
+        started.append(job_id)
+        slow_started.set()
+        time.sleep(0.2)
+        finished.append(job_id)
+        return _result(job_id, WorkflowStatus.SUCCESS)
+
+    leader = _new_leader(
+        monkeypatch, job_service, execute_job, pool_size=3, expert_limits="Slow Expert:1"
+    )
+    with pytest.raises(RuntimeError, match="subjob failed"):
+        leader.execute_job_graph(original_job_id="original")
+
+    # the running subjob was waited for, and the queued one never starts
+    assert finished == started
+    time.sleep(0.3)
+    assert len(started) == 1
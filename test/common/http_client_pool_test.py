@@ -0,0 +1,26 @@
+import threading
+from typing import List
+
+import httpx
+
+from app.core.common.async_func import run_async_function
+from app.core.common.http_client_pool import HttpClientPool
+
+
+def test_clients_are_closed_with_the_loop_of_run_async_function():
+    clients: List[httpx.AsyncClient] = []
+
+    async def use_client() -> None:
+        pool = HttpClientPool()
+        client = pool.get_client("http://model.local/v1/chat")
+        # the client is shared by the requests of the same origin in the loop
+        assert pool.get_client("http://model.local/v1/embeddings") is client
+        clients.append(client)
+
+    # a new thread has no event loop, so run_async_function creates (and closes) one
+    thread = threading.Thread(target=run_async_function, args=(use_client,))
+    thread.start()
+    thread.join(timeout=5)
+
+    assert len(clients) == 1 and clients[0].is_closed
+    assert "http://model.local" not in HttpClientPool().stats()
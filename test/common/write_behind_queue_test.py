@@ -0,0 +1,47 @@
+import time
+from typing import Any, List
+
+from app.core.common.write_behind_queue import WriteBehindQueue
+
+
+def test_partial_batch_outcome_is_counted_per_item():
+    def sink(items: List[Any]) -> List[bool]:
+        return [item % 2 == 0 for item in items]
+
+    queue = WriteBehindQueue(name="test_partial", sink=sink, batch_size=4, flush_interval=10)
+    for item in range(4):
+        queue.put(item)
+    assert queue.flush(timeout=5)
+
+    stats = queue.stats()
+    assert stats["written"] == 2
+    assert stats["failed"] == 2
+    queue.close()
+
+
+def test_failed_sink_counts_the_whole_batch():
+    def sink(items: List[Any]) -> None:
+        raise ValueError("boom")
+
+    queue = WriteBehindQueue(name="test_failed", sink=sink, batch_size=2, flush_interval=10)
+    queue.put("a")
+    queue.put("b")
+    assert queue.flush(timeout=5)
+    assert queue.stats()["failed"] == 2
+    queue.close()
+
+
+def test_flush_of_an_empty_queue_does_not_flush_the_next_item_early():
+    batches: List[List[Any]] = []
+    queue = WriteBehindQueue(
+        name="test_empty_flush", sink=batches.append, batch_size=10, flush_interval=0.5
+    )
+    assert queue.flush(timeout=5)
+
+    queue.put("a")
+    time.sleep(0.1)
+    # still waiting for the flush interval
+    assert batches == []
+    assert queue.flush(timeout=5)
+    assert batches == [["a"]]
+    queue.close()
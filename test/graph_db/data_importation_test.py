@@ -0,0 +1,149 @@
+import re
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from app.plugin.neo4j.cypher_builder import TOTAL_NODES_QUERY, TOTAL_RELATIONSHIPS_QUERY
+from app.plugin.neo4j.resource.data_importation import cap_graph_delta, import_triplets
+
+
+class FakeNode:
+    def __init__(self, label: str, properties: Dict[str, Any]):
+        self.labels = [label]
+        self._properties = properties
+        self.element_id = f"{label}:{properties['id']}"
+
+    def items(self):
+        return self._properties.items()
+
+
+class FakeRelationship:
+    def __init__(self, rel_type: str, properties: Dict[str, Any]):
+        self.type = rel_type
+        self._properties = properties
+
+    def items(self):
+        return self._properties.items()
+
+
+class FakeResult:
+    def __init__(self, records: List[Dict[str, Any]]):
+        self._records = records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def consume(self):
+        rows = len(self._records)
+        return SimpleNamespace(
+            counters=SimpleNamespace(
+                nodes_created=2 * rows, properties_set=3 * rows, relationships_created=rows
+            )
+        )
+
+
+class FakeTx:
+    def run(self, text: str, parameters: Dict[str, Any]) -> FakeResult:
+        labels = dict(re.findall(r"MERGE \((source|target):`([^`]+)`", text))
+        rel_type = re.search(r"\[r:`([^`]+)`\]", text).group(1)
+        return FakeResult(
+            [
+                {
+                    "source": FakeNode(labels["source"], row["source_properties"]),
+                    "target": FakeNode(labels["target"], row["target_properties"]),
+                    "r": FakeRelationship(rel_type, row["relationship_properties"]),
+                }
+                for row in parameters["rows"]
+            ]
+        )
+
+
+class FakeSession:
+    def __init__(self):
+        self.merge_statements: List[Any] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute_write(self, func, statement):
+        self.merge_statements.append(statement)
+        return func(FakeTx(), statement)
+
+    def run(self, text: str, parameters: Dict[str, Any] = None):
+        if text == TOTAL_NODES_QUERY:
+            return SimpleNamespace(single=lambda: {"total_nodes": 100})
+        if text == TOTAL_RELATIONSHIPS_QUERY:
+            return SimpleNamespace(single=lambda: {"total_relationships": 200})
+        labels = [value for key, value in sorted((parameters or {}).items())]
+        return [{"label": label, "count": 10} for label in labels]
+
+
+def _graph_db_service(session: FakeSession) -> Any:
+    store = SimpleNamespace(conn=SimpleNamespace(session=lambda: session))
+    return SimpleNamespace(
+        get_default_graph_db=lambda: store,
+        get_default_graph_db_config=lambda: SimpleNamespace(id="db"),
+    )
+
+
+def _triplet(source: int, target: int, rel_label: str = "KNOWS") -> Dict[str, Any]:
+    return {
+        "source_label": "Person",
+        "source_primary_key": "id",
+        "source_properties": {"id": source, "date": "985-01-02"},
+        "relationship_label": rel_label,
+        "relationship_properties": {"since": 2000},
+        "target_label": "Person",
+        "target_primary_key": "id",
+        "target_properties": {"id": target},
+    }
+
+
+def test_import_triplets_groups_by_labels_and_batches_the_rows():
+    session = FakeSession()
+    triplets = [_triplet(1, 2), _triplet(2, 3), _triplet(3, 1), _triplet(1, 3, "LIKES")]
+
+    stats = import_triplets(_graph_db_service(session), triplets, batch_size=2)
+
+    batches = [(b["relationship_label"], b["rows"]) for b in stats["batches"]]
+    assert batches == [("KNOWS", 2), ("KNOWS", 1), ("LIKES", 1)]
+    first_rows = session.merge_statements[0].parameters["rows"]
+    assert [row["source_id"] for row in first_rows] == [1, 2]
+    # the properties are formatted once, with the dates fixed
+    assert first_rows[0]["source_properties"] == {"id": 1, "date": "0985-01-02"}
+
+    assert stats["relationships_created"] == 4
+    assert stats["node_counts"] == {"Person": 10}
+    assert stats["relationship_counts"] == {"KNOWS": 10, "LIKES": 10}
+    assert (stats["total_nodes"], stats["total_relationships"]) == (100, 200)
+    # the touched vertices and edges are deduplicated
+    assert len(stats["graph_delta"]["vertices"]) == 3
+    assert len(stats["graph_delta"]["edges"]) == 4
+
+
+def test_cap_graph_delta_keeps_updates_and_caps_new_elements():
+    current = {
+        "vertices": [{"id": "a"}, {"id": "b"}],
+        "edges": [{"source": "a", "target": "b", "label": "E"}],
+    }
+    delta = {
+        "vertices": [{"id": "b", "updated": True}, {"id": "c"}, {"id": "d"}],
+        "edges": [
+            {"source": "a", "target": "b", "label": "E", "updated": True},
+            {"source": "b", "target": "c", "label": "E"},
+            {"source": "c", "target": "d", "label": "E"},
+            {"source": "a", "target": "c", "label": "E"},
+        ],
+    }
+
+    capped = cap_graph_delta(current, delta, max_vertices=3, max_edges=2)
+
+    assert capped["vertices"] == [{"id": "b", "updated": True}, {"id": "c"}]
+    # the edge to the left out vertex is dropped, and the edges are capped
+    assert capped["edges"] == [
+        {"source": "a", "target": "b", "label": "E", "updated": True},
+        {"source": "b", "target": "c", "label": "E"},
+    ]
+    assert cap_graph_delta(current, delta, max_vertices=0, max_edges=0) is delta
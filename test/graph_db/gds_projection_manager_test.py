@@ -0,0 +1,143 @@
+from types import SimpleNamespace
+from typing import Any, Dict, List, Set, Tuple
+
+import pytest
+
+from app.core.common.system_env import SystemEnv
+from app.plugin.neo4j.cypher_builder import CypherBuilder
+from app.plugin.neo4j.gds_projection_manager import GdsProjectionManager
+
+
+class FakeResult:
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self._rows = rows
+
+    def data(self):
+        return self._rows
+
+    def single(self):
+        return self._rows[0] if self._rows else None
+
+    def consume(self):
+        return None
+
+
+class FakeGds:
+    """A GDS graph catalog behind a fake session."""
+
+    def __init__(self):
+        self.catalog: Set[str] = set()
+        self.log: List[Tuple[str, str]] = []
+
+    def session(self, **kwargs):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def run(self, query: str, parameters: Dict[str, Any] = None, **kwargs: Any) -> FakeResult:
+        parameters = {**(parameters or {}), **kwargs}
+        graph_name = parameters.get("graph_name")
+        if "gds.graph.project" in query:
+            self.catalog.add(graph_name)
+            self.log.append(("project", graph_name))
+            return FakeResult(
+                [{"graphName": graph_name, "nodeCount": 3, "relationshipCount": 2}]
+            )
+        if "gds.graph.drop" in query:
+            if graph_name in self.catalog:
+                self.catalog.discard(graph_name)
+                self.log.append(("drop", graph_name))
+            return FakeResult([])
+        if "gds.graph.exists" in query:
+            return FakeResult([{"exists": graph_name in self.catalog}])
+        return FakeResult([])
+
+
+@pytest.fixture
+def gds() -> FakeGds:
+    return FakeGds()
+
+
+@pytest.fixture
+def graph_db_service(gds: FakeGds) -> Any:
+    store = SimpleNamespace(conn=gds)
+    return SimpleNamespace(
+        get_default_graph_db=lambda: store,
+        get_default_graph_db_config=lambda: SimpleNamespace(id="db"),
+    )
+
+
+@pytest.fixture
+def manager() -> GdsProjectionManager:
+    """A manager outside of the singleton, caching at most two idle projections."""
+    original = (SystemEnv.GDS_PROJECTION_CACHE_SIZE, SystemEnv.GDS_PROJECTION_IDLE_TTL)
+    SystemEnv.GDS_PROJECTION_CACHE_SIZE = 2
+    SystemEnv.GDS_PROJECTION_IDLE_TTL = 600
+    manager = object.__new__(GdsProjectionManager)
+    manager.__init__()
+    yield manager
+    SystemEnv.GDS_PROJECTION_CACHE_SIZE, SystemEnv.GDS_PROJECTION_IDLE_TTL = original
+
+
+def _project(manager: GdsProjectionManager, graph_db_service: Any, label: str = "*") -> Dict:
+    with manager.projection(graph_db_service, CypherBuilder(), vertex_labels=label) as info:
+        return info
+
+
+def test_projection_is_reused_across_calls(manager, graph_db_service, gds):
+    first = _project(manager, graph_db_service)
+    second = _project(manager, graph_db_service)
+
+    assert not first["reused"] and second["reused"]
+    assert first["graphName"] == second["graphName"]
+    assert [action for action, _ in gds.log] == ["project"]
+
+
+def test_projection_is_projected_again_after_a_write(manager, graph_db_service, gds):
+    first = _project(manager, graph_db_service)
+    manager.bump_write_version(graph_db_service)
+    second = _project(manager, graph_db_service)
+
+    assert not second["reused"]
+    assert second["graphName"] != first["graphName"]
+    assert gds.catalog == {second["graphName"]}
+
+
+def test_projection_in_use_is_dropped_after_its_release(manager, graph_db_service, gds):
+    builder = CypherBuilder()
+    with manager.projection(graph_db_service, builder) as in_use:
+        manager.bump_write_version(graph_db_service)
+        fresh = _project(manager, graph_db_service)
+        # the outdated projection is still used, so it is kept
+        assert in_use["graphName"] in gds.catalog
+        assert fresh["graphName"] != in_use["graphName"]
+
+    assert gds.catalog == {fresh["graphName"]}
+
+
+def test_least_recently_used_projections_beyond_the_cache_size_are_dropped(
+    manager, graph_db_service, gds
+):
+    names = [_project(manager, graph_db_service, label)["graphName"] for label in "ABC"]
+
+    assert gds.catalog == {names[1], names[2]}
+    manager.drop_all()
+    assert not gds.catalog and not manager.stats()
+
+
+def test_projection_dropped_from_the_cache_is_projected_again_under_a_new_name(
+    manager, graph_db_service, gds
+):
+    first = _project(manager, graph_db_service, "A")
+    for label in "BC":
+        _project(manager, graph_db_service, label)
+    assert first["graphName"] not in gds.catalog
+
+    again = _project(manager, graph_db_service, "A")
+    assert not again["reused"]
+    assert again["graphName"] != first["graphName"]
+    assert again["graphName"] in gds.catalog
@@ -0,0 +1,118 @@
+import threading
+import time
+
+from app.core.common.system_env import SystemEnv
+from app.core.toolkit.graph_db.graph_db_driver_registry import GraphDbDriverRegistry
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    def run(self, query):
+        return query
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDriver:
+    def __init__(self):
+        self.closed = False
+
+    def session(self, **kwargs):
+        return FakeSession()
+
+    def verify_connectivity(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def _registry() -> GraphDbDriverRegistry:
+    registry = GraphDbDriverRegistry()
+    registry.close_all()
+    return registry
+
+
+def test_driver_is_shared_and_recreated_on_fingerprint_change():
+    registry = _registry()
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    handle = registry.get_driver(key="db", fingerprint="v1", factory=factory)
+    with handle.session() as session:
+        assert session.run("RETURN 1") == "RETURN 1"
+    with handle.session():
+        pass
+    assert len(drivers) == 1
+
+    with registry.get_driver(key="db", fingerprint="v2", factory=factory).session():
+        pass
+    assert len(drivers) == 2
+    assert drivers[0].closed and not drivers[1].closed
+
+
+def test_invalidated_driver_is_closed_after_its_last_lease():
+    registry = _registry()
+    driver = FakeDriver()
+    handle = registry.get_driver(key="db", fingerprint="v1", factory=lambda: driver)
+
+    with handle.session():
+        registry.invalidate("db")
+        # still used by the session
+        assert not driver.closed
+        assert "db" not in registry.stats()
+    assert driver.closed
+
+
+def test_idle_eviction_skips_leased_drivers():
+    registry = _registry()
+    driver = FakeDriver()
+    handle = registry.get_driver(key="db", fingerprint="v1", factory=lambda: driver)
+
+    original_timeout = SystemEnv.GRAPH_DB_DRIVER_IDLE_TIMEOUT
+    SystemEnv.GRAPH_DB_DRIVER_IDLE_TIMEOUT = 1
+    try:
+        session = handle.session()
+        time.sleep(1.05)
+        assert registry.evict_idle() == 0
+        assert registry.stats()["db"]["leases"] == 1
+
+        session.close()
+        time.sleep(1.05)
+        assert registry.evict_idle() == 1
+        assert driver.closed
+    finally:
+        SystemEnv.GRAPH_DB_DRIVER_IDLE_TIMEOUT = original_timeout
+
+
+def test_factory_runs_outside_of_the_registry_lock():
+    registry = _registry()
+    started = threading.Event()
+    proceed = threading.Event()
+
+    def slow_factory():
+        started.set()
+        proceed.wait(timeout=5)
+        return FakeDriver()
+
+    thread = threading.Thread(
+        target=lambda: registry.get_driver(key="slow", fingerprint="v1", factory=slow_factory)
+        .session()
+        .close()
+    )
+    thread.start()
+    assert started.wait(timeout=5)
+
+    # another key is served while the slow driver is being created
+    with registry.get_driver(key="fast", fingerprint="v1", factory=FakeDriver).session():
+        pass
+
+    proceed.set()
+    thread.join(timeout=5)
+    assert set(registry.stats()) == {"slow", "fast"}
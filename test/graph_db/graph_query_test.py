@@ -0,0 +1,123 @@
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from app.core.common.system_env import SystemEnv
+from app.plugin.neo4j.resource.graph_query import CypherExecutor
+
+
+class FakeResult:
+    def __init__(self, records: List[Dict[str, Any]]):
+        self._records = records
+        self.read_count = 0
+        self.consumed = False
+
+    def __iter__(self):
+        for record in self._records:
+            self.read_count += 1
+            yield record
+
+    def consume(self):
+        self.consumed = True
+        return SimpleNamespace(counters=SimpleNamespace(contains_updates=False))
+
+
+class FakeSession:
+    def __init__(self, result: FakeResult):
+        self._result = result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def run(self, cypher_query: str) -> FakeResult:
+        return self._result
+
+
+class FakeArtifactService:
+    def __init__(self):
+        self.saved: List[Any] = []
+
+    def save_artifact(self, artifact: Any) -> str:
+        self.saved.append(artifact)
+        return "artifact_id"
+
+
+@pytest.fixture
+def limits():
+    """Set the result limits, restoring them after the test."""
+    original = (SystemEnv.CYPHER_RESULT_MAX_ROWS, SystemEnv.CYPHER_RESULT_MAX_BYTES)
+
+    def set_limits(max_rows: int, max_bytes: int) -> None:
+        SystemEnv.CYPHER_RESULT_MAX_ROWS = max_rows
+        SystemEnv.CYPHER_RESULT_MAX_BYTES = max_bytes
+
+    yield set_limits
+    SystemEnv.CYPHER_RESULT_MAX_ROWS, SystemEnv.CYPHER_RESULT_MAX_BYTES = original
+
+
+def _graph_db_service(result: FakeResult) -> Any:
+    store = SimpleNamespace(conn=SimpleNamespace(session=lambda **_: FakeSession(result)))
+    return SimpleNamespace(
+        get_default_graph_db=lambda: store,
+        get_default_graph_db_config=lambda: SimpleNamespace(id="db"),
+        get_schema_metadata=lambda graph_db_config: {},
+    )
+
+
+async def _execute(
+    result: FakeResult, artifact_service: FakeArtifactService, return_artifact_handle: bool = False
+) -> str:
+    return await CypherExecutor().execute_cypher(
+        graph_db_service=_graph_db_service(result),
+        artifact_service=artifact_service,
+        session_id="session",
+        job_id="job",
+        cypher_query="MATCH (n) RETURN n.name AS name",
+        return_artifact_handle=return_artifact_handle,
+    )
+
+
+async def test_records_beyond_the_row_cap_are_not_read(limits):
+    limits(max_rows=2, max_bytes=64 * 1024)
+    result = FakeResult([{"name": f"n{i}"} for i in range(5)])
+
+    output = await _execute(result, FakeArtifactService())
+
+    # one record more than the cap is read to know that the result is truncated
+    assert result.read_count == 3
+    assert result.consumed
+    assert "共读取 2 条记录" in output
+    assert "结果超过 2 条记录的上限" in output
+    assert "n1" in output and "n2" not in output
+
+
+async def test_records_beyond_the_byte_cap_are_omitted_with_their_count(limits):
+    record_bytes = len(str({"name": '"n0"'}).encode("utf-8")) + 1
+    limits(max_rows=100, max_bytes=record_bytes * 2)
+    result = FakeResult([{"name": f"n{i}"} for i in range(5)])
+
+    output = await _execute(result, FakeArtifactService())
+
+    assert result.read_count == 5
+    assert "共读取 5 条记录" in output
+    assert "n1" in output and "n2" not in output
+    assert f"结果超过 {record_bytes * 2} 字节的上限，省略了 3 条记录" in output
+
+
+async def test_artifact_handle_keeps_all_the_read_records_out_of_the_output(limits):
+    limits(max_rows=3, max_bytes=1)
+    result = FakeResult([{"name": f"n{i}"} for i in range(5)])
+    artifact_service = FakeArtifactService()
+
+    output = await _execute(result, artifact_service, return_artifact_handle=True)
+
+    assert "artifact:artifact_id" in output
+    assert "n0" not in output
+    (artifact,) = artifact_service.saved
+    # the byte cap only applies to the inline output
+    assert len(artifact.content) == 3
+    assert artifact.metadata.metadata_dict == {"row_count": 3, "truncated": True}
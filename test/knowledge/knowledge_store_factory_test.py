@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+from app.core.knowledge.knowledge_store_factory import KnowledgeStoreFactory
+from app.core.service.file_service import FileService
+from app.core.service.knowledge_base_service import KnowledgeBaseService
+
+
+class FakeKnowledgeStore:
+    def __init__(self, name: str):
+        self.name = name
+        self.dropped = False
+        self.deleted_documents: List[str] = []
+
+    def drop(self) -> None:
+        self.dropped = True
+
+    def delete_document(self, chunk_id: str) -> None:
+        self.deleted_documents.append(chunk_id)
+
+
+@pytest.fixture
+def created(monkeypatch) -> List[FakeKnowledgeStore]:
+    """Create fake stores in an empty cache of two stores, and return the created ones."""
+    stores: List[FakeKnowledgeStore] = []
+
+    def create(name: str) -> FakeKnowledgeStore:
+        stores.append(FakeKnowledgeStore(name))
+        return stores[-1]
+
+    monkeypatch.setattr(KnowledgeStoreFactory, "_stores", OrderedDict())
+    monkeypatch.setattr(KnowledgeStoreFactory, "_create", staticmethod(create))
+    original = SystemEnv.KNOWLEDGE_STORE_CACHE_SIZE
+    SystemEnv.KNOWLEDGE_STORE_CACHE_SIZE = 2
+    yield stores
+    SystemEnv.KNOWLEDGE_STORE_CACHE_SIZE = original
+
+
+def _service(knowledge_base_dao=None, file_kb_mapping_dao=None) -> KnowledgeBaseService:
+    """Create a service outside of the singleton, without the global knowledge base setup."""
+    service = object.__new__(KnowledgeBaseService)
+    service._knowledge_base_dao = knowledge_base_dao
+    service._file_kb_mapping_dao = file_kb_mapping_dao
+    return service
+
+
+def test_least_recently_used_store_is_evicted(created):
+    first = KnowledgeStoreFactory.get_or_create("a")
+    KnowledgeStoreFactory.get_or_create("b")
+    assert KnowledgeStoreFactory.get_or_create("a") is first
+    KnowledgeStoreFactory.get_or_create("c")
+
+    assert KnowledgeStoreFactory.get_or_create("a") is first
+    assert [store.name for store in created] == ["a", "b", "c"]
+    # "b" was evicted, so it is opened again
+    KnowledgeStoreFactory.get_or_create("b")
+    assert [store.name for store in created] == ["a", "b", "c", "b"]
+
+
+def test_dropped_knowledge_base_is_removed_from_the_cache(created):
+    knowledge_base_dao = SimpleNamespace(
+        get_by_id=lambda id: SimpleNamespace(id=id), delete=lambda id: None
+    )
+    file_kb_mapping_dao = SimpleNamespace(filter_by=lambda kb_id: [])
+    dropped = KnowledgeStoreFactory.get_or_create("kb")
+
+    _service(knowledge_base_dao, file_kb_mapping_dao).clean_knowledge_base(id="kb", drop=True)
+
+    assert dropped.dropped
+    assert KnowledgeStoreFactory.get_or_create("kb") is not dropped
+
+
+def test_deleted_knowledge_keeps_the_cached_store(created, monkeypatch):
+    monkeypatch.setitem(
+        Singleton._instances, FileService, SimpleNamespace(delete_file=lambda id: None)
+    )
+    knowledge_base_dao = SimpleNamespace(update=lambda **kwargs: None)
+    file_kb_mapping_dao = SimpleNamespace(
+        get_by_id=lambda id: SimpleNamespace(chunk_ids="chunk", kb_id="kb"),
+        delete=lambda id: None,
+    )
+    store = KnowledgeStoreFactory.get_or_create("kb")
+
+    _service(knowledge_base_dao, file_kb_mapping_dao).delete_knowledge(file_id="file")
+
+    assert store.deleted_documents == ["chunk"]
+    assert KnowledgeStoreFactory.get_or_create("kb") is store
@@ -0,0 +1,143 @@
+import threading
+from typing import Dict, List, Tuple
+
+import pytest
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+from app.core.memory.reasoner_memory import (
+    BuiltinReasonerMemory,
+    ReasonerMemory,
+    SlidingWindowReasonerMemory,
+)
+from app.core.memory.reasoner_memory_store import ReasonerMemoryStore
+from app.core.model.message import ModelMessage
+from app.core.service.message_service import MessageService
+
+
+class FakeMessageService:
+    def __init__(self):
+        self.saved: Dict[Tuple[str, str], List[ModelMessage]] = {}
+
+    def save_model_messages(self, session_id, job_id, operator_id, messages):
+        self.saved[(job_id, operator_id)] = list(messages)
+
+    def get_model_messages(self, job_id, operator_id):
+        return list(self.saved.get((job_id, operator_id), []))
+
+
+@pytest.fixture
+def message_service(monkeypatch) -> FakeMessageService:
+    service = FakeMessageService()
+    monkeypatch.setitem(Singleton._instances, MessageService, service)
+    return service
+
+
+def _new_store(size: int = 2, max_messages: int = 0) -> ReasonerMemoryStore:
+    """Create a store outside of the singleton, with the given limits."""
+    original = (SystemEnv.REASONER_MEMORY_STORE_SIZE, SystemEnv.REASONER_MEMORY_STORE_MAX_MESSAGES)
+    SystemEnv.REASONER_MEMORY_STORE_SIZE = size
+    SystemEnv.REASONER_MEMORY_STORE_MAX_MESSAGES = max_messages
+    try:
+        store = object.__new__(ReasonerMemoryStore)
+        store.__init__()
+    finally:
+        (
+            SystemEnv.REASONER_MEMORY_STORE_SIZE,
+            SystemEnv.REASONER_MEMORY_STORE_MAX_MESSAGES,
+        ) = original
+    return store
+
+
+def _memory(job_id: str, count: int) -> ReasonerMemory:
+    memory = BuiltinReasonerMemory()
+    for step in range(count):
+        memory.add_message(ModelMessage(payload=f"m{step}", job_id=job_id, step=step + 1))
+    return memory
+
+
+def test_evicted_memory_is_spilled_and_reloaded(message_service):
+    store = _new_store(size=2)
+    store.put("s", "j1", "op", _memory("j1", 2))
+    store.put("s", "j2", "op", _memory("j2", 1))
+    store.put("s", "j3", "op", _memory("j3", 1))
+
+    assert [m.get_payload() for m in message_service.saved[("j1", "op")]] == ["m0", "m1"]
+    assert store.stats()["messages"] == 2
+
+    reloaded = store.get("s", "j1", "op", memory_factory=BuiltinReasonerMemory)
+    assert reloaded is not None
+    assert [m.get_payload() for m in reloaded.get_messages()] == ["m0", "m1"]
+    assert store.stats()["reloads"] == 1
+    assert store.get("s", "j9", "op", memory_factory=BuiltinReasonerMemory) is None
+
+
+def test_pinned_memory_is_not_evicted(message_service):
+    store = _new_store(size=1)
+    memory = _memory("j1", 1)
+    with store.pin("s", "j1", "op"):
+        store.put("s", "j1", "op", memory)
+        store.put("s", "j2", "op", _memory("j2", 1))
+        memory.add_message(ModelMessage(payload="m1", job_id="j1", step=2))
+        assert ("j1", "op") not in message_service.saved
+        assert store.get("s", "j1", "op", memory_factory=BuiltinReasonerMemory) is memory
+
+    # the messages added while pinned are counted once the reasoning is done
+    assert store.stats()["pinned"] == 0
+    assert store.stats()["messages"] == 2
+
+
+def test_reloaded_sliding_window_memory_keeps_its_summary(message_service):
+    store = _new_store(size=1)
+
+    def factory() -> SlidingWindowReasonerMemory:
+        return SlidingWindowReasonerMemory(token_budget=100, keep_messages=1)
+
+    memory = factory()
+    for step in range(3):
+        memory.add_message(ModelMessage(payload=f"m{step}", job_id="j1", step=step + 1))
+    memory.load_state({"summary": "folded m0 and m1", "summarized_count": 2})
+    store.put("s", "j1", "op", memory)
+    store.put("s", "j2", "op", _memory("j2", 1))
+
+    reloaded = store.get("s", "j1", "op", memory_factory=factory)
+    assert reloaded is not memory
+    assert reloaded.get_state()["summary"] == "folded m0 and m1"
+    assert reloaded.get_state()["summarized_count"] == 2
+
+
+def test_release_job_spills_and_drops_its_memories(message_service):
+    store = _new_store(size=4)
+    store.put("s", "j1", "op1", _memory("j1", 1))
+    store.put("s", "j1", "op2", _memory("j1", 2))
+
+    store.release_job("j1")
+    assert store.stats()["memories"] == 0
+    assert store.stats()["messages"] == 0
+
+    assert store.flush(timeout=5)
+    assert set(message_service.saved) == {("j1", "op1"), ("j1", "op2")}
+
+
+def test_release_job_does_not_wait_for_the_spill(message_service, monkeypatch):
+    store = _new_store(size=4)
+    memory = _memory("j1", 1)
+    store.put("s", "j1", "op", memory)
+    spilling = threading.Event()
+    release = threading.Event()
+    save_model_messages = message_service.save_model_messages
+
+    def slow_save_model_messages(**kwargs):
+        spilling.set()
+        assert release.wait(timeout=5)
+        save_model_messages(**kwargs)
+
+    monkeypatch.setattr(message_service, "save_model_messages", slow_save_model_messages)
+    store.release_job("j1")
+    assert spilling.wait(timeout=5)
+
+    # the memory being spilled is still served
+    assert store.get("s", "j1", "op", memory_factory=BuiltinReasonerMemory) is memory
+    release.set()
+    assert store.flush(timeout=5)
+    assert ("j1", "op") in message_service.saved
@@ -0,0 +1,85 @@
+from typing import List, Tuple
+
+from app.core.memory.reasoner_memory import SlidingWindowReasonerMemory
+from app.core.model.message import ModelMessage
+
+
+class FakeSummarizer:
+    def __init__(self):
+        self.calls: List[Tuple[str, List[str]]] = []
+
+    async def __call__(self, summary: str, messages: List[ModelMessage]) -> str:
+        self.calls.append((summary, [m.get_payload() for m in messages]))
+        return f"summary {len(self.calls)}"
+
+
+def _message(step: int) -> ModelMessage:
+    # about 10 tokens each
+    return ModelMessage(payload=f"m{step}".ljust(40, "."), job_id="job", step=step + 1)
+
+
+def _memory(count: int, summarizer=None) -> SlidingWindowReasonerMemory:
+    memory = SlidingWindowReasonerMemory(token_budget=35, keep_messages=2, summarizer=summarizer)
+    for step in range(count):
+        memory.add_message(_message(step))
+    return memory
+
+
+def _payloads(messages: List[ModelMessage]) -> List[str]:
+    return [m.get_payload()[:2] for m in messages]
+
+
+async def test_prompt_within_the_budget_is_not_summarized():
+    summarizer = FakeSummarizer()
+    memory = _memory(3, summarizer)
+
+    assert _payloads(await memory.get_prompt_messages()) == ["m0", "m1", "m2"]
+    assert summarizer.calls == []
+
+
+async def test_messages_out_of_the_window_are_folded_into_the_summary():
+    summarizer = FakeSummarizer()
+    memory = _memory(5, summarizer)
+
+    window = await memory.get_prompt_messages()
+
+    assert summarizer.calls == [("", [m.get_payload() for m in memory.get_messages()[:3]])]
+    assert "summary 1" in window[0].get_payload()
+    assert _payloads(window[1:]) == ["m3", "m4"]
+    # the complete history is kept
+    assert len(memory.get_messages()) == 5
+    assert memory.get_token_stats()[-1]["summarized_messages"] == 3
+
+
+async def test_summary_is_updated_incrementally():
+    summarizer = FakeSummarizer()
+    memory = _memory(5, summarizer)
+    await memory.get_prompt_messages()
+    memory.add_message(_message(5))
+    memory.add_message(_message(6))
+
+    window = await memory.get_prompt_messages()
+
+    assert summarizer.calls[1][0] == "summary 1"
+    assert [payload[:2] for payload in summarizer.calls[1][1]] == ["m3", "m4"]
+    assert _payloads(window[1:]) == ["m5", "m6"]
+
+
+async def test_latest_messages_are_kept_even_over_the_budget():
+    summarizer = FakeSummarizer()
+    memory = _memory(2, summarizer)
+
+    window = await memory.get_prompt_messages(reserved_tokens=100)
+
+    assert _payloads(window) == ["m0", "m1"]
+    assert summarizer.calls == []
+
+
+async def test_folded_messages_are_truncated_without_a_summarizer():
+    memory = _memory(5)
+
+    window = await memory.get_prompt_messages()
+
+    summary = window[0].get_payload()
+    assert "[step 1] m0" in summary and "[step 3] m2" in summary
+    assert "[step 4]" not in summary
@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from app.core.model.execution_context import ExecutionContext
+
+
+@pytest.mark.asyncio
+async def test_current_operator_is_isolated_per_task_and_per_trace():
+    context = ExecutionContext()
+    other_context = ExecutionContext()
+    context.current_operator_id = "root"
+    other_context.current_operator_id = "other"
+
+    async def run_operator(op_id: str) -> str:
+        context.new_operator_span(op_id)
+        await asyncio.sleep(0.01)
+        return str(context.current_operator_id)
+
+    assert await asyncio.gather(run_operator("op1"), run_operator("op2")) == ["op1", "op2"]
+    # the tasks ran in copies of the context
+    assert context.current_operator_id == "root"
+    assert other_context.current_operator_id == "other"
+
+    context.current_operator_id = None
+    assert context.current_operator_id is None
+    assert other_context.current_operator_id == "other"
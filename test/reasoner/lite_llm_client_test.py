@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+from typing import List
+
+import litellm
+import pytest
+
+from app.core.common.singleton import Singleton
+from app.core.common.system_env import SystemEnv
+from app.core.model.message import ModelMessage
+from app.core.service.model_registry_service import ModelRegistryService
+from app.plugin.lite_llm.lite_llm_client import LiteLlmClient
+
+RESPONSE_TEXT = "The graph has three vertices and two edges."
+
+
+@pytest.fixture
+def mocked_acompletion(monkeypatch) -> List[dict]:
+    """Let litellm answer every request with a mocked response, and record the requests."""
+    original_name = SystemEnv.LLM_NAME
+    SystemEnv.LLM_NAME = "openai/gpt-4o"
+    monkeypatch.setitem(Singleton._instances, ModelRegistryService, SimpleNamespace(models={}))
+    requests: List[dict] = []
+    acompletion = litellm.acompletion
+
+    async def mocked(**kwargs):
+        requests.append(kwargs)
+        return await acompletion(**kwargs, mock_response=RESPONSE_TEXT)
+
+    monkeypatch.setattr(litellm, "acompletion", mocked)
+    yield requests
+    SystemEnv.LLM_NAME = original_name
+
+
+async def _generate(client: LiteLlmClient) -> ModelMessage:
+    return await client.generate(
+        sys_prompt="You are a graph expert.",
+        messages=[ModelMessage(payload="Describe the graph.", job_id="job", step=1)],
+    )
+
+
+async def test_streamed_deltas_are_passed_to_the_callback(mocked_acompletion):
+    deltas: List[str] = []
+
+    response = await _generate(LiteLlmClient(stream_callback=deltas.append))
+
+    assert mocked_acompletion[0]["stream"] is True
+    assert len(deltas) > 1
+    assert "".join(deltas) == RESPONSE_TEXT
+    # the complete response is rebuilt from the chunks
+    assert response.get_payload() == RESPONSE_TEXT
+
+
+async def test_async_stream_callback_is_awaited(mocked_acompletion):
+    deltas: List[str] = []
+
+    async def callback(delta: str) -> None:
+        deltas.append(delta)
+
+    response = await _generate(LiteLlmClient(stream_callback=callback))
+
+    assert "".join(deltas) == RESPONSE_TEXT
+    assert response.get_payload() == RESPONSE_TEXT
+
+
+async def test_response_is_not_streamed_without_a_callback(mocked_acompletion):
+    response = await _generate(LiteLlmClient())
+
+    assert mocked_acompletion[0]["stream"] is False
+    assert response.get_payload() == RESPONSE_TEXT
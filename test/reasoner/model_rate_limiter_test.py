@@ -0,0 +1,91 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from app.core.common.system_env import SystemEnv
+from app.core.reasoner.model_rate_limiter import ModelRateLimiter
+
+
+@pytest.fixture
+def limiter() -> ModelRateLimiter:
+    """A limiter outside of the singleton, which sends one request of a model at a time."""
+    original = (SystemEnv.MODEL_CONCURRENCY_INITIAL, SystemEnv.MODEL_CONCURRENCY_MAX)
+    SystemEnv.MODEL_CONCURRENCY_INITIAL = 1
+    SystemEnv.MODEL_CONCURRENCY_MAX = 1
+    limiter = object.__new__(ModelRateLimiter)
+    limiter.__init__()
+    yield limiter
+    SystemEnv.MODEL_CONCURRENCY_INITIAL, SystemEnv.MODEL_CONCURRENCY_MAX = original
+
+
+async def test_requests_wait_for_a_released_slot(limiter):
+    release = asyncio.Event()
+    order: List[str] = []
+
+    async def request(name: str) -> str:
+        order.append(f"{name} start")
+        if name == "first":
+            await release.wait()
+        order.append(f"{name} end")
+        return name
+
+    first = asyncio.create_task(limiter.run("model", lambda: request("first")))
+    second = asyncio.create_task(limiter.run("model", lambda: request("second")))
+    await asyncio.sleep(0.05)
+    assert order == ["first start"]
+    assert limiter.stats()["model"]["in_flight"] == 1
+
+    release.set()
+    assert await asyncio.wait_for(asyncio.gather(first, second), timeout=1) == [
+        "first",
+        "second",
+    ]
+    assert order == ["first start", "first end", "second start", "second end"]
+    assert limiter.stats()["model"]["in_flight"] == 0
+
+
+async def test_cancelled_requests_release_their_slots(limiter):
+    async def hang() -> str:
+        await asyncio.Event().wait()
+        return "never"
+
+    async def answer() -> str:
+        return "answer"
+
+    running = asyncio.create_task(limiter.run("model", hang))
+    waiting = asyncio.create_task(limiter.run("model", answer))
+    await asyncio.sleep(0.05)
+
+    # a cancelled waiter leaves the queue, a cancelled request releases its slot
+    waiting.cancel()
+    await asyncio.sleep(0)
+    running.cancel()
+    for task in (running, waiting):
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert limiter.stats()["model"]["in_flight"] == 0
+    assert await asyncio.wait_for(limiter.run("model", answer), timeout=1) == "answer"
+
+
+async def test_rate_limited_request_is_retried(limiter):
+    class RateLimitedError(Exception):
+        status_code = 429
+
+    original = SystemEnv.MODEL_RATE_LIMIT_BACKOFF
+    SystemEnv.MODEL_RATE_LIMIT_BACKOFF = 0.01
+    attempts: List[int] = []
+
+    async def request() -> str:
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            raise RateLimitedError()
+        return "ok"
+
+    try:
+        assert await asyncio.wait_for(limiter.run("model", request), timeout=1) == "ok"
+    finally:
+        SystemEnv.MODEL_RATE_LIMIT_BACKOFF = original
+    stats = limiter.stats()["model"]
+    assert (stats["retries"], stats["rate_limited"], stats["in_flight"]) == (1, 1, 0)
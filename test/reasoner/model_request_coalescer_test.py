@@ -0,0 +1,76 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from app.core.reasoner.model_request_coalescer import ModelRequestCoalescer
+
+
+def _new_coalescer() -> ModelRequestCoalescer:
+    """Create a coalescer outside of the singleton."""
+    coalescer = object.__new__(ModelRequestCoalescer)
+    coalescer.__init__()
+    return coalescer
+
+
+async def test_identical_requests_in_flight_are_sent_once():
+    coalescer = _new_coalescer()
+    release = asyncio.Event()
+    sent: List[str] = []
+
+    async def request() -> str:
+        sent.append("request")
+        await release.wait()
+        return "answer"
+
+    tasks = [asyncio.create_task(coalescer.run("key", request)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["answer"] * 3
+    assert sent == ["request"]
+    assert coalescer.stats() == {"requests": 3, "coalesced": 2, "in_flight": 0}
+
+
+async def test_leader_failure_is_shared_with_the_waiters():
+    coalescer = _new_coalescer()
+    release = asyncio.Event()
+
+    async def request() -> str:
+        await release.wait()
+        raise ValueError("model error")
+
+    tasks = [asyncio.create_task(coalescer.run("key", request)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    release.set()
+
+    for task in tasks:
+        with pytest.raises(ValueError, match="model error"):
+            await task
+    assert coalescer.stats()["in_flight"] == 0
+
+
+async def test_waiters_resend_the_request_when_the_leader_is_cancelled():
+    coalescer = _new_coalescer()
+    sent: List[int] = []
+
+    async def request() -> str:
+        sent.append(len(sent))
+        if len(sent) == 1:
+            await asyncio.Event().wait()
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    leader = asyncio.create_task(coalescer.run("key", request))
+    await asyncio.sleep(0.01)
+    waiters = [asyncio.create_task(coalescer.run("key", request)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    assert await asyncio.wait_for(asyncio.gather(*waiters), timeout=1) == ["answer"] * 2
+    # one of the waiters took over the request
+    assert sent == [0, 1]
+    assert coalescer.stats()["in_flight"] == 0
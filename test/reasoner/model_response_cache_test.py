@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import pytest
+
+from app.core.common.system_env import SystemEnv
+from app.core.reasoner import model_response_cache as model_response_cache_module
+from app.core.reasoner.model_response_cache import ModelResponseCache
+
+
+@pytest.fixture
+def new_cache(tmp_path):
+    """Create caches outside of the singleton, with the given settings."""
+    names = ("MODEL_RESPONSE_CACHE_SIZE", "MODEL_RESPONSE_CACHE_TTL")
+    names += ("MODEL_RESPONSE_CACHE_PERSIST", "APP_ROOT")
+    original = {name: getattr(SystemEnv, name) for name in names}
+    caches = []
+
+    def new_cache(size: int = 16, ttl: int = 60, persist: bool = False) -> ModelResponseCache:
+        SystemEnv.MODEL_RESPONSE_CACHE_SIZE = size
+        SystemEnv.MODEL_RESPONSE_CACHE_TTL = ttl
+        SystemEnv.MODEL_RESPONSE_CACHE_PERSIST = persist
+        SystemEnv.APP_ROOT = str(tmp_path)
+        cache = object.__new__(ModelResponseCache)
+        cache.__init__()
+        caches.append(cache)
+        return cache
+
+    yield new_cache
+    for cache in caches:
+        if cache._db:
+            cache._db.close()
+    for name, value in original.items():
+        setattr(SystemEnv, name, value)
+
+
+def _tool(name: str) -> Any:
+    return SimpleNamespace(name=name, description=name.upper())
+
+
+def _key(**overrides: Any) -> str:
+    request: Dict[str, Any] = {
+        "model": "model",
+        "request_messages": [{"role": "user", "content": "hello"}],
+        "tools": [_tool("b"), _tool("a")],
+        "temperature": 0.5,
+    }
+    request.update(overrides)
+    return ModelResponseCache.make_key(**request)
+
+
+def test_key_depends_only_on_the_request_content():
+    assert _key() == _key()
+    # neither the order of the tools nor of the message fields matters
+    assert _key() == _key(tools=[_tool("a"), _tool("b")])
+    assert _key() == _key(request_messages=[{"content": "hello", "role": "user"}])
+
+    assert _key() != _key(model="other")
+    assert _key() != _key(request_messages=[{"role": "user", "content": "bye"}])
+    assert _key() != _key(tools=None)
+    assert _key() != _key(temperature=0.0)
+
+
+def test_least_recently_used_entry_is_evicted(new_cache):
+    cache = new_cache(size=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("A", "C")
+    assert cache.stats()["size"] == 2
+
+
+def test_expired_entry_is_a_miss(new_cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(model_response_cache_module.time, "time", lambda: now[0])
+    cache = new_cache(ttl=10)
+    cache.put("a", "A")
+
+    now[0] += 9
+    assert cache.get("a") == "A"
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_persisted_entry_survives_a_new_cache(new_cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(model_response_cache_module.time, "time", lambda: now[0])
+    new_cache(ttl=10, persist=True).put("a", "A")
+
+    restarted = new_cache(ttl=10, persist=True)
+    assert restarted.get("a") == "A"
+    stats = restarted.stats()
+    assert (stats["disk_hits"], stats["size"]) == (1, 1)
+
+    # an expired row is deleted from the file on lookup
+    now[0] += 11
+    assert new_cache(ttl=10, persist=True).get("a") is None
+    assert new_cache(ttl=10, persist=True)._db.execute(
+        "SELECT count(*) FROM model_response_cache"
+    ).fetchone() == (0,)
@@ -0,0 +1,87 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from app.core.common.singleton import Singleton
+from app.core.model.message import ModelMessage, WorkflowMessage
+from app.core.service.action_service import ActionPipeline, ActionService
+
+
+class FakeActionService:
+    def __init__(self):
+        self.started: List[str] = []
+        self.finished: List[str] = []
+        self.input_data: Dict[str, Dict[str, Any]] = {}
+        self.b_started = asyncio.Event()
+
+    def create(self, name: str) -> Any:
+        return name
+
+    async def execute_actions_pipeline(self, action_name: str, inputs: Dict[str, Any]):
+        self.started.append(action_name)
+        self.input_data[action_name] = inputs["message"].get_payload()["action_input"]["input_data"]
+        if action_name == "a":
+            # the independent actions run concurrently
+            await asyncio.wait_for(self.b_started.wait(), timeout=5)
+        elif action_name == "b":
+            self.b_started.set()
+        self.finished.append(action_name)
+        return ModelMessage(payload=f"output of {action_name}", job_id="job", step=1)
+
+
+@pytest.fixture
+def action_service(monkeypatch) -> FakeActionService:
+    service = FakeActionService()
+    monkeypatch.setitem(Singleton._instances, ActionService, service)
+    return service
+
+
+def _dag(*actions: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {
+        act["id"]: {"name": act["name"], "task": act["name"], "prev": act.get("prev", [])}
+        for act in actions
+    }
+
+
+def _pipeline(actions_dag: Dict[str, Dict[str, Any]]) -> ActionPipeline:
+    message = WorkflowMessage(
+        payload={"action_input": {"instruction": "do it", "input_data": {"x": 1}}}, job_id="job"
+    )
+    return ActionPipeline(actions_dag, message, job_id="job", operator_id="op", job=None)
+
+
+async def test_action_runs_after_its_predecessors_with_only_their_outputs(action_service):
+    # "c" refers to its predecessors by id and by name
+    pipeline = _pipeline(
+        _dag(
+            {"id": 1, "name": "a"},
+            {"id": 2, "name": "b"},
+            {"id": 3, "name": "c", "prev": [1, "b"]},
+            {"id": 4, "name": "d"},
+        )
+    )
+
+    answer = json.loads(await pipeline.run())
+
+    assert set(action_service.started[:3]) == {"a", "b", "d"}
+    assert action_service.started[3] == "c"
+    assert action_service.input_data["c"] == {"a": "output of a", "b": "output of b"}
+    assert action_service.input_data["a"] == {}
+    # the summarized input message is not changed by the actions
+    assert pipeline.input_messages.get_payload()["action_input"]["input_data"] == {"x": 1}
+    assert answer["c"] == "output of c"
+
+
+def test_cyclic_dependencies_are_rejected(action_service):
+    with pytest.raises(ValueError, match="环"):
+        _pipeline(
+            _dag({"id": 1, "name": "a", "prev": [2]}, {"id": 2, "name": "b", "prev": [1]})
+        )
+
+
+def test_missing_dependency_is_ignored(action_service):
+    pipeline = _pipeline(_dag({"id": 1, "name": "a", "prev": [9]}))
+
+    assert pipeline.dependencies == {"a": []}
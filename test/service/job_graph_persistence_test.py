@@ -0,0 +1,201 @@
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Type
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.common.singleton import Singleton
+from app.core.dal.dao import dao as dao_module, job_graph_dao as job_graph_dao_module
+from app.core.dal.dao.dao import Dao
+from app.core.dal.dao.job_dao import JobDao
+from app.core.dal.dao.job_graph_dao import JobEdgeDao, JobVertexDao
+from app.core.dal.database import Do
+from app.core.dal.do.job_do import JobDo
+from app.core.model.job import Job, SubJob
+from app.core.model.job_graph import JobGraph
+from app.core.model.message import AgentMessage
+from app.core.service.job_service import JobService
+
+
+@pytest.fixture
+def job_service(monkeypatch) -> Iterator[JobService]:
+    """A job service whose DAOs use an in-memory database."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Do.metadata.create_all(bind=engine)
+    test_session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+    monkeypatch.setattr(dao_module, "DbSession", test_session)
+
+    dao_classes: List[Type[Dao]] = [JobDao, JobVertexDao, JobEdgeDao]
+    for dao_cls in dao_classes:
+        dao = object.__new__(dao_cls)
+        dao.__init__(test_session())
+        monkeypatch.setitem(Singleton._instances, dao_cls, dao)
+
+    service = object.__new__(JobService)
+    service.__init__()
+    yield service
+    engine.dispose()
+
+
+def _create_original_job(service: JobService, dag: str = "") -> str:
+    job = Job(id="job", goal="goal", session_id="session")
+    service.save_job(job)
+    if dag:
+        service._job_dao.update(id=job.id, dag=dag)
+    return job.id
+
+
+def _reload(service: JobService, original_job_id: str) -> JobGraph:
+    """Drop the cached job graph, and load it from the database."""
+    service._job_graphs.clear()
+    return service.get_job_graph(original_job_id)
+
+
+def test_job_graph_deltas_are_persisted(job_service: JobService):
+    original_job_id = _create_original_job(job_service)
+
+    job_graph = JobGraph()
+    for vertex in ("a", "b", "c"):
+        job_graph.add_vertex(vertex)
+    job_graph.add_edge("a", "b")
+    job_graph.add_edge("b", "c")
+    job_service.set_job_graph(original_job_id, job_graph)
+
+    loaded = _reload(job_service, original_job_id)
+    assert set(loaded.vertices()) == {"a", "b", "c"}
+    assert set(loaded.edges()) == {("a", "b"), ("b", "c")}
+
+    # removing a vertex removes its edges
+    job_service._apply_job_graph_delta(original_job_id, removed_vertices={"b"})
+    loaded = _reload(job_service, original_job_id)
+    assert set(loaded.vertices()) == {"a", "c"}
+    assert set(loaded.edges()) == set()
+
+
+def test_many_edges_are_removed_in_chunks(job_service: JobService):
+    original_job_id = _create_original_job(job_service)
+
+    job_graph = JobGraph()
+    edges = {(f"s{i}", f"t{i}") for i in range(1200)}
+    for source, target in edges:
+        job_graph.add_edge(source, target)
+    job_service.set_job_graph(original_job_id, job_graph)
+
+    job_service.set_job_graph(original_job_id, JobGraph())
+    loaded = _reload(job_service, original_job_id)
+    assert loaded.vertices() == []
+    assert loaded.edges() == []
+
+
+def test_legacy_dag_is_migrated_only_once(job_service: JobService):
+    legacy_graph = JobGraph()
+    legacy_graph.add_edge("a", "b")
+    original_job_id = _create_original_job(job_service, dag=legacy_graph.to_json_str())
+
+    loaded = _reload(job_service, original_job_id)
+    assert set(loaded.edges()) == {("a", "b")}
+    job_do = job_service._job_dao.session.get(JobDo, original_job_id)
+    assert job_do is not None and not job_do.dag
+
+    # an emptied job graph does not come back from the legacy dag
+    job_service.set_job_graph(original_job_id, JobGraph())
+    assert _reload(job_service, original_job_id).vertices() == []
+
+
+def test_failed_delta_leaves_the_saved_job_graph_unchanged(job_service: JobService, monkeypatch):
+    original_job_id = _create_original_job(job_service)
+
+    job_graph = JobGraph()
+    job_graph.add_edge("a", "b")
+    job_service.set_job_graph(original_job_id, job_graph)
+
+    def failing_edge(**kwargs):
+        raise RuntimeError("write failed")
+
+    # the edge is written after the vertices were removed and added in the same transaction
+    with monkeypatch.context() as m, pytest.raises(RuntimeError):
+        m.setattr(job_graph_dao_module, "JobEdgeDo", failing_edge)
+        job_service._apply_job_graph_delta(
+            original_job_id, removed_vertices={"b"}, added_edges={("a", "c")}
+        )
+
+    loaded = _reload(job_service, original_job_id)
+    assert set(loaded.vertices()) == {"a", "b"}
+    assert set(loaded.edges()) == {("a", "b")}
+
+
+def _snapshot_statement_count(job_service: JobService, original_job_id: str) -> int:
+    """Take a snapshot of the job graph, and count the SQL statements it ran."""
+    statements: List[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    job_service._job_graphs.clear()
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        job_service.get_job_graph_snapshot(original_job_id)
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+    return len(statements)
+
+
+def test_job_graph_snapshot_is_loaded_in_a_constant_number_of_queries(
+    job_service: JobService,
+):
+    original_job_id = _create_original_job(job_service)
+    message_calls: List[str] = []
+
+    def get_messages_by_job_ids(job_ids, message_type) -> Dict[str, List[AgentMessage]]:
+        message_calls.append("agent messages")
+        return {
+            job_id: [AgentMessage(job_id=job_id, artifact_ids=[f"graph_{job_id}"])]
+            for job_id in job_ids
+        }
+
+    def get_messages(ids) -> Dict[str, str]:
+        message_calls.append("graph messages")
+        return {message_id: f"message {message_id}" for message_id in ids}
+
+    job_service._message_service = SimpleNamespace(
+        get_messages_by_job_ids=get_messages_by_job_ids, get_messages=get_messages
+    )
+
+    def add_subjobs(ids: List[str]) -> None:
+        job_graph = job_service.get_job_graph(original_job_id)
+        for subjob_id in ids:
+            job_service.save_job(
+                SubJob(
+                    id=subjob_id,
+                    goal="goal",
+                    session_id="session",
+                    original_job_id=original_job_id,
+                    expert_id="expert",
+                    is_legacy=subjob_id == "s0",
+                )
+            )
+            job_graph.add_vertex(subjob_id)
+        job_service.set_job_graph(original_job_id, job_graph)
+
+    add_subjobs(["s0", "s1"])
+    few_statements = _snapshot_statement_count(job_service, original_job_id)
+    add_subjobs(["s2", "s3", "s4", "s5"])
+    many_statements = _snapshot_statement_count(job_service, original_job_id)
+    assert 0 < few_statements == many_statements
+
+    snapshot = job_service.get_job_graph_snapshot(original_job_id)
+    assert snapshot.original_job.id == original_job_id
+    assert set(snapshot.subjobs) == {f"s{i}" for i in range(6)}
+    assert set(snapshot.subjob_results) == set(snapshot.subjobs)
+    assert "s0" not in {subjob.id for subjob in snapshot.get_active_subjobs()}
+    assert snapshot.get_agent_messages("s1")[0].get_artifact_ids() == ["graph_s1"]
+    assert snapshot.graph_messages["graph_s1"] == "message graph_s1"
+    # the messages are loaded with one call each, whatever the number of subjobs
+    assert message_calls == ["agent messages", "graph messages"] * 3
+    with pytest.raises(TypeError):
+        snapshot.subjobs["s9"] = snapshot.subjobs["s1"]  # type: ignore
@@ -0,0 +1,85 @@
+from typing import Optional
+
+import pytest
+
+from app.core.common.type import CallParamSource
+from app.core.model.task import ToolCallContext
+from app.core.toolkit.call_plan import CallPlan
+
+
+class GraphService:
+    pass
+
+
+class OtherService:
+    pass
+
+
+async def query_graph(
+    graph_service: GraphService,
+    other_service: OtherService | None,
+    tool_call_ctx: Optional[ToolCallContext],
+    query: str,
+    limit: int = 10,
+    *args,
+    **kwargs,
+) -> str:
+    return query
+
+
+def test_parameters_are_classified_once():
+    plan = CallPlan.compile(query_graph)
+
+    assert plan.func_name == "query_graph"
+    assert plan.is_coroutine
+    # the variadic parameters are not bound
+    assert [(p.name, p.source) for p in plan.params] == [
+        ("graph_service", CallParamSource.SERVICE),
+        ("other_service", CallParamSource.SERVICE),
+        ("tool_call_ctx", CallParamSource.CONTEXT),
+        ("query", CallParamSource.ARGUMENT),
+        ("limit", CallParamSource.ARGUMENT),
+    ]
+    assert plan.params[1].service_types == (OtherService,)
+    assert plan.params[3].required and not plan.params[4].required
+
+
+def test_tool_args_are_bound_with_the_context_and_the_services():
+    plan = CallPlan.compile(query_graph)
+    graph_service = GraphService()
+    tool_call_ctx = object()
+
+    kwargs = plan.bind_tool_args(
+        func_args={"query": "MATCH (n) RETURN n"},
+        tool_call_ctx=tool_call_ctx,
+        services={GraphService: graph_service},
+    )
+
+    # a service which is not available is left to the default of the function
+    assert kwargs == {
+        "query": "MATCH (n) RETURN n",
+        "tool_call_ctx": tool_call_ctx,
+        "graph_service": graph_service,
+    }
+
+
+def test_tool_args_require_the_context_if_the_function_takes_it():
+    plan = CallPlan.compile(query_graph)
+
+    with pytest.raises(ValueError, match="requires FunctionCallContext"):
+        plan.bind_tool_args(func_args={"query": "q"})
+
+
+def test_command_params_are_bound_with_the_defaults():
+    def subscriber(job_id: str, reason: str = "stopped") -> None:
+        pass
+
+    plan = CallPlan.compile(subscriber)
+
+    assert not plan.is_coroutine
+    assert plan.bind_command_params({"job_id": "job", "ignored": 1}) == {
+        "job_id": "job",
+        "reason": "stopped",
+    }
+    with pytest.raises(ValueError, match="missing required parameter 'job_id'"):
+        plan.bind_command_params({"reason": "failed"})
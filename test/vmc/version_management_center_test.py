@@ -0,0 +1,83 @@
+import time
+
+from app.core.central_orchestrator.version_management_center.record import (
+    ActionExecutionRecord,
+    OperatorExecutionRecord,
+    WorkflowExecutionRecord,
+)
+from app.core.central_orchestrator.version_management_center.version_management_center import (
+    VersionManagementCenter,
+)
+
+
+def _new_vmc(max_records: int = 0, trace_ttl: float = 0) -> VersionManagementCenter:
+    """Create a VMC outside of the singleton, with the given retention."""
+    vmc = object.__new__(VersionManagementCenter)
+    vmc.__init__()
+    vmc._max_records = max_records
+    vmc._max_bytes = 0
+    vmc._trace_ttl = trace_ttl
+    return vmc
+
+
+def test_relogging_a_record_does_not_duplicate_it():
+    vmc = _new_vmc()
+    record = ActionExecutionRecord(record_id="r1", action_id="a", trace_id="t1")
+    vmc.log_action(record)
+    vmc.log_action(record)
+
+    assert vmc.stats()["records"] == 1
+    assert vmc.evict_trace("t1") == 1
+    assert vmc.stats()["records"] == 0
+
+
+def test_expired_traces_are_evicted_in_creation_order():
+    vmc = _new_vmc(trace_ttl=0.05)
+    vmc.log_action(ActionExecutionRecord(record_id="r1", trace_id="old"))
+    time.sleep(0.06)
+    vmc.log_action(ActionExecutionRecord(record_id="r2", trace_id="new"))
+
+    assert vmc.get_action_record("r1") is None
+    assert vmc.get_action_record("r2") is not None
+    assert vmc.stats()["evicted_traces"] == 1
+
+
+def test_least_recently_used_trace_is_evicted_over_capacity():
+    vmc = _new_vmc(max_records=2)
+    vmc.log_action(ActionExecutionRecord(record_id="r1", trace_id="t1"))
+    vmc.log_action(ActionExecutionRecord(record_id="r2", trace_id="t2"))
+    # touch t1, so that t2 is the least recently used trace
+    vmc.get_actions_by_trace_id("t1")
+    vmc.log_action(ActionExecutionRecord(record_id="r3", trace_id="t3"))
+
+    assert vmc.get_action_record("r2") is None
+    assert vmc.get_action_record("r1") is not None
+    assert vmc.get_action_record("r3") is not None
+
+
+def _operator(record_id: str, trace_id: str) -> OperatorExecutionRecord:
+    return OperatorExecutionRecord(record_id=record_id, workflow_version_id="w1", trace_id=trace_id)
+
+
+def test_relogged_operator_is_replaced_in_its_workflow():
+    vmc = _new_vmc()
+    workflow = WorkflowExecutionRecord(workflow_version_id="w1", trace_id="t1", span_id="s1")
+    vmc.log_workflow(workflow)
+    vmc.log_operator(_operator("o1", "t1"))
+    vmc.log_operator(_operator("o2", "t1"))
+    relogged = _operator("o1", "t1")
+    vmc.log_operator(relogged)
+
+    assert [r.record_id for r in workflow.operator_records] == ["o1", "o2"]
+    assert workflow.operator_records[0] is relogged
+
+
+def test_evicted_operator_is_dropped_from_its_workflow():
+    vmc = _new_vmc()
+    workflow = WorkflowExecutionRecord(workflow_version_id="w1", trace_id="t1", span_id="s1")
+    vmc.log_workflow(workflow)
+    vmc.log_operator(_operator("o1", "t2"))
+
+    assert vmc.evict_trace("t2") == 1
+    assert workflow.operator_records == []
+    assert vmc.get_workflow_record("w1") is workflow